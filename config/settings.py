@@ -1,6 +1,15 @@
 import os
 from typing import Literal, cast
 
+# Корень проекта: относительные пути кэшей из окружения (.env) отсчитываются от него, а не от текущего каталога
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _project_path(name: str, default: str) -> str:
+    """Путь из переменной окружения name (или default) относительно корня проекта; абсолютный - как есть."""
+    return os.path.join(PROJECT_ROOT, os.getenv(name, default))
+
+
 _RAW_DOMAIN = os.getenv("DOMAIN", "com")
 
 if _RAW_DOMAIN not in {"dev", "com", "ru"}:
@@ -8,9 +17,61 @@ if _RAW_DOMAIN not in {"dev", "com", "ru"}:
 
 DOMAIN: Literal['dev', 'com', 'ru'] = cast(Literal['dev', 'com', 'ru'], _RAW_DOMAIN)
 
-BASE_URL = f"https://api.vezubr.{DOMAIN}/v1/api-ext"
+# API_BASE_URL переопределяет стенд, например локальной заглушкой: http://127.0.0.1:8080/v1/api-ext
+BASE_URL = os.getenv("API_BASE_URL") or f"https://api.vezubr.{DOMAIN}/v1/api-ext"
 
 TIMEOUT = 10
 
 CLIENT_ID=1939
-PRODUCER_ID=1599
\ No newline at end of file
+PRODUCER_ID=1599
+
+# === ПУЛ HTTP-СОЕДИНЕНИЙ ===
+# Количество пулов (по одному на хост) и максимальное число keep-alive соединений в пуле
+POOL_CONNECTIONS = int(os.getenv("POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("POOL_MAXSIZE", "50"))
+
+# Лимит одновременных соединений aiohttp-коннектора для async-клиентов
+ASYNC_POOL_LIMIT = int(os.getenv("ASYNC_POOL_LIMIT", "100"))
+
+# === МАССОВЫЕ ОПЕРАЦИИ (utils.bulk_executor) ===
+# Число параллельных потоков и ограничение частоты запросов (запросов в секунду)
+BULK_MAX_WORKERS = int(os.getenv("BULK_MAX_WORKERS", "8"))
+BULK_RATE_LIMIT = float(os.getenv("BULK_RATE_LIMIT", "20"))
+# Бюджеты адаптивного режима массовой загрузки (utils.adaptive_batching): p99 запроса пачки, мс
+# (по умолчанию - половина TIMEOUT) и допустимая доля неуспешных запросов
+BULK_P99_BUDGET_MS = float(os.getenv("BULK_P99_BUDGET_MS", str(TIMEOUT * 1000 / 2)))
+BULK_ERROR_BUDGET = float(os.getenv("BULK_ERROR_BUDGET", "0.02"))
+
+# === МЕТРИКИ HTTP-ВЫЗОВОВ (utils.http_metrics) ===
+# Файл JSON-сводки задержек по эндпоинтам, записывается в конце прогона pytest
+HTTP_METRICS_FILE = os.getenv("HTTP_METRICS_FILE", "http-metrics.json")
+
+# === КЭШ ТОКЕНОВ (utils.token_store) ===
+# Каталог файлового кэша токенов, общего для процессов pytest и воркеров xdist
+TOKEN_CACHE_DIR = _project_path("TOKEN_CACHE_DIR", ".cache/tokens")
+# За сколько секунд до истечения токен считается устаревшим и запрашивается заново
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "60"))
+# Время жизни токена, если в нём нет claim exp, секунд
+TOKEN_DEFAULT_TTL = float(os.getenv("TOKEN_DEFAULT_TTL", "3600"))
+
+# === ИСТОРИЯ ДЛИТЕЛЬНОСТЕЙ ТЕСТОВ (utils.test_durations) ===
+# JSON с длительностями тестов прошлых прогонов - порядок запуска и разбиение на шарды CI
+TEST_DURATIONS_FILE = _project_path("TEST_DURATIONS_FILE", ".cache/test-durations.json")
+# Каталог allure-results, из которого берутся длительности тестов без собственной истории
+ALLURE_RESULTS_DIR = os.getenv("ALLURE_RESULTS_DIR", "allure-results")
+
+# === РЕЕСТР ИСПОЛЬЗОВАННЫХ ИНН (utils.inn_registry) ===
+# Каталог файлов реестра (по файлу на окружение и тип ИНН), общего для прогонов и воркеров xdist
+INN_REGISTRY_DIR = _project_path("INN_REGISTRY_DIR", ".cache/inns")
+
+# === ЛОКАЛЬНЫЙ КОРПУС ИНН (utils.inn_corpus) ===
+# Проверенные ИНН юрлиц (.npy), собираются заранее: python -m scripts.build_inn_corpus
+INN_CORPUS_FILE = _project_path("INN_CORPUS_FILE", ".cache/inn-corpus.npy")
+
+# === МАНИФЕСТ ТРАНСПОРТА (utils.fleet_seeding) ===
+# id созданных водителей, ТС, прицепов и тягачей по стендам и ролям (python -m scripts.seed_fleet)
+FLEET_MANIFEST_FILE = _project_path("FLEET_MANIFEST_FILE", ".cache/fleet-manifest.json")
+
+# === ЛОКАЛЬНАЯ ЗАГЛУШКА API-EXT (local_api) ===
+# Ключ подписи токенов: сохраняется между перезапусками, чтобы токены из TOKEN_CACHE_DIR оставались действительными
+LOCAL_API_SECRET_FILE = _project_path("LOCAL_API_SECRET_FILE", ".cache/local-api.secret")
@@ -1,17 +1,205 @@
 import os
+import json
 from pathlib import Path
+import allure
 import pytest
-import requests
 from dotenv import load_dotenv
-from config.settings import BASE_URL, TIMEOUT
+from config.settings import BASE_URL, HTTP_METRICS_FILE, TOKEN_CACHE_DIR, TEST_DURATIONS_FILE, ALLURE_RESULTS_DIR
 from pages.create_contractor_page import CreateContractorPage
+from utils.http_session import create_session, set_session, close_session, set_auth_refresher
+from utils.address_repository import get_address_repository, clear_address_repositories
+from utils.token_store import TokenStore
+from utils.http_metrics import get_http_metrics, worker_metrics_path, merge_worker_files
+from utils.unique_ids import worker_id
+from utils.test_durations import load_history, measured_durations
+from utils.perf_baseline import PerfBaseline, PerfThresholds, comparison_table, regressions, write_allure_result
 
 dotenv_path = Path(__file__).parent / ".env"
 if dotenv_path.exists():
     load_dotenv(dotenv_path=dotenv_path)
 
-# === КЭШ ДЛЯ ТОКЕНОВ ===
-_auth_cache = {}
+# === ПАРАМЕТРЫ ЗАПУСКА ===
+def pytest_addoption(parser):
+    group = parser.getgroup("load", "Нагрузочные тесты")
+    group.addoption("--run-load", action="store_true", default=False,
+                    help="запускать тесты с маркером load")
+    group.addoption("--load-mode", choices=["closed", "open"], default="closed",
+                    help="closed - пул потоков; open - отправка по расписанию, задержка от плановой отправки")
+    group.addoption("--load-rate", type=float, default=5.0, help="целевая интенсивность, запросов/с")
+    group.addoption("--load-ramp-up", type=float, default=10.0, help="длительность разгона, с")
+    group.addoption("--load-steady", type=float, default=60.0, help="длительность стабильной фазы, с")
+    group.addoption("--load-ramp-down", type=float, default=10.0, help="длительность спада, с")
+    group.addoption("--load-workers", type=int, default=32, help="число потоков генератора нагрузки")
+    group.addoption("--load-max-error-rate", type=float, default=0.05,
+                    help="допустимая доля ошибок на эндпоинт")
+    group.addoption("--batch-sizes", default="1,10,100,500,1000,5000",
+                    help="размеры пачек для бенчмарка create-list, через запятую")
+    group.addoption("--batch-repeats", type=int, default=3, help="повторов на размер пачки")
+
+    group = parser.getgroup("schedule", "Порядок запуска и шарды")
+    group.addoption("--durations-file", default=TEST_DURATIONS_FILE,
+                    help="JSON с историей длительностей тестов (обновляется в конце прогона)")
+    group.addoption("--duration-order", action="store_true", default=False,
+                    help="сортировать модули по длительности и без -n / --num-shards")
+    group.addoption("--no-duration-order", action="store_true", default=False,
+                    help="запускать в порядке файлов, без сортировки по длительности")
+    group.addoption("--num-shards", type=int, default=1, help="число шардов CI")
+    group.addoption("--shard-id", type=int, default=0, help="номер шарда CI (0..num-shards-1)")
+
+    group = parser.getgroup("perf", "Сравнение с базовой линией производительности")
+    group.addoption("--perf-baseline", default=None,
+                    help="JSON базовой линии: сравнить задержки эндпоинтов и длительности тестов прогона с ней")
+    group.addoption("--perf-baseline-update", action="store_true", default=False,
+                    help="записать результаты прогона в --perf-baseline вместо сравнения")
+    group.addoption("--perf-threshold", type=float, default=0.2, help="допустимый рост перцентиля/длительности, доля")
+    group.addoption("--perf-percentile", type=float, default=95.0, help="сравниваемый перцентиль задержки эндпоинта")
+    group.addoption("--perf-alpha", type=float, default=0.01, help="уровень значимости сдвига распределения")
+    group.addoption("--perf-min-samples", type=int, default=20, help="минимум вызовов эндпоинта для сравнения")
+    group.addoption("--perf-mode", choices=["fail", "warn"], default="fail",
+                    help="fail - регрессия роняет прогон; warn - только отчёт")
+
+
+_test_reports = []
+
+
+def _duration_order_enabled(config) -> bool:
+    """Сортировка по длительности: под xdist (-n), с --num-shards > 1 или явно с --duration-order."""
+    if config.getoption("--no-duration-order"):
+        return False
+    xdist = bool(getattr(config.option, "numprocesses", None)) or hasattr(config, "workerinput")
+    return xdist or config.getoption("--num-shards") > 1 or config.getoption("--duration-order")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Порядок по истории длительностей под xdist и шардами: модули с наибольшей суммарной длительностью
+    первыми, чтобы воркеры xdist (-n) не простаивали, пока один досчитывает длинный сценарий. Тесты модуля
+    остаются подряд - module-фикстуры (LocalApiServer) не пересоздаются. Обычный pytest - в порядке файлов.
+    С --num-shards остаются только тесты своего шарда (разбиение по суммарной длительности,
+    одинаковое на всех шардах).
+    Нагрузочные тесты долгие и создают много данных - по умолчанию пропускаем.
+    """
+    num_shards, shard_id = config.getoption("--num-shards"), config.getoption("--shard-id")
+    if not 0 <= shard_id < num_shards:
+        raise pytest.UsageError(f"--shard-id должен быть от 0 до {num_shards - 1}")
+
+    if num_shards > 1 or _duration_order_enabled(config):
+        history = load_history(config.getoption("--durations-file"), ALLURE_RESULTS_DIR)
+        by_id = {item.nodeid: item for item in items}
+        if num_shards > 1:
+            shard = set(history.shards(list(by_id), num_shards)[shard_id][1])
+            deselected = [item for nodeid, item in by_id.items() if nodeid not in shard]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+            by_id = {nodeid: item for nodeid, item in by_id.items() if nodeid in shard}
+        order = list(by_id)
+        if _duration_order_enabled(config):
+            order = history.longest_modules_first(order)
+        items[:] = [by_id[nodeid] for nodeid in order]
+
+    if config.getoption("--run-load"):
+        return
+    skip_load = pytest.mark.skip(reason="нагрузочный тест: запуск с --run-load")
+    for item in items:
+        if "load" in item.keywords:
+            item.add_marker(skip_load)
+
+
+def pytest_runtest_logreport(report):
+    # Под xdist отчёты воркеров приходят и в контроллер - история пишется один раз, там
+    _test_reports.append((report.nodeid, report.outcome, report.duration))
+
+
+def pytest_sessionfinish(session):
+    """
+    Сохраняет длительности тестов прогона в историю (--durations-file).
+    При запуске с -n это делает контроллер, он же собирает метрики воркеров в один HTTP_METRICS_FILE.
+    """
+    if hasattr(session.config, "workerinput"):
+        return
+    measured = measured_durations(_test_reports)
+    if measured:
+        history = load_history(session.config.getoption("--durations-file"))
+        history.update(measured)
+        history.save()
+
+    merged = merge_worker_files(HTTP_METRICS_FILE)
+    if merged is not None:
+        print(f"\n📊 Задержки HTTP-вызовов всех воркеров ({HTTP_METRICS_FILE}):\n{merged.summary_table()}")
+
+    if session.config.getoption("--perf-baseline"):
+        _check_perf_baseline(session, merged or get_http_metrics(), measured)
+
+
+def _check_perf_baseline(session, metrics, durations):
+    """Сравнение прогона с базовой линией (--perf-baseline) или её обновление (--perf-baseline-update)."""
+    config = session.config
+    path = config.getoption("--perf-baseline")
+    baseline = PerfBaseline.load(path)
+
+    if config.getoption("--perf-baseline-update"):
+        baseline.update(metrics, durations)
+        baseline.save(path)
+        print(f"\n📌 Базовая линия производительности обновлена: {path}")
+        return
+
+    thresholds = PerfThresholds(
+        threshold=config.getoption("--perf-threshold"),
+        percentile=config.getoption("--perf-percentile"),
+        alpha=config.getoption("--perf-alpha"),
+        min_samples=config.getoption("--perf-min-samples"),
+    )
+    rows = baseline.compare(metrics, durations, thresholds)
+    if not rows:
+        print(f"\n⚪ Нет данных для сравнения с базовой линией {path}")
+        return
+
+    print(f"\n📐 Сравнение с базовой линией {path}:\n{comparison_table(rows, thresholds.percentile)}")
+    allure_dir = getattr(config.option, "allure_report_dir", None)
+    if allure_dir:
+        write_allure_result(allure_dir, rows, thresholds.percentile)
+
+    failed = regressions(rows)
+    if failed and config.getoption("--perf-mode") == "fail":
+        print(f"❌ Регрессия производительности: {len(failed)}")
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+# === ОБЩИЙ HTTP-ТРАНСПОРТ ===
+@pytest.fixture(scope="session")
+def http_session():
+    """
+    Общая keep-alive сессия с пулом соединений на весь прогон.
+    Все page-клиенты используют её через utils.http_session.get_session().
+    """
+    session = create_session()
+    set_session(session)
+    yield session
+    close_session()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_metrics_report():
+    """
+    В конце сессии сохраняет гистограммы задержек всех HTTP-вызовов по эндпоинтам
+    в HTTP_METRICS_FILE и прикладывает JSON к Allure.
+    Воркер xdist пишет свой файл, контроллер объединяет их в pytest_sessionfinish.
+    """
+    metrics = get_http_metrics()
+    yield metrics
+
+    if not metrics.endpoints:
+        return
+
+    worker = worker_id()
+    path = HTTP_METRICS_FILE if worker == "master" else worker_metrics_path(HTTP_METRICS_FILE, worker)
+    metrics.write_json(path)
+    print(f"\n📊 Задержки HTTP-вызовов ({path}):\n{metrics.summary_table()}")
+    allure.attach(
+        json.dumps(metrics.to_dict(), ensure_ascii=False, indent=2),
+        name="HTTP-метрики по эндпоинтам",
+        attachment_type=allure.attachment_type.JSON
+    )
 
 
 # === ROLE-RELATED FIXTURES ===
@@ -24,32 +212,33 @@ def role(request):
     return request.param
 
 
+# === КЭШ ТОКЕНОВ ===
 @pytest.fixture(scope="session")
-def get_auth_token():
+def token_store(http_session):
+    """
+    Файловый кэш токенов в TOKEN_CACHE_DIR, общий для процессов pytest и воркеров xdist.
+    В начале сессии параллельно логинится под всеми ролями с учётными данными в .env,
+    истёкший токен обновляется общим транспортом на первый 401.
+    """
+    store = TokenStore(TOKEN_CACHE_DIR, BASE_URL)
+    set_auth_refresher(store)
+    store.login_all(_ROLE_MAP)
+    yield store
+    set_auth_refresher(None)
+
+
+@pytest.fixture(scope="session")
+def get_auth_token(token_store):
+    requested = set()
+
     def _login(role: str):
-        if role in _auth_cache:
-            return _auth_cache[role]
-
-        email = os.getenv(f"{role.upper()}_EMAIL")
-        password = os.getenv(f"{role.upper()}_PASSWORD")
-        if not email or not password:
-            raise ValueError(f"Данные для {role} не найдены в .env")
-
-        print(f"\n[Auth] Запрос роли: {role}")
-        print(f"[Auth] Получен email: {repr(email)}")
-        print(f"[Auth] Получен пароль: {repr(password)}")
-
-        payload = {"username": email, "password": password}
-        response = requests.post(
-            f"{BASE_URL}/user/login",
-            json=payload,
-            timeout=TIMEOUT
-        )
-        assert response.status_code == 200, f"Login failed: {response.text}"
-        data = response.json()
-        token_info = {"token": data["token"], "role": data["role"]}
-        _auth_cache[role] = token_info
-        return token_info
+        if role not in requested:
+            requested.add(role)
+            print(f"\n[Auth] Запрос роли: {role}")
+            print(f"[Auth] Получен email: {repr(os.getenv(f'{role.upper()}_EMAIL'))}")
+            print(f"[Auth] Получен пароль: {repr(os.getenv(f'{role.upper()}_PASSWORD'))}")
+
+        return token_store.get(role)
 
     return _login
 
@@ -97,29 +286,26 @@ def contract_id(request):
     return _ROLE_MAP[role]["contract_id"]
 
 
+# === КЭШ АДРЕСОВ ===
+@pytest.fixture(scope="session")
+def address_repository(get_auth_token):
+    """
+    Репозиторий адресов по роли: /contractor-point/list-info загружается один раз на роль за сессию,
+    поиск по id / externalId идёт по индексу. Использование: address_repository("lkp").find_by_external_id(...)
+    """
+    def _get(role: str):
+        return get_address_repository(BASE_URL, get_auth_token(role)["token"])
+
+    yield _get
+    clear_address_repositories()
+
+
 # === VALID_ADDRESSES (работает с role и indirect) ===
 @pytest.fixture(scope="function")
-def valid_addresses(get_auth_token, role):
+def valid_addresses(get_auth_token, role, address_repository):
     token = get_auth_token(role)["token"]
-    headers = {"Authorization": token}
 
-    resp = requests.post(
-        f"{BASE_URL}/contractor-point/list-info",
-        headers=headers,
-        json={"itemsPerPage": 200},
-        timeout=TIMEOUT
-    )
-    resp.raise_for_status()
-    points = resp.json().get("points", [])
-
-    valid = [
-        p for p in points
-        if p.get("externalId")
-           and p.get("id")
-           and p["externalId"] != "unknown"
-           and isinstance(p["externalId"], str)
-           and p["externalId"].strip()
-    ]
+    valid = address_repository(role).valid_points()
     assert len(valid) >= 2, f"Для роли {role} найдено <2 валидных адресов"
 
     return {
@@ -180,3 +366,29 @@ def contractor_page_lkp(lkp_token):
     """Фикстура для Page Object контрагента с токеном LKP"""
     from config.settings import BASE_URL
     return CreateContractorPage(BASE_URL, lkp_token)
+
+
+# === ЛОКАЛЬНАЯ ЗАГЛУШКА API-EXT ===
+@pytest.fixture(scope="module")
+def local_api():
+    """
+    Заглушка api-ext (local_api) в фоне на модуль тестов: (base_url, token_for), token_for(role) - токен
+    роли lkz / lkp / lke. Заглушки с профилем отказов или своим состоянием - LocalApiServer(...) в самом тесте.
+    """
+    from local_api.app import LocalApiServer
+    with LocalApiServer() as server:
+        yield server.base_url, server.token_for
+
+
+# === НАГРУЗОЧНЫЕ ТЕСТЫ ===
+@pytest.fixture(scope="session")
+def load_profile(request):
+    """Профиль нагрузки из параметров --load-*."""
+    from utils.load_harness import LoadProfile
+    option = request.config.getoption
+    return LoadProfile(
+        rate=option("--load-rate"),
+        ramp_up=option("--load-ramp-up"),
+        steady=option("--load-steady"),
+        ramp_down=option("--load-ramp-down")
+    )
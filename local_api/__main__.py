@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка api-ext для отладки и нагрузочных прогонов без боевого стенда.
+
+Запуск из корня проекта:
+    python -m local_api --port 8080
+    python -m local_api --port 8080 --workers 4 --token-ttl 600
+    python -m local_api --port 8080 --faults realistic --fault-seed 42
+    python -m local_api --port 8080 --faults my-faults.json
+
+Тесты и скрипты направляются на заглушку переменной окружения:
+    API_BASE_URL=http://127.0.0.1:8080/v1/api-ext pytest tests/test_create_shipment_task.py
+"""
+import argparse
+import multiprocessing
+import os
+import secrets
+from aiohttp import web
+from config.settings import LOCAL_API_SECRET_FILE
+from local_api.app import API_PREFIX, create_app
+from local_api.faults import FAULT_PRESETS, FaultProfile
+from local_api.state import ApiState, DEFAULT_TOKEN_TTL
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Локальная заглушка api-ext")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес для прослушивания")
+    parser.add_argument("--port", type=int, default=8080, help="порт")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="число процессов на одном порту (SO_REUSEPORT); состояние у каждого своё")
+    parser.add_argument("--token-ttl", type=float, default=DEFAULT_TOKEN_TTL, help="время жизни токена, с")
+    parser.add_argument("--order-settle-delay", type=float, default=0.0,
+                        help="через сколько секунд созданный заказ переходит в state 12")
+    parser.add_argument("--faults", default="none",
+                        help=f"профиль задержек и отказов: {', '.join(FAULT_PRESETS)} или путь к JSON")
+    parser.add_argument("--fault-seed", type=int, default=None, help="seed инъекции отказов (воспроизводимость)")
+    parser.add_argument("--secret-file", default=LOCAL_API_SECRET_FILE,
+                        help="файл ключа подписи токенов (создаётся при первом запуске)")
+    return parser.parse_args()
+
+
+def load_secret(path: str) -> bytes:
+    """
+    Ключ подписи токенов из файла, при первом запуске - новый.
+    Токены из кэша TOKEN_CACHE_DIR остаются действительными после перезапуска заглушки.
+    """
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    secret = secrets.token_bytes(32)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(secret)
+    return secret
+
+
+def serve(args, secret: bytes, worker: int = 0) -> None:
+    state = ApiState(token_ttl=args.token_ttl, order_settle_delay=args.order_settle_delay, secret=secret)
+    faults = None
+    if args.faults != "none":
+        faults = FaultProfile.load(args.faults)
+        if args.fault_seed is not None:
+            # У каждого воркера своя, но воспроизводимая последовательность
+            faults.reseed(args.fault_seed + worker)
+    web.run_app(create_app(state, faults), host=args.host, port=args.port, reuse_port=args.workers > 1,
+                access_log=None, print=None)
+
+
+def main():
+    args = parse_args()
+    # Общий ключ подписи: токен, выданный одним воркером, принимают все остальные
+    secret = load_secret(args.secret_file)
+
+    print(f"🚀 Заглушка api-ext: http://{args.host}:{args.port}{API_PREFIX} "
+          f"(воркеров: {args.workers}, профиль отказов: {args.faults})")
+    if args.workers == 1:
+        serve(args, secret)
+        return
+
+    workers = [
+        multiprocessing.Process(target=serve, args=(args, secret, i), daemon=True)
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+import asyncio
+import json
+import socket
+import struct
+import threading
+from functools import partial
+from typing import Any, Optional
+from aiohttp import web
+from local_api.faults import FaultProfile
+from local_api.state import ApiError, ApiState, DICTIONARIES
+
+API_PREFIX = "/v1/api-ext"
+STATE_KEY = web.AppKey("state", ApiState)
+FAULTS_KEY = web.AppKey("faults", FaultProfile)
+
+_dumps = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+routes = web.RouteTableDef()
+
+
+def _json(data: Any, status: int = 200) -> web.Response:
+    return web.Response(body=_dumps(data).encode(), status=status, content_type="application/json")
+
+
+async def _body(request: web.Request) -> Any:
+    if not request.can_read_body:
+        return {}
+    try:
+        return await request.json(loads=json.loads)
+    except ValueError:
+        raise ApiError(400, "Некорректный JSON в теле запроса")
+
+
+def _int_id(request: web.Request) -> int:
+    try:
+        return int(request.match_info["id"])
+    except ValueError:
+        raise ApiError(404, "Объект не найден")
+
+
+def _state(request: web.Request) -> ApiState:
+    return request.app[STATE_KEY]
+
+
+@web.middleware
+async def api_middleware(request: web.Request, handler):
+    """Проверка токена (кроме /user/login) и преобразование ApiError в JSON-ответ."""
+    try:
+        if request.path != f"{API_PREFIX}/user/login":
+            _state(request).authenticate(request.headers.get("Authorization"))
+        return await handler(request)
+    except ApiError as e:
+        return _json(e.to_dict(), e.status)
+
+
+def _reset_connection(request: web.Request) -> None:
+    """Оборвать соединение RST-пакетом (SO_LINGER=0), как при падении балансировщика."""
+    transport = request.transport
+    if transport is None:
+        return
+    sock = transport.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    transport.abort()
+
+
+async def _stream_slowly(request: web.Request, response: web.Response, chunk: int, interval: float) -> web.StreamResponse:
+    body = response.body or b""
+    stream = web.StreamResponse(status=response.status, headers=response.headers)
+    stream.content_length = len(body)
+    await stream.prepare(request)
+    try:
+        for offset in range(0, len(body), chunk):
+            await stream.write(body[offset:offset + chunk])
+            await asyncio.sleep(interval)
+        await stream.write_eof()
+    except ConnectionResetError:
+        # Клиент не дождался тела (read-таймаут) и закрыл соединение
+        pass
+    return stream
+
+
+@web.middleware
+async def fault_middleware(request: web.Request, handler):
+    """
+    Задержки и отказы по FaultProfile: задержка перед обработкой, затем обрыв соединения,
+    429 / 5xx (запрос до обработчика не доходит) или медленная отдача тела ответа.
+    """
+    faults = request.app.get(FAULTS_KEY)
+    if faults is None:
+        return await handler(request)
+
+    decision = faults.decide(request.method, request.path)
+    if decision.delay:
+        await asyncio.sleep(decision.delay)
+    if decision.reset:
+        _reset_connection(request)
+        raise asyncio.CancelledError()
+    if decision.status is not None:
+        headers = {"Retry-After": str(decision.retry_after)} if decision.retry_after is not None else None
+        response = _json({"message": "Сервис временно недоступен", "status": False}, decision.status)
+        if headers:
+            response.headers.update(headers)
+        return response
+
+    response = await handler(request)
+    if decision.slow_body and isinstance(response, web.Response):
+        return await _stream_slowly(request, response, decision.chunk, decision.chunk_interval)
+    return response
+
+
+# ==================== АВТОРИЗАЦИЯ, СПРАВОЧНИКИ, ТАРИФЫ ====================
+
+@routes.post("/user/login")
+async def login(request):
+    body = await _body(request)
+    return _json(_state(request).login(body.get("username"), body.get("password")))
+
+
+@routes.get("/dictionaries")
+async def dictionaries(request):
+    return _json(DICTIONARIES)
+
+
+@routes.post("/tariffs/list")
+async def tariffs_list(request):
+    return _json(_state(request).list_tariffs(await _body(request)))
+
+
+@routes.get("/tariffs/{id}")
+async def tariff(request):
+    return _json(_state(request).get_tariff(_int_id(request)))
+
+
+# ==================== АДРЕСА ====================
+
+@routes.post("/contractor-point/list-info")
+async def points_list(request):
+    body = await _body(request)
+    return _json(_state(request).list_points(body.get("itemsPerPage"), body.get("page") or 1))
+
+
+@routes.post("/contractor-point/update")
+async def point_update(request):
+    return _json(_state(request).update_point(await _body(request)))
+
+
+@routes.get("/addresses")
+async def addresses(request):
+    limit = int(request.query.get("limit", 100))
+    return _json({"items": _state(request).list_points(limit)["points"]})
+
+
+# ==================== ГРУЗОМЕСТА ====================
+
+@routes.post("/cargo-place/create-or-update")
+async def cargo_place_upsert(request):
+    return _json(_state(request).upsert_cargo_place(await _body(request)))
+
+
+@routes.post("/cargo-place/create-list")
+async def cargo_place_create_list(request):
+    body = await _body(request)
+    return _json(_state(request).create_cargo_places(body.get("data", [])))
+
+
+@routes.post("/cargo-place/create-or-update-list")
+async def cargo_place_create_or_update_list(request):
+    body = await _body(request)
+    return _json(_state(request).create_cargo_places(body.get("data", []), update=True))
+
+
+@routes.post("/cargo-place/group-info")
+async def cargo_place_group_info(request):
+    body = await _body(request)
+    return _json(_state(request).group_info(body.get("ids", []), body.get("externalIds", [])))
+
+
+@routes.post("/cargo-place/list-by-invoice")
+async def cargo_place_list_by_invoice(request):
+    body = await _body(request)
+    return _json(_state(request).list_by_invoice(body.get("invoiceNumber")))
+
+
+@routes.post("/cargo-place/replace-planned-pairs")
+async def cargo_place_replace_planned_pairs(request):
+    body = await _body(request)
+    return _json(_state(request).replace_planned_pairs(body.get("items", []), body.get("isStrict", False)))
+
+
+@routes.get("/cargo-place/{id}")
+async def cargo_place(request):
+    return _json(_state(request).get_cargo_place(_int_id(request)))
+
+
+# ==================== ЗАДАНИЯ НА ОТГРУЗКУ ====================
+
+@routes.post("/shipment/tasks/create")
+async def shipment_task_create(request):
+    return _json(_state(request).create_shipment_task(await _body(request)))
+
+
+@routes.post("/shipment/tasks/create-list")
+async def shipment_task_create_list(request):
+    body = await _body(request)
+    return _json(_state(request).create_shipment_tasks(body.get("data", [])))
+
+
+@routes.post("/shipment/tasks/cargo-delivery-request/list")
+async def shipment_task_requests(request):
+    body = await _body(request)
+    return _json(_state(request).requests_for_shipment_task(body.get("id")))
+
+
+@routes.get("/shipment/tasks/{id}")
+async def shipment_task(request):
+    return _json(_state(request).shipment_task_details(request.match_info["id"]))
+
+
+@routes.post("/shipment/tasks/{id}/update")
+async def shipment_task_update(request):
+    return _json(_state(request).update_shipment_task(request.match_info["id"], await _body(request)))
+
+
+@routes.route("DELETE", "/shipment/tasks/{id}/delete")
+@routes.post("/shipment/tasks/{id}/delete")
+async def shipment_task_delete(request):
+    return _json(_state(request).delete_shipment_task(request.match_info["id"]))
+
+
+# ==================== ЗАЯВКИ ====================
+
+@routes.post("/cargo-delivery-requests/create")
+async def delivery_request_create(request):
+    return _json(_state(request).create_delivery_request(await _body(request), publish=False))
+
+
+@routes.post("/cargo-delivery-requests/create-and-publish")
+async def delivery_request_create_and_publish(request):
+    return _json(_state(request).create_delivery_request(await _body(request), publish=True))
+
+
+@routes.get("/cargo-delivery-requests/{id}/details")
+async def delivery_request_details(request):
+    return _json(_state(request).request_details(request.match_info["id"]))
+
+
+@routes.get("/cargo-delivery-requests/{id}/take")
+async def delivery_request_take(request):
+    return _json(_state(request).take_delivery_request(request.match_info["id"]))
+
+
+@routes.post("/cargo-delivery-requests/{id}/update")
+async def delivery_request_update(request):
+    body = await _body(request)
+    return _json(_state(request).update_delivery_request(request.match_info["id"], body, active=False))
+
+
+@routes.post("/cargo-delivery-requests/{id}/update/active")
+async def delivery_request_update_active(request):
+    body = await _body(request)
+    return _json(_state(request).update_delivery_request(request.match_info["id"], body, active=True))
+
+
+# ==================== РЕЙСЫ ====================
+
+@routes.post("/cargo-deliveries/create")
+async def delivery_create(request):
+    return _json(_state(request).create_delivery(await _body(request)))
+
+
+@routes.post("/cargo-deliveries/{id}/start")
+async def delivery_start(request):
+    return _json(_state(request).start_delivery(request.match_info["id"]))
+
+
+@routes.post("/cargo-deliveries/{id}/cancel")
+async def delivery_cancel(request):
+    return _json(_state(request).cancel_delivery(request.match_info["id"]))
+
+
+@routes.get("/truck-deliveries/{id}/details")
+async def truck_delivery_details(request):
+    return _json(_state(request).delivery_details(request.match_info["id"]))
+
+
+@routes.post("/truck-deliveries/{id}/transport/appoint")
+async def truck_delivery_appoint(request):
+    body = await _body(request)
+    return _json(_state(request).appoint_transport(request.match_info["id"], body, replace=False))
+
+
+@routes.post("/truck-deliveries/{id}/transport/replace")
+async def truck_delivery_replace(request):
+    body = await _body(request)
+    return _json(_state(request).appoint_transport(request.match_info["id"], body, replace=True))
+
+
+@routes.post("/truck-deliveries/{id}/points/update/statuses")
+async def truck_delivery_points_update(request):
+    return _json(_state(request).update_points(request.match_info["id"], await _body(request)))
+
+
+# ==================== ЗАКАЗЫ ====================
+
+@routes.post("/order/transport-request/create")
+async def order_create(request):
+    return _json(_state(request).create_order(await _body(request), publish=False))
+
+
+@routes.post("/order/transport-request/create-and-publish")
+async def order_create_and_publish(request):
+    return _json(_state(request).create_order(await _body(request), publish=True))
+
+
+@routes.get("/order/{id}/details")
+async def order_details(request):
+    return _json(_state(request).order_details(_int_id(request)))
+
+
+# ==================== КОНТРАГЕНТЫ И ТРАНСПОРТ ====================
+
+@routes.post("/contractor/child-create")
+async def contractor_create(request):
+    return _json(_state(request).create_contractor(await _body(request)))
+
+
+@routes.get("/contractor/profile/{id}")
+async def contractor_profile(request):
+    return _json(_state(request).contractor_profile(_int_id(request)))
+
+
+@routes.post("/{kind:driver|vehicle|trailer|tractor}/create")
+async def transport_create(request):
+    return _json(_state(request).create_transport(request.match_info["kind"], await _body(request)))
+
+
+# ==================== ПРИЛОЖЕНИЕ ====================
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+def create_app(state: Optional[ApiState] = None, faults: Optional[FaultProfile] = None) -> web.Application:
+    """
+    aiohttp-приложение заглушки: маршруты api-ext под префиксом /v1/api-ext.
+    faults - профиль задержек и отказов (local_api.faults); None - отвечать сразу и без ошибок.
+    """
+    api = web.Application(middlewares=[fault_middleware, api_middleware])
+    api[STATE_KEY] = state or ApiState()
+    if faults is not None:
+        api[FAULTS_KEY] = faults
+    api.add_routes(routes)
+
+    # Лимит тела как у боевого стенда не известен: 1 МБ aiohttp по умолчанию не пропускает create-list на 5000 позиций
+    app = web.Application(client_max_size=MAX_BODY_SIZE)
+    app.add_subapp(API_PREFIX, api)
+    return app
+
+
+class LocalApiServer:
+    """
+    Заглушка api-ext в фоновом потоке - для офлайн-тестов и бенчмарков в том же процессе.
+
+        with LocalApiServer() as server:
+            client = ShipmentTaskClient(server.base_url, server.token_for("lkz"))
+
+    port=0 - свободный порт, выбранный ОС; faults - профиль задержек и отказов.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, state: Optional[ApiState] = None,
+                 faults: Optional[FaultProfile] = None):
+        self.host = host
+        self.port = port
+        self.state = state or ApiState()
+        self.faults = faults
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    def token_for(self, role: str = "lkz") -> str:
+        """Токен роли lkz / lkp / lke (логин "<role>-user") - выдаётся состоянием, без HTTP и профиля отказов."""
+        return self.state.login(f"{role}-user", "secret")["token"]
+
+    def start(self) -> "LocalApiServer":
+        self._thread = threading.Thread(target=self._serve, name="local-api", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._runner = web.AppRunner(create_app(self.state, self.faults), access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+
+    def __enter__(self) -> "LocalApiServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,193 @@
+import fnmatch
+import json
+import math
+import random
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
+from utils.http_metrics import endpoint_template
+
+# z-оценка 99-го перцентиля нормального распределения: p99 логнормали = median * exp(2.326 * sigma)
+_Z99 = 2.326
+
+# Коды, которыми отвечает инъекция ошибок сервера
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Распределение задержки ответа, мс.
+    kind: "fixed" (median_ms), "uniform" (min_ms..max_ms) или "lognormal" (median_ms и p99_ms -
+    типичная форма задержек API с длинным хвостом). max_ms ограничивает выбросы.
+    """
+    kind: str = "fixed"
+    median_ms: float = 0.0
+    p99_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: Optional[float] = None
+
+    def sample(self, rng: random.Random) -> float:
+        """Задержка в секундах."""
+        if self.kind == "fixed":
+            value = self.median_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.min_ms, self.max_ms if self.max_ms is not None else self.min_ms)
+        elif self.kind == "lognormal":
+            sigma = math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / _Z99 if self.median_ms > 0 else 0.0
+            value = rng.lognormvariate(math.log(self.median_ms), sigma) if self.median_ms > 0 else 0.0
+        else:
+            raise ValueError(f"Неизвестное распределение задержки: {self.kind}")
+        if self.max_ms is not None:
+            value = min(value, self.max_ms)
+        return max(value, 0.0) / 1000
+
+
+@dataclass
+class EndpointFaults:
+    """
+    Поведение одного эндпоинта. Доли - вероятности на запрос (0..1), проверяются в порядке:
+    reset_rate - обрыв соединения без ответа; throttle_rate - 429 с Retry-After;
+    error_rate - 5xx из SERVER_ERROR_STATUSES; slow_body_rate - тело отдаётся кусками
+    по slow_body_chunk байт с паузой slow_body_interval_ms между ними (проверка read-таймаутов:
+    requests считает таймаут между байтами, а не на весь ответ).
+    """
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    reset_rate: float = 0.0
+    slow_body_rate: float = 0.0
+    slow_body_chunk: int = 64
+    slow_body_interval_ms: float = 100.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointFaults":
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Неизвестные параметры профиля эндпоинта: {sorted(unknown)}")
+        kwargs = dict(data)
+        if "latency" in kwargs:
+            kwargs["latency"] = LatencyDistribution(**kwargs["latency"])
+        return cls(**kwargs)
+
+
+@dataclass
+class FaultDecision:
+    """Что сделать с конкретным запросом."""
+    delay: float = 0.0
+    reset: bool = False
+    status: Optional[int] = None
+    retry_after: Optional[int] = None
+    slow_body: bool = False
+    chunk: int = 64
+    chunk_interval: float = 0.0
+
+
+class FaultProfile:
+    """
+    Профиль задержек и отказов заглушки по эндпоинтам.
+
+    Ключи endpoints - шаблоны "METHOD /путь" или "/путь" в терминах utils.http_metrics.endpoint_template
+    (идентификаторы заменены на {id}, префикс /v1/api-ext отброшен), допускаются маски fnmatch:
+    "POST /shipment/tasks/create-list", "GET /cargo-delivery-requests/{id}/details", "* /cargo-place/*".
+    Первый подходящий ключ (в порядке объявления) побеждает, иначе - default.
+    seed делает последовательность решений воспроизводимой.
+    """
+
+    def __init__(self, default: Optional[EndpointFaults] = None,
+                 endpoints: Optional[Dict[str, EndpointFaults]] = None, seed: Optional[int] = None):
+        self.default = default or EndpointFaults()
+        self.endpoints = endpoints or {}
+        self._random = random.Random(seed)
+        self._cache: Dict[str, EndpointFaults] = {}
+        self.stats: Dict[str, int] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FaultProfile":
+        return cls(
+            default=EndpointFaults.from_dict(data.get("default", {})),
+            endpoints={key: EndpointFaults.from_dict(value) for key, value in data.get("endpoints", {}).items()},
+            seed=data.get("seed"),
+        )
+
+    @classmethod
+    def load(cls, name_or_path: str) -> "FaultProfile":
+        """Профиль по имени из FAULT_PRESETS или из JSON-файла."""
+        if name_or_path in FAULT_PRESETS:
+            return cls.from_dict(FAULT_PRESETS[name_or_path])
+        with open(name_or_path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def reseed(self, seed: Optional[int]) -> None:
+        self._random.seed(seed)
+
+    def for_request(self, method: str, path: str) -> EndpointFaults:
+        key = f"{method.upper()} {endpoint_template(path)}"
+        if key not in self._cache:
+            self._cache[key] = next(
+                (faults for pattern, faults in self.endpoints.items()
+                 if fnmatch.fnmatchcase(key, pattern if " " in pattern else f"* {pattern}")),
+                self.default
+            )
+        return self._cache[key]
+
+    def decide(self, method: str, path: str) -> FaultDecision:
+        faults = self.for_request(method, path)
+        rng = self._random
+        decision = FaultDecision(delay=faults.latency.sample(rng))
+        roll = rng.random()
+
+        if roll < faults.reset_rate:
+            decision.reset = True
+            self._count("reset")
+        elif roll < faults.reset_rate + faults.throttle_rate:
+            decision.status, decision.retry_after = 429, faults.retry_after
+            self._count("429")
+        elif roll < faults.reset_rate + faults.throttle_rate + faults.error_rate:
+            decision.status = rng.choice(SERVER_ERROR_STATUSES)
+            self._count(str(decision.status))
+        elif rng.random() < faults.slow_body_rate:
+            decision.slow_body = True
+            decision.chunk = faults.slow_body_chunk
+            decision.chunk_interval = faults.slow_body_interval_ms / 1000
+            self._count("slow_body")
+        return decision
+
+    def _count(self, kind: str) -> None:
+        self.stats[kind] = self.stats.get(kind, 0) + 1
+
+
+# Готовые профили для --faults: без отказов, "как прод" и деградация стенда
+FAULT_PRESETS: Dict[str, Dict[str, Any]] = {
+    "none": {},
+    "realistic": {
+        "default": {
+            "latency": {"kind": "lognormal", "median_ms": 40, "p99_ms": 400, "max_ms": 5000},
+            "error_rate": 0.002,
+            "throttle_rate": 0.002,
+        },
+        "endpoints": {
+            "POST /shipment/tasks/create-list": {
+                "latency": {"kind": "lognormal", "median_ms": 300, "p99_ms": 3000, "max_ms": 20000},
+                "error_rate": 0.005,
+            },
+            "POST /cargo-place/create*-list": {
+                "latency": {"kind": "lognormal", "median_ms": 250, "p99_ms": 2500, "max_ms": 20000},
+                "error_rate": 0.005,
+            },
+        },
+    },
+    "degraded": {
+        "default": {
+            "latency": {"kind": "lognormal", "median_ms": 200, "p99_ms": 8000, "max_ms": 40000},
+            "error_rate": 0.05,
+            "throttle_rate": 0.05,
+            "retry_after": 2,
+            "reset_rate": 0.01,
+            "slow_body_rate": 0.05,
+            "slow_body_chunk": 256,
+            "slow_body_interval_ms": 2000,
+        },
+    },
+}
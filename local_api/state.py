@@ -0,0 +1,778 @@
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+# Роли пользователей api-ext: клиент (ЛКЗ), подрядчик (ЛКП), экспедитор (ЛКЭ)
+ROLE_IDS = {"lkz": 1, "lkp": 2, "lke": 4}
+
+# Время жизни выданного токена по умолчанию, секунд
+DEFAULT_TOKEN_TTL = 3600.0
+
+# Точки, на которые ссылаются тесты и генераторы (mass_shipment_task_page, shipment_task_page)
+SEED_POINT_IDS = [
+    17974, 17978, 17980, 17984, 18290, 18293, 18294, 18481, 18499, 18520, 18527, 18528, 18529,
+    18532, 18534, 18535, 18647, 18785, 19162, 19203, 19206, 27317, 27318, 27606, 27607, 27883,
+    # Адреса по id из test_create_cargo_place_by_id, test_create_transport_request_with_4_cargo и деталки Задания
+    27114, 27125, 27282, 27287, 27288, 27374, 27648, 27649, 27650,
+]
+
+# Адреса стенда, на которые тесты ссылаются по externalId (EXISTING_EXTERNAL_IDS, cargo_*_page)
+SEED_POINT_EXTERNAL_IDS = [
+    "Izhevsk - Telegina - 47", "Izhevsk - Pastuhova - 37", "Izhevsk - Udmurtskaya - 12",
+    "Izhevsk - Shkolnaya - 27", "Izhevsk 76-276", "Izhevsk 36-950", "Izhevsk 81-870", "Izhevsk 71-130",
+    "Izhevsk 64-649", "IZH - 50let 40", "IZH - deryabino 702", "IZH - promish 29",
+]
+
+# Часовой пояс адресов стенда: время в деталке Задания отдаётся в нём (test_shipment_task_update, UTC+3)
+POINT_TIMEZONE = "Europe/Moscow"
+
+# Поля времени Задания и точка, по часовому поясу которой они отдаются в деталке
+TASK_TIME_FIELDS = {
+    "requiredSentAtFrom": "departurePoint",
+    "requiredSentAtTill": "departurePoint",
+    "requiredDeliveredAtFrom": "arrivalPoint",
+    "requiredDeliveredAtTill": "arrivalPoint",
+}
+
+# Задание и рейсы стенда, которые тесты читают по фиксированному id (test_shipment_task, test_call_to_detail)
+SEED_TASK_ID = "b676f327-baff-4f5c-96d1-077a86f6dc55"
+SEED_ORDER_IDS = [40178, 40179]
+
+# Состояния заказа: опубликован и оформлен полностью (TARGET_ORDER_STATES сценария 2)
+ORDER_STATE_PUBLISHED = 2
+ORDER_STATE_READY = 12
+
+DICTIONARIES = {
+    "cargoPlaceStatuses": [
+        {"id": "new", "title": "Новое"},
+        {"id": "waiting_for_sending", "title": "Ожидает отправки"},
+        {"id": "in_delivery", "title": "В доставке"},
+        {"id": "delivered", "title": "Доставлено"},
+        {"id": "replaced", "title": "Заменено"},
+    ],
+    "cargoPlaceSegmentStatuses": [
+        {"id": "planned", "title": "Запланирован"},
+        {"id": "executing", "title": "Выполняется"},
+        {"id": "completed", "title": "Завершён"},
+    ],
+    "orderUiState": [
+        {"id": ORDER_STATE_PUBLISHED, "title": "Опубликован"},
+        {"id": ORDER_STATE_READY, "title": "Исполнитель назначен"},
+    ],
+    "truckDeliveryStatus": [
+        {"id": "new", "title": "Новый"},
+        {"id": "appointed", "title": "Транспорт назначен"},
+        {"id": "executing", "title": "Выполняется"},
+        {"id": "completed", "title": "Завершён"},
+        {"id": "canceled", "title": "Отменён"},
+    ],
+    "userRoles": [
+        {"id": ROLE_IDS["lkz"], "title": "Заказчик"},
+        {"id": ROLE_IDS["lkp"], "title": "Подрядчик"},
+        {"id": ROLE_IDS["lke"], "title": "Экспедитор"},
+    ],
+    "tariffTypes": [
+        {"id": 1, "title": "Почасовой"},
+        {"id": 2, "title": "Фиксированный"},
+    ],
+}
+
+
+class ApiError(Exception):
+    """Ошибка бизнес-логики: превращается в JSON-ответ {"message", "status": false} с кодом status."""
+
+    def __init__(self, status: int, message: str, errors: Optional[list] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.errors = errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"message": self.message, "status": False}
+        if self.errors is not None:
+            data["errors"] = self.errors
+        return data
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _to_local(value: Any, tz_name: Optional[str]) -> Any:
+    """ISO-время (без смещения - UTC) в часовом поясе точки; нераспознанное значение - как есть."""
+    try:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(ZoneInfo(tz_name or POINT_TIMEZONE)).isoformat()
+
+
+def _digits(phone: Any) -> Any:
+    """Телефон в виде, который хранит api-ext: только цифры ('+7 (907) 016-74-91' -> '79070167491')."""
+    return "".join(c for c in phone if c.isdigit()) if isinstance(phone, str) else phone
+
+
+class ApiState:
+    """
+    In-memory состояние локальной заглушки api-ext.
+
+    Хранит адреса, грузоместа, задания на отгрузку, заявки,
+    рейсы, заказы, контрагентов, транспорт и тарифы. Переходы статусов повторяют
+    боевой api-ext: заявка waiting_producer_confirmation -> confirmed (take) -> in_progress
+    (старт рейса) -> completed; рейс new -> appointed -> executing -> completed / canceled.
+    Не потокобезопасно: все обращения идут из одного event loop сервера.
+    """
+
+    def __init__(self, token_ttl: float = DEFAULT_TOKEN_TTL, order_settle_delay: float = 0.0,
+                 secret: Optional[bytes] = None):
+        """
+        :param token_ttl: время жизни токена, секунд (после - 401)
+        :param order_settle_delay: через сколько секунд созданный заказ переходит в state 12
+        :param secret: ключ подписи токенов (общий для воркеров одного сервера)
+        """
+        self.token_ttl = token_ttl
+        self.secret = secret or secrets.token_bytes(32)
+        self.order_settle_delay = order_settle_delay
+        self._ids = itertools.count(100_000)
+        self.points: Dict[int, dict] = {}
+        self.points_by_external_id: Dict[str, dict] = {}
+        self.cargo_places: Dict[int, dict] = {}
+        self.cargo_places_by_external_id: Dict[str, dict] = {}
+        self.shipment_tasks: Dict[str, dict] = {}
+        self.delivery_requests: Dict[str, dict] = {}
+        self.deliveries: Dict[str, dict] = {}
+        self.orders: Dict[int, dict] = {}
+        self.contractors: Dict[int, dict] = {}
+        self.contractor_inns: Dict[str, int] = {}
+        self.drivers: Dict[int, dict] = {}
+        self.vehicles: Dict[int, dict] = {}
+        self.trailers: Dict[int, dict] = {}
+        self.tractors: Dict[int, dict] = {}
+        self.tariffs: Dict[int, dict] = {}
+        self._seed()
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    # ==================== НАЧАЛЬНЫЕ ДАННЫЕ ====================
+
+    def _seed(self) -> None:
+        seed_points = [(point_id, f"Izhevsk-LOCAL-{point_id}") for point_id in SEED_POINT_IDS]
+        seed_points += [(self._next_id(), external_id) for external_id in SEED_POINT_EXTERNAL_IDS]
+        for i, (point_id, external_id) in enumerate(seed_points):
+            self._store_point({
+                "id": point_id,
+                "externalId": external_id,
+                "title": f"Склад {i + 1}",
+                "addressString": f"Ижевск, ул. Пушкинская, {i + 1}",
+                "latitude": 56.85 + i / 1000,
+                "longitude": 53.2 + i / 1000,
+                "cityName": "Ижевск",
+                "timezone": POINT_TIMEZONE,
+                "contacts": [""],
+                "phone": "",
+                "email": "",
+                "loadingType": 1,
+            })
+        self._seed_shipment_task()
+        for order_id in SEED_ORDER_IDS:
+            addresses = [{**self.points[point_id], "position": i + 1} for i, point_id in enumerate((17974, 18528))]
+            self.orders[order_id] = {
+                "payload": {"orderIdentifier": f"LOCAL-{order_id}", "addresses": addresses},
+                "created_at": float("-inf"),
+                "published": True,
+                "cargo_place_ids": [],
+            }
+
+        # 400 активных и 40 неактивных тарифов, включая тарифы, на которые ссылаются тесты
+        for tariff_id in range(23000, 23440):
+            self.tariffs[tariff_id] = {
+                "id": tariff_id,
+                "title": f"Тариф {tariff_id}",
+                "type": 1,
+                "isActive": tariff_id < 23400,
+                "params": {"serviceCosts": [], "baseWorkCosts": []},
+            }
+        self.tariffs[23760] = {
+            "id": 23760, "title": "все допы 45907832", "type": 2, "isActive": True,
+            "params": {"serviceCosts": [], "baseWorkCosts": []},
+        }
+        self.tariffs[23762] = {
+            "id": 23762, "title": "почасовой тариф для автотестов", "type": 1, "isActive": True,
+            "params": {
+                "serviceCosts": [
+                    {"article": 1405, "vehicleTypeId": 1, "costPerService": 70000},
+                    {"article": 1405, "vehicleTypeId": 2, "costPerService": 100000},
+                ],
+                "baseWorkCosts": [
+                    {"vehicleTypeId": 1, "cost": 50000, "hoursWork": 7, "hoursInnings": 1},
+                    {"vehicleTypeId": 2, "cost": 80000, "hoursWork": 7, "hoursInnings": 1},
+                ],
+            },
+        }
+
+    def _seed_shipment_task(self) -> None:
+        """Задание стенда с заявками и исполнителем, которое test_shipment_task сверяет поле в поле."""
+        points = {
+            point_id: {"id": point_id, "externalId": None, "address": self.points[point_id]["addressString"]}
+            for point_id in (19162, 27114)
+        }
+        requests = [("25-VZ-493", {"driverId": 4534, "vehicleId": 3120}), ("25-VZ-494", None), ("25-VZ-495", None)]
+        self.shipment_tasks[SEED_TASK_ID] = {
+            "id": SEED_TASK_ID,
+            "status": "pick_pending",
+            "title": "хлебобулочные изделия",
+            "number": "булочки",
+            "externalTaskNumber": "EXT-булочки",
+            "shipBy": "fm_logistic",
+            "isCargoPlacesEnabled": True,
+            "volume": 5000000,
+            "weight": 300000,
+            "quantity": 55,
+            "cost": 11230000,
+            "createdAt": "2025-11-01T08:25:10+00:00",
+            "requiredSentAtFrom": "2025-11-02T06:00:00",
+            "requiredSentAtTill": "2025-11-02T09:00:00",
+            "requiredDeliveredAtFrom": "2025-11-03T06:00:00",
+            "requiredDeliveredAtTill": "2025-11-03T09:00:00",
+            "departurePoint": points[19162],
+            "arrivalPoint": points[27114],
+            "shipper": {"title": "ООО Пекарня"},
+            "consignee": {"title": "ООО Магазин"},
+            "cargoPlacesSummary": {"count": 1, "weight": 300000, "volume": 5000000},
+            "cargoPlaces": [{"id": self._next_id(), "title": "хлебобулочные изделия", "quantity": 55}],
+            "cargoDeliveryRequests": [
+                {"cargoDeliveryRequest": {"id": str(uuid.uuid4()), "requestNr": request_nr}, "executorInfo": executor}
+                for request_nr, executor in requests
+            ],
+        }
+
+    # ==================== АВТОРИЗАЦИЯ ====================
+
+    @staticmethod
+    def _role_for(username: str) -> str:
+        """Роль по логину: сначала {ROLE}_EMAIL из окружения, затем подстрока lkz/lke/lkp в логине."""
+        for role in ROLE_IDS:
+            if os.getenv(f"{role.upper()}_EMAIL") == username:
+                return role
+        lowered = (username or "").lower()
+        return next((role for role in ROLE_IDS if role in lowered), "lkz")
+
+    def login(self, username: str, password: str) -> Dict[str, Any]:
+        if not username or not password:
+            raise ApiError(401, "Неверный логин или пароль")
+        role = self._role_for(username)
+        claims = {"sub": username, "role": role, "exp": time.time() + self.token_ttl, "jti": secrets.token_hex(8)}
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        body = _b64(json.dumps(claims).encode())
+        return {"token": f"Bearer {header}.{body}.{self._sign(header, body)}", "role": ROLE_IDS[role]}
+
+    def _sign(self, header: str, body: str) -> str:
+        return _b64(hmac.new(self.secret, f"{header}.{body}".encode(), hashlib.sha256).digest())
+
+    def authenticate(self, token: Optional[str]) -> str:
+        """
+        Роль владельца токена; ApiError(401) для чужого или истёкшего токена.
+        Токен проверяется по подписи, поэтому его принимают все воркеры с общим secret.
+        """
+        parts = (token or "").removeprefix("Bearer ").split(".")
+        if len(parts) != 3 or not hmac.compare_digest(parts[2], self._sign(parts[0], parts[1])):
+            raise ApiError(401, "Требуется авторизация")
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        if claims["exp"] < time.time():
+            raise ApiError(401, "Срок действия токена истёк")
+        return claims["role"]
+
+    # ==================== АДРЕСА ====================
+
+    def _store_point(self, point: dict) -> dict:
+        old = self.points.get(point["id"])
+        if old is not None and old.get("externalId") != point.get("externalId"):
+            self.points_by_external_id.pop(old.get("externalId"), None)
+        self.points[point["id"]] = point
+        if point.get("externalId"):
+            self.points_by_external_id[point["externalId"]] = point
+        return point
+
+    def list_points(self, items_per_page: Optional[int] = None, page: int = 1) -> Dict[str, Any]:
+        points = list(self.points.values())
+        if items_per_page:
+            start = (max(page, 1) - 1) * items_per_page
+            points = points[start:start + items_per_page]
+        return {"itemsCount": len(self.points), "points": points}
+
+    def update_point(self, payload: dict) -> Dict[str, Any]:
+        """/contractor-point/update: создание или обновление по externalId."""
+        existing = self.points_by_external_id.get(payload.get("externalId"))
+        point_id = existing["id"] if existing else self._next_id()
+        self._store_point({**(existing or {}), **payload, "id": point_id})
+        return {"id": point_id}
+
+    def resolve_point(self, ref: Any) -> Optional[dict]:
+        """Адрес по id, externalId или объекту {"id": ...}."""
+        if isinstance(ref, dict):
+            ref = ref.get("id") or ref.get("externalId")
+        if isinstance(ref, int):
+            return self.points.get(ref)
+        return self.points_by_external_id.get(ref)
+
+    # ==================== ГРУЗОМЕСТА ====================
+
+    def upsert_cargo_place(self, payload: dict) -> dict:
+        """/cargo-place/create-or-update: обновление по externalId или создание нового ГМ."""
+        departure = self.resolve_point(payload.get("departureAddressExternalId") or payload.get("departureAddress"))
+        delivery = self.resolve_point(payload.get("deliveryAddressExternalId") or payload.get("deliveryAddress"))
+        errors = []
+        if departure is None:
+            errors.append({"field": "departureAddress", "message": "Адрес отправления не найден"})
+        if delivery is None:
+            errors.append({"field": "deliveryAddress", "message": "Адрес доставки не найден"})
+        if errors:
+            raise ApiError(422, "Ошибка валидации грузоместа", errors)
+
+        external_id = payload.get("externalId") or f"CP-{uuid.uuid4().hex[:10].upper()}"
+        existing = self.cargo_places_by_external_id.get(external_id)
+        cargo_place = {
+            **(existing or {"id": self._next_id(), "status": "new", "createdAt": _now_iso()}),
+            **payload,
+            "externalId": external_id,
+            "barCode": payload.get("barCode") or external_id,
+            "comment": payload.get("comment", ""),
+            "departureAddress": departure["id"],
+            "deliveryAddress": delivery["id"],
+            "departureAddressExternalId": departure.get("externalId"),
+            "deliveryAddressExternalId": delivery.get("externalId"),
+            "departurePoint": {"id": departure["id"], "externalId": departure.get("externalId")},
+            "deliveryPoint": {"id": delivery["id"], "externalId": delivery.get("externalId")},
+            "isDeleted": False,
+        }
+        self.cargo_places[cargo_place["id"]] = cargo_place
+        self.cargo_places_by_external_id[external_id] = cargo_place
+        return cargo_place
+
+    def create_cargo_places(self, items: List[dict], update: bool = False) -> Dict[str, Any]:
+        """
+        /cargo-place/create-list и /cargo-place/create-or-update-list: поэлементный результат
+        {"id", "status": "ok" | "error", "errors"}. create-list не перезаписывает существующие ГМ.
+        """
+        data = []
+        for item in items:
+            if not update and item.get("externalId") in self.cargo_places_by_external_id:
+                data.append({"id": None, "status": "error",
+                             "errors": [{"field": "externalId", "message": "Грузоместо уже существует"}]})
+                continue
+            try:
+                data.append({"id": self.upsert_cargo_place(item)["id"], "status": "ok", "errors": []})
+            except ApiError as e:
+                data.append({"id": None, "status": "error", "errors": e.errors})
+        return {"status": "ok", "data": data}
+
+    def get_cargo_place(self, cargo_place_id: int) -> dict:
+        cargo_place = self.cargo_places.get(cargo_place_id)
+        if cargo_place is None:
+            raise ApiError(404, "Грузоместо не найдено")
+        return cargo_place
+
+    def group_info(self, ids: List[int], external_ids: Optional[List[str]] = None) -> List[dict]:
+        """ГМ по id и/или externalId без повторов; неизвестные пропускаются."""
+        found = [self.cargo_places.get(i) for i in ids or []]
+        found += [self.cargo_places_by_external_id.get(e) for e in external_ids or []]
+        return list({cp["id"]: cp for cp in found if cp is not None}.values())
+
+    def list_by_invoice(self, invoice_number: str) -> Dict[str, Any]:
+        cargo_places = [
+            {"cargoPlaceId": cp["id"], "barcode": cp["barCode"], "externalId": cp["externalId"], "status": cp["status"],
+             "statusAddress": cp.get("statusAddress"), "statusUpdateAt": cp.get("statusUpdateAt")}
+            for cp in self.cargo_places.values() if cp.get("invoiceNumber") == invoice_number
+        ]
+        return {"status": "ok", "cargoPlaces": cargo_places}
+
+    def replace_planned_pairs(self, items: List[dict], is_strict: bool = False) -> List[dict]:
+        """Плановое ГМ помечается replaced; при isStrict первая ошибка прерывает запрос."""
+        errors = []
+        for i, item in enumerate(items):
+            planned = self.cargo_places.get(item.get("plannedId")) or \
+                self.cargo_places_by_external_id.get(item.get("plannedExternalId"))
+            actual = self.cargo_places.get(item.get("cargoPlaceId")) or \
+                self.cargo_places_by_external_id.get(item.get("cargoPlaceExternalId"))
+            if planned is None or actual is None:
+                error = {"index": i, "message": "Грузоместо не найдено"}
+                if is_strict:
+                    raise ApiError(422, "Ошибка замены грузомест", [error])
+                errors.append(error)
+                continue
+            planned["status"] = "replaced"
+            planned["replacedBy"] = actual["id"]
+        return errors
+
+    # ==================== ЗАДАНИЯ НА ОТГРУЗКУ ====================
+
+    def _build_shipment_task(self, payload: dict, task_id: Optional[str] = None) -> dict:
+        cargo_places = payload.get("cargoPlaces") or [{
+            "id": self._next_id(),
+            "title": payload.get("title", ""),
+            "weight": payload.get("weight"),
+            "volume": payload.get("volume"),
+            "quantity": payload.get("quantity", 1),
+        }]
+        return {
+            **payload,
+            "id": task_id or str(uuid.uuid4()),
+            "status": "created",
+            "createdAt": _now_iso(),
+            "cargoPlaces": cargo_places,
+        }
+
+    def create_shipment_task(self, payload: dict) -> Dict[str, Any]:
+        task = self._build_shipment_task(payload)
+        self.shipment_tasks[task["id"]] = task
+        return {"id": task["id"]}
+
+    def create_shipment_tasks(self, items: List[dict]) -> Dict[str, Any]:
+        data = []
+        for item in items:
+            task = self._build_shipment_task(item)
+            self.shipment_tasks[task["id"]] = task
+            data.append({"id": task["id"], "status": "ok", "errors": []})
+        return {"status": "ok", "data": data}
+
+    def get_shipment_task(self, task_id: str) -> dict:
+        task = self.shipment_tasks.get(task_id)
+        if task is None:
+            raise ApiError(404, "Задание не найдено")
+        return task
+
+    def _task_point(self, ref: Any) -> Any:
+        """Точка Задания в деталке: {"id", "externalId", "address"} по ссылке из payload."""
+        if isinstance(ref, dict) and "address" in ref:
+            return ref
+        point = self.resolve_point(ref)
+        if point is None:
+            return ref
+        return {"id": point["id"], "externalId": point.get("externalId"), "address": point.get("addressString")}
+
+    def shipment_task_details(self, task_id: str) -> dict:
+        """Деталка Задания: точки развёрнуты, окна отгрузки и доставки - в часовом поясе своей точки."""
+        task = self.get_shipment_task(task_id)
+        details = {
+            "cargoDeliveryRequests": [],
+            **task,
+            "departurePoint": self._task_point(task.get("departurePoint")),
+            "arrivalPoint": self._task_point(task.get("arrivalPoint")),
+        }
+        for field, point_field in TASK_TIME_FIELDS.items():
+            if details.get(field):
+                point = self.resolve_point(details[point_field]) or {}
+                details[field] = _to_local(details[field], point.get("timezone"))
+        return details
+
+    def update_shipment_task(self, task_id: str, payload: dict) -> Dict[str, Any]:
+        task = self.get_shipment_task(task_id)
+        task.update(payload.get("data", payload))
+        task["updatedAt"] = _now_iso()
+        return {"id": task_id}
+
+    def delete_shipment_task(self, task_id: str) -> Dict[str, Any]:
+        self.get_shipment_task(task_id)
+        del self.shipment_tasks[task_id]
+        return {"status": True}
+
+    def requests_for_shipment_task(self, task_id: Optional[str]) -> Dict[str, Any]:
+        """/shipment/tasks/cargo-delivery-request/list: заявки, в которые включено задание."""
+        requests = [
+            {"id": r["id"], "requestNr": r["requestNr"], "status": r["status"]}
+            for r in self.delivery_requests.values()
+            if task_id in (r.get("shipmentTasks") or [])
+        ]
+        return {"itemsCount": len(requests), "data": requests}
+
+    # ==================== ЗАЯВКИ ====================
+
+    def create_delivery_request(self, payload: dict, publish: bool) -> Dict[str, Any]:
+        request = {
+            "departurePoint": None,
+            "arrivalPoint": None,
+            "cargoPlaces": [],
+            **payload,
+            "id": str(uuid.uuid4()),
+            "requestNr": f"R-{self._next_id()}",
+            "status": "waiting_producer_confirmation" if publish else "draft",
+            "createdAt": _now_iso(),
+        }
+        self.delivery_requests[request["id"]] = request
+        return {"id": request["id"], "requestNr": request["requestNr"], "status": request["status"]}
+
+    def _get_request(self, request_id: str) -> dict:
+        request = self.delivery_requests.get(request_id)
+        if request is None:
+            raise ApiError(404, "Заявка не найдена")
+        return request
+
+    @staticmethod
+    def _parameters_details(request: dict) -> Dict[str, Any]:
+        """parametersDetails деталки: маршрут и требования к ТС из parameters заявки."""
+        parameters = request.get("parameters") or {}
+        route = parameters.get("route") or request.get("route") or []
+        return {
+            "points": [{**point, "position": point.get("position", i + 1)} for i, point in enumerate(route)],
+            "orderType": parameters.get("orderType"),
+            "pointChangeType": parameters.get("pointChangeType"),
+            "requiredVehicleTypeId": parameters.get("vehicleTypeId", request.get("vehicleTypeId")),
+            "requiredBodyTypes": parameters.get("bodyTypes", request.get("bodyTypes")),
+        }
+
+    def request_details(self, request_id: str) -> dict:
+        """
+        Детали заявки: parametersDetails, исходящие рейсы и executionParameters - список,
+        как у api-ext, с параметрами последнего активного рейса.
+        """
+        request = self._get_request(request_id)
+        deliveries = [self.deliveries[d] for d in request.get("deliveries", [])]
+        details = {
+            **request,
+            "parametersDetails": self._parameters_details(request),
+            "preliminaryCalculation": None,
+            "outgoingEntities": [
+                {"id": d["id"], "type": "delivery", "status": d["status"],
+                 "executionParameters": [d["executionParameters"]] if d.get("executionParameters") else []}
+                for d in deliveries
+            ],
+            "executionParameters": [],
+        }
+        details.pop("deliveries", None)
+        active = [d for d in deliveries if d["status"] != "canceled" and d.get("executionParameters")]
+        if active:
+            details["executionParameters"] = [active[-1]["executionParameters"]]
+        return details
+
+    def update_delivery_request(self, request_id: str, payload: dict, active: bool) -> List[dict]:
+        """
+        update - только черновик; update/active - только опубликованная заявка.
+        Как и api-ext, при успехе отвечает пустым списком ошибок.
+        """
+        request = self._get_request(request_id)
+        if active == (request["status"] == "draft"):
+            expected = "опубликованной" if active else "черновика"
+            raise ApiError(409, f"Операция доступна только для {expected} заявки")
+        request.update(payload)
+        return []
+
+    def take_delivery_request(self, request_id: str) -> Dict[str, Any]:
+        request = self._get_request(request_id)
+        if request["status"] != "waiting_producer_confirmation":
+            raise ApiError(409, f"Заявку в статусе {request['status']} нельзя принять")
+        request["status"] = "confirmed"
+        return {"id": request_id, "status": request["status"]}
+
+    # ==================== РЕЙСЫ ====================
+
+    def create_delivery(self, payload: dict) -> Dict[str, Any]:
+        requests = [self._get_request(r) for r in payload.get("requests", [])]
+        if not requests:
+            raise ApiError(422, "Не указаны заявки рейса")
+        for request in requests:
+            if request["status"] not in ("confirmed", "in_progress"):
+                raise ApiError(409, f"Заявка {request['id']} не принята подрядчиком")
+
+        route = self._parameters_details(requests[0])["points"]
+        delivery = {
+            "id": str(uuid.uuid4()),
+            "type": payload.get("type", "truck"),
+            "producer": payload.get("producer"),
+            "requests": [r["id"] for r in requests],
+            "status": "new",
+            "createdAt": _now_iso(),
+            "points": [{"position": i + 1, "status": "planned"} for i in range(max(len(route), 2))],
+            "executionParameters": None,
+        }
+        self.deliveries[delivery["id"]] = delivery
+        for request in requests:
+            request.setdefault("deliveries", []).append(delivery["id"])
+        return {"id": delivery["id"]}
+
+    def _get_delivery(self, delivery_id: str) -> dict:
+        delivery = self.deliveries.get(delivery_id)
+        if delivery is None:
+            raise ApiError(404, "Рейс не найден")
+        return delivery
+
+    def delivery_details(self, delivery_id: str) -> dict:
+        return self._get_delivery(delivery_id)
+
+    def _execution_parameters(self, driver_id: int, vehicle_id: int) -> Dict[str, Any]:
+        driver = self.drivers.get(driver_id) or {}
+        vehicle = self.vehicles.get(vehicle_id) or {}
+        full_name = " ".join(filter(None, [driver.get("surname"), driver.get("name"), driver.get("patronymic")]))
+        return {
+            "driver": driver_id,
+            "vehicle": vehicle_id,
+            "driverFullName": full_name or f"Водитель {driver_id}",
+            "driverPhone": driver.get("applicationPhone") or f"+7900{driver_id % 10_000_000:07d}",
+            "driverLicenseId": driver.get("driverLicenseId") or f"{driver_id:010d}",
+            "vehiclePlateNumber": vehicle.get("plateNumber") or f"А{vehicle_id % 1000:03d}АА18",
+            "vehicleMarkAndModel": vehicle.get("markAndModel") or "ГАЗ Газель",
+            "companyName": "ООО Локальный перевозчик",
+        }
+
+    def appoint_transport(self, delivery_id: str, payload: dict, replace: bool) -> Dict[str, Any]:
+        delivery = self._get_delivery(delivery_id)
+        if delivery["status"] in ("canceled", "completed"):
+            raise ApiError(409, f"Рейс в статусе {delivery['status']}")
+        if replace and not delivery.get("executionParameters"):
+            raise ApiError(409, "На рейс ещё не назначен транспорт")
+        delivery["executionParameters"] = self._execution_parameters(payload.get("driver"), payload.get("vehicle"))
+        if delivery["status"] == "new":
+            delivery["status"] = "appointed"
+        return {"id": delivery_id, "status": delivery["status"]}
+
+    def start_delivery(self, delivery_id: str) -> Dict[str, Any]:
+        delivery = self._get_delivery(delivery_id)
+        if delivery["status"] != "appointed":
+            raise ApiError(409, f"Рейс в статусе {delivery['status']} нельзя начать")
+        delivery["status"] = "executing"
+        for request_id in delivery["requests"]:
+            self.delivery_requests[request_id]["status"] = "in_progress"
+        return {"id": delivery_id, "status": delivery["status"]}
+
+    def cancel_delivery(self, delivery_id: str) -> Dict[str, Any]:
+        delivery = self._get_delivery(delivery_id)
+        if delivery["status"] == "completed":
+            raise ApiError(409, "Завершённый рейс нельзя отменить")
+        delivery["status"] = "canceled"
+        return {"id": delivery_id, "status": delivery["status"]}
+
+    def update_points(self, delivery_id: str, payload: dict) -> Dict[str, Any]:
+        """Точки с completedAt завершаются; когда завершены все - рейс и его заявки completed."""
+        delivery = self._get_delivery(delivery_id)
+        if delivery["status"] in ("canceled", "completed"):
+            raise ApiError(409, f"Рейс в статусе {delivery['status']}")
+        by_position = {p["position"]: p for p in delivery["points"]}
+        for update in payload.get("points", []):
+            point = by_position.get(update.get("position"))
+            if point is None:
+                continue
+            point.update(update)
+            point["status"] = "completed" if update.get("completedAt") else "executing"
+        if all(p["status"] == "completed" for p in delivery["points"]):
+            delivery["status"] = "completed"
+            for request_id in delivery["requests"]:
+                self.delivery_requests[request_id]["status"] = "completed"
+        return {"id": delivery_id, "status": delivery["status"]}
+
+    # ==================== ЗАКАЗЫ ====================
+
+    def create_order(self, payload: dict, publish: bool) -> Dict[str, Any]:
+        """
+        Рейс из /create и /create-and-publish: через order_settle_delay оба переходят в state 12,
+        до этого - state 1 и 2 соответственно. Включённые ГМ переходят в waiting_for_sending.
+        """
+        order_id = self._next_id()
+        cargo_place_ids = [cp.get("cargoPlaceId") or cp.get("id") for cp in payload.get("cargoPlaces", [])]
+        self.orders[order_id] = {
+            "payload": payload,
+            "created_at": time.monotonic(),
+            "published": publish,
+            "cargo_place_ids": cargo_place_ids,
+        }
+        for cargo_place_id in cargo_place_ids:
+            cargo_place = self.cargo_places.get(cargo_place_id)
+            if cargo_place is not None:
+                departure = self.points.get(cargo_place["departureAddress"]) or {}
+                cargo_place.update({"status": "waiting_for_sending", "statusUpdateAt": _now_iso(),
+                                    "statusAddress": departure.get("addressString")})
+        return {"id": order_id}
+
+    def order_details(self, order_id: int) -> Dict[str, Any]:
+        order = self.orders.get(order_id)
+        if order is None:
+            raise ApiError(404, "Заказ не найден")
+        if time.monotonic() - order["created_at"] >= self.order_settle_delay:
+            state = ORDER_STATE_READY
+        else:
+            state = ORDER_STATE_PUBLISHED if order["published"] else 1
+        payload = order["payload"]
+        cargo_places = [self.cargo_places.get(i, {"id": i}) for i in order["cargo_place_ids"]]
+        return {
+            "id": order_id,
+            "orderIdentifier": payload.get("orderIdentifier"),
+            "state": state,
+            "transportOrder": {**payload, "id": order_id, "points": payload.get("addresses", []),
+                               "cargoPlaces": cargo_places},
+        }
+
+    # ==================== КОНТРАГЕНТЫ И ТРАНСПОРТ ====================
+
+    def create_contractor(self, payload: dict) -> Dict[str, Any]:
+        inn = payload.get("inn")
+        if not inn:
+            raise ApiError(422, "Не указан ИНН")
+        if inn in self.contractor_inns:
+            raise ApiError(422, f"Контрагент с ИНН {inn} дублирован")
+        contractor_id = self._next_id()
+        users = payload.get("users") or [{}]
+        self.contractors[contractor_id] = {
+            **payload,
+            "id": contractor_id,
+            "role": payload.get("role") or (users[0].get("roles") or [1])[0],
+        }
+        self.contractor_inns[inn] = contractor_id
+        return {"id": contractor_id}
+
+    def contractor_profile(self, contractor_id: int) -> dict:
+        contractor = self.contractors.get(contractor_id)
+        if contractor is None:
+            raise ApiError(404, "Контрагент не найден")
+        return contractor
+
+    def create_transport(self, kind: str, payload: dict) -> dict:
+        """
+        Водитель / ТС / прицеп / тягач: payload с id и статусом active, как отвечает api-ext -
+        телефон водителя только цифрами, тягач обёрнут в {"tractor": {...}}.
+        """
+        registry = {"driver": self.drivers, "vehicle": self.vehicles,
+                    "trailer": self.trailers, "tractor": self.tractors}[kind]
+        plate = payload.get("plateNumber")
+        if plate and any(item.get("plateNumber") == plate for item in registry.values()):
+            raise ApiError(422, f"Госномер {plate} уже используется")
+        item = {**payload, "id": self._next_id(), "status": "active"}
+        if "applicationPhone" in item:
+            item["applicationPhone"] = _digits(item["applicationPhone"])
+        registry[item["id"]] = item
+        return {"tractor": item} if kind == "tractor" else item
+
+    # ==================== ТАРИФЫ ====================
+
+    def list_tariffs(self, payload: dict) -> Dict[str, Any]:
+        status = payload.get("status")
+        title = payload.get("filterTitle")
+        tariffs = [
+            t for t in self.tariffs.values()
+            if (status is None or t["isActive"] == bool(status)) and (not title or title in t["title"])
+        ]
+        items_count = len(tariffs)
+        per_page = payload.get("itemsPerPage")
+        if per_page:
+            page = max(payload.get("page") or 1, 1)
+            tariffs = tariffs[(page - 1) * per_page:page * per_page]
+        return {"itemsCount": items_count, "tariffs": [{"id": t["id"], "title": t["title"]} for t in tariffs]}
+
+    def get_tariff(self, tariff_id: int) -> dict:
+        tariff = self.tariffs.get(tariff_id)
+        if tariff is None:
+            raise ApiError(404, "Тариф не найден")
+        return tariff
@@ -1,22 +1,22 @@
 import requests
 from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient
 
 
-class AddressClient:
+class AddressClient(BaseClient):
     """
     Простой клиент для работы с адресами
     """
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def get_my_addresses(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Получение адресов текущего пользователя
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/addresses",
                 headers=self.headers,
                 params={"limit": limit},
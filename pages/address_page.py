@@ -1,7 +1,8 @@
 import random
-import requests
 from datetime import datetime
 from typing import Optional, List, Dict
+from utils.http_session import get_session
+from utils.address_repository import get_address_repository
 
 
 class AddressPage:
@@ -9,7 +10,7 @@ class AddressPage:
     def list_addresses(base_url: str, token: str, items_per_page: int = 500) -> list:
         """Получить список всех адресов."""
         headers = {"Authorization": token}
-        response = requests.post(
+        response = get_session().post(
             f"{base_url}/contractor-point/list-info",
             headers=headers,
             json={"itemsPerPage": items_per_page}
@@ -19,21 +20,23 @@ class AddressPage:
 
     @staticmethod
     def find_by_external_id(base_url: str, token: str, external_id: str) -> dict | None:
-        """Найти адрес по externalId."""
-        addresses = AddressPage.list_addresses(base_url, token, items_per_page=1000)
-        return next((a for a in addresses if a.get("externalId") == external_id), None)
+        """Найти адрес по externalId (через кэш адресов роли, список загружается один раз)."""
+        return get_address_repository(base_url, token).find_by_external_id(external_id)
 
     @staticmethod
     def create_or_update_address(base_url: str, token: str, payload: dict) -> int:
-        """Создать или обновить адрес. Возвращает id."""
+        """Создать или обновить адрес. Возвращает id. Кэш адресов роли обновляется на месте."""
         headers = {"Authorization": token}
-        response = requests.post(
+        response = get_session().post(
             f"{base_url}/contractor-point/update",
             headers=headers,
             json=payload
         )
         response.raise_for_status()
-        return response.json().get("id", 0)
+        address_id = response.json().get("id", 0)
+
+        get_address_repository(base_url, token).upsert({**payload, "id": address_id or payload.get("id")})
+        return address_id
 
     @staticmethod
     def create_address_payload(**overrides) -> dict:
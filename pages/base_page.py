@@ -0,0 +1,91 @@
+import asyncio
+import json
+import aiohttp
+import requests
+from typing import Optional, Any
+from utils.http_session import get_session, get_auth_refresher
+
+
+class BaseClient:
+    """
+    Базовый клиент api-ext.
+    Хранит base_url, заголовок авторизации и общую keep-alive сессию с пулом соединений.
+    """
+
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {"Authorization": token}
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        """Явно переданная сессия или общая сессия из utils.http_session."""
+        return self._session if self._session is not None else get_session()
+
+
+class AsyncResponse:
+    """
+    Прочитанный ответ aiohttp с интерфейсом requests.Response
+    (status_code, text, url, json(), raise_for_status()),
+    чтобы sync- и async-клиенты разбирали ответы одними и теми же методами.
+    """
+
+    def __init__(self, status_code: int, content: bytes, url: str, encoding: Optional[str] = None):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}",
+                response=self
+            )
+
+
+class AsyncClientMixin:
+    """
+    Примесь для async-вариантов клиентов.
+    Ставится первой в списке базовых классов перед sync-клиентом:
+    генерация payload и разбор ответов наследуются, а запросы идут через общий aiohttp.ClientSession.
+    """
+
+    def __init__(self, base_url: str, token: str, session: aiohttp.ClientSession):
+        super().__init__(base_url, token)
+        self._async_session = session
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self._async_session
+
+    async def _request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> AsyncResponse:
+        """Выполнить запрос и сразу прочитать тело, вернув соединение в пул."""
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        refresher = get_auth_refresher()
+        headers = dict(self.headers)
+        if refresher is not None:
+            headers["Authorization"] = refresher.resolve(headers["Authorization"])
+
+        response = await self._send(method, url, headers, **kwargs)
+        if response.status_code == 401 and refresher is not None:
+            # Вход - синхронный запрос, выполняем его вне event loop
+            new_token = await asyncio.to_thread(refresher.refresh_token, headers["Authorization"])
+            if new_token:
+                headers["Authorization"] = new_token
+                response = await self._send(method, url, headers, **kwargs)
+        return response
+
+    async def _send(self, method: str, url: str, headers: dict, **kwargs) -> AsyncResponse:
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, content, str(response.url), response.charset)
@@ -1,18 +1,16 @@
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import requests
 from datetime import datetime, timedelta
+from pages.base_page import BaseClient
 
 
-class CargoPlaceListClient:
+class CargoPlaceListClient(BaseClient):
     CARGO_TYPES = ["free", "pallet", "box", "bag"]
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip("/")
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def _generate_random_dimensions(self) -> Dict[str, int]:
         """Генерирует случайные, но валидные размеры и вес."""
@@ -90,7 +88,7 @@ class CargoPlaceListClient:
         url = f"{self.base_url}/cargo-place/create-list"
         payload = {"data": cargo_places}
 
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, headers=self.headers, json=payload)
 
         if response.status_code != 200:
             print(f"\n❌ Ошибка создания списка грузомест: {response.status_code}")
@@ -1,17 +1,17 @@
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class CargoDeliveriesCancelClient:
+class CargoDeliveriesCancelClient(BaseClient):
     """
     Клиент для отмены рейса (Truck Delivery)
     Эндпоинт: POST /v1/api-ext/cargo-deliveries/{id}/cancel
     """
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def cancel_cargo_delivery(self, truck_delivery_id: str) -> Dict[str, Any]:
         """
@@ -27,7 +27,7 @@ class CargoDeliveriesCancelClient:
 
         print(f"🔄 [CargoDeliveriesCancel] Отмена рейса {truck_delivery_id}")
 
-        response = requests.post(url, headers=self.headers, timeout=30)
+        response = self.session.post(url, headers=self.headers, timeout=30)
 
         if response.status_code != 200:
             print(f"❌ Ошибка отмены рейса: {response.status_code}")
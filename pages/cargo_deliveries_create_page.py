@@ -1,12 +1,12 @@
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class CargoDeliveriesCreateClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+class CargoDeliveriesCreateClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def create_cargo_delivery(self, request_id: str, producer_id: int) -> str:
         """
@@ -31,7 +31,7 @@ class CargoDeliveriesCreateClient:
         print(f"🚚 [CargoDeliveriesCreate] Создание рейса для заявки {request_id}")
         print(f"   Подрядчик (producer): {producer_id}")
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
 
         if response.status_code != 200:
             print(f"❌ Ошибка создания рейса: {response.status_code}")
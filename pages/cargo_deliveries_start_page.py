@@ -1,12 +1,12 @@
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class CargoDeliveriesStartClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+class CargoDeliveriesStartClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def start_cargo_delivery(self, cargo_delivery_id: str) -> Dict[str, Any]:
         """
@@ -23,7 +23,7 @@ class CargoDeliveriesStartClient:
 
         print(f"🚀 [CargoDeliveriesStart] Начало исполнения рейса {cargo_delivery_id}")
 
-        response = requests.post(url, headers=self.headers, timeout=30)
+        response = self.session.post(url, headers=self.headers, timeout=30)
 
         if response.status_code != 200:
             print(f"❌ Ошибка начала рейса: {response.status_code}")
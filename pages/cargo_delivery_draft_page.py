@@ -2,20 +2,18 @@ import requests
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient
 
 
-class CargoDeliveryDraftClient:
+class CargoDeliveryDraftClient(BaseClient):
     """
     Клиент для работы с эндпоинтом /api-ext/cargo-delivery-requests/create
     для создания заявок в черновик (без публикации)
     """
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def create_draft_delivery_request(
             self,
@@ -122,7 +120,7 @@ class CargoDeliveryDraftClient:
         url = f"{self.base_url}/cargo-delivery-requests/create"
         print(f"   URL: {url}")
 
-        response = requests.post(
+        response = self.session.post(
             url,
             headers=self.headers,
             json=payload,
@@ -1,18 +1,20 @@
 import requests
 import json
-import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient, AsyncClientMixin
+from utils.polling import poll, apoll, PollResult, DEFAULT_TIMEOUT
 
 
-class CargoDeliveryClient:
+class CargoDeliveryClient(BaseClient):
     """
     Клиент для работы с эндпоинтом /cargo-delivery-requests/create-and-publish
     """
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        # Результат последнего ожидания (wait_for_delivery_status / verify_driver_change_in_request / ...)
+        self.last_poll_result: Optional[PollResult] = None
 
     # ==================== ОСНОВНЫЕ МЕТОДЫ ДЛЯ СОЗДАНИЯ ЗАЯВОК ====================
 
@@ -36,68 +38,24 @@ class CargoDeliveryClient:
         """
         Создание и публикация заявки на доставку груза
         """
-        if body_types is None:
-            body_types = [3, 4, 7, 8]
-
-        if route is None:
-            route = []
-
-        if to_start_at_from is None:
-            to_start_at_from = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-
-        if client_identifier is None:
-            client_identifier = f"API-TEST-{datetime.now().strftime('%d%m%Y-%H%M%S')}"
-
-        payload = {
-            "deliveryType": delivery_type,
-            "deliverySubType": delivery_sub_type,
-            "parameters": {
-                "bodyTypes": body_types,
-                "vehicleTypeId": vehicle_type_id,
-                "orderType": order_type,
-                "pointChangeType": point_change_type,
-                "route": route
-            },
-            "comment": comment,
-            "clientIdentifier": client_identifier,
-            "toStartAtFrom": to_start_at_from,
-            "parametersForProducers": {
-                "shares": [
-                    {
-                        "producer": producer_id,
-                        "rate": rate
-                    }
-                ],
-                "selectingStrategy": selecting_strategy
-            }
-        }
+        payload = self._build_publish_payload(
+            delivery_type, delivery_sub_type, body_types, vehicle_type_id, order_type, point_change_type,
+            route, comment, client_identifier, to_start_at_from, producer_id, rate, selecting_strategy
+        )
 
         if cargo_places:
             payload["parameters"]["cargoPlaces"] = cargo_places
 
-        print(f" Payload для создания заявки на доставку:")
-        print(f"   clientIdentifier: {client_identifier}")
-        print(f"   deliverySubType: {delivery_sub_type}")
-        print(f"   route points: {len(route)}")
-        if cargo_places:
-            print(f"   cargoPlaces: {len(cargo_places)}")
+        self._print_publish_payload(payload, cargo_places)
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/cargo-delivery-requests/create-and-publish",
             headers=self.headers,
             json=payload,
             timeout=30
         )
 
-        if response.status_code != 200:
-            print(f"❌ Ошибка создания заявки: {response.status_code}")
-            print(f"Ответ: {response.text}")
-            print(f"Запрос: {json.dumps(payload, indent=2, ensure_ascii=False)}")
-            response.raise_for_status()
-
-        result = response.json()
-        print(f"✅ Заявка создана: ID={result.get('id')}, requestNr={result.get('requestNr')}")
-        return result
+        return self._parse_publish_response(response, payload)
 
     def create_and_publish_delivery_request_with_tasks(
             self,
@@ -120,6 +78,45 @@ class CargoDeliveryClient:
         """
         Создание и публикация заявки на доставку груза с поддержкой shipmentTasks
         """
+        payload = self._build_publish_payload(
+            delivery_type, delivery_sub_type, body_types, vehicle_type_id, order_type, point_change_type,
+            route, comment, client_identifier, to_start_at_from, producer_id, rate, selecting_strategy
+        )
+
+        if cargo_places:
+            payload["cargoPlaces"] = cargo_places
+
+        if shipment_tasks:
+            payload["shipmentTasks"] = shipment_tasks
+
+        self._print_publish_payload(payload, cargo_places, shipment_tasks)
+
+        response = self.session.post(
+            f"{self.base_url}/cargo-delivery-requests/create-and-publish",
+            headers=self.headers,
+            json=payload,
+            timeout=30
+        )
+
+        return self._parse_publish_response(response, payload)
+
+    def _build_publish_payload(
+            self,
+            delivery_type: str,
+            delivery_sub_type: str,
+            body_types: Optional[List[int]],
+            vehicle_type_id: int,
+            order_type: int,
+            point_change_type: int,
+            route: Optional[List[Dict]],
+            comment: str,
+            client_identifier: Optional[str],
+            to_start_at_from: Optional[str],
+            producer_id: Optional[int],
+            rate: int,
+            selecting_strategy: str
+    ) -> Dict[str, Any]:
+        """Базовый payload для /create-and-publish (без cargoPlaces и shipmentTasks)"""
         if body_types is None:
             body_types = [3, 4, 7, 8]
 
@@ -132,7 +129,7 @@ class CargoDeliveryClient:
         if client_identifier is None:
             client_identifier = f"API-TEST-{datetime.now().strftime('%d%m%Y-%H%M%S')}"
 
-        payload = {
+        return {
             "deliveryType": delivery_type,
             "deliverySubType": delivery_sub_type,
             "parameters": {
@@ -156,28 +153,22 @@ class CargoDeliveryClient:
             }
         }
 
-        if cargo_places:
-            payload["cargoPlaces"] = cargo_places
-
-        if shipment_tasks:
-            payload["shipmentTasks"] = shipment_tasks
-
+    def _print_publish_payload(
+            self,
+            payload: Dict[str, Any],
+            cargo_places: List[Dict] = None,
+            shipment_tasks: List[Dict] = None
+    ):
         print(f" Payload для создания заявки на доставку:")
-        print(f"   clientIdentifier: {client_identifier}")
-        print(f"   deliverySubType: {delivery_sub_type}")
-        print(f"   route points: {len(route)}")
+        print(f"   clientIdentifier: {payload['clientIdentifier']}")
+        print(f"   deliverySubType: {payload['deliverySubType']}")
+        print(f"   route points: {len(payload['parameters']['route'])}")
         if cargo_places:
             print(f"   cargoPlaces: {len(cargo_places)}")
         if shipment_tasks:
             print(f"   shipmentTasks: {len(shipment_tasks)}")
 
-        response = requests.post(
-            f"{self.base_url}/cargo-delivery-requests/create-and-publish",
-            headers=self.headers,
-            json=payload,
-            timeout=30
-        )
-
+    def _parse_publish_response(self, response, payload: Dict[str, Any]) -> Dict[str, Any]:
         if response.status_code != 200:
             print(f"❌ Ошибка создания заявки: {response.status_code}")
             print(f"Ответ: {response.text}")
@@ -242,11 +233,14 @@ class CargoDeliveryClient:
         """
         url = f"{self.base_url}/cargo-delivery-requests/{request_id}/details"
 
-        response = requests.get(
+        response = self.session.get(
             url=url,
             headers=self.headers
         )
 
+        return self._parse_details_response(response, request_id)
+
+    def _parse_details_response(self, response, request_id) -> Dict[str, Any]:
         if response.status_code != 200:
             raise Exception(f"Ошибка получения деталей заявки {request_id}: {response.status_code} - {response.text}")
 
@@ -338,7 +332,7 @@ class CargoDeliveryClient:
         return {}
 
     def wait_for_delivery_status(self, request_id: str, delivery_id_uuid: str, expected_status: str = "canceled",
-                                 max_attempts: int = 5, delay: int = 3) -> bool:
+                                 timeout: float = DEFAULT_TIMEOUT) -> bool:
         """
         Ожидание и проверка статуса рейса в деталях заявки
 
@@ -346,42 +340,115 @@ class CargoDeliveryClient:
             request_id: ID заявки
             delivery_id_uuid: ID рейса
             expected_status: ожидаемый статус
-            max_attempts: максимальное количество попыток
-            delay: задержка между попытками в секундах
+            timeout: общий дедлайн ожидания в секундах (опрос с экспоненциальной задержкой)
 
         Returns:
             bool: True если статус соответствует ожидаемому
         """
         print(f"\n Ожидание статуса '{expected_status}' для рейса {delivery_id_uuid}...")
 
-        for attempt in range(max_attempts):
-            print(f" Попытка {attempt + 1} из {max_attempts}...")
+        result = poll(
+            lambda: self.get_delivery_request_details(request_id),
+            lambda details: self._delivery_status_reached(details, delivery_id_uuid, expected_status),
+            timeout=timeout
+        )
+        return self._finish_delivery_status_wait(result, expected_status)
+
+    def _delivery_status_reached(self, details: dict, delivery_id_uuid: str, expected_status: str) -> bool:
+        if self.check_delivery_status_in_request_details(details, delivery_id_uuid, expected_status):
+            return True
+
+        # Выводим что нашлось для отладки
+        delivery_entity = self.find_delivery_in_outgoing_entities(details)
+        if delivery_entity:
+            print(f"⚠️ Статус найденного delivery: {delivery_entity.get('status')} (ожидается '{expected_status}')")
+        else:
+            print(f"⚠️ Delivery не найден в outgoingEntities")
+        return False
 
-            try:
-                details = self.get_delivery_request_details(request_id)
+    def _finish_delivery_status_wait(self, result: PollResult, expected_status: str) -> bool:
+        self._remember_poll(result)
 
-                if self.check_delivery_status_in_request_details(details, delivery_id_uuid, expected_status):
-                    print(f"✅ Статус '{expected_status}' подтвержден")
-                    return True
-                else:
-                    # Выводим что нашлось для отладки
-                    delivery_entity = self.find_delivery_in_outgoing_entities(details)
-                    if delivery_entity:
-                        print(
-                            f"⚠️ Статус найденного delivery: {delivery_entity.get('status')} (ожидается '{expected_status}')")
-                    else:
-                        print(f"⚠️ Delivery не найден в outgoingEntities")
-
-            except Exception as e:
-                print(f"❌ Ошибка при получении деталей заявки: {str(e)}")
-
-            if attempt < max_attempts - 1:
-                print(f"⏳ Ждем {delay} секунды...")
-                time.sleep(delay)
-
-        print(f"❌ Не удалось дождаться статуса '{expected_status}' после {max_attempts} попыток")
+        if result.success:
+            print(f"✅ Статус '{expected_status}' подтвержден")
+            return True
+
+        if result.error is not None:
+            print(f"❌ Ошибка при получении деталей заявки: {str(result.error)}")
+        print(f"❌ Не удалось дождаться статуса '{expected_status}' за {result.elapsed:.1f} с")
         return False
 
+    def wait_for_request_status(self, request_id: str, statuses, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Ожидание статуса заявки - предусловия следующего шага (принять заявку, создать рейс).
+        Сам шаг после этого выполняется один раз: повтор действия, изменяющего состояние, может его задвоить.
+
+        Args:
+            request_id: ID заявки
+            statuses: ожидаемый статус или список допустимых статусов
+            timeout: общий дедлайн ожидания в секундах
+
+        Returns:
+            dict: Детали заявки в ожидаемом статусе
+
+        Raises:
+            TimeoutError: если статус не достигнут за timeout
+        """
+        statuses = (statuses,) if isinstance(statuses, str) else tuple(statuses)
+        result = poll(
+            lambda: self.get_delivery_request_details(request_id),
+            lambda details: details.get("status") in statuses,
+            timeout=timeout
+        )
+        return self._finish_request_status_wait(result, request_id, statuses)
+
+    def _finish_request_status_wait(self, result: PollResult, request_id: str, statuses: tuple) -> Dict[str, Any]:
+        self._remember_poll(result)
+
+        if result.success:
+            return result.value
+        last_status = result.value.get("status") if result.value else None
+        raise TimeoutError(
+            f"Заявка {request_id} не перешла в статус {'/'.join(statuses)} за {result.elapsed:.1f} с "
+            f"(последний статус: {last_status})"
+        ) from result.error
+
+    def wait_for_delivery_in_request(self, request_id: str, delivery_id_uuid: str,
+                                     timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Ожидание появления рейса в outgoingEntities заявки (предусловие назначения транспорта)
+
+        Returns:
+            dict: Запись рейса из outgoingEntities
+
+        Raises:
+            TimeoutError: если рейс не появился за timeout
+        """
+        result = poll(
+            lambda: self._delivery_in_request(self.get_delivery_request_details(request_id), delivery_id_uuid),
+            timeout=timeout
+        )
+        return self._finish_delivery_in_request_wait(result, request_id, delivery_id_uuid)
+
+    @staticmethod
+    def _delivery_in_request(details: dict, delivery_id_uuid: str) -> Optional[Dict[str, Any]]:
+        return next((e for e in details.get("outgoingEntities") or [] if e.get("id") == delivery_id_uuid), None)
+
+    def _finish_delivery_in_request_wait(self, result: PollResult, request_id: str,
+                                         delivery_id_uuid: str) -> Dict[str, Any]:
+        self._remember_poll(result)
+
+        if result.success:
+            return result.value
+        raise TimeoutError(
+            f"Рейс {delivery_id_uuid} не появился в заявке {request_id} за {result.elapsed:.1f} с"
+        ) from result.error
+
+    def _remember_poll(self, result: PollResult):
+        """Сохраняет результат последнего ожидания (фактическое время доступно в last_poll_result.elapsed)"""
+        self.last_poll_result = result
+        print(f"⏱ Ожидание: {result.elapsed:.2f} с, попыток: {result.attempts}")
+
     def take_delivery_request(self, request_id):
         """
         Принятие FTL заявки исполнителем
@@ -394,11 +461,14 @@ class CargoDeliveryClient:
         """
         url = f"{self.base_url}/cargo-delivery-requests/{request_id}/take"
 
-        response = requests.get(
+        response = self.session.get(
             url=url,
             headers=self.headers
         )
 
+        return self._parse_take_response(response, request_id)
+
+    def _parse_take_response(self, response, request_id) -> Dict[str, Any]:
         if response.status_code != 200:
             raise Exception(f"Ошибка принятия заявки {request_id}: {response.status_code} - {response.text}")
 
@@ -418,7 +488,9 @@ class CargoDeliveryClient:
             dict или None: Информация о водителе и ТС из executionParameters
         """
         details = self.get_delivery_request_details(request_id)
+        return self._driver_info_from_details(details, request_id)
 
+    def _driver_info_from_details(self, details: Dict, request_id: str) -> Optional[Dict[str, Any]]:
         print(f"\n🔍 Анализируем структуру заявки {request_id}...")
         print(f"Статус заявки: {details.get('status')}")
 
@@ -474,61 +546,54 @@ class CargoDeliveryClient:
     def verify_driver_change_in_request(
             self,
             request_id: str,
-            max_attempts: int = 5,
-            delay: int = 3
+            timeout: float = DEFAULT_TIMEOUT
     ) -> Optional[Dict[str, Any]]:
         """
         Проверка наличия информации о водителе в заявке с повторными попытками
 
         Args:
             request_id: ID заявки
-            max_attempts: Максимальное количество попыток
-            delay: Задержка между попытками
+            timeout: общий дедлайн ожидания в секундах
 
         Returns:
             dict или None: Информация о водителе из executionParameters
         """
         print(f"\n🔍 Проверка водителя в заявке {request_id}")
 
-        for attempt in range(max_attempts):
-            print(f"\n🔍 Попытка {attempt + 1} из {max_attempts}...")
+        result = poll(
+            lambda: self.get_driver_info_from_request(request_id),
+            self._has_driver,
+            timeout=timeout
+        )
+        return self._finish_driver_wait(result)
 
-            try:
-                driver_info = self.get_driver_info_from_request(request_id)
+    @staticmethod
+    def _has_driver(driver_info: Optional[Dict[str, Any]]) -> bool:
+        return bool(driver_info and driver_info.get("driver_full_name"))
 
-                if driver_info and driver_info.get("driver_full_name"):
-                    print(f"✅ Водитель найден:")
-                    print(f"   ФИО: {driver_info['driver_full_name']}")
-                    print(f"   Телефон: {driver_info['driver_phone']}")
-                    print(f"   Номер ТС: {driver_info['plate_number']}")
-                    return driver_info
-                else:
-                    print(f"⚠ Информация о водителе не найдена")
-
-                    if attempt < max_attempts - 1:
-                        print(f"⏳ Ждем {delay} секунды...")
-                        time.sleep(delay)
-                    else:
-                        print(f"❌ Водитель не найден после {max_attempts} попыток")
-                        return None
-
-            except Exception as e:
-                print(f"❌ Ошибка при проверке: {str(e)}")
-                if attempt < max_attempts - 1:
-                    print(f"⏳ Ждем {delay} секунды и пробуем снова...")
-                    time.sleep(delay)
-                else:
-                    print(f"❌ Все попытки завершились ошибкой")
-                    raise
+    def _finish_driver_wait(self, result: PollResult) -> Optional[Dict[str, Any]]:
+        self._remember_poll(result)
 
+        if result.success:
+            driver_info = result.value
+            print(f"✅ Водитель найден:")
+            print(f"   ФИО: {driver_info['driver_full_name']}")
+            print(f"   Телефон: {driver_info['driver_phone']}")
+            print(f"   Номер ТС: {driver_info['plate_number']}")
+            return driver_info
+
+        if result.error is not None:
+            print(f"❌ Все попытки завершились ошибкой")
+            raise result.error
+
+        print(f"❌ Водитель не найден за {result.elapsed:.1f} с")
         return None
 
     def compare_drivers_in_request(
             self,
             request_id: str,
             initial_driver_info: Dict,
-            max_attempts: int = 5,
-            delay: int = 3
+            timeout: float = DEFAULT_TIMEOUT
     ) -> Dict[str, Any]:
         """
         Сравнение водителя с первоначальным (для проверки замены)
@@ -536,64 +601,54 @@ class CargoDeliveryClient:
         Args:
             request_id: ID заявки
             initial_driver_info: Информация о первоначальном водителе
-            max_attempts: Максимальное количество попыток
-            delay: Задержка между попытками
+            timeout: общий дедлайн ожидания в секундах
 
         Returns:
             dict: Результаты сравнения
         """
         print(f"\n🔍 Сравнение водителей в заявке {request_id}")
 
-        for attempt in range(max_attempts):
-            print(f"\n🔍 Попытка {attempt + 1} из {max_attempts}...")
+        result = poll(
+            lambda: self.get_driver_info_from_request(request_id),
+            lambda info: self._driver_changed(initial_driver_info, info),
+            timeout=timeout
+        )
+        return self._finish_driver_comparison(result, initial_driver_info)
 
-            try:
-                current_driver_info = self.get_driver_info_from_request(request_id)
+    def _driver_changed(self, initial_driver_info: Dict, current_driver_info: Optional[Dict]) -> bool:
+        if not self._has_driver(current_driver_info):
+            print(f"⚠️ Текущий водитель не найден")
+            return False
 
-                if not current_driver_info or not current_driver_info.get("driver_full_name"):
-                    print(f"⚠️ Текущий водитель не найден")
-                    if attempt < max_attempts - 1:
-                        print(f" Ждем {delay} секунды...")
-                        time.sleep(delay)
-                    continue
+        comparison = self._compare_execution_params(initial_driver_info, current_driver_info)
+        if comparison["driver_changed"] or comparison["vehicle_changed"]:
+            print(f"✅ Изменения обнаружены!")
+            return True
 
-                # Сравниваем ключевые поля
-                comparison = self._compare_execution_params(initial_driver_info, current_driver_info)
+        print(f"⚠️ Изменений не обнаружено")
+        return False
 
-                if comparison["driver_changed"] or comparison["vehicle_changed"]:
-                    print(f"✅ Изменения обнаружены!")
-                    return {
-                        "current_driver_info": current_driver_info,
-                        "comparison": comparison,
-                        "success": True
-                    }
-                else:
-                    print(f"⚠️ Изменений не обнаружено")
-
-                    if attempt < max_attempts - 1:
-                        print(f" Ждем {delay} секунды...")
-                        time.sleep(delay)
-                    else:
-                        print(f"❌ Изменения не обнаружены после {max_attempts} попыток")
-                        return {
-                            "current_driver_info": current_driver_info,
-                            "comparison": comparison,
-                            "success": False
-                        }
-
-            except Exception as e:
-                print(f"❌ Ошибка при сравнении: {str(e)}")
-                if attempt < max_attempts - 1:
-                    print(f" Ждем {delay} секунды и пробуем снова...")
-                    time.sleep(delay)
-                else:
-                    print(f"❌ Все попытки завершились ошибкой")
-                    raise
+    def _finish_driver_comparison(self, result: PollResult, initial_driver_info: Dict) -> Dict[str, Any]:
+        self._remember_poll(result)
+        current_driver_info = result.value
+
+        if not self._has_driver(current_driver_info):
+            if result.error is not None:
+                print(f"❌ Все попытки завершились ошибкой")
+                raise result.error
+            return {
+                "current_driver_info": None,
+                "comparison": None,
+                "success": False
+            }
+
+        if not result.success:
+            print(f"❌ Изменения не обнаружены за {result.elapsed:.1f} с")
 
         return {
-            "current_driver_info": None,
-            "comparison": None,
-            "success": False
+            "current_driver_info": current_driver_info,
+            "comparison": self._compare_execution_params(initial_driver_info, current_driver_info),
+            "success": result.success
         }
 
     def _compare_execution_params(self, param1: Dict, param2: Dict) -> Dict[str, bool]:
@@ -660,3 +715,156 @@ class CargoDeliveryClient:
         print(f"  Погрузка: {'Да' if driver_info.get('is_loading_work') else 'Нет'}")
         print(f"  Разгрузка: {'Да' if driver_info.get('is_unloading_work') else 'Нет'}")
         print("=" * 60 + "\n")
+
+
+class AsyncCargoDeliveryClient(AsyncClientMixin, CargoDeliveryClient):
+    """
+    Async-вариант CargoDeliveryClient: те же методы, но сетевые вызовы - корутины
+    поверх общего aiohttp.ClientSession (см. utils.http_session.create_async_session)
+    """
+
+    async def create_and_publish_delivery_request(
+            self,
+            delivery_type: str = "auto",
+            delivery_sub_type: str = "ftl",
+            body_types: List[int] = None,
+            vehicle_type_id: int = 1,
+            order_type: int = 1,
+            point_change_type: int = 2,
+            route: List[Dict] = None,
+            comment: str = "Тестовая заявка API",
+            client_identifier: str = None,
+            to_start_at_from: str = None,
+            producer_id: int = None,
+            rate: int = 100000,
+            selecting_strategy: str = "rate",
+            cargo_places: List[Dict] = None
+    ) -> Dict[str, Any]:
+        payload = self._build_publish_payload(
+            delivery_type, delivery_sub_type, body_types, vehicle_type_id, order_type, point_change_type,
+            route, comment, client_identifier, to_start_at_from, producer_id, rate, selecting_strategy
+        )
+
+        if cargo_places:
+            payload["parameters"]["cargoPlaces"] = cargo_places
+
+        self._print_publish_payload(payload, cargo_places)
+
+        response = await self._request(
+            "POST",
+            f"{self.base_url}/cargo-delivery-requests/create-and-publish",
+            json=payload,
+            timeout=30
+        )
+
+        return self._parse_publish_response(response, payload)
+
+    async def create_and_publish_delivery_request_with_tasks(
+            self,
+            delivery_type: str = "auto",
+            delivery_sub_type: str = "ftl",
+            body_types: List[int] = None,
+            vehicle_type_id: int = 1,
+            order_type: int = 1,
+            point_change_type: int = 2,
+            route: List[Dict] = None,
+            comment: str = "Тестовая заявка API",
+            client_identifier: str = None,
+            to_start_at_from: str = None,
+            producer_id: int = None,
+            rate: int = 100000,
+            selecting_strategy: str = "rate",
+            cargo_places: List[Dict] = None,
+            shipment_tasks: List[Dict] = None
+    ) -> Dict[str, Any]:
+        payload = self._build_publish_payload(
+            delivery_type, delivery_sub_type, body_types, vehicle_type_id, order_type, point_change_type,
+            route, comment, client_identifier, to_start_at_from, producer_id, rate, selecting_strategy
+        )
+
+        if cargo_places:
+            payload["cargoPlaces"] = cargo_places
+
+        if shipment_tasks:
+            payload["shipmentTasks"] = shipment_tasks
+
+        self._print_publish_payload(payload, cargo_places, shipment_tasks)
+
+        response = await self._request(
+            "POST",
+            f"{self.base_url}/cargo-delivery-requests/create-and-publish",
+            json=payload,
+            timeout=30
+        )
+
+        return self._parse_publish_response(response, payload)
+
+    async def get_delivery_request_details(self, request_id):
+        response = await self._request("GET", f"{self.base_url}/cargo-delivery-requests/{request_id}/details")
+        return self._parse_details_response(response, request_id)
+
+    async def take_delivery_request(self, request_id):
+        response = await self._request("GET", f"{self.base_url}/cargo-delivery-requests/{request_id}/take")
+        return self._parse_take_response(response, request_id)
+
+    async def get_driver_info_from_request(self, request_id: str) -> Optional[Dict[str, Any]]:
+        details = await self.get_delivery_request_details(request_id)
+        return self._driver_info_from_details(details, request_id)
+
+    async def wait_for_delivery_status(self, request_id: str, delivery_id_uuid: str, expected_status: str = "canceled",
+                                       timeout: float = DEFAULT_TIMEOUT) -> bool:
+        print(f"\n Ожидание статуса '{expected_status}' для рейса {delivery_id_uuid}...")
+
+        result = await apoll(
+            lambda: self.get_delivery_request_details(request_id),
+            lambda details: self._delivery_status_reached(details, delivery_id_uuid, expected_status),
+            timeout=timeout
+        )
+        return self._finish_delivery_status_wait(result, expected_status)
+
+    async def wait_for_request_status(self, request_id: str, statuses,
+                                      timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        statuses = (statuses,) if isinstance(statuses, str) else tuple(statuses)
+        result = await apoll(
+            lambda: self.get_delivery_request_details(request_id),
+            lambda details: details.get("status") in statuses,
+            timeout=timeout
+        )
+        return self._finish_request_status_wait(result, request_id, statuses)
+
+    async def wait_for_delivery_in_request(self, request_id: str, delivery_id_uuid: str,
+                                           timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        async def fetch():
+            return self._delivery_in_request(await self.get_delivery_request_details(request_id), delivery_id_uuid)
+
+        result = await apoll(fetch, timeout=timeout)
+        return self._finish_delivery_in_request_wait(result, request_id, delivery_id_uuid)
+
+    async def verify_driver_change_in_request(
+            self,
+            request_id: str,
+            timeout: float = DEFAULT_TIMEOUT
+    ) -> Optional[Dict[str, Any]]:
+        print(f"\n🔍 Проверка водителя в заявке {request_id}")
+
+        result = await apoll(
+            lambda: self.get_driver_info_from_request(request_id),
+            self._has_driver,
+            timeout=timeout
+        )
+        return self._finish_driver_wait(result)
+
+    async def compare_drivers_in_request(
+            self,
+            request_id: str,
+            initial_driver_info: Dict,
+            timeout: float = DEFAULT_TIMEOUT
+    ) -> Dict[str, Any]:
+        print(f"\n🔍 Сравнение водителей в заявке {request_id}")
+
+        result = await apoll(
+            lambda: self.get_driver_info_from_request(request_id),
+            lambda info: self._driver_changed(initial_driver_info, info),
+            timeout=timeout
+        )
+        return self._finish_driver_comparison(result, initial_driver_info)
@@ -2,16 +2,14 @@ import requests
 import json
 import random
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient
 
 
-class CargoDeliveryUpdateActiveClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+class CargoDeliveryUpdateActiveClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def update_active_request(
             self,
@@ -84,7 +82,7 @@ class CargoDeliveryUpdateActiveClient:
         print(f"   Полный payload:")
         print(json.dumps(payload, indent=2, ensure_ascii=False))
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
 
         print(f"🔍 Ответ сервера: status={response.status_code}")
         print(f"   Текст ответа: {response.text[:500]}...")
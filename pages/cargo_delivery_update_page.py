@@ -2,20 +2,18 @@ import requests
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
+from pages.base_page import BaseClient
 
 
-class CargoDeliveryUpdateClient:
+class CargoDeliveryUpdateClient(BaseClient):
     """
     Клиент для работы с эндпоинтом /cargo-delivery-requests/{id}/update
     для редактирования заявок в статусе draft
     """
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def update_draft_request(
             self,
@@ -128,7 +126,7 @@ class CargoDeliveryUpdateClient:
         print(f"   Payload: {json.dumps(payload, ensure_ascii=False)}")
 
         # Используем POST
-        response = requests.post(
+        response = self.session.post(
             url,
             headers=self.headers,
             json=payload,
@@ -1,15 +1,15 @@
 import random
 from typing import Optional, Dict, Any
 import requests
+from pages.base_page import BaseClient, AsyncClientMixin
+from utils.unique_ids import unique_id
 
 
-class CargoPlaceClient:
+class CargoPlaceClient(BaseClient):
     CARGO_TYPES = ["pallet", "box", "bag"]
-    _counter = 0  # классовый счётчик
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def create_cargo_place(
             self,
@@ -23,10 +23,58 @@ class CargoPlaceClient:
             invoice_number: str = None,
             comment: str = "Тестирование внешнего API"
     ) -> Dict[str, Any]:
-        # Генерация title, если не задан
+        payload = self._build_cargo_place_payload(
+            departure_external_id, delivery_external_id, title, external_id,
+            cargo_type, weight_kg, volume_m3, invoice_number, comment
+        )
+
+        response = self.session.post(
+            f"{self.base_url}/cargo-place/create-or-update",
+            headers=self.headers,
+            json=payload
+        )
+
+        return self._parse_create_response(response)
+
+    def create_cargo_place_by_id(
+            self,
+            departure_address_id: int,
+            delivery_address_id: int,
+            title: str,
+            external_id: str = None,
+            cargo_type: Optional[str] = None,
+            weight_kg: Optional[int] = None,
+            volume_m3: Optional[int] = None,
+            comment: str = "Тестирование внешнего API"
+    ) -> Dict[str, Any]:
+        payload = self._build_cargo_place_by_id_payload(
+            departure_address_id, delivery_address_id, title, external_id,
+            cargo_type, weight_kg, volume_m3, comment
+        )
+
+        response = self.session.post(
+            f"{self.base_url}/cargo-place/create-or-update",
+            headers=self.headers,
+            json=payload
+        )
+
+        return self._parse_create_by_id_response(response, payload)
+
+    def _build_cargo_place_payload(
+            self,
+            departure_external_id: str,
+            delivery_external_id: str,
+            title: Optional[str],
+            external_id: Optional[str],
+            cargo_type: Optional[str],
+            weight_kg: Optional[int],
+            volume_m3: Optional[int],
+            invoice_number: Optional[str],
+            comment: str
+    ) -> Dict[str, Any]:
+        # Генерация title, если не задан: уникален для прогона и воркера xdist
         if title is None:
-            CargoPlaceClient._counter += 1
-            title = f"API-{CargoPlaceClient._counter:05d}"
+            title = unique_id("API")
 
         actual_type = cargo_type or random.choice(self.CARGO_TYPES)
         weight_kg = weight_kg or random.randint(100, 1000)
@@ -35,7 +83,7 @@ class CargoPlaceClient:
         volume = int(volume_m3 * 1_000_000)
         weight = int(weight_kg * 1000)
 
-        payload = {
+        return {
             "type": actual_type,
             "title": title,
             "externalId": external_id,
@@ -50,35 +98,16 @@ class CargoPlaceClient:
             "invoiceNumber": invoice_number
         }
 
-        response = requests.post(
-            f"{self.base_url}/cargo-place/create-or-update",
-            headers=self.headers,
-            json=payload
-        )
-
-        if response.status_code != 200:
-            error_msg = f"Ошибка создания грузоместа: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "message" in error_data:
-                    error_msg += f"\nСообщение: {error_data['message']}"
-            except:
-                error_msg += f"\nОтвет: {response.text[:200]}"
-
-            raise AssertionError(error_msg)
-
-        return response.json()
-
-    def create_cargo_place_by_id(
+    def _build_cargo_place_by_id_payload(
             self,
             departure_address_id: int,
             delivery_address_id: int,
             title: str,
-            external_id: str = None,
-            cargo_type: Optional[str] = None,
-            weight_kg: Optional[int] = None,
-            volume_m3: Optional[int] = None,
-            comment: str = "Тестирование внешнего API"
+            external_id: Optional[str],
+            cargo_type: Optional[str],
+            weight_kg: Optional[int],
+            volume_m3: Optional[int],
+            comment: str
     ) -> Dict[str, Any]:
         actual_type = cargo_type or random.choice(self.CARGO_TYPES)
         weight_kg = weight_kg or random.randint(100, 1000)
@@ -87,7 +116,7 @@ class CargoPlaceClient:
         volume = int(volume_m3 * 1_000_000)
         weight = int(weight_kg * 1000)
 
-        payload = {
+        return {
             "type": actual_type,
             "title": title,
             "externalId": external_id,
@@ -102,12 +131,21 @@ class CargoPlaceClient:
             "deliveryAddress": delivery_address_id,
         }
 
-        response = requests.post(
-            f"{self.base_url}/cargo-place/create-or-update",
-            headers=self.headers,
-            json=payload
-        )
+    def _parse_create_response(self, response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            error_msg = f"Ошибка создания грузоместа: {response.status_code}"
+            try:
+                error_data = response.json()
+                if "message" in error_data:
+                    error_msg += f"\nСообщение: {error_data['message']}"
+            except:
+                error_msg += f"\nОтвет: {response.text[:200]}"
+
+            raise AssertionError(error_msg)
 
+        return response.json()
+
+    def _parse_create_by_id_response(self, response, payload: Dict[str, Any]) -> Dict[str, Any]:
         if response.status_code != 200:
             print(f"\n❌ Ошибка создания ГМ по ID: {response.status_code}")
             print(f"URL: {response.url}")
@@ -117,4 +155,47 @@ class CargoPlaceClient:
 
         result = response.json()
         print(f"✅ ГМ создано по ID: ID={result.get('id')}, title={result.get('title')}")
-        return result
\ No newline at end of file
+        return result
+
+
+class AsyncCargoPlaceClient(AsyncClientMixin, CargoPlaceClient):
+    """Async-вариант CargoPlaceClient для массового создания грузомест в одном event loop"""
+
+    async def create_cargo_place(
+            self,
+            departure_external_id: str,
+            delivery_external_id: str,
+            title: str = None,
+            external_id: str = None,
+            cargo_type: Optional[str] = None,
+            weight_kg: Optional[int] = None,
+            volume_m3: Optional[int] = None,
+            invoice_number: str = None,
+            comment: str = "Тестирование внешнего API"
+    ) -> Dict[str, Any]:
+        payload = self._build_cargo_place_payload(
+            departure_external_id, delivery_external_id, title, external_id,
+            cargo_type, weight_kg, volume_m3, invoice_number, comment
+        )
+
+        response = await self._request("POST", f"{self.base_url}/cargo-place/create-or-update", json=payload)
+        return self._parse_create_response(response)
+
+    async def create_cargo_place_by_id(
+            self,
+            departure_address_id: int,
+            delivery_address_id: int,
+            title: str,
+            external_id: str = None,
+            cargo_type: Optional[str] = None,
+            weight_kg: Optional[int] = None,
+            volume_m3: Optional[int] = None,
+            comment: str = "Тестирование внешнего API"
+    ) -> Dict[str, Any]:
+        payload = self._build_cargo_place_by_id_payload(
+            departure_address_id, delivery_address_id, title, external_id,
+            cargo_type, weight_kg, volume_m3, comment
+        )
+
+        response = await self._request("POST", f"{self.base_url}/cargo-place/create-or-update", json=payload)
+        return self._parse_create_by_id_response(response, payload)
@@ -6,34 +6,29 @@ import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from dataclasses import dataclass
+import numpy as np
 from config.settings import TIMEOUT
 from utils.inn_fetcher import INNFetcher
+from utils.inn_generator import REAL_REGIONS, REAL_IFNS, generate_inns, format_inns
+from utils.inn_registry import InnRegistry
+from pages.base_page import BaseClient
 
 
 class ContractorDataGenerator:
-    """Генератор тестовых данных для контрагентов с реалистичными ИНН"""
+    """
+    Генератор тестовых данных для контрагентов с реалистичными ИНН.
+    registry - реестр ИНН, уже использованных на стенде (utils.inn_registry): с ним ИНН выдаются
+    только не занятые в прошлых прогонах и другими воркерами, без лишних отказов сервера.
+    """
 
-    def __init__(self):
+    def __init__(self, registry: Optional[InnRegistry] = None):
         self.inn_cache = []  # Кэш полученных ИНН
         self.used_inns = set()  # Уже использованные ИНН в этой сессии
+        self.registry = registry
 
-        # Реальные коды регионов РФ
-        self.REAL_REGIONS = [
-            1, 2, 3, 4, 5, 7, 10, 11, 12, 13, 14, 15,
-            16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27,
-            28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39,
-            40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51,
-            52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63,
-            64, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75,
-            76, 77, 78, 79, 82, 86, 87, 89
-        ]
-
-        # Наиболее распространённые коды налоговых инспекций
-        self.REAL_IFNS = [
-            1, 2, 3, 4, 5, 6, 7, 8, 9,
-            10, 11, 12, 13, 14, 15, 16, 17, 18, 19,
-            20, 21, 22, 23, 24, 25
-        ]
+        # Реальные коды регионов РФ и наиболее распространённые коды налоговых инспекций
+        self.REAL_REGIONS = list(REAL_REGIONS)
+        self.REAL_IFNS = list(REAL_IFNS)
 
     def generate_realistic_inn(self, entity_type: str = "entity") -> str:
         """
@@ -92,6 +87,31 @@ class ContractorDataGenerator:
         else:
             raise ValueError("Тип должен быть 'individual' или 'entity'")
 
+    def generate_realistic_inns(self, count: int, entity_type: str = "entity", seed: Optional[int] = None) -> List[str]:
+        """
+        Пакетная генерация count уникальных реалистичных ИНН (NumPy, без вывода на каждый ИНН)
+        для подготовки контрагентов нагрузочных прогонов. Уже использованные в сессии ИНН не выдаются
+        и выданные помечаются использованными.
+        """
+        if self.registry is not None and self.registry.entity_type == entity_type:
+            inns = self.registry.reserve(count, seed)
+            self.used_inns.update(inns)
+            print(f"📝 Зарезервировано реалистичных ИНН: {len(inns)}")
+            return inns
+
+        used = [inn for inn in self.used_inns if len(inn) == (10 if entity_type == "entity" else 12) and inn.isdigit()]
+        exclude = np.array(used, dtype=np.int64) if used else None
+        inns = format_inns(generate_inns(count, entity_type, seed, exclude), entity_type)
+        self.used_inns.update(inns)
+        print(f"📝 Сгенерировано реалистичных ИНН: {len(inns)}")
+        return inns
+
+    def mark_used(self, inn: str) -> None:
+        """Пометить ИНН использованным в сессии и в реестре стенда."""
+        self.used_inns.add(inn)
+        if self.registry is not None:
+            self.registry.add([inn])
+
     def get_fresh_inn(self, source: str = "realistic") -> str:
         """
         Получение свежего ИНН из различных источников
@@ -99,7 +119,7 @@ class ContractorDataGenerator:
         Parameters:
         -----------
         source : str
-            Источник: "radar", "star", "generated", "mixed", "realistic"
+            Источник: "corpus", "radar", "star", "generated", "mixed", "realistic"
 
             "realistic" - использует метод generate_realistic_inn с реальными кодами регионов
 
@@ -109,27 +129,35 @@ class ContractorDataGenerator:
             Свежий ИНН
         """
         if source == "realistic":
+            if self.registry is not None:
+                # Выбор и запись в реестр атомарны - ИНН не выдаётся повторно ни в этом, ни в других процессах
+                inn = self.registry.reserve(1)[0]
+                self.used_inns.add(inn)
+                print(f"📝 Зарезервирован реалистичный ИНН: {inn}")
+                return inn
+
             # Используем новый метод генерации реалистичных ИНН
             inn = self.generate_realistic_inn("entity")
             self.used_inns.add(inn)
             return inn
 
-        # Старая логика для других источников
+        # Старая логика для других источников. ИНН кэша уже заняты в реестре (INNFetcher занимает их
+        # под блокировкой реестра), поэтому здесь проверяется только использование в этой сессии
         if not self.inn_cache:
             print(f"📥 Получение свежих ИНН из источника: {source}")
-            self.inn_cache = INNFetcher.get_fresh_inns(10, source)
+            self.inn_cache = INNFetcher.get_fresh_inns(10, source, self.registry)
 
         # Берем ИНН из кэша, пропуская уже использованные
         for inn in self.inn_cache[:]:
+            self.inn_cache.remove(inn)
             if inn not in self.used_inns:
                 self.used_inns.add(inn)
-                self.inn_cache.remove(inn)
                 print(f"🎯 Используем ИНН: {inn}")
                 return inn
 
         # Если все ИНН использованы, получаем новые
         print("🔄 Все ИНН использованы, получаем новые...")
-        self.inn_cache = INNFetcher.get_fresh_inns(10, source)
+        self.inn_cache = [inn for inn in INNFetcher.get_fresh_inns(10, source, self.registry) if inn not in self.used_inns]
 
         if self.inn_cache:
             inn = self.inn_cache.pop(0)
@@ -138,7 +166,7 @@ class ContractorDataGenerator:
 
         # Если не получилось, генерируем реалистичный
         print("⚠️  Не удалось получить ИНН, генерируем реалистичный...")
-        return self.generate_realistic_inn("entity")
+        return self.get_fresh_inn("realistic")
 
     @staticmethod
     def generate_random_email() -> str:
@@ -187,16 +215,17 @@ class ContractorDataGenerator:
         return f"{random.choice(prefixes)} '{base_name} {timestamp}'"
 
 
-class CreateContractorPage:
+class CreateContractorPage(BaseClient):
     """Page Object для работы с созданием контрагентов"""
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
-        self.generator = ContractorDataGenerator()
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None,
+                 inn_registry: Optional[InnRegistry] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
+        # Реестр использованных ИНН стенда: по умолчанию - общий файл окружения base_url
+        if inn_registry is None:
+            inn_registry = InnRegistry.for_environment(base_url)
+        self.generator = ContractorDataGenerator(inn_registry)
         self.created_contractors = []
 
         print(f"\n🔧 CreateContractorPage инициализирован:")
@@ -209,6 +238,7 @@ class CreateContractorPage:
             name: Optional[str] = None,
             inn_source: str = "realistic",
             add_bank_details: bool = False,
+            verbose: bool = True,
             **kwargs
     ) -> Dict[str, Any]:
         """
@@ -224,6 +254,8 @@ class CreateContractorPage:
             Источник ИНН
         add_bank_details : bool
             Добавлять банковские реквизиты
+        verbose : bool
+            Печатать подготовленные данные (для массового создания - False)
         **kwargs : дополнительные параметры
         """
         # Получаем ИНН
@@ -277,12 +309,13 @@ class CreateContractorPage:
             if key not in ["inn", "name", "vatRate", "taxationSystem"]:
                 contractor_data[key] = value
 
-        print(f"📝 Подготовлены данные контрагента:")
-        print(f"   Роль: {'Заказчик' if role == 1 else 'Подрядчик'} ({role})")
-        print(f"   ИНН: {inn}")
-        print(f"   Название: {name}")
-        print(f"   Банковские реквизиты: {'Да' if add_bank_details else 'Нет'}")
-        print(f"   Поля в запросе: {list(contractor_data.keys())}")
+        if verbose:
+            print(f"📝 Подготовлены данные контрагента:")
+            print(f"   Роль: {'Заказчик' if role == 1 else 'Подрядчик'} ({role})")
+            print(f"   ИНН: {inn}")
+            print(f"   Название: {name}")
+            print(f"   Банковские реквизиты: {'Да' if add_bank_details else 'Нет'}")
+            print(f"   Поля в запросе: {list(contractor_data.keys())}")
 
         return contractor_data
 
@@ -337,12 +370,15 @@ class CreateContractorPage:
 
         return contractor_data
 
+    @property
+    def child_create_url(self) -> str:
+        if "/v1/api-ext" in self.base_url:
+            return f"{self.base_url}/contractor/child-create"
+        return f"{self.base_url}/v1/api-ext/contractor/child-create"
+
     def create_child_contractor(self, contractor_data: Dict[str, Any]) -> Dict[str, Any]:
         """Создание контрагента"""
-        if "/v1/api-ext" in self.base_url:
-            url = f"{self.base_url}/contractor/child-create"
-        else:
-            url = f"{self.base_url}/v1/api-ext/contractor/child-create"
+        url = self.child_create_url
 
         print(f"\n📤 Отправка запроса:")
         print(f"   URL: {url}")
@@ -358,7 +394,7 @@ class CreateContractorPage:
             )
 
             try:
-                response = requests.post(
+                response = self.session.post(
                     url,
                     json=contractor_data,
                     headers=self.headers,
@@ -386,6 +422,9 @@ class CreateContractorPage:
                 if response.status_code == 200:
                     response_data = response.json()
 
+                    if contractor_data.get("inn"):
+                        self.generator.mark_used(contractor_data["inn"])
+
                     if "id" in response_data:
                         self.created_contractors.append({
                             "id": response_data["id"],
@@ -402,7 +441,7 @@ class CreateContractorPage:
                     if "дублирован" in response.text.lower() or "duplicate" in response.text.lower():
                         inn = contractor_data.get("inn")
                         if inn:
-                            self.generator.used_inns.add(inn)
+                            self.generator.mark_used(inn)
                             print(f"🚫 ИНН {inn} помечен как дублированный")
 
                     # Если ИНН не найден в реестрах
@@ -435,7 +474,7 @@ class CreateContractorPage:
 
         with allure.step(f"Получение профиля контрагента ID={contractor_id}"):
             try:
-                response = requests.get(
+                response = self.session.get(
                     url,
                     headers=self.headers,
                     timeout=TIMEOUT
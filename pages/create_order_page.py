@@ -1,16 +1,16 @@
 import requests
 import json
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient, AsyncClientMixin
 
 
-class TransportRequestClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+class TransportRequestClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def get_order_details(self, order_id: int) -> dict:
-        response = requests.get(
+        response = self.session.get(
             f"{self.base_url}/order/{order_id}/details",
             headers=self.headers
         )
@@ -28,6 +28,58 @@ class TransportRequestClient:
             inner_comment: str = "Тестовое создание рейса"
     ) -> Dict[str, Any]:
         """Создать транспортный рейс."""
+        payload = self._build_transport_request_payload(
+            addresses, cargo_place_specs, client_id, producer_id, contract_id,
+            order_identifier, inner_comment, strict_external_id=True
+        )
+
+        response = self.session.post(
+            f"{self.base_url}/order/transport-request/create",
+            headers=self.headers,
+            json=payload
+        )
+
+        return self._parse_create_response(response)
+
+    def create_and_publish_transport_request(
+            self,
+            addresses: List[Dict[str, Any]],
+            cargo_place_specs: List[Dict[str, Any]],
+            client_id: int,
+            producer_id: int,
+            contract_id: int,
+            order_identifier: str,
+            inner_comment: str = "Тестовое создание рейса (с публикацией)"
+    ) -> Dict[str, Any]:
+        payload = self._build_transport_request_payload(
+            addresses, cargo_place_specs, client_id, producer_id, contract_id,
+            order_identifier, inner_comment, strict_external_id=False
+        )
+
+        # Используем /create-and-publish вместо /create
+        response = self.session.post(
+            f"{self.base_url}/order/transport-request/create-and-publish",
+            headers=self.headers,
+            json=payload
+        )
+
+        return self._parse_create_and_publish_response(response, payload)
+
+    def _build_transport_request_payload(
+            self,
+            addresses: List[Dict[str, Any]],
+            cargo_place_specs: List[Dict[str, Any]],
+            client_id: int,
+            producer_id: int,
+            contract_id: int,
+            order_identifier: str,
+            inner_comment: str,
+            strict_external_id: bool
+    ) -> Dict[str, Any]:
+        """
+        Payload для /order/transport-request/create и /create-and-publish.
+        strict_external_id=True требует externalId у каждого адреса (как в /create).
+        """
         now = datetime.now()
         start_date = (now + timedelta(days=1)).strftime("%Y-%m-%d")
         start_time = "10:00"
@@ -37,7 +89,7 @@ class TransportRequestClient:
         for i, addr in enumerate(addresses):
             route.append({
                 "id": addr["id"],
-                "externalId": addr["externalId"],
+                "externalId": addr["externalId"] if strict_external_id else addr.get("externalId", ""),
                 "latitude": addr.get("latitude"),
                 "longitude": addr.get("longitude"),
                 "addressString": addr["addressString"],
@@ -56,7 +108,7 @@ class TransportRequestClient:
                 "statusFlowType": "fullFlow"
             })
 
-        payload = {
+        return {
             "toStartAtDate": start_date,
             "toStartAtTime": start_time,
             "requiredProducers": [producer_id],
@@ -78,12 +130,7 @@ class TransportRequestClient:
             "cargoPlaces": cargo_place_specs
         }
 
-        response = requests.post(
-            f"{self.base_url}/order/transport-request/create",
-            headers=self.headers,
-            json=payload
-        )
-
+    def _parse_create_response(self, response) -> Dict[str, Any]:
         if response.status_code != 200:
             error_msg = f"Ошибка создания рейса: {response.status_code}"
             try:
@@ -97,7 +144,26 @@ class TransportRequestClient:
 
         return response.json()
 
-    def create_and_publish_transport_request(
+    def _parse_create_and_publish_response(self, response, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if response.status_code != 200:
+            print(f"\n❌ Ошибка создания и публикации рейса: {response.status_code}")
+            print(f"URL: {response.url}")
+            print(f"Ответ: {response.text}")
+            print(f"Запрос: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+            response.raise_for_status()
+
+        return response.json()
+
+
+class AsyncTransportRequestClient(AsyncClientMixin, TransportRequestClient):
+    """Async-вариант TransportRequestClient: параллельное создание рейсов и опрос их деталей"""
+
+    async def get_order_details(self, order_id: int) -> dict:
+        response = await self._request("GET", f"{self.base_url}/order/{order_id}/details")
+        response.raise_for_status()
+        return response.json()
+
+    async def create_transport_request(
             self,
             addresses: List[Dict[str, Any]],
             cargo_place_specs: List[Dict[str, Any]],
@@ -105,70 +171,34 @@ class TransportRequestClient:
             producer_id: int,
             contract_id: int,
             order_identifier: str,
-            inner_comment: str = "Тестовое создание рейса (с публикацией)"
+            inner_comment: str = "Тестовое создание рейса"
     ) -> Dict[str, Any]:
-        now = datetime.now()
-        start_date = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-        start_time = "10:00"
+        payload = self._build_transport_request_payload(
+            addresses, cargo_place_specs, client_id, producer_id, contract_id,
+            order_identifier, inner_comment, strict_external_id=True
+        )
 
-        # Формируем маршрут с position
-        route = []
-        for i, addr in enumerate(addresses):
-            route.append({
-                "id": addr["id"],
-                "externalId": addr.get("externalId", ""),
-                "latitude": addr.get("latitude"),
-                "longitude": addr.get("longitude"),
-                "addressString": addr["addressString"],
-                "cityName": addr.get("cityName") or "Ижевск",
-                "cityFiasId": addr.get("cityFiasId"),
-                "timeZoneId": addr.get("timezone") or "Europe/Samara",
-                "contacts": addr.get("contacts") or [""],
-                "phone": addr.get("phone") or "",
-                "email": addr.get("email") or "",
-                "title": addr.get("title") or "Адрес",
-                "attachedFiles": [],
-                "isLoadingWork": (i == 0),
-                "isUnloadingWork": (i == len(addresses) - 1),
-                "position": i + 1,
-                "loadingType": addr.get("loadingType", 1),
-                "statusFlowType": "fullFlow"
-            })
+        response = await self._request("POST", f"{self.base_url}/order/transport-request/create", json=payload)
+        return self._parse_create_response(response)
 
-        payload = {
-            "toStartAtDate": start_date,
-            "toStartAtTime": start_time,
-            "requiredProducers": [producer_id],
-            "client": client_id,
-            "orderIdentifier": order_identifier,
-            "innerComment": inner_comment,
-            "publicComment": "",
-            "publishingType": "rate",
-            "clientRate": 50000,
-            "parametersForProducers": [{
-                "producer": producer_id,
-                "tariff": 0,
-                "contract": contract_id
-            }],
-            "orderType": 1,
-            "vehicleType": 1,
-            "bodyTypes": [3, 4],
-            "addresses": route,
-            "cargoPlaces": cargo_place_specs
-        }
+    async def create_and_publish_transport_request(
+            self,
+            addresses: List[Dict[str, Any]],
+            cargo_place_specs: List[Dict[str, Any]],
+            client_id: int,
+            producer_id: int,
+            contract_id: int,
+            order_identifier: str,
+            inner_comment: str = "Тестовое создание рейса (с публикацией)"
+    ) -> Dict[str, Any]:
+        payload = self._build_transport_request_payload(
+            addresses, cargo_place_specs, client_id, producer_id, contract_id,
+            order_identifier, inner_comment, strict_external_id=False
+        )
 
-        # Используем /create-and-publish вместо /create
-        response = requests.post(
+        response = await self._request(
+            "POST",
             f"{self.base_url}/order/transport-request/create-and-publish",
-            headers=self.headers,
             json=payload
         )
-
-        if response.status_code != 200:
-            print(f"\n❌ Ошибка создания и публикации рейса: {response.status_code}")
-            print(f"URL: {response.url}")
-            print(f"Ответ: {response.text}")
-            print(f"Запрос: {json.dumps(payload, ensure_ascii=False, indent=2)}")
-            response.raise_for_status()
-
-        return response.json()
\ No newline at end of file
+        return self._parse_create_and_publish_response(response, payload)
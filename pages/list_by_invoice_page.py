@@ -1,15 +1,15 @@
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class ListByInvoiceClient:
+class ListByInvoiceClient(BaseClient):
     """Клиент для работы с эндпоинтом /cargo-place/list-by-invoice"""
 
 
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def list_by_invoice(self, invoice_number: str) -> Dict[str, Any]:
         """
@@ -18,7 +18,7 @@ class ListByInvoiceClient:
         :return: Ответ API (dict)
         """
         payload = {"invoiceNumber": invoice_number}
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/cargo-place/list-by-invoice",
             headers=self.headers,
             json=payload,
@@ -1,15 +1,26 @@
 from faker import Faker
+import functools
+import json
 import random
 import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from config.settings import TIMEOUT
+from pages.base_page import BaseClient
 
 fake = Faker('ru_RU')
 
+POINT_IDS = [17978, 18535, 18534, 17980, 18294, 18293, 18529, 18785, 18527, 18290, 27606, 18520, 27607, 18532, 27883, 27317, 19203, 19206, 18499, 18481, 17984, 27318]
+TYPE_PACKAGES = ["free", "box", "pallet", "container", "bag", "RP"]
+
+# Размер пула названий Faker для пакетной генерации: одно обращение к Faker на название, а не на задание
+TITLE_POOL_SIZE = 2000
+
+
 def generate_random_task_item():
     """Генерирует один объект задания с рандомными данными."""
-    point_id = [17978, 18535, 18534, 17980, 18294, 18293, 18529, 18785, 18527, 18290, 27606, 18520, 27607, 18532, 27883, 27317, 19203, 19206, 18499, 18481, 17984, 27318]
-    arrival_id = random.choice(point_id)
-    departure_id = random.choice([pid for pid in point_id if pid != arrival_id])
-    type_package = ["free", "box", "pallet", "container", "bag", "RP"]
+    arrival_id = random.choice(POINT_IDS)
+    departure_id = random.choice([pid for pid in POINT_IDS if pid != arrival_id])
 
     return {
         "number": fake.numerify("###-###"),
@@ -27,23 +38,186 @@ def generate_random_task_item():
         "weight": random.randint(100_000, 500_000),
         "cost": random.randint(1_000_000, 5_000_000),
         "quantity": random.randint(1, 100),
-        "types": [random.choice(type_package)],
+        "types": [random.choice(TYPE_PACKAGES)],
         "isCargoPlacesEnabled": False
     }
 
-def is_valid_uuid(uuid_string: str) -> bool:
-    """Проверяет, является ли строка корректным UUID4."""
-    uuid4_pattern = re.compile(
-        r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-4[0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}$'
-    )
-    return bool(uuid4_pattern.match(uuid_string))
+
+# ==================== ПАКЕТНАЯ ГЕНЕРАЦИЯ ====================
+
+@functools.lru_cache(maxsize=8)
+def _title_pool(seed: Optional[int], size: int) -> Tuple[str, ...]:
+    """Названия Faker (как fake.word().lower()), воспроизводимые при заданном seed."""
+    faker = Faker('ru_RU')
+    faker.seed_instance(seed)
+    return tuple(faker.word().lower() for _ in range(size))
+
+
+_TRIPLES = [f"{i:03d}" for i in range(1000)]
+
+
+def _task_columns(count: int, rng: np.random.Generator, titles: Tuple[str, ...]) -> Dict[str, list]:
+    """
+    Колонки полей count заданий одним вызовом NumPy на колонку, с теми же распределениями,
+    что у generate_random_task_item. Пункт отправления - равновероятно любой, кроме пункта
+    прибытия: сдвиг индекса прибытия на 1..n-1 по кругу.
+    """
+    points = np.asarray(POINT_IDS)
+    arrival = rng.integers(0, len(points), count)
+    departure = (arrival + rng.integers(1, len(points), count)) % len(points)
+    numbers = rng.integers(0, 1000, (2, count)).tolist()
+    return {
+        "number": [f"{_TRIPLES[a]}-{_TRIPLES[b]}" for a, b in zip(*numbers)],
+        "title": np.asarray(titles, dtype=object)[rng.integers(0, len(titles), count)].tolist(),
+        "arrival": points[arrival].tolist(),
+        "departure": points[departure].tolist(),
+        "volume": (rng.integers(1, 11, count) * 1_000_000).tolist(),
+        "weight": rng.integers(100_000, 500_001, count).tolist(),
+        "cost": rng.integers(1_000_000, 5_000_001, count).tolist(),
+        "quantity": rng.integers(1, 101, count).tolist(),
+        "type": np.asarray(TYPE_PACKAGES, dtype=object)[rng.integers(0, len(TYPE_PACKAGES), count)].tolist(),
+    }
+
+
+def generate_task_items(count: int, seed: Optional[int] = None,
+                        title_pool_size: int = TITLE_POOL_SIZE) -> List[Dict[str, Any]]:
+    """
+    count заданий с полями как у generate_random_task_item, но колонками NumPy и пулом названий Faker -
+    для наборов из сотен тысяч и миллионов заданий. С seed результат воспроизводим.
+    """
+    rng = np.random.default_rng(seed)
+    c = _task_columns(count, rng, _title_pool(seed, title_pool_size))
+    return [
+        {
+            "number": number,
+            "title": title,
+            "shipBy": "vezubr",
+            "requiredSentAtFrom": None,
+            "requiredSentAtTill": None,
+            "requiredDeliveredAtTill": None,
+            "requiredDeliveredAtFrom": None,
+            "consignee": None,
+            "shipper": None,
+            "arrivalPoint": {"id": arrival},
+            "departurePoint": {"id": departure},
+            "volume": volume,
+            "weight": weight,
+            "cost": cost,
+            "quantity": quantity,
+            "types": [type_package],
+            "isCargoPlacesEnabled": False
+        }
+        for number, title, arrival, departure, volume, weight, cost, quantity, type_package in zip(
+            c["number"], c["title"], c["arrival"], c["departure"], c["volume"],
+            c["weight"], c["cost"], c["quantity"], c["type"]
+        )
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def _json_fragments(seed: Optional[int], title_pool_size: int) -> Dict[str, list]:
+    """
+    Заранее сериализованные куски задания для generate_task_items_json: у полей с малым числом
+    значений (название из пула, пара пунктов, объём, количество + тип) все варианты собираются один раз.
+    """
+    n = len(POINT_IDS)
+    return {
+        "title": [
+            f'", "title": {json.dumps(title)}, "shipBy": "vezubr", "requiredSentAtFrom": null, '
+            f'"requiredSentAtTill": null, "requiredDeliveredAtTill": null, "requiredDeliveredAtFrom": null, '
+            f'"consignee": null, "shipper": null, "arrivalPoint": '
+            for title in _title_pool(seed, title_pool_size)
+        ],
+        "points": [
+            f'{{"id": {POINT_IDS[a]}}}, "departurePoint": {{"id": {POINT_IDS[d]}}}, "volume": '
+            for a in range(n) for d in range(n)
+        ],
+        "volume": [f'{v * 1_000_000}, "weight": ' for v in range(11)],
+        "quantity_type": [
+            f', "quantity": {q}, "types": [{json.dumps(t)}], "isCargoPlacesEnabled": false}}'
+            for q in range(101) for t in TYPE_PACKAGES
+        ],
+    }
 
 
+def generate_task_items_json(count: int, seed: Optional[int] = None,
+                             title_pool_size: int = TITLE_POOL_SIZE) -> bytes:
+    """
+    Готовое тело /shipment/tasks/create-list ({"data": [...]}, UTF-8, как json.dumps) без промежуточных dict:
+    задание склеивается из заранее сериализованных кусков, выбранных индексами NumPy, одним str.join.
+    Те же значения, что у generate_task_items с тем же seed. Отправляется через data=.
+    """
+    if count == 0:
+        return b'{"data": []}'
+    rng = np.random.default_rng(seed)
+    fragments = _json_fragments(seed, title_pool_size)
+    n = len(POINT_IDS)
+    # Те же вызовы rng и в том же порядке, что в _task_columns
+    arrival = rng.integers(0, n, count)
+    departure = (arrival + rng.integers(1, n, count)) % n
+    first, second = rng.integers(0, 1000, (2, count)).tolist()
+    title = rng.integers(0, title_pool_size, count)
+    volume = rng.integers(1, 11, count)
+    weight = rng.integers(100_000, 500_001, count).tolist()
+    cost = rng.integers(1_000_000, 5_000_001, count).tolist()
+    quantity = rng.integers(1, 101, count)
+    type_package = rng.integers(0, len(TYPE_PACKAGES), count)
 
+    def pick(pool: list, indexes: np.ndarray) -> list:
+        return np.asarray(pool, dtype=object)[indexes].tolist()
 
+    columns = [
+        [', {"number": "'] * count,
+        [_TRIPLES[i] for i in first],
+        ["-"] * count,
+        [_TRIPLES[i] for i in second],
+        pick(fragments["title"], title),
+        pick(fragments["points"], arrival * n + departure),
+        pick(fragments["volume"], volume),
+        list(map(str, weight)),
+        [', "cost": '] * count,
+        list(map(str, cost)),
+        pick(fragments["quantity_type"], quantity * len(TYPE_PACKAGES) + type_package),
+    ]
+    pieces = [None] * (count * len(columns))
+    for i, column in enumerate(columns):
+        pieces[i::len(columns)] = column
+    pieces[0] = '{"number": "'
+    return f'{{"data": [{"".join(pieces)}]}}'.encode("utf-8")
 
 
+def iter_task_payloads(total: int, batch_size: int, seed: Optional[int] = None,
+                       serialized: bool = True) -> Iterator[Any]:
+    """
+    Тела create-list по batch_size заданий для total заданий, без генерации всего набора в памяти.
+    Пачки получают независимые seed из numpy.random.SeedSequence - набор воспроизводим целиком.
+    serialized=False отдаёт списки dict вместо готового JSON.
+    """
+    batches = -(-total // batch_size)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(batches)):
+        count = min(batch_size, total - i * batch_size)
+        batch_seed = int(child.generate_state(1)[0])
+        yield generate_task_items_json(count, batch_seed) if serialized else generate_task_items(count, batch_seed)
 
 
+def is_valid_uuid(uuid_string: str) -> bool:
+    """Проверяет, является ли строка корректным UUID4."""
+    uuid4_pattern = re.compile(
+        r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-4[0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}$'
+    )
+    return bool(uuid4_pattern.match(uuid_string))
+
 
+class ShipmentTaskListClient(BaseClient):
+    """Клиент массового создания Заданий: /shipment/tasks/create-list."""
 
+    def create_tasks_list(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Создаёт пачку Заданий; ответ - {"status", "data": [{"id", "status", "errors"}, ...]} в порядке входа."""
+        response = self.session.post(
+            f"{self.base_url}/shipment/tasks/create-list",
+            headers={**self.headers, "Content-Type": "application/json"},
+            json={"data": tasks},
+            timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
@@ -1,25 +1,27 @@
 import requests
 import json
 from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient
 
 
-class ReplacePlannedPairsClient:
+class ReplacePlannedPairsClient(BaseClient):
     """Клиент для работы с эндпоинтом /cargo-place/replace-planned-pairs"""
 
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def replace_planned_pairs(
             self,
             items: List[Dict[str, Any]],
-            is_strict: bool = False
+            is_strict: bool = False,
+            verbose: bool = True
     ) -> List[Any]:
         """
         Замена плановых ГМ на фактические парами
 
         :param items: Список пар для замены
         :param is_strict: Флаг строгой проверки ошибок
+        :param verbose: Печатать запрос и ответ (для массовой загрузки пачками - False)
         :return: Ответ API (обычно пустой список при успехе)
         """
         payload = {
@@ -27,19 +29,21 @@ class ReplacePlannedPairsClient:
             "isStrict": is_strict
         }
 
-        print(f"📤 Запрос к /cargo-place/replace-planned-pairs:")
-        print(f"   URL: {self.base_url}/cargo-place/replace-planned-pairs")
-        print(f"   Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
+        if verbose:
+            print(f"📤 Запрос к /cargo-place/replace-planned-pairs:")
+            print(f"   URL: {self.base_url}/cargo-place/replace-planned-pairs")
+            print(f"   Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/cargo-place/replace-planned-pairs",
             headers=self.headers,
             json=payload,
             timeout=10
         )
 
-        print(f"📥 Ответ: {response.status_code}")
-        print(f"   Тело: {response.text}")
+        if verbose:
+            print(f"📥 Ответ: {response.status_code}")
+            print(f"   Тело: {response.text}")
 
         response.raise_for_status()
         return response.json()
@@ -127,7 +131,7 @@ class ReplacePlannedPairsClient:
                 "isStrict": False
             }
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/cargo-place/replace-planned-pairs",
                 headers=self.headers,
                 json=test_payload,
@@ -1,14 +1,12 @@
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient, AsyncClientMixin
 
 
-class TruckDeliveriesDetailsClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+class TruckDeliveriesDetailsClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def get_truck_delivery_details(self, truck_delivery_id: str) -> Dict[str, Any]:
         """
@@ -18,8 +16,12 @@ class TruckDeliveriesDetailsClient:
         """
         url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/details"
 
-        response = requests.get(url, headers=self.headers, timeout=30)
+        response = self.session.get(url, headers=self.headers, timeout=30)
+        return self._parse_details_response(response, truck_delivery_id)
 
+    @staticmethod
+    def _parse_details_response(response, truck_delivery_id: str) -> Dict[str, Any]:
+        """Разбор ответа /truck-deliveries/{id}/details (общий для sync и async)"""
         if response.status_code != 200:
             print(f"❌ Ошибка получения деталей рейса {truck_delivery_id}: {response.status_code}")
             print(f"Ответ: {response.text[:200]}")
@@ -32,4 +34,17 @@ class TruckDeliveriesDetailsClient:
     def get_points_info(self, truck_delivery_id: str) -> List[Dict[str, Any]]:
         """Получение информации о точках маршрута рейса"""
         details = self.get_truck_delivery_details(truck_delivery_id)
-        return details.get("points", [])
\ No newline at end of file
+        return details.get("points", [])
+
+
+class AsyncTruckDeliveriesDetailsClient(AsyncClientMixin, TruckDeliveriesDetailsClient):
+    """Async-вариант TruckDeliveriesDetailsClient для параллельного опроса рейсов"""
+
+    async def get_truck_delivery_details(self, truck_delivery_id: str) -> Dict[str, Any]:
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/details"
+        response = await self._request("GET", url, timeout=30)
+        return self._parse_details_response(response, truck_delivery_id)
+
+    async def get_points_info(self, truck_delivery_id: str) -> List[Dict[str, Any]]:
+        details = await self.get_truck_delivery_details(truck_delivery_id)
+        return details.get("points", [])
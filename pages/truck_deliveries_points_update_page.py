@@ -1,35 +1,70 @@
 import requests
 import json
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pages.base_page import BaseClient, AsyncClientMixin
 
 
-class TruckDeliveriesPointsUpdateClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url.rstrip('/')
-        self.headers = {
-            "Authorization": token,
-            "Content-Type": "application/json"
-        }
+def format_frontend_time(dt: datetime) -> str:
+    # Важно: форматируем как на фронте - "YYYY-MM-DDTHH:MM:SSZ" (без +00:00!)
+    # Убираем микросекунды и timezone offset, добавляем Z
+    return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S") + "Z"
+
+
+class TruckDeliveriesPointsUpdateClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
+        self.headers["Content-Type"] = "application/json"
 
     def complete_all_points(self, truck_delivery_id: str) -> Dict[str, Any]:
         """
         Завершение рейса в правильном формате как на фронте
         """
         url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_complete_payload(truck_delivery_id)
+
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
+
+        return self._parse_complete_response(response, payload)
+
+    def complete_all_points_simple(self, truck_delivery_id: str) -> Dict[str, Any]:
+        """Простой вариант завершения - с startedAt и completedAt"""
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_simple_payload(truck_delivery_id)
+
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
+
+        if response.status_code != 200:
+            print(f"⚠️ Ошибка простого завершения: {response.status_code}")
+            print(f"Ответ: {response.text[:200]}")
+            # Пробуем еще более простой вариант
+            return self.complete_all_points_minimal(truck_delivery_id)
+
+        result = response.json()
+        print(f"✅ Рейс завершен простым способом: {result}")
+        return result
+
+    def complete_all_points_minimal(self, truck_delivery_id: str) -> Dict[str, Any]:
+        """Минимальный вариант завершения - только completedAt"""
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_minimal_payload(truck_delivery_id)
+
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
 
+        return self._parse_minimal_response(response)
+
+    def update_points_statuses(self, truck_delivery_id: str, points_count: int = 3) -> Dict[str, Any]:
+        """Старый метод для обратной совместимости"""
+        print(f"⚠️  Используется устаревший метод update_points_statuses, используйте complete_all_points")
+        return self.complete_all_points(truck_delivery_id)
+
+    def _build_complete_payload(self, truck_delivery_id: str) -> Dict[str, Any]:
         # Текущее время в UTC
-        from datetime import datetime, timezone, timedelta
         now = datetime.now(timezone.utc)
 
         # Базовое время: 20 секунд назад (чтобы все было в прошлом)
         base_time = now - timedelta(seconds=20)
 
-        # Важно: форматируем как на фронте - "YYYY-MM-DDTHH:MM:SSZ" (без +00:00!)
-        def format_frontend_time(dt):
-            # Убираем микросекунды и timezone offset, добавляем Z
-            return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S") + "Z"
-
         # Создаем точки как на фронте:
         points = [
             {
@@ -49,42 +84,25 @@ class TruckDeliveriesPointsUpdateClient:
             }
         ]
 
-        payload = {"points": points}
-
         print(f"🏁 [TruckDeliveriesPointsUpdate] Завершение рейса {truck_delivery_id}")
         print(f"   Формат как на фронте (без +00:00):")
         for i, point in enumerate(points, 1):
             print(f"   Точка {i}: startedAt={point['startedAt']}, completedAt={point['completedAt']}")
         print(f"   Все времена в прошлом относительно: {format_frontend_time(now)}")
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
-
-        if response.status_code != 200:
-            print(f"❌ Ошибка завершения рейса: {response.status_code}")
-            print(f"Ответ: {response.text}")
-            print(f"Запрос: {json.dumps(payload, indent=2, ensure_ascii=False)}")
-            response.raise_for_status()
-
-        result = response.json()
-        print(f"✅ Рейс завершен: {result}")
-        return result
-
-    def complete_all_points_simple(self, truck_delivery_id: str) -> Dict[str, Any]:
-        """Простой вариант завершения - с startedAt и completedAt"""
-        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
-
-        from datetime import datetime, timezone, timedelta
+        return {"points": points}
 
+    def _build_simple_payload(self, truck_delivery_id: str) -> Dict[str, Any]:
         # Время в прошлом (2 минуты назад)
         past_time = datetime.now(timezone.utc) - timedelta(minutes=2)
 
-        def format_frontend_time(dt):
-            return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S") + "Z"
-
         time_str = format_frontend_time(past_time)
         time_str_started = format_frontend_time(past_time - timedelta(seconds=30))
 
-        payload = {
+        print(f"🏁 [SimpleComplete] Завершение рейса {truck_delivery_id}")
+        print(f"   startedAt: {time_str_started}, completedAt: {time_str}")
+
+        return {
             "points": [
                 {
                     "position": 1,
@@ -104,36 +122,15 @@ class TruckDeliveriesPointsUpdateClient:
             ]
         }
 
-        print(f"🏁 [SimpleComplete] Завершение рейса {truck_delivery_id}")
-        print(f"   startedAt: {time_str_started}, completedAt: {time_str}")
-
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
-
-        if response.status_code != 200:
-            print(f"⚠️ Ошибка простого завершения: {response.status_code}")
-            print(f"Ответ: {response.text[:200]}")
-            # Пробуем еще более простой вариант
-            return self.complete_all_points_minimal(truck_delivery_id)
-
-        result = response.json()
-        print(f"✅ Рейс завершен простым способом: {result}")
-        return result
-
-    def complete_all_points_minimal(self, truck_delivery_id: str) -> Dict[str, Any]:
-        """Минимальный вариант завершения - только completedAt"""
-        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
-
-        from datetime import datetime, timezone, timedelta
-
+    def _build_minimal_payload(self, truck_delivery_id: str) -> Dict[str, Any]:
         # Время в далеком прошлом (вчера)
         yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-
-        def format_frontend_time(dt):
-            return dt.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S") + "Z"
-
         time_str = format_frontend_time(yesterday)
 
-        payload = {
+        print(f"🏁 [MinimalComplete] Завершение рейса {truck_delivery_id}")
+        print(f"   completedAt (вчера): {time_str}")
+
+        return {
             "points": [
                 {"position": 1, "completedAt": time_str},
                 {"position": 2, "completedAt": time_str},
@@ -141,11 +138,18 @@ class TruckDeliveriesPointsUpdateClient:
             ]
         }
 
-        print(f"🏁 [MinimalComplete] Завершение рейса {truck_delivery_id}")
-        print(f"   completedAt (вчера): {time_str}")
+    def _parse_complete_response(self, response, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if response.status_code != 200:
+            print(f"❌ Ошибка завершения рейса: {response.status_code}")
+            print(f"Ответ: {response.text}")
+            print(f"Запрос: {json.dumps(payload, indent=2, ensure_ascii=False)}")
+            response.raise_for_status()
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+        result = response.json()
+        print(f"✅ Рейс завершен: {result}")
+        return result
 
+    def _parse_minimal_response(self, response) -> Dict[str, Any]:
         if response.status_code != 200:
             print(f"❌ Ошибка минимального завершения: {response.status_code}")
             print(f"Ответ: {response.text[:200]}")
@@ -156,7 +160,40 @@ class TruckDeliveriesPointsUpdateClient:
         return result
 
 
-    def update_points_statuses(self, truck_delivery_id: str, points_count: int = 3) -> Dict[str, Any]:
-        """Старый метод для обратной совместимости"""
+class AsyncTruckDeliveriesPointsUpdateClient(AsyncClientMixin, TruckDeliveriesPointsUpdateClient):
+    """Async-вариант TruckDeliveriesPointsUpdateClient"""
+
+    async def complete_all_points(self, truck_delivery_id: str) -> Dict[str, Any]:
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_complete_payload(truck_delivery_id)
+
+        response = await self._request("POST", url, json=payload, timeout=30)
+
+        return self._parse_complete_response(response, payload)
+
+    async def complete_all_points_simple(self, truck_delivery_id: str) -> Dict[str, Any]:
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_simple_payload(truck_delivery_id)
+
+        response = await self._request("POST", url, json=payload, timeout=30)
+
+        if response.status_code != 200:
+            print(f"⚠️ Ошибка простого завершения: {response.status_code}")
+            print(f"Ответ: {response.text[:200]}")
+            return await self.complete_all_points_minimal(truck_delivery_id)
+
+        result = response.json()
+        print(f"✅ Рейс завершен простым способом: {result}")
+        return result
+
+    async def complete_all_points_minimal(self, truck_delivery_id: str) -> Dict[str, Any]:
+        url = f"{self.base_url}/truck-deliveries/{truck_delivery_id}/points/update/statuses"
+        payload = self._build_minimal_payload(truck_delivery_id)
+
+        response = await self._request("POST", url, json=payload, timeout=30)
+
+        return self._parse_minimal_response(response)
+
+    async def update_points_statuses(self, truck_delivery_id: str, points_count: int = 3) -> Dict[str, Any]:
         print(f"⚠️  Используется устаревший метод update_points_statuses, используйте complete_all_points")
-        return self.complete_all_points(truck_delivery_id)
+        return await self.complete_all_points(truck_delivery_id)
@@ -1,12 +1,12 @@
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class TruckDeliveriesTransportAppointClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+class TruckDeliveriesTransportAppointClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def appoint_transport(self, truck_delivery_id: str, driver_id: int, vehicle_id: int) -> Dict[str, Any]:
         """
@@ -28,7 +28,7 @@ class TruckDeliveriesTransportAppointClient:
         # Полезно выводить и payload для отладки
         print(f"   Payload (isLiftingValidationRequired=False): {payload}")
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
 
         if response.status_code != 200:
             print(f"❌ Ошибка назначения транспорта: {response.status_code}")
@@ -1,12 +1,12 @@
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from pages.base_page import BaseClient
 
 
-class TruckDeliveriesTransportReplaceClient:
-    def __init__(self, base_url: str, token: str):
-        self.base_url = base_url
-        self.headers = {"Authorization": token}
+class TruckDeliveriesTransportReplaceClient(BaseClient):
+    def __init__(self, base_url: str, token: str, session: Optional[requests.Session] = None):
+        super().__init__(base_url, token, session)
 
     def replace_transport(self, truck_delivery_id: str, driver_id: int, vehicle_id: int) -> Dict[str, Any]:
         """
@@ -33,7 +33,7 @@ class TruckDeliveriesTransportReplaceClient:
         print(f"🔄 [TruckDeliveriesReplace] Замена транспорта на рейсе {truck_delivery_id}")
         print(f"   Новый водитель: {driver_id}, Новое ТС: {vehicle_id}")
 
-        response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+        response = self.session.post(url, json=payload, headers=self.headers, timeout=30)
 
         if response.status_code != 200:
             print(f"❌ Ошибка замены транспорта: {response.status_code}")
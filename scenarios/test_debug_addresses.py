@@ -4,6 +4,7 @@ import requests
 from pages.create_cargo_page import CargoPlaceClient
 from pages.create_order_page import TransportRequestClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
 
 
 @pytest.mark.parametrize("role", ["lke"], indirect=True)
@@ -19,7 +20,7 @@ def test_scenario_2_quick(get_auth_token, role, client_id, producer_id, contract
     addresses = []
 
     for i in range(2):
-        ext_id = f"QUICK-ADDR-{i}-{int(time.time())}"
+        ext_id = unique_id(f"QUICK-ADDR-{i}")
 
         payload = {
             "addressString": f"г Ижевск, Быстрая улица {i + 1}, д {i + 10}",
@@ -76,7 +77,7 @@ def test_scenario_2_quick(get_auth_token, role, client_id, producer_id, contract
             departure_external_id=addresses[0]["externalId"],
             delivery_external_id=addresses[1]["externalId"],
             title="Тестовый груз",
-            external_id=f"CP-QUICK-{int(time.time())}",
+            external_id=unique_id("CP-QUICK"),
             weight_kg=10,
             volume_m3=0.1
         )
@@ -99,7 +100,7 @@ def test_scenario_2_quick(get_auth_token, role, client_id, producer_id, contract
             client_id=client_id,
             producer_id=producer_id,
             contract_id=contract_id,
-            order_identifier=f"QUICK-TEST-{int(time.time())}"
+            order_identifier=unique_id("QUICK-TEST")
         )["id"]
 
         print(f"✅ Рейс создан: ID={order_id}")
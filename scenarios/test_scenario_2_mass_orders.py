@@ -1,13 +1,21 @@
-import time
+import asyncio
 import pytest
 from pages.address_page import AddressPage
-from pages.create_cargo_page import CargoPlaceClient
-from pages.create_order_page import TransportRequestClient
+from pages.create_cargo_page import AsyncCargoPlaceClient
+from pages.create_order_page import AsyncTransportRequestClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
+from utils.http_session import create_async_session
+from utils.status_watcher import StatusWatcher
 
 DEPARTURE_POINT = 1
 DESTINATION_POINTS = [2, 3, 4, 5]
 
+# Рейс считается обработанным, когда он в статусе 12 и к нему привязаны все 4 грузоместа
+TARGET_ORDER_STATES = {12}
+CARGO_PLACES_PER_ORDER = 4
+MONITORING_TIMEOUT = 600
+
 # Шаблоны для адресов
 ADDRESS_TEMPLATES = {
     "Izhevsk 81-870": {
@@ -67,9 +75,9 @@ def ensure_address_exists(base_url: str, token: str, external_id: str) -> dict:
         statusFlowType="fullFlow"
     )
 
-    address_id = address_client.create_or_update_address(base_url, token, payload)
+    address_client.create_or_update_address(base_url, token, payload)
 
-    # Получаем созданный адрес
+    # Созданный адрес уже добавлен в кэш адресов роли - повторной загрузки списка нет
     return address_client.find_by_external_id(base_url, token, external_id)
 
 
@@ -81,6 +89,82 @@ def get_status_text(status_code: int) -> str:
         return f"Статус {status_code}"
 
 
+async def create_cargo_and_orders(
+        token: str,
+        addresses: list,
+        external_ids: list,
+        client_id: int,
+        producer_id: int,
+        contract_id: int
+) -> tuple:
+    """Параллельно создать 20 грузомест, затем параллельно 5 рейсов по 4 грузоместа."""
+    async with create_async_session() as session:
+        cargo_client = AsyncCargoPlaceClient(BASE_URL, token, session)
+
+        cargo_external_ids = [unique_id("CP") for _ in range(20)]
+        cargo_responses = await asyncio.gather(*[
+            cargo_client.create_cargo_place(
+                departure_external_id=external_ids[i % len(external_ids)],
+                delivery_external_id=external_ids[(i + 1) % len(external_ids)],
+                title=f"Груз-{i + 1}",
+                external_id=cargo_external_ids[i],
+                weight_kg=50,
+                volume_m3=0.5
+            )
+            for i in range(20)
+        ])
+
+        cargo_list = [
+            {
+                "id": resp["id"],
+                "externalId": resp.get("externalId") or cargo_external_ids[i]
+            }
+            for i, resp in enumerate(cargo_responses)
+        ]
+
+        order_client = AsyncTransportRequestClient(BASE_URL, token, session)
+        order_responses = await asyncio.gather(*[
+            order_client.create_transport_request(
+                addresses=addresses,
+                cargo_place_specs=[
+                    {
+                        "cargoPlaceId": cp["id"],
+                        "externalId": cp["externalId"],
+                        "departurePointPosition": DEPARTURE_POINT,
+                        "arrivalPointPosition": DESTINATION_POINTS[idx]
+                    }
+                    for idx, cp in enumerate(cargo_list[i * 4: (i + 1) * 4])
+                ],
+                client_id=client_id,
+                producer_id=producer_id,
+                contract_id=contract_id,
+                order_identifier=unique_id(f"SCENARIO2-{i}")
+            )
+            for i in range(5)
+        ])
+
+    return cargo_list, [resp["id"] for resp in order_responses]
+
+
+def print_order_details(key, details: dict) -> None:
+    """Вывести статус рейса (callback наблюдателя при изменении статуса)."""
+    status_text = get_status_text(details.get("state"))
+    cargo_places = details.get("transportOrder", {}).get("cargoPlaces", [])
+    print(f"  Рейс {key[1]}: {status_text}, грузомест = {len(cargo_places)}")
+
+
+async def monitor_orders(token: str, order_ids: list, timeout: float = MONITORING_TIMEOUT) -> dict:
+    """Параллельно опрашивать детали рейсов до целевого статуса; завершается, как только обработаны все."""
+    async with create_async_session() as session:
+        order_client = AsyncTransportRequestClient(BASE_URL, token, session)
+        watcher = StatusWatcher(timeout=timeout, on_change=print_order_details)
+
+        for oid in order_ids:
+            watcher.watch_order(order_client, oid, TARGET_ORDER_STATES, CARGO_PLACES_PER_ORDER)
+
+        return await watcher.run()
+
+
 @pytest.mark.parametrize("role", ["lke"], indirect=True)
 def test_scenario_2_mass_orders(get_auth_token, role, client_id, producer_id, contract_id):
     """
@@ -88,7 +172,7 @@ def test_scenario_2_mass_orders(get_auth_token, role, client_id, producer_id, co
     1. Создание/получение 5 адресов
     2. Создание 20 грузомест
     3. Создание 5 рейсов по 4 грузоместа
-    4. Мониторинг статусов рейсов в течение 10 минут
+    4. Мониторинг статусов рейсов до обработки всех рейсов (не дольше 10 минут)
     """
     token = get_auth_token(role)["token"]
 
@@ -107,75 +191,29 @@ def test_scenario_2_mass_orders(get_auth_token, role, client_id, producer_id, co
         assert addr, f"Не удалось получить или создать адрес: {ext_id}"
         addresses.append(addr)
 
-    # 2. Создать 20 грузомест
-    cargo_client = CargoPlaceClient(BASE_URL, token)
-    cargo_list = []
-
-    for i in range(20):
-        dep = external_ids[i % len(external_ids)]
-        arr = external_ids[(i + 1) % len(external_ids)]
-        external_id_cp = f"CP-{45529 + i}"
-
-        resp = cargo_client.create_cargo_place(
-            departure_external_id=dep,
-            delivery_external_id=arr,
-            title=f"Груз-{i + 1}",
-            external_id=external_id_cp,
-            weight_kg=50,
-            volume_m3=0.5
-        )
-
-        cargo_list.append({
-            "id": resp["id"],
-            "externalId": resp.get("externalId") or external_id_cp
-        })
-
-    # 3. Создать 5 рейсов по 4 грузоместа
-    order_client = TransportRequestClient(BASE_URL, token)
-    order_ids = []
-
-    for i in range(5):
-        batch = cargo_list[i * 4: (i + 1) * 4]
-        cargo_specs = [
-            {
-                "cargoPlaceId": cp["id"],
-                "externalId": cp["externalId"],
-                "departurePointPosition": DEPARTURE_POINT,
-                "arrivalPointPosition": DESTINATION_POINTS[idx]
-            }
-            for idx, cp in enumerate(batch)
-        ]
-
-        order_id = order_client.create_transport_request(
-            addresses=addresses,
-            cargo_place_specs=cargo_specs,
-            client_id=client_id,
-            producer_id=producer_id,
-            contract_id=contract_id,
-            order_identifier=f"SCENARIO2-{i}-{int(time.time())}"
-        )["id"]
-
-        order_ids.append(order_id)
+    # 2-3. Создать 20 грузомест и 5 рейсов по 4 грузоместа (параллельно в одном event loop)
+    cargo_list, order_ids = asyncio.run(create_cargo_and_orders(
+        token, addresses, external_ids, client_id, producer_id, contract_id
+    ))
 
     print(f"\n✅ Все рейсы успешно созданы!")
     print(f"Создано рейсов: {len(order_ids)}")
     print(f"ID рейсов: {order_ids}")
 
-    # 4. Мониторинг деталей рейсов каждую минуту в течение 10 минут
+    # 4. Мониторинг деталей рейсов: параллельный адаптивный опрос с ранней остановкой
     print(f"\n🔍 Начинаем мониторинг статусов рейсов...")
 
-    for minute in range(1, 11):
-        time.sleep(60)
+    results = asyncio.run(monitor_orders(token, order_ids))
 
-        print(f"\n🔍 Минута {minute}/10:")
-
-        for oid in order_ids:
-            details = order_client.get_order_details(oid)
-            status_code = details.get("state")
-            status_text = get_status_text(status_code)
-            cargo_places = details.get("transportOrder", {}).get("cargoPlaces", [])
+    print(f"\n🔍 Итог мониторинга:")
+    for (_, oid), result in results.items():
+        mark = "✅" if result.success else "⚠️"
+        print(f"  {mark} Рейс {oid}: {result.elapsed:.1f} с, опросов = {result.polls}")
 
-            print(f"  Рейс {oid}: {status_text}, грузомест = {len(cargo_places)}")
+    unfinished = [oid for (_, oid), result in results.items() if not result.success]
+    if unfinished:
+        print(f"⚠️ Рейсы не дошли до статуса {sorted(TARGET_ORDER_STATES)} с {CARGO_PLACES_PER_ORDER} грузоместами "
+              f"за {MONITORING_TIMEOUT:.0f} с: {unfinished}")
 
     # Итоговый отчет
     print(f"\n" + "=" * 50)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Кривая "пропускная способность - размер пачки" для /shipment/tasks/create-list.
+
+Запуск из корня проекта:
+    python -m scripts.batch_benchmark --sizes 1,10,100,500,1000,5000 --repeats 3 --output batch.json --csv batch.csv --cleanup
+"""
+import argparse
+import json
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+from config.settings import BASE_URL  # noqa: E402
+from utils.api_helpers import login  # noqa: E402
+from utils.batch_benchmark import BatchBenchmark, DEFAULT_BATCH_SIZES  # noqa: E402
+from utils.bulk_executor import bulk_delete  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Бенчмарк размера пачки create-list")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_BATCH_SIZES)), help="размеры пачек через запятую")
+    parser.add_argument("--repeats", type=int, default=3, help="повторов на размер")
+    parser.add_argument("--warmup", type=int, default=1, help="разогревающих запросов")
+    parser.add_argument("--role", default="lkz", help="роль, от которой создаются Задания")
+    parser.add_argument("--max-latency-ms", type=float, default=None,
+                        help="не рекомендовать размеры, худший запрос которых дольше (например, таймаута клиента)")
+    parser.add_argument("--output", help="путь для JSON-отчёта")
+    parser.add_argument("--csv", help="путь для CSV-кривой")
+    parser.add_argument("--cleanup", action="store_true", help="удалить созданные Задания после прогона")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    token = login(args.role)["token"]
+
+    print(f"📦 Размеры пачек {sizes}, по {args.repeats} повтора: {BASE_URL}/shipment/tasks/create-list")
+    benchmark = BatchBenchmark(BASE_URL, token)
+    try:
+        curve = benchmark.run(sizes, repeats=args.repeats, warmup=args.warmup)
+    finally:
+        if args.cleanup and benchmark.created_ids:
+            bulk_delete(token, "shipment_task", benchmark.created_ids)
+
+    print(curve.summary_table())
+    if args.max_latency_ms is not None:
+        print(f"С ограничением {args.max_latency_ms:.0f} мс: {curve.recommended_batch_size(args.max_latency_ms)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(curve.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"📄 Отчёт: {args.output}")
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8") as f:
+            f.write(curve.to_csv())
+        print(f"📄 Кривая: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
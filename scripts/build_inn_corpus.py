@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Сборка локального корпуса ИНН (utils.inn_corpus) - источника ИНН для тестов без обращения к сторонним сайтам.
+
+Запуск из корня проекта:
+    python -m scripts.build_inn_corpus --from-file inns.txt                # ИНН из файла (по одному в строке)
+    python -m scripts.build_inn_corpus --scrape 50                         # пополнить с radar4site и star-pro
+    python -m scripts.build_inn_corpus --stats                             # состав корпуса по регионам
+
+В корпус попадают только реальные ИНН: сгенерированные проходят контрольные цифры, но стенд отклоняет их
+как несуществующие организации. ИНН ИП (12 цифр) - в отдельный корпус:
+    python -m scripts.build_inn_corpus --entity-type individual --from-file ip.txt --output .cache/inn-corpus-ip.npy
+"""
+import argparse
+import re
+from config.settings import INN_CORPUS_FILE
+from utils.inn_corpus import InnCorpus, build_corpus
+from utils.inn_fetcher import INNFetcher
+from utils.inn_generator import INN_LENGTH
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сборка локального корпуса ИНН")
+    parser.add_argument("--output", default=INN_CORPUS_FILE, help="файл корпуса (.npy)")
+    parser.add_argument("--entity-type", choices=sorted(INN_LENGTH), default="entity",
+                        help="тип ИНН корпуса: entity - юрлица (10 цифр), individual - ИП (12 цифр)")
+    parser.add_argument("--from-file", action="append", default=[],
+                        help="текстовый файл с ИНН (можно несколько); берутся только ИНН длины --entity-type")
+    parser.add_argument("--scrape", type=int, default=0, help="сколько ИНН юрлиц запросить с каждого сайта")
+    parser.add_argument("--replace", action="store_true", help="собрать корпус заново, а не дополнить")
+    parser.add_argument("--stats", action="store_true", help="вывести число ИНН по регионам")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    inns = []
+
+    for path in args.from_file:
+        with open(path, encoding="utf-8") as f:
+            found = re.findall(rf"\b\d{{{INN_LENGTH[args.entity_type]}}}\b", f.read())
+        inns.extend(found)
+        print(f"📄 {path}: {len(found)} ИНН")
+
+    if args.scrape:
+        inns.extend(INNFetcher.fetch_inns_from_radar4site(args.scrape))
+        inns.extend(INNFetcher.fetch_inns_from_star_pro(args.scrape))
+
+    if inns or args.replace:
+        counts = build_corpus(args.output, inns, entity_type=args.entity_type, merge=not args.replace)
+        print(f"📦 Корпус {args.output}: принято {counts['accepted']}, отброшено {counts['rejected']}, "
+              f"всего {counts['total']}")
+
+    corpus = InnCorpus(args.output, entity_type=args.entity_type)
+    if args.stats:
+        for region, count in sorted(corpus.regions().items()):
+            print(f"{region:02d}: {count}")
+    print(f"📊 В корпусе: {len(corpus)} ИНН, регионов: {len(corpus.regions())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон page-клиентов с заданной интенсивностью.
+
+Запуск из корня проекта:
+    python -m scripts.load_test --target shipment_tasks --rate 5 --ramp-up 30 --steady 120 --ramp-down 30
+    python -m scripts.load_test --target shipment_tasks --target cargo_places --rate 10 --output load.json
+    python -m scripts.load_test --mode open --target delivery_requests --rate 20 --steady 300
+"""
+import argparse
+import json
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+from utils.api_helpers import login  # noqa: E402
+from utils.bulk_executor import bulk_delete  # noqa: E402
+from utils.load_harness import LoadProfile, LoadRunner, OpenLoopRunner, DEFAULT_LOAD_WORKERS  # noqa: E402
+from utils.load_targets import (  # noqa: E402
+    LOAD_TARGETS, LOAD_TARGET_ROLES, build_load_target, build_async_load_target
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест api-ext")
+    parser.add_argument("--target", action="append", choices=sorted(LOAD_TARGETS),
+                        help="цель нагрузки (можно несколько; по умолчанию shipment_tasks)")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed",
+                        help="closed - пул потоков; open - отправка строго по расписанию, задержка от плановой отправки")
+    parser.add_argument("--rate", type=float, default=5.0, help="целевая интенсивность, запросов/с")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="длительность разгона, с")
+    parser.add_argument("--steady", type=float, default=60.0, help="длительность стабильной фазы, с")
+    parser.add_argument("--ramp-down", type=float, default=10.0, help="длительность спада, с")
+    parser.add_argument("--workers", type=int, default=DEFAULT_LOAD_WORKERS, help="число потоков (режим closed)")
+    parser.add_argument("--batch-size", type=int, default=10, help="размер пачки для create-list")
+    parser.add_argument("--seed", type=int, default=None, help="seed выбора цели при смешанной нагрузке")
+    parser.add_argument("--output", help="путь для JSON-отчёта")
+    parser.add_argument("--cleanup", action="store_true", help="удалить созданные Задания после прогона")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    names = args.target or ["shipment_tasks"]
+
+    tokens = {role: login(role)["token"] for role in {LOAD_TARGET_ROLES[name] for name in names}}
+    created_task_ids = []
+
+    profile = LoadProfile(args.rate, args.ramp_up, args.steady, args.ramp_down)
+    print(f"🚀 Нагрузка ({args.mode}): {', '.join(names)}; {args.rate} rps, "
+          f"{profile.duration:.0f} с (разгон {args.ramp_up}, стабильно {args.steady}, спад {args.ramp_down})")
+
+    if args.mode == "open":
+        def build_targets(session):
+            return [
+                build_async_load_target(name, session, tokens[LOAD_TARGET_ROLES[name]], args.batch_size, created_task_ids)
+                for name in names
+            ]
+
+        report = OpenLoopRunner(profile, build_targets, seed=args.seed).run()
+    else:
+        targets = [
+            build_load_target(name, tokens[LOAD_TARGET_ROLES[name]], args.batch_size, created_task_ids)
+            for name in names
+        ]
+        report = LoadRunner(profile, targets, max_workers=args.workers, seed=args.seed).run()
+    print(report.summary_table())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"📄 Отчёт: {args.output}")
+
+    if args.cleanup and created_task_ids:
+        bulk_delete(tokens[LOAD_TARGET_ROLES["shipment_tasks"]], "shipment_task", created_task_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Массовое создание дочерних контрагентов (заказчиков и подрядчиков) перед нагрузочным прогоном.
+
+Запуск из корня проекта:
+    python -m scripts.provision_contractors --customers 200 --contractors 200 --workers 8 --output contractors.json
+"""
+import argparse
+import json
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+from config.settings import BASE_URL, BULK_MAX_WORKERS, BULK_RATE_LIMIT  # noqa: E402
+from utils.api_helpers import login  # noqa: E402
+from utils.contractor_provisioning import ContractorProvisioner  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Массовое создание контрагентов")
+    parser.add_argument("--customers", type=int, default=0, help="сколько заказчиков (роль 1) создать")
+    parser.add_argument("--contractors", type=int, default=0, help="сколько подрядчиков (роль 2) создать")
+    parser.add_argument("--role", default="lke", help="роль, от которой создаются контрагенты")
+    parser.add_argument("--workers", type=int, default=BULK_MAX_WORKERS, help="параллельных запросов")
+    parser.add_argument("--rate", type=float, default=BULK_RATE_LIMIT, help="запросов в секунду")
+    parser.add_argument("--no-profiles", action="store_true", help="не запрашивать профили созданных")
+    parser.add_argument("--output", help="JSON со списком созданных контрагентов (id, ИНН, роль)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    specs = [{"role": 1}] * args.customers + [{"role": 2}] * args.contractors
+    provisioner = ContractorProvisioner.for_token(
+        BASE_URL, login(args.role)["token"],
+        max_workers=args.workers, rate=args.rate, fetch_profiles=not args.no_profiles
+    )
+
+    created = []
+
+    def on_result(result):
+        if result.success:
+            created.append({"id": result.id, "inn": result.inn, "role": result.spec["role"]})
+            if len(created) % 50 == 0:
+                print(f"   ... создано {len(created)} из {len(specs)}")
+        else:
+            print(f"❌ #{result.index}: {result.error}")
+
+    print(f"🏢 Создание {len(specs)} контрагентов: {BASE_URL}")
+    report = provisioner.run(specs, on_result)
+    print(report.summary())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(created, f, ensure_ascii=False, indent=2)
+        print(f"📄 Список: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Массовое создание водителей, ТС, прицепов и тягачей с записью id в манифест (utils.fleet_seeding).
+
+Запуск из корня проекта:
+    python -m scripts.seed_fleet --drivers 200 --vehicles 200 --trailers 50 --tractors 50 --workers 8 --rate 20
+    python -m scripts.seed_fleet --drivers 200 --vehicles 200 --ensure    # досоздать до 200, учитывая манифест
+    python -m scripts.seed_fleet --stats
+"""
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+from config.settings import BASE_URL, BULK_MAX_WORKERS, BULK_RATE_LIMIT, FLEET_MANIFEST_FILE  # noqa: E402
+from utils.api_helpers import login  # noqa: E402
+from utils.fleet_seeding import FleetManifest, FleetSeeder  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Массовое создание транспорта")
+    parser.add_argument("--drivers", type=int, default=0, help="сколько водителей создать")
+    parser.add_argument("--vehicles", type=int, default=0, help="сколько ТС создать")
+    parser.add_argument("--trailers", type=int, default=0, help="сколько прицепов создать")
+    parser.add_argument("--tractors", type=int, default=0, help="сколько тягачей создать")
+    parser.add_argument("--role", default="lkp", help="роль-владелец транспорта")
+    parser.add_argument("--workers", type=int, default=BULK_MAX_WORKERS, help="параллельных запросов")
+    parser.add_argument("--rate", type=float, default=BULK_RATE_LIMIT, help="запросов в секунду")
+    parser.add_argument("--manifest", default=FLEET_MANIFEST_FILE, help="файл манифеста")
+    parser.add_argument("--ensure", action="store_true", help="количества - целевые: досоздать недостающее")
+    parser.add_argument("--reset", action="store_true", help="очистить манифест стенда и роли перед созданием")
+    parser.add_argument("--stats", action="store_true", help="только вывести содержимое манифеста")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    manifest = FleetManifest(args.manifest, BASE_URL, args.role)
+    if args.reset:
+        manifest.reset()
+        print(f"🧹 Манифест {BASE_URL} ({args.role}) очищен")
+
+    counts = {"driver": args.drivers, "vehicle": args.vehicles, "trailer": args.trailers, "tractor": args.tractors}
+    if not args.stats and any(counts.values()):
+        seeder = FleetSeeder(BASE_URL, login(args.role)["token"], args.role, manifest,
+                             max_workers=args.workers, rate=args.rate)
+        print(f"🚚 Создание транспорта {counts}: {BASE_URL}")
+        reports = seeder.ensure(counts) if args.ensure else seeder.seed(counts)
+        for report in reports.values():
+            print(report.summary())
+
+    print(f"📄 Манифест {args.manifest} ({args.role}): {manifest.counts()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+История длительностей тестов для порядка запуска и шардов CI.
+
+Запуск из корня проекта:
+    python -m scripts.test_durations --allure-results allure-results   # перенести длительности из Allure в историю
+    python -m scripts.test_durations --top 20                          # самые долгие тесты по истории
+"""
+import argparse
+from config.settings import TEST_DURATIONS_FILE
+from utils.test_durations import DurationHistory, durations_from_allure
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="История длительностей тестов")
+    parser.add_argument("--durations-file", default=TEST_DURATIONS_FILE, help="JSON с историей длительностей")
+    parser.add_argument("--allure-results", help="каталог allure-results, длительности из которого добавить в историю")
+    parser.add_argument("--top", type=int, default=10, help="сколько самых долгих тестов показать")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    history = DurationHistory(args.durations_file)
+
+    if args.allure_results:
+        imported = durations_from_allure(args.allure_results)
+        history.update(imported)
+        history.save()
+        print(f"📥 Из {args.allure_results} добавлено тестов: {len(imported)} -> {args.durations_file}")
+
+    print(f"⏱ Самые долгие тесты ({len(history.durations)} в истории):")
+    for key, duration in history.slowest(args.top):
+        print(f"{duration:>10.1f} с  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,136 @@
 #!/usr/bin/env python3
 import os
 import json
-import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
+# Кэш разобранных файлов: повторный запуск на растущем каталоге читает только новые и изменённые
+DEFAULT_CACHE = os.path.join(".cache", "allure-stats.json")
+CACHE_VERSION = 2
 
-def count_tests(results_dir):
-    passed = failed = skipped = broken = 0
+# Меньше этого числа новых файлов разбираем в текущем процессе - пул процессов не окупается
+PARALLEL_THRESHOLD = 200
+
+STATUSES = ("passed", "failed", "skipped", "broken")
+
+
+def find_result_files(results_dir):
+    """Пути *-result.json (рекурсивно) с mtime_ns и размером - по ним определяется, изменился ли файл."""
+    found = {}
+    stack = [results_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith("-result.json"):
+                    stat = entry.stat()
+                    found[entry.path] = [stat.st_mtime_ns, stat.st_size]
+    return found
+
+
+def parse_result(path):
+    """Статус, длительность (с), имя и feature теста из файла результата Allure; None - файл не читается."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    labels = {label.get("name"): label.get("value") for label in data.get("labels", [])}
+    start, stop = data.get("start"), data.get("stop")
+    return {
+        "status": data.get("status", ""),
+        "duration": (stop - start) / 1000 if start and stop else 0.0,
+        "name": data.get("fullName") or data.get("name", ""),
+        "feature": labels.get("feature") or "",
+    }
+
+
+def _parse_chunk(paths):
+    return [parse_result(path) for path in paths]
 
-    pattern = os.path.join(results_dir, "**", "*.json")
-    for json_file in glob.glob(pattern, recursive=True):
+
+def load_cache(cache_path):
+    """Кэш всех каталогов результатов: {"version", "dirs": {абсолютный путь: {"files", "last_summary"}}}."""
+    if cache_path:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                status = data.get('status', '')
-                if status == 'passed':
-                    passed += 1
-                elif status == 'failed':
-                    failed += 1
-                elif status == 'skipped':
-                    skipped += 1
-                elif status == 'broken':
-                    broken += 1
-        except Exception as e:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") == CACHE_VERSION:
+                return cache
+        except (FileNotFoundError, ValueError):
+            pass
+    return {"version": CACHE_VERSION, "dirs": {}}
+
+
+def dir_cache(cache, results_dir):
+    return cache["dirs"].setdefault(os.path.abspath(results_dir), {"files": {}, "last_summary": None})
+
+
+def save_cache(cache_path, cache):
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        # dumps, а не dump: потоковый dump идёт через медленный Python-кодировщик
+        f.write(json.dumps(cache, ensure_ascii=False))
+    os.replace(tmp, cache_path)
+
+
+def collect_results(results_dir, cache, workers=None):
+    """
+    Записи всех результатов каталога и число заново разобранных файлов. Файлы с теми же mtime
+    и размером берутся из кэша, новые разбираются параллельно пулом процессов.
+    Кэш обновляется на месте, удалённые файлы из него уходят.
+    """
+    found = find_result_files(results_dir)
+    cached = dir_cache(cache, results_dir)["files"]
+    stale = [path for path, stamp in found.items() if cached.get(path, {}).get("stamp") != stamp]
+
+    workers = workers or os.cpu_count() or 1
+    if len(stale) >= PARALLEL_THRESHOLD and workers > 1:
+        chunk = max(1, len(stale) // (workers * 4))
+        chunks = [stale[i:i + chunk] for i in range(0, len(stale), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = [record for records in pool.map(_parse_chunk, chunks) for record in records]
+    else:
+        parsed = _parse_chunk(stale)
+
+    for path, record in zip(stale, parsed):
+        cached[path] = {"stamp": found[path], "record": record}
+    for path in set(cached) - set(found):
+        del cached[path]
+
+    return [cached[path]["record"] for path in found if cached[path]["record"] is not None], len(stale)
+
+
+def summarize(records, top=5):
+    """Счётчики по статусам, суммарная длительность, самые долгие тесты и итоги по feature."""
+    summary = {status: 0 for status in STATUSES}
+    features = {}
+    for record in records:
+        status = record["status"]
+        if status not in summary:
             continue
+        summary[status] += 1
+        feature = features.setdefault(record["feature"] or "Без feature", {"total": 0, "failed": 0, "duration": 0.0})
+        feature["total"] += 1
+        feature["failed"] += status in ("failed", "broken")
+        feature["duration"] += record["duration"]
+
+    counted = [record for record in records if record["status"] in summary]
+    summary["total"] = len(counted)
+    summary["duration"] = round(sum(record["duration"] for record in counted), 1)
+    summary["slowest"] = [
+        [record["name"], round(record["duration"], 1)]
+        for record in sorted(counted, key=lambda record: -record["duration"])[:top]
+    ]
+    summary["features"] = dict(sorted(features.items(), key=lambda item: -item[1]["duration"]))
+    return summary
 
-    return passed, failed, skipped, broken
+
+def count_tests(results_dir):
+    summary = summarize(collect_results(results_dir, load_cache(None))[0])
+    return summary["passed"], summary["failed"], summary["skipped"], summary["broken"]
 
 
 def create_bar(percent):
@@ -34,27 +140,13 @@ def create_bar(percent):
     return bar
 
 
-def main():
-    # Указываем путь к allure results (стандартный для Python)
-    results_dir = "allure-results"
+def _delta(value, previous):
+    return f"{value - previous:+g}" if previous is not None else "0"
 
-    # Если нет результатов, создаем пустые значения
-    if not os.path.exists(results_dir):
-        print("PASSED=0")
-        print("FAILED=0")
-        print("SKIPPED=0")
-        print("BROKEN=0")
-        print("TOTAL=0")
-        print("PASSED_PERCENT=0")
-        print("FAILED_PERCENT=0")
-        print("SKIPPED_PERCENT=0")
-        print("PASSED_BAR=[----------] 0%")
-        print("FAILED_BAR=[----------] 0%")
-        print("SKIPPED_BAR=[----------] 0%")
-        return
 
-    passed, failed, skipped, broken = count_tests(results_dir)
-    total = passed + failed + skipped + broken
+def print_summary(summary, previous=None):
+    passed, failed, skipped, broken = (summary[status] for status in STATUSES)
+    total = summary["total"]
 
     # Расчет процентов
     if total > 0:
@@ -77,6 +169,58 @@ def main():
     print(f"FAILED_BAR={create_bar(failed_percent)}")
     print(f"SKIPPED_BAR={create_bar(skipped_percent)}")
 
+    # Длительности и изменения относительно предыдущего запуска скрипта
+    print(f"DURATION_TOTAL={summary['duration']}")
+    for key in ("passed", "failed", "skipped", "broken", "total"):
+        print(f"{key.upper()}_DELTA={_delta(summary[key], previous and previous.get(key))}")
+    print(f"DURATION_DELTA={_delta(summary['duration'], previous and previous.get('duration'))}")
+    for i, (name, duration) in enumerate(summary["slowest"], 1):
+        print(f"SLOWEST_{i}={name} ({duration}s)")
+    for i, (feature, totals) in enumerate(summary["features"].items(), 1):
+        print(f"FEATURE_{i}={feature}: {totals['total']} тестов, {totals['failed']} упало, "
+              f"{totals['duration']:.1f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Статистика allure-results для Jenkins (KEY=VALUE)")
+    parser.add_argument("results_dir", nargs="?", default="allure-results", help="каталог allure-results")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="файл кэша разобранных результатов")
+    parser.add_argument("--no-cache", action="store_true", help="разобрать все файлы заново, кэш не писать")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов разбора (по умолчанию - все ядра)")
+    parser.add_argument("--top", type=int, default=5, help="сколько самых долгих тестов вывести")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Указываем путь к allure results (стандартный для Python)
+    results_dir = args.results_dir
+
+    # Если нет результатов, создаем пустые значения
+    if not os.path.exists(results_dir):
+        print("PASSED=0")
+        print("FAILED=0")
+        print("SKIPPED=0")
+        print("BROKEN=0")
+        print("TOTAL=0")
+        print("PASSED_PERCENT=0")
+        print("FAILED_PERCENT=0")
+        print("SKIPPED_PERCENT=0")
+        print("PASSED_BAR=[----------] 0%")
+        print("FAILED_BAR=[----------] 0%")
+        print("SKIPPED_BAR=[----------] 0%")
+        return
+
+    cache = load_cache(None if args.no_cache else args.cache)
+    records, _ = collect_results(results_dir, cache, args.workers)
+    summary = summarize(records, args.top)
+    state = dir_cache(cache, results_dir)
+    print_summary(summary, state["last_summary"])
+
+    if not args.no_cache:
+        state["last_summary"] = {key: summary[key] for key in (*STATUSES, "total", "duration")}
+        save_cache(args.cache, cache)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
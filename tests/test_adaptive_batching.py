@@ -0,0 +1,89 @@
+import time
+import allure
+import requests
+from utils.adaptive_batching import AimdTuner
+from utils.cargo_ingestion import CargoPlaceIngestor
+
+
+@allure.feature("Массовые операции")
+@allure.story("Адаптивный размер пачки")
+@allure.description("AIMD: рост в пределах бюджетов, двукратный спад при превышении p99, ошибках и перегрузке")
+def test_aimd_grows_and_backs_off():
+    tuner = AimdTuner(initial_chunk=100, max_chunk=1000, chunk_step=50, initial_concurrency=2,
+                      max_concurrency=4, p99_budget_ms=1000, error_budget=0.1, window=4)
+
+    for _ in range(4):
+        tuner.observe(tuner.epoch, 200)
+    assert (tuner.chunk_size, tuner.concurrency) == (150, 3)
+
+    # Ответ на запрос старого режима не учитывается
+    tuner.observe(0, 5000, overload=True)
+    assert (tuner.chunk_size, tuner.concurrency) == (150, 3)
+
+    for latency in (300, 300, 300, 1500):
+        tuner.observe(tuner.epoch, latency)
+    assert (tuner.chunk_size, tuner.concurrency) == (75, 1)
+
+    tuner.observe(tuner.epoch, 10000, error=True, overload=True)
+    assert (tuner.chunk_size, tuner.concurrency) == (37, 1)
+
+    for error in (True, False, False, False):
+        tuner.observe(tuner.epoch, 100, error=error)
+    assert tuner.chunk_size == 18
+    assert "спад: ошибки 25% > 10%" in tuner.summary()
+
+
+@allure.feature("Массовые операции")
+@allure.story("Адаптивный размер пачки")
+@allure.description("Загрузчик с тюнером сходится к пачке под бюджетом p99, большие пачки отваливаются по таймауту")
+def test_ingestor_converges_under_latency_budget():
+    sizes = []
+
+    def send(items):
+        sizes.append(len(items))
+        if len(items) > 400:
+            raise requests.Timeout("read timeout")
+        time.sleep(len(items) * 0.0001)
+        return {"data": [{"id": i, "status": "ok", "errors": []} for i in range(len(items))]}
+
+    tuner = AimdTuner(initial_chunk=50, max_chunk=1000, chunk_step=50, max_concurrency=4,
+                      p99_budget_ms=30, error_budget=0.05, window=4)
+    # Отправка идемпотентна (как create-or-update-list) - пачки, отвалившиеся по таймауту, повторяются
+    report = CargoPlaceIngestor(send, tuner=tuner, retries=3, idempotent=True, retry_delay=0.001).run(
+        {"n": i} for i in range(30000)
+    )
+
+    assert report.succeeded == report.total == 30000
+    assert max(sizes) > 200
+    assert 25 <= tuner.chunk_size <= 400
+    assert any("спад" in d.reason for d in tuner.decisions)
+    assert "Итог: пачка" in report.summary()
+
+
+@allure.feature("Массовые операции")
+@allure.story("Адаптивный размер пачки")
+@allure.description("Адаптивный режим для create-list Заданий и replace-planned-pairs на заглушке api-ext")
+def test_adaptive_bulk_clients_against_local_api(local_api):
+    base_url, token_for = local_api
+    tasks = CargoPlaceIngestor.adaptive(
+        CargoPlaceIngestor.for_shipment_tasks, base_url, token_for("lkz"),
+        initial_chunk=10, max_chunk=200, window=2
+    ).run({"title": f"Задание {i}", "arrivalPoint": {"id": 17978}} for i in range(500))
+    assert tasks.succeeded == 500
+
+    token = token_for("lke")
+    places = []
+    CargoPlaceIngestor.for_create_list(base_url, token, chunk_size=50).run(
+        ({"externalId": f"PAIR-{i}", "isPlanned": i % 2 == 0, "departureAddress": 17978, "deliveryAddress": 18535}
+         for i in range(40)),
+        on_result=lambda r: places.append(r.id)
+    )
+    pairs = [{"plannedId": places[i], "cargoPlaceId": places[i + 1]} for i in range(0, 40, 2)]
+    pairs.append({"plannedId": 10 ** 9, "cargoPlaceId": places[1]})
+
+    report = CargoPlaceIngestor.adaptive(
+        CargoPlaceIngestor.for_replace_planned_pairs, base_url, token, initial_chunk=7, window=2
+    ).run(pairs)
+
+    assert (report.total, report.succeeded) == (21, 20)
+    assert report.failed[0].index == 20 and report.failed[0].errors == ["Грузоместо не найдено"]
@@ -0,0 +1,50 @@
+import allure
+from utils import http_session
+from utils.address_repository import AddressRepository
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    """Считает обращения к /contractor-point/list-info."""
+
+    def __init__(self, points):
+        self.points = points
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        return _FakeResponse({"points": [dict(p) for p in self.points]})
+
+
+@allure.feature("Адреса")
+@allure.story("Кэш адресов")
+@allure.description("Список адресов загружается один раз, поиск идёт по индексу, upsert обновляет индекс на месте")
+def test_repository_loads_once_and_upserts(monkeypatch):
+    session = _FakeSession([
+        {"id": 1, "externalId": "unknown"},
+        {"id": 2, "externalId": "Izhevsk 81-870", "title": "A"},
+        {"id": 3, "externalId": "Izhevsk - Pastuhova - 37", "title": "B"},
+    ])
+    monkeypatch.setattr(http_session, "_shared_session", session)
+    repository = AddressRepository("https://example.test/v1/api-ext", "token")
+
+    assert repository.find_by_external_id("Izhevsk 81-870")["id"] == 2
+    assert repository.get(3)["title"] == "B"
+    assert [p["id"] for p in repository.valid_points()] == [2, 3]
+
+    repository.upsert({"id": 4, "externalId": "Izhevsk-SCENARIO-1", "title": "C"})
+    repository.upsert({"id": 2, "externalId": "Izhevsk 81-870", "title": "A2"})
+
+    assert repository.find_by_external_id("Izhevsk-SCENARIO-1")["id"] == 4
+    assert repository.get(2)["title"] == "A2"
+    assert session.calls == 1
@@ -0,0 +1,41 @@
+import allure
+import requests
+from local_api.app import LocalApiServer
+from local_api.faults import FaultProfile
+from utils.batch_benchmark import BatchBenchmark, BatchCurve, BatchPoint, BatchSample
+
+
+@allure.feature("Нагрузка")
+@allure.story("Размер пачки")
+@allure.description("Бенчмарк create-list на заглушке: фазы запроса, созданные id и ошибки по размерам пачек")
+def test_benchmark_against_local_api():
+    faults = FaultProfile.from_dict({"endpoints": {
+        "POST /shipment/tasks/create-list": {"latency": {"kind": "fixed", "median_ms": 20}},
+    }})
+    with LocalApiServer(faults=faults) as server:
+        benchmark = BatchBenchmark(server.base_url, server.token_for("lkz"), session=requests.Session())
+        curve = benchmark.run([1, 10, 100], repeats=2)
+
+    rows = curve.to_dict()["points"]
+    assert [row["batch_size"] for row in rows] == [1, 10, 100]
+    assert all(row["errors"] == 0 and row["server_ms"] >= 20 for row in rows)
+    assert rows[2]["items_per_s"] > rows[0]["items_per_s"]
+    assert len(benchmark.created_ids) == 2 * (1 + 10 + 100) + 1
+    assert "Рекомендуемый размер пачки" in curve.summary_table()
+    assert curve.to_csv().splitlines()[0].startswith("batch_size,repeats,errors")
+
+
+@allure.feature("Нагрузка")
+@allure.story("Размер пачки")
+@allure.description("Рекомендуется наименьший размер у колена кривой, без ошибок и в пределах допустимой задержки")
+def test_recommended_batch_size_is_the_knee():
+    def point(size, total_ms, failed=0):
+        return BatchPoint(size, [BatchSample(size, 0.0, total_ms, 0.0, 0.0, 0, 200, failed_items=failed)])
+
+    # шт/с: 1 -> 20, 10 -> 200, 100 -> 950, 500 -> 1000, 1000 -> 1010 (с ошибками)
+    curve = BatchCurve("POST /shipment/tasks/create-list", [
+        point(1, 50), point(10, 50), point(100, 105.3), point(500, 500), point(1000, 990, failed=3),
+    ])
+
+    assert curve.recommended_batch_size() == 100
+    assert curve.recommended_batch_size(max_latency_ms=60) == 10
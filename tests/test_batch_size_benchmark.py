@@ -0,0 +1,33 @@
+import allure
+import pytest
+from config.settings import BASE_URL
+from utils.batch_benchmark import BatchBenchmark
+from utils.bulk_executor import bulk_delete
+
+
+@pytest.mark.load
+@allure.feature("Нагрузка")
+@allure.story("Размер пачки")
+@allure.description("Кривая пропускной способности /shipment/tasks/create-list от размера пачки: "
+                    "сериализация, сервер, разбор ответа и стоимость одного задания")
+@pytest.mark.parametrize("role", ["lkz"])
+def test_shipment_create_list_batch_sizes(role, get_auth_token, request):
+    token = get_auth_token(role)["token"]
+    sizes = [int(size) for size in request.config.getoption("--batch-sizes").split(",")]
+    repeats = request.config.getoption("--batch-repeats")
+    benchmark = BatchBenchmark(BASE_URL, token)
+
+    try:
+        with allure.step(f"Размеры пачек {sizes}, по {repeats} повтора"):
+            curve = benchmark.run(sizes, repeats=repeats)
+            curve.attach_to_allure("create-list")
+            print(f"\n{curve.summary_table()}")
+    finally:
+        if benchmark.created_ids:
+            with allure.step("Удаление созданных Заданий"):
+                bulk_delete(token, "shipment_task", benchmark.created_ids)
+
+    points = curve.to_dict()["points"]
+    assert all(point["errors"] < point["repeats"] for point in points), \
+        f"Есть размеры пачек, на которых не прошёл ни один запрос: {points}"
+    assert curve.recommended_batch_size() is not None, "Не удалось выбрать размер пачки"
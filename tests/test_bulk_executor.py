@@ -0,0 +1,47 @@
+import time
+import allure
+from utils.bulk_executor import BulkExecutor, TokenBucket, TransientError
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = "Service Unavailable"
+
+
+@allure.feature("Утилиты")
+@allure.story("Массовые операции")
+@allure.description("BulkExecutor повторяет временные ошибки и собирает сводный отчёт в порядке входных элементов")
+def test_bulk_executor_retries_transient_errors():
+    calls = {}
+
+    def action(item):
+        calls[item] = calls.get(item, 0) + 1
+        if item == "flaky" and calls[item] < 3:
+            raise TransientError(_Response(503))
+        if item == "broken":
+            raise RuntimeError("HTTP 404")
+        return item
+
+    report = BulkExecutor(action, max_workers=4, rate=1000, retries=3, retry_delay=0.01).run(
+        ["a", "flaky", "broken", "b"], title="Тест"
+    )
+
+    assert [o.item for o in report.outcomes] == ["a", "flaky", "broken", "b"]
+    assert [o.item for o in report.failed] == ["broken"]
+    assert report.outcomes[1].attempts == 3
+    assert calls["broken"] == 1
+    assert "broken" in report.summary()
+
+
+@allure.feature("Утилиты")
+@allure.story("Массовые операции")
+@allure.description("TokenBucket ограничивает частоту после исчерпания начального запаса")
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    started = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+
+    assert time.monotonic() - started >= 10 / 50 * 0.9
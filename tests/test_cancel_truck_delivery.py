@@ -2,13 +2,13 @@
 import allure
 
 import uuid
-import time
 from datetime import datetime, timedelta
 from pages.cargo_delivery_page import CargoDeliveryClient
 from pages.cargo_deliveries_create_page import CargoDeliveriesCreateClient
 from pages.truck_deliveries_transport_appoint_page import TruckDeliveriesTransportAppointClient
 from pages.cargo_deliveries_cancel_page import CargoDeliveriesCancelClient
 from config.settings import BASE_URL, PRODUCER_ID
+from utils.polling import poll
 
 
 @allure.story("Отмена рейса после назначения водителя")
@@ -82,27 +82,27 @@ def test_cancel_truck_delivery_after_driver_appointment(
         request_id = response["id"]
         request_nr = response["requestNr"]
 
-    time.sleep(1)
+    # Перед каждым шагом ждём его предусловие в деталях заявки, а сам шаг выполняем один раз:
+    # повтор создания рейса или назначения после таймаута может задвоить изменение на стенде
 
     # ==================== 2. ПРИНЯТИЕ ЗАЯВКИ ====================
     with allure.step("2. LKP принимает заявку"):
         lkp_client = CargoDeliveryClient(BASE_URL, lkp_token)
+        lkp_client.wait_for_request_status(request_id, "waiting_producer_confirmation")
         lkp_client.take_delivery_request(request_id)
 
-    time.sleep(1)
-
     # ==================== 3. СОЗДАНИЕ РЕЙСА ====================
     with allure.step("3. LKP создает рейс"):
+        lkp_client.wait_for_request_status(request_id, ["confirmed", "in_progress"])
         lkp_cargo_create = CargoDeliveriesCreateClient(BASE_URL, lkp_token)
         delivery_id_uuid = lkp_cargo_create.create_cargo_delivery(
             request_id=request_id,
             producer_id=PRODUCER_ID
         )
 
-    time.sleep(1)
-
     # ==================== 4. НАЗНАЧЕНИЕ ВОДИТЕЛЯ ====================
     with allure.step("4. LKP назначает водителя"):
+        lkp_client.wait_for_delivery_in_request(request_id, delivery_id_uuid)
         lkp_transport_appoint = TruckDeliveriesTransportAppointClient(BASE_URL, lkp_token)
         lkp_transport_appoint.appoint_transport(
             truck_delivery_id=delivery_id_uuid,
@@ -110,19 +110,29 @@ def test_cancel_truck_delivery_after_driver_appointment(
             vehicle_id=INITIAL_VEHICLE_ID
         )
 
-    time.sleep(1)
-
     # ==================== 5. ОТМЕНА РЕЙСА ====================
     with allure.step("5. LKP отменяет рейс"):
+        # Ждём, пока назначенный водитель появится в заявке; сам тест проверяет только отмену
+        lkp_client.verify_driver_change_in_request(request_id)
         lkp_cargo_cancel = CargoDeliveriesCancelClient(BASE_URL, lkp_token)
         lkp_cargo_cancel.cancel_cargo_delivery(delivery_id_uuid)
 
-    time.sleep(2)
-
     # ==================== 6. ПРОВЕРКА СТАТУСА В ЗАЯВКЕ ====================
     with allure.step("6. Проверка статуса canceled в деталях заявки"):
-        # Получаем детали заявки через LKP
-        details = lkp_client.get_delivery_request_details(request_id)
+        # Опрашиваем детали заявки через LKP, пока рейс не перейдёт в canceled
+        result = poll(
+            lambda: lkp_client.get_delivery_request_details(request_id),
+            lambda d: any(
+                e.get("id") == delivery_id_uuid and e.get("status") == "canceled"
+                for e in d.get("outgoingEntities") or []
+            )
+        )
+        allure.attach(
+            f"Ожидание: {result.elapsed:.2f} с, попыток: {result.attempts}",
+            name="Ожидание статуса canceled",
+            attachment_type=allure.attachment_type.TEXT
+        )
+        details = result.last_value()
 
         # Проверяем наличие outgoingEntities
         assert "outgoingEntities" in details
@@ -3,6 +3,7 @@ import pytest
 import json
 from pages.cargo_create_list_page import CargoPlaceListClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
 
 # Внешние ID и внутренние ID адресов — подставьте реальные значения из вашей системы
 VALID_EXTERNAL_IDS = [
@@ -29,9 +30,9 @@ def test_create_cargo_places_list(role, get_auth_token):
         cargo = client.generate_cargo_place(
             departure_external_id=dep_ext,
             delivery_external_id=del_ext,
-            external_id=f"EXT-GM-{role}-{i + 1:03d}",
-            bar_code=f"BC-{role}-{i + 1:03d}",
-            invoice_number=f"INV-{role}-{i + 1:03d}",
+            external_id=unique_id(f"EXT-GM-{role}"),
+            bar_code=unique_id(f"BC-{role}"),
+            invoice_number=unique_id(f"INV-{role}"),
             is_planned=False
         )
         cargo_list.append(cargo)
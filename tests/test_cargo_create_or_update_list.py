@@ -3,6 +3,7 @@ import pytest
 import json
 from pages.cargo_create_or_update_list_page import CargoPlaceCreateOrUpdateListClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
 
 
 VALID_EXTERNAL_IDS = [
@@ -25,9 +26,9 @@ def test_create_or_update_cargo_places_list(role, get_auth_token):
         cargo = client.generate_cargo_place(
             departure_external_id=dep_ext,
             delivery_external_id=del_ext,
-            external_id=f"EXT-GM-UPD-{role}-{i + 1:03d}",
-            bar_code=f"BC-UPD-{role}-{i + 1:03d}",
-            invoice_number=f"INV-UPD-{role}-{i + 1:03d}",
+            external_id=unique_id(f"EXT-GM-UPD-{role}"),
+            bar_code=unique_id(f"BC-UPD-{role}"),
+            invoice_number=unique_id(f"INV-UPD-{role}"),
             is_planned=False
         )
         cargo_list.append(cargo)
@@ -0,0 +1,82 @@
+import time
+import allure
+import requests
+from utils.cargo_ingestion import CargoPlaceIngestor
+
+
+class _FakeCreateList:
+    """Имитация /cargo-place/create-list: элемент "flaky" проходит со второй попытки, "bad" - никогда."""
+
+    def __init__(self):
+        self.chunk_sizes = []
+        self.seen = {}
+
+    def __call__(self, cargo_places):
+        self.chunk_sizes.append(len(cargo_places))
+        data = []
+        for cp in cargo_places:
+            ext = cp["externalId"]
+            self.seen[ext] = self.seen.get(ext, 0) + 1
+            failed = ext == "bad" or (ext == "flaky" and self.seen[ext] == 1)
+            data.append({
+                "id": None if failed else f"id-{ext}",
+                "status": "error" if failed else "ok",
+                "errors": ["ошибка"] if failed else []
+            })
+        return {"status": "ok", "data": data}
+
+
+@allure.feature("Грузоместа")
+@allure.story("Потоковая загрузка")
+@allure.description("Ингестор режет поток на пачки, сопоставляет результаты со входом и повторяет только неуспешные")
+def test_ingestor_chunks_and_retries_failed_items():
+    send = _FakeCreateList()
+    specs = ({"externalId": ext} for ext in ["flaky", "bad"] + [f"CP-{i}" for i in range(23)])
+
+    ids = {}
+    report = CargoPlaceIngestor(send, chunk_size=10, concurrency=3, retries=2).run(
+        specs, on_result=lambda r: ids.__setitem__(r.index, r.id)
+    )
+
+    assert report.total == 25
+    assert report.succeeded == 24
+    assert [r.spec["externalId"] for r in report.failed] == ["bad"]
+    assert report.failed[0].attempts == 3
+    assert ids[0] == "id-flaky" and ids[24] == "id-CP-22"
+    assert send.seen["CP-0"] == 1
+    assert max(send.chunk_sizes) <= 10
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"HTTP {status_code}", response=response)
+
+
+@allure.feature("Грузоместа")
+@allure.story("Потоковая загрузка")
+@allure.description("Пачка с неизвестным исходом (таймаут чтения) не отправляется повторно в create-list; "
+                    "отклонённая с 429 - повторяется после задержки")
+def test_ingestor_resends_whole_chunk_only_when_safe():
+    sent = []
+
+    def send(cargo_places):
+        sent.append([cp["externalId"] for cp in cargo_places])
+        first = cargo_places[0]["externalId"]
+        if first == "timeout":
+            raise requests.ReadTimeout("read timeout")
+        if first == "busy" and len(sent) < 3:
+            raise _http_error(429)
+        return {"data": [{"id": cp["externalId"], "status": "ok", "errors": []} for cp in cargo_places]}
+
+    started = time.monotonic()
+    report = CargoPlaceIngestor(send, chunk_size=2, concurrency=1, retries=2, retry_delay=0.05).run(
+        {"externalId": ext} for ext in ["timeout", "t2", "busy", "b2"]
+    )
+
+    assert sent.count(["timeout", "t2"]) == 1
+    assert sent.count(["busy", "b2"]) == 2
+    assert report.succeeded == 2
+    assert sorted(r.spec["externalId"] for r in report.failed) == ["t2", "timeout"]
+    assert "Исход неизвестен" in report.failed[0].errors[1]
+    assert time.monotonic() - started >= 0.04
@@ -6,6 +6,7 @@ import requests
 from pages.cargo_create_list_page import CargoPlaceListClient
 from config.settings import BASE_URL
 from utils.api_helpers import get_two_valid_addresses
+from utils.unique_ids import unique_id
 
 
 @allure.story("API test")
@@ -47,9 +48,9 @@ def test_get_cargo_place_group_info(
         cargo = client.generate_cargo_place(
             departure_external_id=dep_addr["externalId"],
             delivery_external_id=del_addr["externalId"],
-            external_id=f"EXT-GM-{role}-{i + 1:03d}",
-            bar_code=f"BC-{role}-{i + 1:03d}",
-            invoice_number=f"INV-{role}-{i + 1:03d}",
+            external_id=unique_id(f"EXT-GM-{role}"),
+            bar_code=unique_id(f"BC-{role}"),
+            invoice_number=unique_id(f"INV-{role}"),
             is_planned=False,
             producer_id=producer_id,
             contract_id=contract_id,
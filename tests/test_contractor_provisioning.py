@@ -0,0 +1,39 @@
+import allure
+import requests
+from local_api.app import LocalApiServer
+from pages.create_contractor_page import CreateContractorPage
+from utils.contractor_provisioning import ContractorProvisioner
+from utils.inn_generator import format_inns, generate_inns
+from utils.inn_registry import InnRegistry
+
+
+@allure.feature("Контрагенты")
+@allure.story("Массовое создание")
+@allure.description("Конвейер создаёт контрагентов параллельно, перевыпускает отклонённый ИНН и получает профили")
+def test_provisioning_pipeline_reissues_rejected_inn(tmp_path):
+    with LocalApiServer() as server:
+        token = server.token_for("lke")
+        registry = InnRegistry(tmp_path / "entity-registry")
+        page = CreateContractorPage(server.base_url, token, inn_registry=registry)
+
+        taken, *fresh = format_inns(generate_inns(100, seed=9))
+        assert requests.post(page.child_create_url, headers=page.headers,
+                             json={"inn": taken, "role": 1, "name": "Занят"}).status_code == 200
+        issued = iter([taken, *fresh])
+
+        provisioner = ContractorProvisioner(page, max_workers=4, rate=1000,
+                                            inn_source=lambda count: [next(issued) for _ in range(count)])
+        specs = [{"role": 1 + i % 2} for i in range(30)]
+        seen = []
+        report = provisioner.run(specs, on_result=seen.append)
+
+    assert report.summary().startswith("Создано 30 из 30")
+    assert report.reissued == 1 and not report.failed
+    assert sorted(result.index for result in seen) == list(range(30))
+    assert len({result.inn for result in seen}) == 30 and taken not in {result.inn for result in seen}
+
+    reissued = next(result for result in seen if result.rejected_inns)
+    assert reissued.rejected_inns == [taken] and reissued.attempts == 2
+    assert all(result.profile["id"] == result.id and result.profile["inn"] == result.inn for result in seen)
+    assert all(result.profile["role"] == specs[result.index]["role"] for result in seen)
+    assert registry.contains([taken] + [result.inn for result in seen]).all()
@@ -4,6 +4,7 @@ import json
 
 from pages.create_cargo_page import CargoPlaceClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
 
 
 # Адреса по ID (внутренние ID системы Везубр)
@@ -23,7 +24,7 @@ def test_create_cargo_place_by_address_id(role, get_auth_token):
 
     for i, delivery_id in enumerate(DELIVERY_ADDRESS_IDS, start=1):
         title = f"Тестирование API {i}"
-        external_id = f"API-ID-TEST-{role}-{i:02d}"
+        external_id = unique_id(f"API-ID-TEST-{role}")
 
         with allure.step(f"Создание грузоместа №{i}: {title}"):
             response_data = client.create_cargo_place_by_id(
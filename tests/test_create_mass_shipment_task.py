@@ -5,6 +5,7 @@ import time
 from pprint import pprint
 from config.settings import BASE_URL
 from pages.mass_shipment_task_page import *
+from utils.bulk_executor import bulk_delete
 
 CLEAN_UP_AFTER_TEST = True  # если True - запускается блок удаления
 
@@ -80,41 +81,5 @@ def test_create_list_tasks(role, get_auth_token):
     # Опциональное удаление
     if CLEAN_UP_AFTER_TEST and created_id:
         with allure.step("Удаление всех созданных Заданий"):
-            deleted_count = 0
-            failed_deletions = []
-
-            for task_id in created_id:
-                delete_url = f"{BASE_URL}/shipment/tasks/{task_id}/delete"
-                try:
-                    delete_response = requests.delete(delete_url, headers=headers)
-                    if delete_response.status_code == 200:
-                        deleted_count += 1
-                    else:
-                        failed_deletions.append({
-                            "id": task_id,
-                            "status": delete_response.status_code,
-                            "body": delete_response.text
-                        })
-                except Exception as e:
-                    failed_deletions.append({
-                        "id": task_id,
-                        "error": str(e)
-                    })
-                time.sleep(0.2)
-
-                # результаты удаления
-            if not failed_deletions:
-                with allure.step("✅ Все созданные Задания успешно удалены"):
-                    pass
-            else:
-                with allure.step(f"⚠️ Не удалось удалить {len(failed_deletions)} из {len(created_id)} заданий"):
-                    allure.attach(
-                        "\n".join([f"ID: {fail['id']}, ошибка: {fail.get('status', '')} {fail.get('error', '')}" for fail in failed_deletions]),
-                        name="Ошибки удаления",
-                        attachment_type=allure.attachment_type.TEXT
-                    )
-
-
-
-
-
+            # Параллельно, с ограничением частоты и повтором временных ошибок; сводка ошибок - во вложении
+            bulk_delete(token, "shipment_task", created_id)
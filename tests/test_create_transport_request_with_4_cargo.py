@@ -8,6 +8,7 @@ import uuid
 from pages.create_cargo_page import CargoPlaceClient
 from pages.create_order_page import TransportRequestClient
 from config.settings import BASE_URL
+from utils.unique_ids import unique_id
 
 # Конфигурация - РАЗНЫЕ АДРЕСА ДЛЯ КАЖДОЙ ВЫГРУЗКИ
 DEPARTURE_ID = 27282
@@ -51,10 +52,10 @@ def test_create_transport_request_with_4_cargo(role, get_auth_token):
     # 5. Создадим 4 грузоместа
     cargo_client = CargoPlaceClient(BASE_URL, token)
     cargo_places = []
+    external_ids = [unique_id(f"API-TR-TEST-{role}") for _ in DELIVERY_IDS]
 
-    for i, delivery_id in enumerate(DELIVERY_IDS, start=1):
+    for i, (delivery_id, external_id) in enumerate(zip(DELIVERY_IDS, external_ids), start=1):
         title = f"Тестирование API {i}"
-        external_id = f"API-TR-TEST-{role}-{i:02d}"
         cargo_resp = cargo_client.create_cargo_place_by_id(
             departure_address_id=DEPARTURE_ID,
             delivery_address_id=delivery_id,
@@ -69,7 +70,7 @@ def test_create_transport_request_with_4_cargo(role, get_auth_token):
     cargo_specs = []
     for i, cargo in enumerate(cargo_places):
         # Используем переданный external_id (который мы знаем)
-        actual_external_id = f"API-TR-TEST-{role}-{i + 1:02d}"
+        actual_external_id = external_ids[i]
 
         cargo_specs.append({
             "cargoPlaceId": cargo["id"],
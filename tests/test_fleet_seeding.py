@@ -0,0 +1,39 @@
+import allure
+import requests
+from local_api.app import LocalApiServer
+from pages.vehicle_page import VehiclePage
+from utils.fleet_seeding import FleetManifest, FleetSeeder
+
+
+@allure.feature("Транспорт")
+@allure.story("Массовое создание")
+@allure.description("Водители, ТС, прицепы и тягачи создаются параллельно, id попадают в манифест, номера не повторяются")
+def test_seed_fleet_writes_manifest(tmp_path, monkeypatch):
+    with LocalApiServer() as server:
+        token = server.token_for("lkp")
+        manifest = FleetManifest(tmp_path / "fleet.json", server.base_url, "lkp")
+        seeder = FleetSeeder(server.base_url, token, manifest=manifest, max_workers=4, rate=1000)
+
+        # Госномер занят на стенде вне манифеста: стенд отклонит его, payload сгенерируется заново
+        requests.post(f"{server.base_url}/vehicle/create", headers={"Authorization": token},
+                      json={"plateNumber": "AUTO_TAKEN"})
+        plates = iter(["AUTO_TAKEN"])
+        generate_plate = VehiclePage.generate_random_plate_number
+        monkeypatch.setattr(VehiclePage, "generate_random_plate_number",
+                            staticmethod(lambda prefix="AUTO": next(plates, None) or generate_plate(prefix)))
+
+        reports = seeder.seed({"driver": 6, "vehicle": 6, "trailer": 2, "tractor": 2})
+        assert all(not report.failed for report in reports.values())
+        assert manifest.counts() == {"driver": 6, "vehicle": 6, "trailer": 2, "tractor": 2}
+        assert len(manifest.keys("vehicle")) == 6 and "AUTO_TAKEN" not in manifest.keys("vehicle")
+
+        # ensure досоздаёт только недостающее
+        assert set(seeder.ensure({"driver": 8, "vehicle": 6})) == {"driver"}
+        assert manifest.counts()["driver"] == 8
+
+    reopened = FleetManifest(tmp_path / "fleet.json", server.base_url, "lkp")
+    assert reopened.ids("driver") == manifest.ids("driver")
+    assert reopened.pick("vehicle", exclude=tuple(reopened.ids("vehicle")[1:])) == reopened.ids("vehicle")[0]
+    assert FleetManifest(tmp_path / "fleet.json", server.base_url, "lke").counts()["driver"] == 0
+    reopened.reset()
+    assert manifest.counts()["driver"] == 0
@@ -0,0 +1,35 @@
+import allure
+import pytest
+from utils.http_metrics import HttpMetrics, endpoint_template
+
+
+@allure.feature("Утилиты")
+@allure.story("HTTP-метрики")
+@allure.description("Идентификаторы в пути заменяются на {id}, префикс api-ext и query отбрасываются")
+@pytest.mark.parametrize("url, expected", [
+    ("https://api.vezubr.com/v1/api-ext/truck-deliveries/3f2b6c1e-8a4d-4c2b-9f1e-2a3b4c5d6e7f/details",
+     "/truck-deliveries/{id}/details"),
+    ("https://api.vezubr.com/v1/api-ext/order/12345/details?x=1", "/order/{id}/details"),
+    ("https://api.vezubr.com/v1/api-ext/shipment/tasks/create-list", "/shipment/tasks/create-list"),
+])
+def test_endpoint_template(url, expected):
+    assert endpoint_template(url) == expected
+
+
+@allure.feature("Утилиты")
+@allure.story("HTTP-метрики")
+@allure.description("Метрики группируются по методу и шаблону и объединяются между процессами")
+def test_metrics_group_and_merge():
+    a, b = HttpMetrics(), HttpMetrics()
+    a.record("get", "https://h/v1/api-ext/order/1/details", 200, 10.0, 0, 500)
+    a.record("GET", "https://h/v1/api-ext/order/2/details", 404, 30.0, 0, 50)
+    b.record("GET", "https://h/v1/api-ext/order/3/details", 200, 20.0, 0, 500)
+
+    merged = HttpMetrics.from_dict(a.to_dict()).merge(b).to_dict()
+    row = merged["GET /order/{id}/details"]
+
+    assert list(merged) == ["GET /order/{id}/details"]
+    assert row["count"] == 3
+    assert row["statuses"] == {"200": 2, "404": 1}
+    assert row["response_bytes"] == 1050
+    assert row["max_ms"] == 30.0
@@ -0,0 +1,54 @@
+import allure
+from utils.inn_corpus import InnCorpus, build_corpus
+from utils.inn_fetcher import INNFetcher
+from utils.inn_generator import format_inns, generate_inns, validate_inns
+from utils.inn_registry import InnRegistry
+
+
+@allure.feature("Контрагенты")
+@allure.story("Локальный корпус ИНН")
+@allure.description("Сборка корпуса отбраковывает невалидные ИНН, дополняет существующий файл и индексирует регионы")
+def test_build_corpus_and_take(tmp_path):
+    path = tmp_path / "inn-corpus.npy"
+    generated = format_inns(generate_inns(5000, seed=2))
+
+    counts = build_corpus(path, generated[:3000] + ["1234567890", "12345", "7707083893"], merge=False)
+    assert counts == {"accepted": 3001, "rejected": 2, "total": 3001}
+    assert build_corpus(path, generated[2000:])["total"] == 5001
+
+    corpus = InnCorpus(path, seed=1)
+    assert len(corpus) == 5001 and sum(corpus.regions().values()) == 5001
+    assert corpus.regions()[77] == sum(inn.startswith("77") for inn in generated) + 1
+
+    moscow = corpus.take(10, region=77)
+    assert len(moscow) == 10 and all(inn.startswith("77") for inn in moscow)
+    taken = corpus.take(4000)
+    assert len(set(taken)) == 4000 and not set(taken) & set(moscow)
+    assert validate_inns(taken).all()
+
+    registry = InnRegistry(tmp_path / "entity-registry")
+    registry.add(corpus.take(500))
+    fresh = InnCorpus(path, seed=1).take(5001, exclude=registry)
+    assert len(fresh) == 4501 and not registry.contains(fresh).any()
+
+
+@allure.feature("Контрагенты")
+@allure.story("Локальный корпус ИНН")
+@allure.description("get_fresh_inns берёт ИНН из корпуса и догенерирует, не обращаясь к сторонним сайтам")
+def test_get_fresh_inns_uses_corpus(tmp_path, monkeypatch):
+    def no_network(count):
+        raise AssertionError("тест не должен ходить на сторонние сайты")
+
+    path = tmp_path / "inn-corpus.npy"
+    build_corpus(path, format_inns(generate_inns(3, seed=4)))
+    monkeypatch.setattr(INNFetcher, "corpus", InnCorpus(path))
+    monkeypatch.setattr(INNFetcher, "fetch_inns_from_radar4site", staticmethod(no_network))
+    monkeypatch.setattr(INNFetcher, "fetch_inns_from_star_pro", staticmethod(no_network))
+
+    inns = INNFetcher.get_fresh_inns(5, "mixed")
+    assert len(inns) == 5 and validate_inns(inns).all()
+    assert len(set(inns) & set(format_inns(generate_inns(3, seed=4)))) == 3
+    assert INNFetcher.get_fresh_inns(5, "corpus") == []
+
+    monkeypatch.setattr(INNFetcher, "corpus", InnCorpus(tmp_path / "missing.npy"))
+    assert INNFetcher.fetch_inns_from_corpus(5) == []
@@ -0,0 +1,44 @@
+import allure
+import numpy as np
+from pages.create_contractor_page import ContractorDataGenerator
+from utils.inn_generator import REAL_REGIONS, format_inns, generate_inns, validate_inns
+
+
+@allure.feature("Контрагенты")
+@allure.story("Пакетная генерация ИНН")
+@allure.description("Пакетный генератор даёт уникальные валидные ИНН с реальными регионами и воспроизводим по seed")
+def test_generate_inns():
+    for entity_type, length in (("entity", 10), ("individual", 12)):
+        values = generate_inns(50000, entity_type, seed=3)
+        inns = format_inns(values, entity_type)
+
+        assert np.array_equal(values, generate_inns(50000, entity_type, seed=3))
+        assert len(set(inns)) == 50000
+        assert all(len(inn) == length and inn.isdigit() for inn in inns)
+        assert {int(inn[:2]) for inn in inns} == set(REAL_REGIONS)
+        assert validate_inns(values, entity_type, real_prefix=True).all()
+        assert validate_inns(inns, entity_type, real_prefix=True).all()
+
+    excluded = generate_inns(1000, seed=1)
+    assert not np.isin(generate_inns(1000, seed=1, exclude=excluded), excluded).any()
+
+
+@allure.feature("Контрагенты")
+@allure.story("Пакетная генерация ИНН")
+@allure.description("Пакетная проверка согласована с поштучным генератором и отбраковывает испорченные ИНН")
+def test_validate_inns_matches_single_generator():
+    generator = ContractorDataGenerator()
+    entity = [generator.generate_realistic_inn("entity") for _ in range(50)]
+    individual = [generator.generate_realistic_inn("individual") for _ in range(50)]
+    assert validate_inns(entity, real_prefix=True).all()
+    assert validate_inns(individual, "individual", real_prefix=True).all()
+
+    broken = [inn[:-1] + str((int(inn[-1]) + 1) % 10) for inn in entity]
+    assert not validate_inns(broken).any()
+    assert validate_inns(["", "12345", "12345678ab", "7707083893"]).tolist() == [False, False, False, True]
+    assert validate_inns(["9907083894"]).tolist() == [True]
+    assert validate_inns(["9907083894"], real_prefix=True).tolist() == [False]
+
+    inns = generator.generate_realistic_inns(100, seed=5)
+    assert generator.used_inns.issuperset(inns)
+    assert not set(generator.generate_realistic_inns(100, seed=5)) & set(inns)
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+import allure
+from pages.create_contractor_page import ContractorDataGenerator
+from utils import inn_registry
+from utils.inn_corpus import InnCorpus, build_corpus
+from utils.inn_fetcher import INNFetcher
+from utils.inn_generator import format_inns, generate_inns, validate_inns
+from utils.inn_registry import InnRegistry
+
+
+def _reserve_many(path: str) -> list:
+    registry = InnRegistry(path)
+    return [inn for _ in range(30) for inn in registry.reserve(5)]
+
+
+def _take_from_corpus(paths: tuple) -> list:
+    corpus_path, registry_path = paths
+    # Одинаковый seed у всех процессов: без занятия под блокировкой они выбрали бы одни и те же ИНН
+    INNFetcher.corpus = InnCorpus(corpus_path, seed=7)
+    registry = InnRegistry(registry_path)
+    return [inn for _ in range(10) for inn in INNFetcher.fetch_inns_from_corpus(20, exclude=registry)]
+
+
+@allure.feature("Контрагенты")
+@allure.story("Реестр использованных ИНН")
+@allure.description("Реестр сохраняется между прогонами: занятые ИНН не выдаются повторно, журнал сливается с основой")
+def test_registry_persists_between_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(inn_registry, "COMPACT_THRESHOLD", 100)
+    registry = InnRegistry.for_environment("http://stand-a/v1/api-ext", registry_dir=tmp_path)
+
+    first = registry.reserve(80, seed=1)
+    registry.add(["7707083893", "7707083893", "bad"])
+    assert len(registry) == 81 and "7707083893" in registry
+    assert validate_inns(first, real_prefix=True).all()
+
+    # Новый процесс видит тот же реестр; тот же seed не возвращает занятые ИНН
+    reopened = InnRegistry.for_environment("http://stand-a/v1/api-ext/", registry_dir=tmp_path)
+    assert reopened.contains(first).all()
+    second = reopened.reserve(80, seed=1)
+    assert not set(first) & set(second)
+    assert len(reopened) == 161 and not (tmp_path / f"{reopened.path.name}.log").exists()
+    assert reopened.filter_unused(["7707083893", second[0], "7736050003"]) == ["7736050003"]
+
+    other_stand = InnRegistry.for_environment("http://stand-b/v1/api-ext", registry_dir=tmp_path)
+    assert len(other_stand) == 0
+
+    generator = ContractorDataGenerator(reopened)
+    inn = generator.get_fresh_inn("realistic")
+    assert inn in InnRegistry(reopened.path) and inn in generator.used_inns
+    generator.mark_used("7736050003")
+    assert "7736050003" in InnRegistry(reopened.path)
+
+
+@allure.feature("Контрагенты")
+@allure.story("Реестр использованных ИНН")
+@allure.description("Параллельные процессы (воркеры xdist) резервируют ИНН из одного реестра без пересечений")
+def test_registry_is_safe_across_processes(tmp_path):
+    path = str(tmp_path / "entity-shared")
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        reserved = [inn for inns in pool.map(_reserve_many, [path] * 3) for inn in inns]
+
+    assert len(reserved) == len(set(reserved)) == 450
+    assert len(InnRegistry(path)) == 450
+
+
+@allure.feature("Контрагенты")
+@allure.story("Реестр использованных ИНН")
+@allure.description("ИНН из корпуса занимаются в реестре атомарно: воркеры с одинаковой выборкой не получают один ИНН")
+def test_corpus_inns_are_claimed_across_processes(tmp_path):
+    corpus_path = str(tmp_path / "inn-corpus.npy")
+    build_corpus(corpus_path, format_inns(generate_inns(2000, seed=5)))
+    registry_path = str(tmp_path / "entity-shared")
+    registry = InnRegistry(registry_path)
+    assert registry.claim(["7707083893", "7707083893", "7736050003"]) == ["7707083893", "7736050003"]
+    assert registry.claim(["7707083893", "bad"]) == []
+
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        taken = [inn for inns in pool.map(_take_from_corpus, [(corpus_path, registry_path)] * 3) for inn in inns]
+
+    assert len(taken) == len(set(taken)) == 600
+    assert InnRegistry(registry_path).contains(taken).all()
@@ -0,0 +1,37 @@
+import random
+import allure
+from utils.latency_histogram import LatencyHistogram
+
+
+@allure.feature("Нагрузка")
+@allure.story("Гистограмма задержек")
+@allure.description("Перцентили гистограммы совпадают с точными в пределах заданной точности (2 значащие цифры)")
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(42)
+    values = [rng.lognormvariate(3, 1) for _ in range(10_000)]
+    histogram = LatencyHistogram()
+    for v in values:
+        histogram.record(v)
+
+    ordered = sorted(values)
+    for p in (50, 90, 99, 99.9):
+        exact = ordered[int(p / 100 * len(ordered)) - 1]
+        assert abs(histogram.percentile(p) - exact) / exact < 0.02
+    assert histogram.count == len(values)
+
+
+@allure.feature("Нагрузка")
+@allure.story("Гистограмма задержек")
+@allure.description("Гистограммы складываются и переживают сериализацию в JSON")
+def test_histogram_merge_and_roundtrip():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in range(1, 101):
+        a.record(v)
+        b.record(v * 10)
+
+    merged = LatencyHistogram.from_dict(a.to_dict()).merge(b)
+
+    assert merged.count == 200
+    assert merged.max_ms == 1000
+    exact = sorted(list(range(1, 101)) + list(range(10, 1001, 10)))[99]
+    assert abs(merged.percentile(50) - exact) / exact < 0.01
@@ -0,0 +1,39 @@
+import allure
+import pytest
+from utils.bulk_executor import bulk_delete
+from utils.load_harness import LoadRunner, OpenLoopRunner
+from utils.load_targets import LOAD_TARGET_ROLES, build_load_target, build_async_load_target
+
+
+@pytest.mark.load
+@allure.feature("Нагрузка")
+@allure.story("Профиль разгон / стабильная фаза / спад")
+@allure.description("Нагрузка на эндпоинт с заданной интенсивностью: p50/p95/p99, пропускная способность, доля ошибок")
+@pytest.mark.parametrize("target_name", ["shipment_tasks", "delivery_requests", "cargo_places"])
+def test_endpoint_under_load(target_name, get_auth_token, load_profile, request):
+    token = get_auth_token(LOAD_TARGET_ROLES[target_name])["token"]
+    created_task_ids = []
+    mode = request.config.getoption("--load-mode")
+
+    with allure.step(f"Нагрузка ({mode}) {load_profile.rate} rps, {load_profile.duration:.0f} с: {target_name}"):
+        if mode == "open":
+            runner = OpenLoopRunner(
+                load_profile,
+                lambda session: [build_async_load_target(target_name, session, token, created_task_ids=created_task_ids)]
+            )
+        else:
+            target = build_load_target(target_name, token, created_task_ids=created_task_ids)
+            runner = LoadRunner(load_profile, [target], max_workers=request.config.getoption("--load-workers"))
+        report = runner.run()
+        report.attach_to_allure(target_name)
+        print(f"\n{report.summary_table()}")
+
+    if created_task_ids:
+        with allure.step("Удаление созданных Заданий"):
+            bulk_delete(token, "shipment_task", created_task_ids)
+
+    stats = report.to_dict()["endpoints"][0]
+    max_error_rate = request.config.getoption("--load-max-error-rate")
+    assert stats["requests"] > 0, "Не отправлено ни одного запроса"
+    assert stats["error_rate"] <= max_error_rate, \
+        f"Доля ошибок {stats['error_rate']:.1%} больше допустимой {max_error_rate:.0%}: {stats['top_errors']}"
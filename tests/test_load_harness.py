@@ -0,0 +1,63 @@
+import allure
+from utils.load_harness import LoadProfile, LoadRunner, LoadTarget, OpenLoopRunner
+
+
+@allure.feature("Нагрузка")
+@allure.story("Профиль разгон / стабильная фаза / спад")
+@allure.description("Число запросов в расписании соответствует площади профиля интенсивности")
+def test_profile_arrivals_match_rate():
+    profile = LoadProfile(rate=10, ramp_up=2, steady=3, ramp_down=2)
+
+    arrivals = list(profile.arrival_times())
+
+    # 10 * (2/2 + 3 + 2/2) = 50 запросов; в разгоне реже, чем в стабильной фазе
+    assert abs(len(arrivals) - 50) <= 1
+    assert sum(1 for t in arrivals if t < 1) < sum(1 for t in arrivals if 2 <= t < 3)
+    assert arrivals == sorted(arrivals) and arrivals[-1] <= profile.duration
+
+
+@allure.feature("Нагрузка")
+@allure.story("Профиль разгон / стабильная фаза / спад")
+@allure.description("LoadRunner считает запросы, ошибки и перцентили по каждой цели")
+def test_runner_collects_stats():
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] % 5 == 0:
+            raise RuntimeError("HTTP 503")
+
+    profile = LoadProfile(rate=100, steady=0.5)
+    report = LoadRunner(profile, [LoadTarget("GET /fake", flaky)], max_workers=4).run()
+    stats = report.to_dict()["endpoints"][0]
+
+    assert stats["requests"] == 50
+    assert stats["errors"] == 10
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+@allure.feature("Нагрузка")
+@allure.story("Open-loop")
+@allure.description("Open-loop генератор не ждёт ответов: зависание сервера видно в хвосте задержек")
+def test_open_loop_measures_from_intended_send_time():
+    import asyncio
+
+    def build_targets(session):
+        calls = {"n": 0}
+
+        async def stalls_once():
+            calls["n"] += 1
+            # Первый запрос "зависает" на 300 мс; остальные быстрые
+            await asyncio.sleep(0.3 if calls["n"] == 1 else 0.001)
+
+        return [LoadTarget("POST /fake", stalls_once)]
+
+    profile = LoadProfile(rate=100, steady=0.5)
+    report = OpenLoopRunner(profile, build_targets).run()
+    stats = report.to_dict()["endpoints"][0]
+
+    # Все 50 запросов отправлены вовремя, несмотря на зависание первого
+    assert stats["requests"] == 50
+    assert report.duration < 0.5 + 0.3 + 0.2
+    assert stats["max_ms"] >= 300
+    assert stats["p50_ms"] < 100
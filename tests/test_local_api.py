@@ -0,0 +1,135 @@
+import asyncio
+import allure
+import pytest
+import requests
+from local_api.app import LocalApiServer
+from local_api.state import ApiState
+from pages.cargo_deliveries_cancel_page import CargoDeliveriesCancelClient
+from pages.cargo_deliveries_create_page import CargoDeliveriesCreateClient
+from pages.cargo_delivery_page import AsyncCargoDeliveryClient, CargoDeliveryClient
+from pages.truck_deliveries_transport_appoint_page import TruckDeliveriesTransportAppointClient
+from utils.http_session import create_async_session
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Задания на отгрузку")
+@allure.description("Создание, чтение и удаление задания: после удаления деталка отдаёт 404")
+def test_shipment_task_lifecycle(local_api):
+    base_url, token_for = local_api
+    headers = {"Authorization": token_for("lkz")}
+
+    response = requests.post(f"{base_url}/shipment/tasks/create", headers=headers,
+                             json={"title": "Булочка", "departurePoint": {"id": 17978}})
+    task_id = response.json()["id"]
+
+    details = requests.get(f"{base_url}/shipment/tasks/{task_id}", headers=headers).json()
+    assert details["status"] == "created"
+    assert details["title"] == "Булочка"
+    assert details["cargoPlaces"]
+
+    assert requests.delete(f"{base_url}/shipment/tasks/{task_id}/delete", headers=headers).status_code == 200
+    response = requests.get(f"{base_url}/shipment/tasks/{task_id}", headers=headers)
+    assert response.status_code == 404
+    assert response.json() == {"message": "Задание не найдено", "status": False}
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Заявки и рейсы")
+@allure.description("Page-клиенты проходят цепочку публикация -> принятие -> рейс -> назначение -> отмена")
+def test_delivery_flow_through_page_clients(local_api):
+    base_url, token_for = local_api
+    lkz = CargoDeliveryClient(base_url, token_for("lkz"))
+    lkp_token = token_for("lkp")
+    lkp = CargoDeliveryClient(base_url, lkp_token)
+
+    created = lkz.create_and_publish_delivery_request(
+        route=[
+            lkz.create_route_point(17978, 1, is_loading_work=True),
+            lkz.create_route_point(18535, 2, is_unloading_work=True),
+        ],
+        comment="Офлайн",
+        client_identifier="LOCAL-1",
+        to_start_at_from="2030-01-01T10:00:00Z",
+        producer_id=1599
+    )
+    request_id = created["id"]
+    assert lkp.get_delivery_request_details(request_id)["status"] == "waiting_producer_confirmation"
+
+    lkp.take_delivery_request(request_id)
+    delivery_id = CargoDeliveriesCreateClient(base_url, lkp_token).create_cargo_delivery(request_id, 1599)
+    TruckDeliveriesTransportAppointClient(base_url, lkp_token).appoint_transport(delivery_id, 11, 22)
+
+    details = lkp.get_delivery_request_details(request_id)
+    assert details["status"] == "confirmed"
+    assert details["executionParameters"][0]["driver"] == 11
+
+    CargoDeliveriesCancelClient(base_url, lkp_token).cancel_cargo_delivery(delivery_id)
+    details = lkp.get_delivery_request_details(request_id)
+    assert [(e["id"], e["status"]) for e in details["outgoingEntities"]] == [(delivery_id, "canceled")]
+    assert details["executionParameters"] == []
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Заявки и рейсы")
+@allure.description("Async-клиент ждёт статус заявки и рейс в outgoingEntities корутинами, как sync-клиент")
+def test_async_client_waits_for_request_preconditions(local_api):
+    base_url, token_for = local_api
+    lkz = CargoDeliveryClient(base_url, token_for("lkz"))
+    lkp_token = token_for("lkp")
+    request_id = lkz.create_and_publish_delivery_request(
+        route=[
+            lkz.create_route_point(17978, 1, is_loading_work=True),
+            lkz.create_route_point(18535, 2, is_unloading_work=True),
+        ],
+        client_identifier="LOCAL-ASYNC-1",
+        to_start_at_from="2030-01-01T10:00:00Z",
+        producer_id=1599
+    )["id"]
+
+    async def scenario():
+        async with create_async_session() as session:
+            lkp = AsyncCargoDeliveryClient(base_url, lkp_token, session)
+            waiting = await lkp.wait_for_request_status(request_id, "waiting_producer_confirmation")
+
+            await lkp.take_delivery_request(request_id)
+            delivery_id = await asyncio.to_thread(
+                CargoDeliveriesCreateClient(base_url, lkp_token).create_cargo_delivery, request_id, 1599
+            )
+            entity = await lkp.wait_for_delivery_in_request(request_id, delivery_id, timeout=5)
+
+            with pytest.raises(TimeoutError, match="не перешла в статус in_progress"):
+                await lkp.wait_for_request_status(request_id, "in_progress", timeout=0.3)
+            return waiting, entity, delivery_id
+
+    waiting, entity, delivery_id = asyncio.run(scenario())
+    assert waiting["id"] == request_id
+    assert entity["id"] == delivery_id
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Грузоместа")
+@allure.description("create-list отдаёт поэлементный результат и не перезаписывает существующие ГМ")
+def test_cargo_create_list_reports_per_item(local_api):
+    base_url, token_for = local_api
+    headers = {"Authorization": token_for("lke")}
+    item = {"externalId": "CP-LOCAL-1", "departureAddressExternalId": "Izhevsk-LOCAL-17978",
+            "deliveryAddressExternalId": "Izhevsk-LOCAL-18535"}
+    bad = {**item, "externalId": "CP-LOCAL-2", "deliveryAddressExternalId": "нет такого"}
+
+    data = requests.post(f"{base_url}/cargo-place/create-list", headers=headers,
+                         json={"data": [item, bad, item]}).json()["data"]
+
+    assert [d["status"] for d in data] == ["ok", "error", "error"]
+    assert data[0]["id"] > 0
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Авторизация")
+@allure.description("Без токена и с истёкшим токеном - 401")
+def test_expired_token_is_rejected():
+    with LocalApiServer(state=ApiState(token_ttl=-1)) as server:
+        assert requests.get(f"{server.base_url}/dictionaries").status_code == 401
+        headers = {"Authorization": server.token_for("lkz")}
+        response = requests.get(f"{server.base_url}/dictionaries", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["message"] == "Срок действия токена истёк"
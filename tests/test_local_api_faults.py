@@ -0,0 +1,86 @@
+import random
+import time
+import allure
+import pytest
+import requests
+from local_api.app import LocalApiServer
+from local_api.faults import FaultProfile, LatencyDistribution
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Профили отказов")
+@allure.description("Логнормальная задержка попадает в заданные медиану и p99, max_ms срезает хвост")
+def test_lognormal_latency_matches_median_and_p99():
+    distribution = LatencyDistribution(kind="lognormal", median_ms=50, p99_ms=500, max_ms=2000)
+    rng = random.Random(1)
+    samples = sorted(distribution.sample(rng) * 1000 for _ in range(20000))
+
+    assert samples[len(samples) // 2] == pytest.approx(50, rel=0.1)
+    assert samples[int(len(samples) * 0.99)] == pytest.approx(500, rel=0.15)
+    assert samples[-1] <= 2000
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Профили отказов")
+@allure.description("Профиль эндпоинта выбирается по шаблону пути с {id} и маскам, иначе - default")
+def test_endpoint_profile_matching():
+    profile = FaultProfile.from_dict({
+        "default": {"error_rate": 0.1},
+        "endpoints": {
+            "GET /cargo-delivery-requests/{id}/details": {"error_rate": 0.2},
+            "/cargo-place/create*-list": {"error_rate": 0.3},
+        },
+    })
+
+    details = "/v1/api-ext/cargo-delivery-requests/0b4f6a49-9c1e-4f6e-8d8f-2f1b5c7a9e01/details"
+    assert profile.for_request("GET", details).error_rate == 0.2
+    assert profile.for_request("POST", "/v1/api-ext/cargo-place/create-or-update-list").error_rate == 0.3
+    assert profile.for_request("POST", "/v1/api-ext/shipment/tasks/create").error_rate == 0.1
+
+    with pytest.raises(ValueError):
+        FaultProfile.from_dict({"default": {"eror_rate": 0.1}})
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Профили отказов")
+@allure.description("429 с Retry-After, 5xx и обрыв соединения видны клиенту как на боевом стенде")
+def test_throttle_errors_and_resets():
+    faults = FaultProfile.from_dict({"endpoints": {
+        "POST /tariffs/list": {"throttle_rate": 1, "retry_after": 3},
+        "GET /tariffs/{id}": {"error_rate": 1},
+        "GET /dictionaries": {"reset_rate": 1},
+    }})
+    with LocalApiServer(faults=faults) as server:
+        headers = {"Authorization": server.token_for("lkz")}
+
+        response = requests.post(f"{server.base_url}/tariffs/list", headers=headers, json={})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+
+        assert requests.get(f"{server.base_url}/tariffs/23762", headers=headers).status_code >= 500
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f"{server.base_url}/dictionaries", headers=headers)
+
+    assert faults.stats["429"] == 1 and faults.stats["reset"] == 1
+
+
+@allure.feature("Локальная заглушка api-ext")
+@allure.story("Профили отказов")
+@allure.description("Медленное тело: read-таймаут requests считается между байтами, а не на весь ответ")
+def test_slow_body_and_read_timeout():
+    faults = FaultProfile.from_dict({"endpoints": {
+        "GET /tariffs/{id}": {"slow_body_rate": 1, "slow_body_chunk": 50, "slow_body_interval_ms": 150},
+    }})
+    with LocalApiServer(faults=faults) as server:
+        headers = {"Authorization": server.token_for("lkz")}
+
+        # Каждая пауза короче таймаута - ответ приходит целиком, хотя в сумме дольше таймаута
+        started = time.perf_counter()
+        response = requests.get(f"{server.base_url}/tariffs/23762", headers=headers, timeout=0.5)
+        assert response.json()["id"] == 23762
+        assert time.perf_counter() - started > 0.5
+
+        # Пауза длиннее таймаута - обрыв при чтении тела
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f"{server.base_url}/tariffs/23762", headers=headers, timeout=0.1)
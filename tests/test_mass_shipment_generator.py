@@ -0,0 +1,37 @@
+import json
+import allure
+from pages.mass_shipment_task_page import (
+    POINT_IDS, TYPE_PACKAGES, generate_random_task_item, generate_task_items, generate_task_items_json, iter_task_payloads
+)
+
+
+@allure.feature("Задание")
+@allure.story("Пакетная генерация")
+@allure.description("Пакетный генератор даёт те же поля и диапазоны, что generate_random_task_item, и воспроизводим по seed")
+def test_batch_items_match_single_item_semantics():
+    items = generate_task_items(20000, seed=7)
+
+    assert items == generate_task_items(20000, seed=7)
+    assert items != generate_task_items(20000, seed=8)
+    assert all(item.keys() == generate_random_task_item().keys() for item in items[:10])
+    assert all(item["arrivalPoint"]["id"] != item["departurePoint"]["id"] for item in items)
+    assert {item["departurePoint"]["id"] for item in items} == set(POINT_IDS)
+    assert {item["types"][0] for item in items} == set(TYPE_PACKAGES)
+    assert {item["volume"] for item in items} == {v * 1_000_000 for v in range(1, 11)}
+    assert min(item["quantity"] for item in items) == 1 and max(item["quantity"] for item in items) == 100
+    assert all(100_000 <= item["weight"] <= 500_000 and 1_000_000 <= item["cost"] <= 5_000_000 for item in items)
+    assert all(len(item["number"]) == 7 and item["number"][3] == "-" for item in items)
+    assert all(item["title"] == item["title"].lower() and item["title"] for item in items)
+
+
+@allure.feature("Задание")
+@allure.story("Пакетная генерация")
+@allure.description("Готовый JSON совпадает побайтно с json.dumps тех же заданий, пачки воспроизводимы")
+def test_serialized_payloads():
+    assert generate_task_items_json(3000, seed=1) == json.dumps({"data": generate_task_items(3000, seed=1)}).encode()
+    assert json.loads(generate_task_items_json(0)) == {"data": []}
+
+    bodies = list(iter_task_payloads(2500, 1000, seed=5))
+    assert [len(json.loads(body)["data"]) for body in bodies] == [1000, 1000, 500]
+    assert bodies == list(iter_task_payloads(2500, 1000, seed=5))
+    assert [json.loads(body)["data"] for body in bodies] == list(iter_task_payloads(2500, 1000, seed=5, serialized=False))
@@ -0,0 +1,82 @@
+import random
+import allure
+from utils.http_metrics import HttpMetrics
+from utils.perf_baseline import (
+    PerfBaseline, PerfThresholds, REGRESSION, OK, NO_DATA, IMPROVED, mann_whitney_greater, write_allure_result
+)
+
+CREATE_LIST = "https://host/v1/api-ext/shipment/tasks/create-list"
+PUBLISH = "https://host/v1/api-ext/cargo-delivery-requests/create-and-publish"
+
+
+def _metrics(seed, samples):
+    """HttpMetrics с логнормальными задержками: {url: (медиана мс, число вызовов)}."""
+    rng = random.Random(seed)
+    metrics = HttpMetrics()
+    for url, (median_ms, count) in samples.items():
+        for _ in range(count):
+            metrics.record("POST", url, 200, rng.lognormvariate(0, 0.3) * median_ms)
+    return metrics
+
+
+def _verdicts(rows):
+    return {row.key: row.verdict for row in rows}
+
+
+@allure.feature("Производительность")
+@allure.story("Базовая линия")
+@allure.description("Сдвиг распределения ловится, шум того же распределения и одиночные выбросы - нет")
+def test_endpoint_regression_is_statistical():
+    baseline = PerfBaseline(_metrics(1, {CREATE_LIST: (300, 200), PUBLISH: (100, 200)}))
+
+    slower = _metrics(2, {CREATE_LIST: (450, 200), PUBLISH: (100, 200)})
+    assert _verdicts(baseline.compare(slower, {})) == {
+        "POST /shipment/tasks/create-list": REGRESSION, "POST /cargo-delivery-requests/create-and-publish": OK
+    }
+
+    noisy = _metrics(3, {CREATE_LIST: (300, 200), PUBLISH: (100, 200)})
+    for _ in range(15):
+        noisy.record("POST", PUBLISH, 200, 5000)
+    rows = baseline.compare(noisy, {}, PerfThresholds(threshold=0.2))
+    assert all(row.verdict == OK for row in rows)
+
+    few = _metrics(4, {CREATE_LIST: (900, 5)})
+    assert _verdicts(baseline.compare(few, {})) == {"POST /shipment/tasks/create-list": NO_DATA}
+
+    faster = _metrics(5, {CREATE_LIST: (150, 200)})
+    assert _verdicts(baseline.compare(faster, {})) == {"POST /shipment/tasks/create-list": IMPROVED}
+
+
+@allure.feature("Производительность")
+@allure.story("Базовая линия")
+@allure.description("Критерий Манна-Уитни по гистограммам: одинаковые выборки не значимы, сдвинутые - значимы")
+def test_mann_whitney_on_histograms():
+    same = _metrics(1, {CREATE_LIST: (100, 500)}).endpoints[("POST", "/shipment/tasks/create-list")].histogram
+    other = _metrics(2, {CREATE_LIST: (100, 500)}).endpoints[("POST", "/shipment/tasks/create-list")].histogram
+    shifted = _metrics(3, {CREATE_LIST: (120, 500)}).endpoints[("POST", "/shipment/tasks/create-list")].histogram
+
+    assert mann_whitney_greater(other, same) > 0.01
+    assert mann_whitney_greater(shifted, same) < 0.001
+    assert mann_whitney_greater(same, shifted) > 0.99
+
+
+@allure.feature("Производительность")
+@allure.story("Базовая линия")
+@allure.description("Длительность теста сравнивается с медианой последних прогонов с учётом их разброса")
+def test_test_duration_regression(tmp_path):
+    path = str(tmp_path / "perf-baseline.json")
+    baseline = PerfBaseline()
+    scenario = "scenarios/test_scenario_2_mass_orders.py::test_scenario_2_mass_orders[lke]"
+    for duration in (600, 640, 580, 900, 610):
+        baseline.update(HttpMetrics(), {scenario: duration, "tests/test_a.py::test_a": 1.0})
+    baseline.save(path)
+    baseline = PerfBaseline.load(path)
+
+    assert baseline.tests[scenario] == [600, 640, 580, 900, 610]
+    assert _verdicts(baseline.compare(HttpMetrics(), {scenario: 700})) == {scenario: OK}
+    assert _verdicts(baseline.compare(HttpMetrics(), {scenario: 1000})) == {scenario: REGRESSION}
+
+    rows = baseline.compare(HttpMetrics(), {scenario: 1000, "tests/test_a.py::test_a": 1.0})
+    write_allure_result(str(tmp_path / "allure-results"), rows)
+    files = sorted(p.name.split("-")[-1] for p in (tmp_path / "allure-results").iterdir())
+    assert files == ["attachment.html", "result.json"]
@@ -0,0 +1,91 @@
+import asyncio
+import allure
+import pytest
+from utils.polling import poll, apoll, retry_until_ok
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("poll() возвращает значение, как только условие выполнено, и сообщает затраченное время")
+def test_poll_returns_when_predicate_met():
+    values = iter([None, None, {"status": "canceled"}])
+
+    result = poll(lambda: next(values), lambda v: v is not None, timeout=5, interval=0.01)
+
+    assert result.success
+    assert result.attempts == 3
+    assert result.value == {"status": "canceled"}
+    assert 0 <= result.elapsed < 5
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("poll() не превышает общий дедлайн и поднимает TimeoutError при unwrap()")
+def test_poll_respects_deadline():
+    result = poll(lambda: False, timeout=0.2, interval=0.05, max_interval=0.1)
+
+    assert not result.success
+    assert result.elapsed < 0.5
+    with pytest.raises(TimeoutError):
+        result.unwrap()
+    assert result.last_value() is False
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("last_value() поднимает последнюю ошибку, если fetch() ни разу не вернул значение")
+def test_poll_last_value_without_value_raises_error():
+    def fetch():
+        raise ConnectionError("нет соединения")
+
+    result = poll(fetch, timeout=0.1, interval=0.02)
+
+    assert not result.success
+    with pytest.raises(ConnectionError):
+        result.last_value()
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("retry_until_ok() повторяет действие до первого успешного вызова")
+def test_retry_until_ok_retries_exceptions():
+    calls = {"n": 0}
+
+    def action():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise ValueError("ещё не готово")
+        return "ok"
+
+    assert retry_until_ok(action, timeout=5, interval=0.01) == "ok"
+    assert calls["n"] == 3
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("retry_until_ok() не повторяет ошибки вне retry_on - они поднимаются с первой попытки")
+def test_retry_until_ok_raises_non_retryable_at_once():
+    calls = {"n": 0}
+
+    def action():
+        calls["n"] += 1
+        raise ValueError("HTTP 400")
+
+    with pytest.raises(ValueError):
+        retry_until_ok(action, timeout=5, interval=0.01, retry_on=(ConnectionError,))
+    assert calls["n"] == 1
+
+
+@allure.feature("Утилиты")
+@allure.story("Ожидание с дедлайном")
+@allure.description("apoll() - async-вариант с той же семантикой")
+def test_apoll_returns_when_predicate_met():
+    values = iter([1, 2, 3])
+
+    async def fetch():
+        return next(values)
+
+    result = asyncio.run(apoll(fetch, lambda v: v == 3, timeout=5, interval=0.01))
+
+    assert result.success
+    assert result.attempts == 3
@@ -1,7 +1,6 @@
 import allure
 import pytest
 import uuid
-import time
 from datetime import datetime, timedelta
 from pages.cargo_delivery_page import CargoDeliveryClient
 from pages.cargo_deliveries_create_page import CargoDeliveriesCreateClient
@@ -10,6 +9,8 @@ from pages.truck_deliveries_transport_replace_page import TruckDeliveriesTranspo
 from pages.cargo_deliveries_start_page import CargoDeliveriesStartClient
 from pages.truck_deliveries_points_update_page import TruckDeliveriesPointsUpdateClient
 from config.settings import BASE_URL, PRODUCER_ID
+from utils.fleet_seeding import FleetSeeder
+from utils.polling import poll
 
 
 class TestReplaceDriverExecutionParams:
@@ -18,8 +19,6 @@ class TestReplaceDriverExecutionParams:
     TEST_ADDRESSES = [27648, 27649, 27650]
     INITIAL_DRIVER_ID = 5534
     INITIAL_VEHICLE_ID = 9710
-    REPLACEMENT_DRIVER_ID = 5684
-    REPLACEMENT_VEHICLE_ID = 9887
 
     @pytest.fixture
     def test_addresses(self):
@@ -35,6 +34,20 @@ class TestReplaceDriverExecutionParams:
             "delivery": addresses[2]
         }
 
+    @pytest.fixture
+    def replacement_transport(self, lkp_token):
+        """Водитель и ТС для замены - из манифеста транспорта (python -m scripts.seed_fleet), при нехватке досоздаются"""
+        seeder = FleetSeeder(BASE_URL, lkp_token, role="lkp")
+        seeder.ensure({"driver": 1, "vehicle": 1})
+
+        driver_id = seeder.manifest.pick("driver", exclude=(self.INITIAL_DRIVER_ID,))
+        vehicle_id = seeder.manifest.pick("vehicle", exclude=(self.INITIAL_VEHICLE_ID,))
+        if driver_id is None or vehicle_id is None:
+            pytest.skip("В манифесте транспорта нет водителя или ТС для замены")
+
+        print(f"📌 Транспорт для замены: водитель {driver_id}, ТС {vehicle_id}")
+        return {"driver_id": driver_id, "vehicle_id": vehicle_id}
+
     def check_driver_in_execution_params(self, lkz_client, request_id, expected_info=None):
         """Проверка водителя в executionParameters"""
         print(f"\n🔍 Проверяем executionParameters в заявке {request_id}...")
@@ -79,7 +92,8 @@ class TestReplaceDriverExecutionParams:
             self,
             lkz_token,
             lkp_token,
-            test_addresses
+            test_addresses,
+            replacement_transport
     ):
         """
         Тест замены водителя с проверкой через executionParameters:
@@ -150,21 +164,22 @@ class TestReplaceDriverExecutionParams:
 
             print(f"✅ Создана заявка: ID={request_id}, №={request_nr}")
 
-        time.sleep(2)
+        # Перед шагами 2-4 ждём их предусловие в деталях заявки, а сами шаги выполняем один раз:
+        # повтор создания рейса или назначения после таймаута может задвоить изменение на стенде
 
         # ==================== 2. ПРИНЯТИЕ ЗАЯВКИ ====================
         with allure.step("2. LKP принимает заявку"):
             lkp_client = CargoDeliveryClient(BASE_URL, lkp_token)
 
+            lkp_client.wait_for_request_status(request_id, "waiting_producer_confirmation")
             lkp_client.take_delivery_request(request_id)
             print(f"✅ LKP принял заявку")
 
-        time.sleep(3)
-
         # ==================== 3. СОЗДАНИЕ РЕЙСА ====================
         with allure.step("3. LKP создает рейс"):
             lkp_cargo_create = CargoDeliveriesCreateClient(BASE_URL, lkp_token)
 
+            lkp_client.wait_for_request_status(request_id, ["confirmed", "in_progress"])
             delivery_id_uuid = lkp_cargo_create.create_cargo_delivery(
                 request_id=request_id,
                 producer_id=PRODUCER_ID
@@ -172,12 +187,11 @@ class TestReplaceDriverExecutionParams:
 
             print(f"✅ Создан рейс: ID={delivery_id_uuid}")
 
-        time.sleep(2)
-
         # ==================== 4. НАЗНАЧЕНИЕ ПЕРВОНАЧАЛЬНОГО ТРАНСПОРТА ====================
         with allure.step("4. LKP назначает первоначальный транспорт"):
             lkp_transport_appoint = TruckDeliveriesTransportAppointClient(BASE_URL, lkp_token)
 
+            lkp_client.wait_for_delivery_in_request(request_id, delivery_id_uuid)
             lkp_transport_appoint.appoint_transport(
                 truck_delivery_id=delivery_id_uuid,
                 driver_id=self.INITIAL_DRIVER_ID,
@@ -188,33 +202,24 @@ class TestReplaceDriverExecutionParams:
             print(f"   Водитель: {self.INITIAL_DRIVER_ID}")
             print(f"   ТС: {self.INITIAL_VEHICLE_ID}")
 
-        time.sleep(3)
-
         # ==================== 5. ПРОВЕРКА ПЕРВОНАЧАЛЬНОГО ВОДИТЕЛЯ ====================
         with allure.step("5. LKZ проверяет водителя в executionParameters"):
             print(f"\n🔍 LKZ проверяет назначенного водителя...")
 
-            # Проверяем несколько раз с задержкой
-            max_attempts = 5
-            initial_exec_param = None
-
-            for attempt in range(max_attempts):
-                print(f"🔍 Попытка {attempt + 1} из {max_attempts}...")
-
-                initial_exec_param = self.check_driver_in_execution_params(lkz_client, request_id)
-
-                if initial_exec_param and initial_exec_param.get("driverFullName"):
-                    print(f"✅ Водитель найден в executionParameters")
-                    print(f"   Имя: {initial_exec_param.get('driverFullName')}")
-                    print(f"   Телефон: {initial_exec_param.get('driverPhone')}")
-                    print(f"   Номер ТС: {initial_exec_param.get('vehiclePlateNumber')}")
-                    break
+            # Опрашиваем до появления водителя (нарастающая задержка, общий дедлайн)
+            result = poll(
+                lambda: self.check_driver_in_execution_params(lkz_client, request_id),
+                lambda param: bool(param and param.get("driverFullName"))
+            )
+            initial_exec_param = result.value
 
-                if attempt < max_attempts - 1:
-                    print(f"⏳ Ждем 3 секунды...")
-                    time.sleep(3)
-                else:
-                    print(f"⚠️ Водитель не найден после {max_attempts} попыток")
+            if result.success:
+                print(f"✅ Водитель найден в executionParameters за {result.elapsed:.2f} с")
+                print(f"   Имя: {initial_exec_param.get('driverFullName')}")
+                print(f"   Телефон: {initial_exec_param.get('driverPhone')}")
+                print(f"   Номер ТС: {initial_exec_param.get('vehiclePlateNumber')}")
+            else:
+                print(f"⚠️ Водитель не найден за {result.elapsed:.2f} с ({result.attempts} попыток)")
 
             if initial_exec_param:
                 print(f"\n📋 ИНФОРМАЦИЯ О ПЕРВОНАЧАЛЬНОМ ВОДИТЕЛЕ:")
@@ -228,74 +233,69 @@ class TestReplaceDriverExecutionParams:
 
             lkp_transport_replace.replace_transport(
                 truck_delivery_id=delivery_id_uuid,
-                driver_id=self.REPLACEMENT_DRIVER_ID,
-                vehicle_id=self.REPLACEMENT_VEHICLE_ID
+                driver_id=replacement_transport["driver_id"],
+                vehicle_id=replacement_transport["vehicle_id"]
             )
 
             print(f"✅ Транспорт заменен:")
-            print(f"   Новый водитель: {self.REPLACEMENT_DRIVER_ID}")
-            print(f"   Новое ТС: {self.REPLACEMENT_VEHICLE_ID}")
-
-        time.sleep(3)
+            print(f"   Новый водитель: {replacement_transport['driver_id']}")
+            print(f"   Новое ТС: {replacement_transport['vehicle_id']}")
 
         # ==================== 7. ПРОВЕРКА ЗАМЕНЫ ====================
         with allure.step("7. LKZ проверяет замененного водителя"):
             print(f"\n🔍 LKZ проверяет замененного водителя...")
 
-            # Проверяем несколько раз
-            max_attempts = 5
-            new_exec_param = None
-
-            for attempt in range(max_attempts):
-                print(f"🔍 Попытка {attempt + 1} из {max_attempts}...")
-
-                new_exec_param = self.check_driver_in_execution_params(lkz_client, request_id)
+            fields_to_compare = ["driverFullName", "driverPhone", "driverLicenseId", "vehiclePlateNumber"]
 
-                if new_exec_param and new_exec_param.get("driverFullName"):
-                    print(f"✅ Водитель найден в executionParameters")
+            def _replaced(param):
+                if not (param and param.get("driverFullName")):
+                    return False
+                if not initial_exec_param:
+                    return True
+                return any(initial_exec_param.get(f) != param.get(f) for f in fields_to_compare)
 
-                    # Проверяем что данные изменились
-                    if initial_exec_param:
-                        # Сравниваем ключевые поля
-                        fields_to_compare = ["driverFullName", "driverPhone", "driverLicenseId", "vehiclePlateNumber"]
-                        changes_detected = False
+            # Опрашиваем до появления изменённых данных водителя
+            result = poll(
+                lambda: self.check_driver_in_execution_params(lkz_client, request_id),
+                _replaced
+            )
+            new_exec_param = result.value
+            print(f"⏱ Ожидание замены: {result.elapsed:.2f} с, попыток: {result.attempts}")
 
-                        print(f"\n🔍 СРАВНЕНИЕ ДО И ПОСЛЕ ЗАМЕНЫ:")
-                        for field in fields_to_compare:
-                            old_value = initial_exec_param.get(field)
-                            new_value = new_exec_param.get(field)
+            if new_exec_param and new_exec_param.get("driverFullName"):
+                print(f"✅ Водитель найден в executionParameters")
 
-                            if old_value != new_value:
-                                print(f"  {field}: '{old_value}' → '{new_value}' ✅ ИЗМЕНИЛОСЬ")
-                                changes_detected = True
-                            else:
-                                print(f"  {field}: '{old_value}' → '{new_value}' ❌ НЕ ИЗМЕНИЛОСЬ")
+                # Проверяем что данные изменились
+                if initial_exec_param:
+                    print(f"\n🔍 СРАВНЕНИЕ ДО И ПОСЛЕ ЗАМЕНЫ:")
+                    for field in fields_to_compare:
+                        old_value = initial_exec_param.get(field)
+                        new_value = new_exec_param.get(field)
 
-                        if changes_detected:
-                            print(f"\n🎉 ЗАМЕНА ПОДТВЕРЖДЕНА!")
+                        if old_value != new_value:
+                            print(f"  {field}: '{old_value}' → '{new_value}' ✅ ИЗМЕНИЛОСЬ")
                         else:
-                            print(f"\n⚠️ Данные не изменились!")
-
-                    break
+                            print(f"  {field}: '{old_value}' → '{new_value}' ❌ НЕ ИЗМЕНИЛОСЬ")
 
-                if attempt < max_attempts - 1:
-                    print(f"⏳ Ждем 3 секунды...")
-                    time.sleep(3)
-                else:
-                    print(f"⚠️ Водитель не найден после {max_attempts} попыток")
+                    if result.success:
+                        print(f"\n🎉 ЗАМЕНА ПОДТВЕРЖДЕНА!")
+                    else:
+                        print(f"\n⚠️ Данные не изменились!")
+            else:
+                print(f"⚠️ Водитель не найден за {result.elapsed:.2f} с ({result.attempts} попыток)")
 
         # ==================== 8. НАЧАЛО РЕЙСА ====================
         with allure.step("8. LKP начинает рейс"):
             lkp_cargo_start = CargoDeliveriesStartClient(BASE_URL, lkp_token)
+            delivery_started = False
 
             try:
                 lkp_cargo_start.start_cargo_delivery(delivery_id_uuid)
+                delivery_started = True
                 print(f"✅ Рейс начат")
             except Exception as e:
                 print(f"⚠️ Не удалось начать рейс: {e}")
 
-        time.sleep(2)
-
         # ==================== 9. ЗАВЕРШЕНИЕ РЕЙСА ====================
         with allure.step("9. LKP завершает рейс"):
             try:
@@ -303,6 +303,15 @@ class TestReplaceDriverExecutionParams:
 
                 print(f"\n🔧 Завершаем рейс...")
 
+                if delivery_started:
+                    # Точки закрываются после перехода заявки в исполнение; не дождались - всё равно закрываем
+                    result = poll(
+                        lambda: lkp_client.get_delivery_request_details(request_id),
+                        lambda details: details.get("status") == "in_progress"
+                    )
+                    if not result.success:
+                        print(f"⚠️ Заявка не перешла в in_progress за {result.elapsed:.2f} с")
+
                 try:
                     lkp_points_update.complete_all_points(delivery_id_uuid)
                     print(f"✅ Рейс завершен")
@@ -0,0 +1,52 @@
+import asyncio
+import allure
+from utils.status_watcher import StatusWatcher
+
+
+class _FakeOrderClient:
+    """Заказ переходит в state=12 после заданного числа опросов."""
+
+    def __init__(self, ready_after: dict):
+        self.ready_after = ready_after
+        self.calls = {oid: 0 for oid in ready_after}
+
+    async def get_order_details(self, order_id):
+        self.calls[order_id] += 1
+        state = 12 if self.calls[order_id] >= self.ready_after[order_id] else 1
+        return {"state": state, "transportOrder": {"cargoPlaces": [{}] * 4}}
+
+
+@allure.feature("Утилиты")
+@allure.story("Наблюдение за статусами")
+@allure.description("StatusWatcher разрешает future каждой сущности и останавливается, когда все в целевом статусе")
+def test_watcher_stops_when_all_done():
+    client = _FakeOrderClient({1: 1, 2: 3, 3: 5})
+
+    async def scenario():
+        watcher = StatusWatcher(timeout=5, interval=0.01, max_interval=0.02)
+        futures = {oid: watcher.watch_order(client, oid, {12}, 4) for oid in client.ready_after}
+        results = await watcher.run()
+        return futures, results
+
+    futures, results = asyncio.run(scenario())
+
+    assert all(r.success for r in results.values())
+    assert futures[3].result().polls == 5
+    assert client.calls == {1: 1, 2: 3, 3: 5}
+
+
+@allure.feature("Утилиты")
+@allure.story("Наблюдение за статусами")
+@allure.description("По истечении дедлайна незавершённые сущности разрешаются с success=False")
+def test_watcher_timeout():
+    client = _FakeOrderClient({1: 10 ** 6})
+
+    async def scenario():
+        watcher = StatusWatcher(timeout=0.2, interval=0.01, max_interval=0.05)
+        watcher.watch_order(client, 1, {12})
+        return await watcher.run()
+
+    result = asyncio.run(scenario())[("order", 1)]
+
+    assert not result.success
+    assert result.value["state"] == 1
@@ -0,0 +1,94 @@
+import json
+import allure
+from utils.test_durations import DurationHistory, durations_from_allure, measured_durations
+
+SCENARIO = "scenarios/test_scenario_2_mass_orders.py::test_scenario_2_mass_orders"
+REPLACE = "tests/test_replace_driver_and_vehicle.py::test_replace_driver_and_vehicle[lkp]"
+
+
+def _history(tmp_path, durations):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(durations), encoding="utf-8")
+    return DurationHistory(str(path))
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("Порядок по длительности")
+@allure.description("Долгие тесты идут первыми, тест без истории оценивается медианой")
+def test_longest_first_and_estimates(tmp_path):
+    history = _history(tmp_path, {
+        SCENARIO: 600.0,
+        "tests/test_replace_driver_and_vehicle.py::test_replace_driver_and_vehicle": 120.0,
+        "tests/test_a.py::test_a": 1.0,
+        "tests/test_b.py::test_b[lkz]": 3.0,
+    })
+
+    assert history.estimate(REPLACE) == 120.0
+    assert history.estimate("tests/test_new.py::test_new") == 61.5
+    assert history.longest_first(["tests/test_a.py::test_a", REPLACE, SCENARIO]) == [
+        SCENARIO, REPLACE, "tests/test_a.py::test_a"
+    ]
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("Порядок по длительности")
+@allure.description("Модули идут по суммарной длительности, тесты модуля остаются подряд и в исходном порядке")
+def test_longest_modules_first_keeps_modules_together(tmp_path):
+    history = _history(tmp_path, {
+        "tests/test_a.py::test_fast": 1.0,
+        "tests/test_a.py::test_slow": 50.0,
+        "tests/test_b.py::test_one": 30.0,
+        "tests/test_b.py::test_two": 30.0,
+        "tests/test_c.py::test_c": 5.0,
+    })
+    order = ["tests/test_a.py::test_fast", "tests/test_c.py::test_c", "tests/test_a.py::test_slow",
+             "tests/test_b.py::test_one", "tests/test_b.py::test_two"]
+
+    assert history.longest_modules_first(order) == [
+        "tests/test_b.py::test_one", "tests/test_b.py::test_two",
+        "tests/test_a.py::test_fast", "tests/test_a.py::test_slow",
+        "tests/test_c.py::test_c",
+    ]
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("Шарды CI")
+@allure.description("Шарды близки по суммарной длительности, каждый тест попадает ровно в один шард")
+def test_shards_are_balanced(tmp_path):
+    durations = {f"tests/test_{i}.py::test_{i}": float(i) for i in range(1, 41)}
+    durations[SCENARIO] = 100.0
+    history = _history(tmp_path, durations)
+
+    shards = history.shards(list(durations), 4)
+
+    totals = [total for total, _ in shards]
+    assert max(totals) - min(totals) <= 40
+    assert sorted(nodeid for _, members in shards for nodeid in members) == sorted(durations)
+    assert shards[0][1][0] == SCENARIO
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("История длительностей")
+@allure.description("История пополняется из отчётов прогона и allure-results, пропущенные тесты не учитываются")
+def test_history_update_from_reports_and_allure(tmp_path):
+    results = tmp_path / "allure-results"
+    results.mkdir()
+    for name, status, duration_ms in (("a", "passed", 2000), ("b", "passed", 4000), ("c", "skipped", 0)):
+        (results / f"{name}-result.json").write_text(json.dumps({
+            "fullName": "tests.test_replace_driver_and_vehicle#test_replace_driver_and_vehicle",
+            "status": status, "start": 1000, "stop": 1000 + duration_ms,
+        }), encoding="utf-8")
+    assert durations_from_allure(str(results)) == {
+        "tests/test_replace_driver_and_vehicle.py::test_replace_driver_and_vehicle": 3.0
+    }
+
+    measured = measured_durations([
+        (REPLACE, "passed", 0.5), (REPLACE, "passed", 9.0), (REPLACE, "passed", 0.5),
+        ("tests/test_load.py::test_load", "skipped", 0.1),
+    ])
+    assert measured == {REPLACE: 10.0}
+
+    history = _history(tmp_path, {REPLACE: 20.0})
+    history.update(measured)
+    history.save()
+    assert DurationHistory(history.path).durations == {REPLACE: 15.0}
@@ -0,0 +1,60 @@
+import json
+import allure
+from scripts import test_stats
+
+
+def _write_result(directory, name, status, duration_ms, feature="Грузоместа"):
+    (directory / f"{name}-result.json").write_text(json.dumps({
+        "fullName": f"tests.test_{name}#test_{name}", "status": status,
+        "start": 1000, "stop": 1000 + duration_ms,
+        "labels": [{"name": "feature", "value": feature}],
+    }), encoding="utf-8")
+
+
+@allure.feature("Статистика прогонов")
+@allure.story("Агрегатор allure-results")
+@allure.description("Повторный запуск разбирает только новые файлы, параллельный разбор даёт тот же результат")
+def test_incremental_and_parallel_collection(tmp_path, monkeypatch):
+    results = tmp_path / "allure-results"
+    (results / "nested").mkdir(parents=True)
+    for i in range(30):
+        _write_result(results if i % 2 else results / "nested", f"t{i}", "passed", 100 * i)
+    (results / "abc-container.json").write_text(json.dumps({"children": []}), encoding="utf-8")
+    (results / "broken-result.json").write_text("{", encoding="utf-8")
+
+    cache = test_stats.load_cache(None)
+    monkeypatch.setattr(test_stats, "PARALLEL_THRESHOLD", 1)
+    records, parsed = test_stats.collect_results(str(results), cache, workers=2)
+    assert (len(records), parsed) == (30, 31)
+
+    _write_result(results, "new", "failed", 50)
+    (results / "t1-result.json").unlink()
+    records, parsed = test_stats.collect_results(str(results), cache)
+    assert (len(records), parsed) == (30, 1)
+    assert sum(record["status"] == "failed" for record in records) == 1
+
+
+@allure.feature("Статистика прогонов")
+@allure.story("Агрегатор allure-results")
+@allure.description("Вывод KEY=VALUE для Jenkins: прежние ключи, самые долгие тесты, итоги по feature и изменения")
+def test_summary_output(tmp_path, capsys, monkeypatch):
+    results = tmp_path / "allure-results"
+    results.mkdir()
+    _write_result(results, "slow", "passed", 600000, feature="Сценарии")
+    _write_result(results, "fast", "failed", 1500)
+    _write_result(results, "skip", "skipped", 0)
+    cache_path = str(tmp_path / "cache.json")
+    monkeypatch.setattr("sys.argv", ["test_stats.py", str(results), "--cache", cache_path, "--top", "2"])
+
+    test_stats.main()
+    _write_result(results, "other", "passed", 500)
+    test_stats.main()
+    # Второй вывод перекрывает первый
+    lines = dict(line.split("=", 1) for line in capsys.readouterr().out.splitlines())
+
+    assert (lines["PASSED"], lines["FAILED"], lines["TOTAL"], lines["PASSED_PERCENT"]) == ("2", "1", "4", "50")
+    assert (lines["PASSED_DELTA"], lines["TOTAL_DELTA"], lines["DURATION_DELTA"]) == ("+1", "+1", "+0.5")
+    assert lines["SLOWEST_1"] == "tests.test_slow#test_slow (600.0s)"
+    assert lines["FEATURE_1"] == "Сценарии: 1 тестов, 0 упало, 600.0s"
+    assert lines["FEATURE_2"] == "Грузоместа: 3 тестов, 1 упало, 2.0s"
+    assert test_stats.count_tests(str(results)) == (2, 1, 1, 0)
@@ -0,0 +1,80 @@
+import time
+import allure
+import pytest
+from local_api.app import LocalApiServer
+from local_api.state import ApiState
+from pages.truck_deliveries_details_page import TruckDeliveriesDetailsClient
+from utils import http_session
+from utils.api_helpers import login
+from utils.token_store import TokenStore, token_expires_at
+
+
+@pytest.fixture
+def credentials(monkeypatch):
+    monkeypatch.setenv("LKZ_EMAIL", "lkz-user")
+    monkeypatch.setenv("LKZ_PASSWORD", "secret")
+    monkeypatch.setenv("LKP_EMAIL", "lkp-user")
+    monkeypatch.setenv("LKP_PASSWORD", "secret")
+    monkeypatch.delenv("LKE_EMAIL", raising=False)
+
+
+@pytest.fixture
+def shared_transport(monkeypatch):
+    """Отдельная общая сессия и refresher на время теста."""
+    monkeypatch.setattr(http_session, "_shared_session", http_session.create_session())
+    yield
+    http_session.set_auth_refresher(None)
+    http_session.close_session()
+
+
+@allure.feature("Авторизация")
+@allure.story("Кэш токенов")
+@allure.description("Токен, записанный одним процессом, подхватывается другим без повторного входа")
+def test_token_shared_between_stores(tmp_path, credentials, shared_transport):
+    with LocalApiServer() as server:
+        first = TokenStore(tmp_path, server.base_url, login)
+        second = TokenStore(tmp_path, server.base_url, login)
+
+        assert first.login_all(["lkz", "lke", "lkp"]).keys() == {"lkz", "lkp"}
+        assert second.get("lkz") == first.get("lkz")
+        assert (first.logins, second.logins) == (2, 0)
+
+        other_env = TokenStore(tmp_path, server.base_url.replace("127.0.0.1", "localhost"), login)
+        assert other_env.get("lkz")["token"] != first.get("lkz")["token"]
+
+
+@allure.feature("Авторизация")
+@allure.story("Кэш токенов")
+@allure.description("Срок жизни берётся из exp токена, истекающий токен запрашивается заново")
+def test_expiring_token_is_renewed(tmp_path, credentials, shared_transport):
+    with LocalApiServer(state=ApiState(token_ttl=30)) as server:
+        store = TokenStore(tmp_path, server.base_url, login, refresh_margin=60)
+        token = store.get("lkz")["token"]
+
+        assert token_expires_at(token) == pytest.approx(time.time() + 30, abs=5)
+        assert store.get("lkz")["token"] != token
+        assert store.logins == 2
+
+
+@allure.feature("Авторизация")
+@allure.story("Кэш токенов")
+@allure.description("На 401 общий транспорт обновляет токен и повторяет запрос, клиент со старым токеном продолжает работать")
+def test_refresh_on_401_through_shared_transport(tmp_path, credentials, shared_transport):
+    state = ApiState(token_ttl=3600)
+    with LocalApiServer(state=state) as server:
+        store = TokenStore(tmp_path, server.base_url, login, refresh_margin=0)
+        http_session.set_auth_refresher(store)
+        stale = store.get("lkp")["token"]
+
+        # Сервер сменил ключ подписи - все выданные токены стали недействительны
+        state.secret = b"rotated"
+        client = TruckDeliveriesDetailsClient(server.base_url, stale)
+        response = client.session.get(f"{server.base_url}/dictionaries", headers=client.headers)
+
+        assert response.status_code == 200
+        assert store.logins == 2
+        assert store.resolve(stale) == store.get("lkp")["token"] != stale
+
+        # Следующий вызов со старым токеном идёт сразу с новым, без повторного входа
+        assert client.session.get(f"{server.base_url}/dictionaries", headers=client.headers).status_code == 200
+        assert store.logins == 2
@@ -0,0 +1,42 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+import allure
+from utils import http_metrics, unique_ids
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("Уникальные идентификаторы")
+@allure.description("Идентификаторы не повторяются между потоками и содержат id прогона и номер воркера xdist")
+def test_unique_ids_per_worker(monkeypatch):
+    # Модуль не перезагружается: общий счётчик _sequence не должен сбрасываться для остальных тестов воркера
+    monkeypatch.setattr(unique_ids, "_RUN_ID", "abcdef")
+    monkeypatch.setattr(unique_ids, "_WORKER_TAG", "w3")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    first = unique_ids.next_sequence()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = list(pool.map(lambda _: unique_ids.unique_id("EXT-GM-lkp"), range(2000)))
+
+    assert len(set(ids)) == len(ids)
+    assert all(re.fullmatch(r"EXT-GM-lkp-abcdef-w3-\d{5}", value) for value in ids)
+    assert min(int(value.rsplit("-", 1)[1]) for value in ids) > first
+    assert unique_ids.worker_id() == "gw3"
+
+
+@allure.feature("Параллельный запуск")
+@allure.story("Метрики воркеров")
+@allure.description("Файлы метрик воркеров объединяются в один отчёт и удаляются")
+def test_merge_worker_metrics(tmp_path):
+    path = str(tmp_path / "http-metrics.json")
+    for worker, count in (("gw0", 3), ("gw1", 2)):
+        metrics = http_metrics.HttpMetrics()
+        for _ in range(count):
+            metrics.record("GET", "https://host/v1/api-ext/tariffs/23762", 200, 10.0)
+        metrics.write_json(http_metrics.worker_metrics_path(path, worker))
+
+    merged = http_metrics.merge_worker_files(path)
+
+    assert merged.to_dict()["GET /tariffs/{id}"]["count"] == 5
+    assert http_metrics.HttpMetrics.read_json(path).to_dict() == merged.to_dict()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["http-metrics.json"]
+    assert http_metrics.merge_worker_files(str(tmp_path / "other.json")) is None
@@ -1,7 +1,6 @@
 import allure
 import pytest
 import uuid
-import time
 import random
 from datetime import datetime, timedelta
 from pages.cargo_delivery_page import CargoDeliveryClient
@@ -11,6 +10,7 @@ from pages.cargo_deliveries_start_page import CargoDeliveriesStartClient
 from pages.cargo_delivery_update_active_page import CargoDeliveryUpdateActiveClient
 from pages.truck_deliveries_points_update_page import TruckDeliveriesPointsUpdateClient
 from config.settings import BASE_URL
+from utils.polling import poll
 
 
 class TestUpdateActiveDeliveryRequest:
@@ -118,11 +118,15 @@ class TestUpdateActiveDeliveryRequest:
                 attachment_type=allure.attachment_type.TEXT
             )
 
-        time.sleep(2)  # Даем время на обработку
-
         # ==================== 2. ПРОВЕРЯЕМ СОЗДАНИЕ ====================
         with allure.step("2. Проверка создания заявки LKZ"):
-            details = lkz_client.get_delivery_request_details(request_id)
+            # Ждём появления заявки в нужном статусе вместо фиксированной паузы
+            result = poll(
+                lambda: lkz_client.get_delivery_request_details(request_id),
+                lambda d: d.get("status") == "waiting_producer_confirmation"
+            )
+            print(f"⏱ Ожидание статуса: {result.elapsed:.2f} с, попыток: {result.attempts}")
+            details = result.last_value()
             initial_status = details["status"]
 
             assert initial_status == "waiting_producer_confirmation", \
@@ -148,11 +152,14 @@ class TestUpdateActiveDeliveryRequest:
                 attachment_type=allure.attachment_type.TEXT
             )
 
-        time.sleep(3)  # Даем время на обновление статуса
-
         # ==================== 4. ПРОВЕРЯЕМ СТАТУС ПОСЛЕ ПРИНЯТИЯ ====================
         with allure.step("4. Проверка статуса после принятия"):
-            details = lkz_client.get_delivery_request_details(request_id)
+            result = poll(
+                lambda: lkz_client.get_delivery_request_details(request_id),
+                lambda d: d.get("status") in ["confirmed", "in_progress"]
+            )
+            print(f"⏱ Ожидание статуса: {result.elapsed:.2f} с, попыток: {result.attempts}")
+            details = result.last_value()
             confirmed_status = details["status"]
 
             # Статус должен быть 'confirmed' или аналогичный
@@ -163,6 +170,7 @@ class TestUpdateActiveDeliveryRequest:
 
         # ==================== 5. LKP СОЗДАЕТ РЕЙС (TD) ====================
         with allure.step("5. LKP создает рейс внутри заявки"):
+            # Предусловие (статус после принятия) проверено на шаге 4 - рейс создаётся один раз
             lkp_cargo_create = CargoDeliveriesCreateClient(BASE_URL, lkp_token)
 
             delivery_id_uuid = lkp_cargo_create.create_cargo_delivery(
@@ -178,12 +186,12 @@ class TestUpdateActiveDeliveryRequest:
                 attachment_type=allure.attachment_type.TEXT
             )
 
-        time.sleep(2)
-
         # ==================== 6. LKP НАЗНАЧАЕТ ВОДИТЕЛЯ И ТС ====================
         with allure.step("6. LKP назначает водителя и ТС на рейс"):
             lkp_transport_appoint = TruckDeliveriesTransportAppointClient(BASE_URL, lkp_token)
 
+            # Ждём появления рейса в заявке, затем назначаем один раз (повтор может задвоить назначение)
+            lkp_client.wait_for_delivery_in_request(request_id, delivery_id_uuid)
             appoint_result = lkp_transport_appoint.appoint_transport(
                 truck_delivery_id=delivery_id_uuid,  # ID рейса
                 driver_id=self.LKP_DRIVER_ID,
@@ -192,12 +200,13 @@ class TestUpdateActiveDeliveryRequest:
 
             print(f"✅ Назначены водитель {self.LKP_DRIVER_ID} и ТС {self.LKP_VEHICLE_ID}")
 
-        time.sleep(2)
-
         # ==================== 7. LKP НАЧИНАЕТ ИСПОЛНЕНИЕ РЕЙСА ====================
         with allure.step("7. LKP начинает исполнение рейса"):
             lkp_cargo_start = CargoDeliveriesStartClient(BASE_URL, lkp_token)
 
+            # Рейс можно начать, когда назначенный водитель виден в заявке
+            assert lkp_client.verify_driver_change_in_request(request_id), \
+                f"Водитель не появился в заявке {request_id} после назначения"
             start_result = lkp_cargo_start.start_cargo_delivery(
                 cargo_delivery_id=delivery_id_uuid  # Тот же ID рейса
             )
@@ -275,29 +284,19 @@ class TestUpdateActiveDeliveryRequest:
                 # Пропускаем тест если не можем отредактировать
                 pytest.skip(f"Не удалось отредактировать заявку: {e}")
 
-        time.sleep(3)  # Даем больше времени на синхронизацию
-
         # ==================== 10. ПРОВЕРЯЕМ ДАННЫЕ У LKZ ====================
         with allure.step("10. Проверка обновленного комментария заявки у LKZ"):
-            # Ждем обновления с повторными попытками
-            max_attempts = 5
-            updated_comment = None
-
-            for attempt in range(max_attempts):
-                details_lkz = lkz_client.get_delivery_request_details(request_id)
-                current_comment = details_lkz.get("comment")
-
-                print(f" Попытка {attempt + 1}: комментарий LKZ = '{current_comment}'")
-
-                if current_comment == new_comment:
-                    updated_comment = current_comment
-                    print(f"✅ Комментарий обновлен на попытке {attempt + 1}")
-                    break
+            # Ждем обновления: опрос с нарастающей задержкой до общего дедлайна
+            result = poll(
+                lambda: lkz_client.get_delivery_request_details(request_id),
+                lambda d: d.get("comment") == new_comment
+            )
+            details_lkz = result.last_value()
 
-                if attempt < max_attempts - 1:
-                    time.sleep(2)
-                else:
-                    print(f"⚠️ Комментарий не обновился после {max_attempts} попыток")
+            if result.success:
+                print(f"✅ Комментарий обновлен за {result.elapsed:.2f} с (попыток: {result.attempts})")
+            else:
+                print(f"⚠️ Комментарий не обновился за {result.elapsed:.2f} с ({result.attempts} попыток)")
 
             print(f"📋 Проверка данных LKZ:")
             print(f"   Статус: {details_lkz.get('status')}")
@@ -351,9 +350,14 @@ class TestUpdateActiveDeliveryRequest:
                     complete_result = lkp_points_update.complete_all_points(delivery_id_uuid)
                     print(f"✅ Рейс завершен. Транспорт освобожден.")
 
-                    # Проверяем статус через 2 секунды
-                    time.sleep(2)
-                    details = lkz_client.get_delivery_request_details(request_id)
+                    # Ждём перехода рейса в completed
+                    details = poll(
+                        lambda: lkz_client.get_delivery_request_details(request_id),
+                        lambda d: any(
+                            e.get("id") == delivery_id_uuid and e.get("status") == "completed"
+                            for e in d.get("outgoingEntities", [])
+                        )
+                    ).value or {}
                     for entity in details.get("outgoingEntities", []):
                         if entity.get("id") == delivery_id_uuid:
                             status = entity.get('status')
@@ -0,0 +1,148 @@
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+from config.settings import BULK_P99_BUDGET_MS, BULK_ERROR_BUDGET
+
+
+@dataclass
+class TuningDecision:
+    """Изменение параметров тюнера и его причина (для отчёта)."""
+    epoch: int
+    chunk_size: int
+    concurrency: int
+    reason: str
+
+
+@dataclass
+class _Window:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def p99(self) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)] if ordered else 0.0
+
+
+class AimdTuner:
+    """
+    Подбор размера пачки и числа параллельных запросов массовых эндпоинтов на ходу,
+    по схеме AIMD (аддитивный рост, мультипликативный спад), как окно перегрузки TCP.
+
+    После каждых window ответов: если p99 задержки окна и доля ошибок в бюджетах
+    (p99 < p99_budget_ms * headroom, ошибки <= error_budget) - пачка растёт на chunk_step,
+    параллельность на 1; если бюджет превышен - оба параметра умножаются на backoff.
+    Таймаут, обрыв соединения и 429 - сигнал перегрузки сразу, без ожидания конца окна.
+
+    Ответы на запросы, отправленные до последнего изменения параметров (epoch), в окно
+    не попадают: они описывают старый режим и не должны повторно "наказывать" уже уменьшенную пачку.
+    Потокобезопасен - им пользуются рабочие потоки загрузчика.
+    """
+
+    def __init__(
+            self,
+            initial_chunk: int = 100,
+            min_chunk: int = 1,
+            max_chunk: int = 1000,
+            chunk_step: Optional[int] = None,
+            initial_concurrency: int = 2,
+            max_concurrency: int = 8,
+            p99_budget_ms: float = BULK_P99_BUDGET_MS,
+            error_budget: float = BULK_ERROR_BUDGET,
+            window: int = 8,
+            backoff: float = 0.5,
+            headroom: float = 0.8
+    ):
+        self.min_chunk, self.max_chunk = min_chunk, max_chunk
+        self.chunk_step = chunk_step or max(1, max_chunk // 20)
+        self.max_concurrency = max_concurrency
+        self.p99_budget_ms = p99_budget_ms
+        self.error_budget = error_budget
+        self.window = window
+        self.backoff = backoff
+        self.headroom = headroom
+
+        self._chunk = float(min(max(initial_chunk, min_chunk), max_chunk))
+        self._concurrency = float(min(max(initial_concurrency, 1), max_concurrency))
+        self._epoch = 0
+        self._current = _Window()
+        self._lock = threading.Lock()
+        self.decisions: List[TuningDecision] = []
+
+    # ==================== ТЕКУЩИЕ ПАРАМЕТРЫ ====================
+
+    @property
+    def chunk_size(self) -> int:
+        return int(self._chunk)
+
+    @property
+    def concurrency(self) -> int:
+        return int(self._concurrency)
+
+    @property
+    def epoch(self) -> int:
+        """Номер режима: запоминается при отправке пачки и передаётся в observe()."""
+        return self._epoch
+
+    # ==================== НАБЛЮДЕНИЯ ====================
+
+    def observe(self, epoch: int, latency_ms: float, error: bool = False, overload: bool = False) -> None:
+        """
+        Результат одного запроса пачки.
+        :param epoch: значение self.epoch на момент отправки
+        :param error: запрос не выполнен (5xx, исключение)
+        :param overload: явный сигнал перегрузки (таймаут, обрыв, 429) - спад сразу
+        """
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            if overload:
+                self._decrease(f"перегрузка ({latency_ms:.0f} мс)")
+                return
+            self._current.latencies.append(latency_ms)
+            self._current.errors += error
+            if self._current.count < self.window:
+                return
+
+            p99, error_rate = self._current.p99(), self._current.errors / self._current.count
+            if error_rate > self.error_budget:
+                self._decrease(f"ошибки {error_rate:.0%} > {self.error_budget:.0%}")
+            elif p99 > self.p99_budget_ms:
+                self._decrease(f"p99 {p99:.0f} мс > {self.p99_budget_ms:.0f} мс")
+            elif p99 < self.p99_budget_ms * self.headroom:
+                self._increase(f"p99 {p99:.0f} мс, ошибки {error_rate:.0%}")
+            else:
+                # Около границы бюджета - держим режим, копим новое окно
+                self._current = _Window()
+
+    def _increase(self, reason: str) -> None:
+        chunk = min(self._chunk + self.chunk_step, self.max_chunk)
+        concurrency = min(self._concurrency + 1, self.max_concurrency)
+        self._apply(chunk, concurrency, f"рост: {reason}")
+
+    def _decrease(self, reason: str) -> None:
+        chunk = max(self._chunk * self.backoff, self.min_chunk)
+        concurrency = max(self._concurrency * self.backoff, 1)
+        self._apply(chunk, concurrency, f"спад: {reason}")
+
+    def _apply(self, chunk: float, concurrency: float, reason: str) -> None:
+        changed = int(chunk) != self.chunk_size or int(concurrency) != self.concurrency
+        self._chunk, self._concurrency = chunk, concurrency
+        self._current = _Window()
+        if changed:
+            self._epoch += 1
+            self.decisions.append(TuningDecision(self._epoch, self.chunk_size, self.concurrency, reason))
+
+    # ==================== ОТЧЁТ ====================
+
+    def summary(self) -> str:
+        lines = [f"Итог: пачка {self.chunk_size}, параллельно {self.concurrency} "
+                 f"(изменений: {len(self.decisions)})"]
+        lines += [f"  #{d.epoch}: пачка {d.chunk_size}, параллельно {d.concurrency} - {d.reason}"
+                  for d in self.decisions[-20:]]
+        return "\n".join(lines)
+
@@ -0,0 +1,136 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from config.settings import TIMEOUT
+from utils.http_session import get_session
+
+# Сколько точек запрашивать из /contractor-point/list-info за один раз
+LIST_INFO_PAGE_SIZE = 1000
+
+
+class AddressRepository:
+    """
+    Кэш адресов (contractor-point) одной роли в одном окружении.
+
+    Список /contractor-point/list-info загружается один раз при первом обращении
+    и индексируется по id и externalId. Созданные/обновлённые через
+    AddressPage.create_or_update_address адреса добавляются в индекс на месте,
+    без повторной загрузки всего списка.
+    """
+
+    def __init__(self, base_url: str, token: str, items_per_page: int = LIST_INFO_PAGE_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.items_per_page = items_per_page
+        self._points: List[dict] = []
+        self._by_id: Dict[int, dict] = {}
+        self._by_external_id: Dict[str, dict] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, force: bool = False) -> None:
+        """Загрузить список адресов (один запрос); force=True - перечитать заново."""
+        with self._lock:
+            if self._loaded and not force:
+                return
+
+            response = get_session().post(
+                f"{self.base_url}/contractor-point/list-info",
+                headers={"Authorization": self.token},
+                json={"itemsPerPage": self.items_per_page},
+                timeout=TIMEOUT
+            )
+            response.raise_for_status()
+
+            self._points, self._by_id, self._by_external_id = [], {}, {}
+            for point in response.json().get("points", []):
+                self._index(point)
+            self._loaded = True
+
+    def _index(self, point: dict) -> None:
+        existing = self._by_id.get(point.get("id")) or self._by_external_id.get(point.get("externalId"))
+        if existing is not None:
+            # Обновляем запись на месте, чтобы порядок списка не менялся
+            old_external_id = existing.get("externalId")
+            existing.update(point)
+            if old_external_id != existing.get("externalId"):
+                self._by_external_id.pop(old_external_id, None)
+            point = existing
+        else:
+            self._points.append(point)
+
+        if point.get("id"):
+            self._by_id[point["id"]] = point
+        if point.get("externalId"):
+            self._by_external_id[point["externalId"]] = point
+
+    # ==================== ПОИСК ====================
+
+    def all(self) -> List[dict]:
+        """Все адреса роли (копии)."""
+        self.load()
+        with self._lock:
+            return [dict(p) for p in self._points]
+
+    def get(self, point_id: int) -> Optional[dict]:
+        """Адрес по id или None."""
+        self.load()
+        with self._lock:
+            point = self._by_id.get(point_id)
+            return dict(point) if point else None
+
+    def find_by_external_id(self, external_id: str) -> Optional[dict]:
+        """Адрес по externalId или None."""
+        self.load()
+        with self._lock:
+            point = self._by_external_id.get(external_id)
+            return dict(point) if point else None
+
+    def valid_points(self) -> List[dict]:
+        """Адреса с id и непустым externalId (кроме "unknown") - пригодные для грузомест и заявок."""
+        return [
+            p for p in self.all()
+            if p.get("id")
+               and isinstance(p.get("externalId"), str)
+               and p["externalId"].strip()
+               and p["externalId"].strip().lower() != "unknown"
+        ]
+
+    # ==================== ОБНОВЛЕНИЕ ====================
+
+    def upsert(self, point: dict) -> None:
+        """
+        Добавить или обновить адрес в индексе.
+        Если список ещё не загружался, ничего не делаем - адрес придёт при первой загрузке.
+        """
+        with self._lock:
+            if self._loaded:
+                self._index(dict(point))
+
+    def invalidate(self) -> None:
+        """Сбросить кэш: следующий запрос перечитает список."""
+        with self._lock:
+            self._loaded = False
+
+
+# Репозитории по (base_url, token): токен определяет роль, base_url - окружение
+_repositories: Dict[Tuple[str, str], AddressRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def get_address_repository(base_url: str, token: str) -> AddressRepository:
+    """Общий на процесс репозиторий адресов для роли (токена) и окружения (base_url)."""
+    key = (base_url.rstrip('/'), token)
+    with _repositories_lock:
+        if key not in _repositories:
+            _repositories[key] = AddressRepository(base_url, token)
+        return _repositories[key]
+
+
+def clear_address_repositories() -> None:
+    """Сбросить все репозитории (используется фикстурой address_repository в конце сессии)."""
+    with _repositories_lock:
+        _repositories.clear()
@@ -1,28 +1,37 @@
-import requests
+import os
 from config.settings import BASE_URL, TIMEOUT
+from utils.address_repository import get_address_repository
+from utils.http_session import get_session
 
 
-def get_two_valid_addresses(headers: dict) -> tuple[dict, dict]:
-    resp = requests.post(
-        f"{BASE_URL}/contractor-point/list-info",
-        headers=headers,
-        json={"itemsPerPage": 200},
+def login(role: str, base_url: str = BASE_URL, session=None) -> dict:
+    """
+    Авторизация под ролью (lkz / lke / lkp) по учётным данным из окружения.
+    Возвращает {"token": ..., "role": ...}. Используется фикстурой get_auth_token и CLI-скриптами.
+    """
+    email = os.getenv(f"{role.upper()}_EMAIL")
+    password = os.getenv(f"{role.upper()}_PASSWORD")
+    if not email or not password:
+        raise ValueError(f"Данные для {role} не найдены в .env")
+
+    response = (session or get_session()).post(
+        f"{base_url}/user/login",
+        json={"username": email, "password": password},
         timeout=TIMEOUT
     )
-    resp.raise_for_status()
-    points = resp.json().get("points", [])
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    data = response.json()
+    return {"token": data["token"], "role": data["role"]}
+
+
+def get_two_valid_addresses(headers: dict) -> tuple[dict, dict]:
+    repository = get_address_repository(BASE_URL, headers["Authorization"])
 
     # Фильтруем: externalId должен быть непустой строкой И не "unknown"
-    valid = [
-        p for p in points
-        if p.get("externalId")
-           and isinstance(p["externalId"], str)
-           and p["externalId"].strip().lower() != "unknown"
-           and p.get("id")
-    ]
+    valid = repository.valid_points()
 
     assert len(valid) >= 2, (
         f"Недостаточно валидных адресов (без 'unknown'): {len(valid)}\n"
-        f"Доступные externalId: {[p.get('externalId') for p in points[:10]]}"
+        f"Доступные externalId: {[p.get('externalId') for p in repository.all()[:10]]}"
     )
     return valid[0], valid[1]
\ No newline at end of file
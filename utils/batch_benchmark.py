@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import allure
+import requests
+from config.settings import TIMEOUT
+from pages.mass_shipment_task_page import generate_random_task_item
+from utils.http_session import get_session
+
+# Размеры пачек по умолчанию
+DEFAULT_BATCH_SIZES = (1, 10, 100, 500, 1000, 5000)
+
+# Рекомендуемый размер - наименьший, дающий эту долю максимальной пропускной способности
+KNEE_FRACTION = 0.9
+
+
+@dataclass
+class BatchSample:
+    """
+    Один запрос пачки, мс. serialize - json.dumps тела; server - от отправки до заголовков ответа
+    (загрузка тела запроса, обработка на сервере, сеть); download - чтение тела ответа; parse - json ответа.
+    """
+    batch_size: int
+    serialize_ms: float
+    server_ms: float
+    download_ms: float
+    parse_ms: float
+    request_bytes: int
+    status: Optional[int]
+    failed_items: int = 0
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        return self.serialize_ms + self.server_ms + self.download_ms + self.parse_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.failed_items == 0
+
+
+@dataclass
+class BatchPoint:
+    """Медианы по повторам одного размера пачки."""
+    batch_size: int
+    samples: List[BatchSample] = field(default_factory=list)
+
+    def _median(self, attr: str) -> float:
+        values = [getattr(s, attr) for s in self.samples if s.error is None]
+        return statistics.median(values) if values else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total_ms = self._median("total_ms")
+        return {
+            "batch_size": self.batch_size,
+            "repeats": len(self.samples),
+            "errors": sum(not s.ok for s in self.samples),
+            "serialize_ms": round(self._median("serialize_ms"), 2),
+            "server_ms": round(self._median("server_ms"), 2),
+            "download_ms": round(self._median("download_ms"), 2),
+            "parse_ms": round(self._median("parse_ms"), 2),
+            "total_ms": round(total_ms, 2),
+            "max_total_ms": round(max((s.total_ms for s in self.samples if s.error is None), default=0.0), 2),
+            "request_kb": round(self._median("request_bytes") / 1024, 1),
+            "per_item_ms": round(total_ms / self.batch_size, 3),
+            "items_per_s": round(self.batch_size / (total_ms / 1000), 1) if total_ms else 0.0,
+            "last_error": next((s.error or f"ошибок в позициях: {s.failed_items}"
+                                for s in reversed(self.samples) if not s.ok), None),
+        }
+
+
+@dataclass
+class BatchCurve:
+    """Кривая "пропускная способность - размер пачки" и рекомендуемый размер."""
+    endpoint: str
+    points: List[BatchPoint]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.endpoint,
+            "recommended_batch_size": self.recommended_batch_size(),
+            "points": [p.to_dict() for p in self.points],
+        }
+
+    def recommended_batch_size(self, max_latency_ms: Optional[float] = None) -> Optional[int]:
+        """
+        Наименьший размер без ошибок, дающий KNEE_FRACTION от лучшей пропускной способности:
+        дальше рост пачки почти не ускоряет загрузку, но увеличивает задержку и цену ошибки.
+        max_latency_ms отбрасывает размеры, худший запрос которых дольше (например, таймаута клиента).
+        """
+        rows = [p.to_dict() for p in self.points]
+        rows = [r for r in rows if not r["errors"] and r["items_per_s"]
+                and (max_latency_ms is None or r["max_total_ms"] <= max_latency_ms)]
+        if not rows:
+            return None
+        best = max(r["items_per_s"] for r in rows)
+        return min(r["batch_size"] for r in rows if r["items_per_s"] >= KNEE_FRACTION * best)
+
+    def summary_table(self) -> str:
+        rows = [p.to_dict() for p in self.points]
+        best = max((r["items_per_s"] for r in rows), default=0.0) or 1.0
+        header = (f"{'пачка':>6} {'повт.':>5} {'ош.':>4} {'сериал.':>8} {'сервер':>9} {'чтение':>8} "
+                  f"{'разбор':>8} {'всего':>9} {'мс/шт':>8} {'шт/с':>9}  кривая")
+        lines = [f"Размер пачки: {self.endpoint}", header, "-" * (len(header) + 20)]
+        for r in rows:
+            bar = "█" * round(20 * r["items_per_s"] / best)
+            lines.append(
+                f"{r['batch_size']:>6} {r['repeats']:>5} {r['errors']:>4} {r['serialize_ms']:>8.1f} "
+                f"{r['server_ms']:>9.1f} {r['download_ms']:>8.1f} {r['parse_ms']:>8.1f} {r['total_ms']:>9.1f} "
+                f"{r['per_item_ms']:>8.3f} {r['items_per_s']:>9.1f}  {bar}"
+            )
+        for r in rows:
+            if r["last_error"]:
+                lines.append(f"⚠️ пачка {r['batch_size']}: {r['last_error']}")
+        lines.append(f"Медианы по повторам, мс. Рекомендуемый размер пачки: {self.recommended_batch_size()}")
+        return "\n".join(lines)
+
+    def to_csv(self) -> str:
+        rows = [p.to_dict() for p in self.points]
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        return buffer.getvalue()
+
+    def attach_to_allure(self, name: str = "Размер пачки") -> None:
+        allure.attach(self.summary_table(), name=f"{name}: сводка", attachment_type=allure.attachment_type.TEXT)
+        allure.attach(self.to_csv(), name=f"{name}: кривая", attachment_type=allure.attachment_type.CSV)
+        allure.attach(
+            json.dumps(self.to_dict(), ensure_ascii=False, indent=2),
+            name=f"{name}: JSON",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+
+class BatchBenchmark:
+    """
+    Прогон эндпоинта массового создания по размерам пачек: для каждого размера repeats запросов
+    (после warmup разогревающих), фазы запроса замеряются отдельно, чтобы было видно,
+    где растёт стоимость - на клиенте (сериализация, разбор) или на сервере.
+
+    Тело сериализуется заранее и отправляется байтами, поэтому время сервера не включает json.dumps.
+    Успешно созданные id собираются в created_ids для последующего удаления.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            token: str,
+            endpoint: str = "/shipment/tasks/create-list",
+            make_item: Callable[[], Dict[str, Any]] = generate_random_task_item,
+            session: Optional[requests.Session] = None,
+            timeout: float = TIMEOUT
+    ):
+        self.url = f"{base_url.rstrip('/')}{endpoint}"
+        self.endpoint = endpoint
+        self.headers = {"Authorization": token, "Content-Type": "application/json"}
+        self.make_item = make_item
+        self.session = session or get_session()
+        self.timeout = timeout
+        self.created_ids: List[str] = []
+
+    def measure(self, batch_size: int) -> BatchSample:
+        items = [self.make_item() for _ in range(batch_size)]
+
+        started = time.perf_counter()
+        body = json.dumps({"data": items}).encode("utf-8")
+        serialized = time.perf_counter()
+        try:
+            response = self.session.post(self.url, data=body, headers=self.headers, timeout=self.timeout, stream=True)
+            headers_at = time.perf_counter()
+            content = response.content
+            downloaded = time.perf_counter()
+        except requests.RequestException as e:
+            return BatchSample(batch_size, (serialized - started) * 1000, (time.perf_counter() - serialized) * 1000,
+                               0.0, 0.0, len(body), None, error=f"{type(e).__name__}: {e}")
+
+        sample = BatchSample(
+            batch_size=batch_size,
+            serialize_ms=(serialized - started) * 1000,
+            server_ms=(headers_at - serialized) * 1000,
+            download_ms=(downloaded - headers_at) * 1000,
+            parse_ms=0.0,
+            request_bytes=len(body),
+            status=response.status_code,
+        )
+        if response.status_code != 200:
+            sample.error = f"HTTP {response.status_code}: {response.text[:200]}"
+            return sample
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            sample.error = f"{type(e).__name__}: {e}"
+            return sample
+        sample.parse_ms = (time.perf_counter() - downloaded) * 1000
+
+        results = data.get("data", []) if isinstance(data, dict) else []
+        self.created_ids.extend(item["id"] for item in results if item.get("id"))
+        sample.failed_items = batch_size - sum(item.get("status") == "ok" for item in results)
+        return sample
+
+    def run(self, sizes: Sequence[int] = DEFAULT_BATCH_SIZES, repeats: int = 3, warmup: int = 1) -> BatchCurve:
+        for _ in range(warmup):
+            self.measure(min(sizes))
+        points = []
+        for size in sizes:
+            point = BatchPoint(size)
+            for _ in range(repeats):
+                point.samples.append(self.measure(size))
+            points.append(point)
+        return BatchCurve(f"POST {self.endpoint}", points)
@@ -0,0 +1,204 @@
+import threading
+import time
+import random
+import allure
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+from config.settings import BASE_URL, TIMEOUT, BULK_MAX_WORKERS, BULK_RATE_LIMIT
+from utils.http_session import get_session
+
+# Статусы, при которых запрос имеет смысл повторить
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+# Эндпоинты удаления сущностей, которые создаёт набор тестов
+DELETE_ENDPOINTS = {
+    "shipment_task": "/shipment/tasks/{id}/delete",
+}
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket: не больше rate запросов в секунду в среднем,
+    с допустимым всплеском до capacity запросов подряд.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Блокирует вызывающий поток, пока не освободится токен."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TransientError(Exception):
+    """Временная ошибка ответа (429/5xx) - операцию можно повторить."""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}: {response.text[:200]}")
+        self.response = response
+
+
+@dataclass
+class BulkOutcome:
+    """Результат операции над одним элементом."""
+    item: Any
+    success: bool
+    attempts: int
+    result: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkReport:
+    """Сводный отчёт массовой операции."""
+    title: str
+    outcomes: List[BulkOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BulkOutcome]:
+        return [o for o in self.outcomes if o.success]
+
+    @property
+    def failed(self) -> List[BulkOutcome]:
+        return [o for o in self.outcomes if not o.success]
+
+    @property
+    def retried(self) -> int:
+        return sum(1 for o in self.outcomes if o.attempts > 1)
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.title}: успешно {len(self.succeeded)} из {len(self.outcomes)} за {self.elapsed:.2f} с",
+            f"Повторных попыток понадобилось: {self.retried}",
+        ]
+        if self.failed:
+            lines.append("")
+            lines.append("Ошибки:")
+            lines.extend(f"ID: {o.item}, попыток: {o.attempts}, ошибка: {o.error}" for o in self.failed)
+        return "\n".join(lines)
+
+    def attach_to_allure(self) -> None:
+        """Добавить сводку в Allure отдельным шагом с вложением."""
+        mark = "✅" if not self.failed else "⚠️"
+        with allure.step(f"{mark} {self.title}: {len(self.succeeded)}/{len(self.outcomes)}"):
+            allure.attach(
+                self.summary(),
+                name=self.title,
+                attachment_type=allure.attachment_type.TEXT
+            )
+
+
+class BulkExecutor:
+    """
+    Параллельное выполнение однотипной операции над множеством элементов
+    (удаление созданных тестами сущностей и т.п.).
+
+    - не больше max_workers одновременных запросов (потоки над общей keep-alive сессией);
+    - ограничение частоты через TokenBucket (rate запросов в секунду);
+    - повтор временных ошибок (TransientError, сетевые ошибки) с экспоненциальной задержкой;
+    - один сводный BulkReport вместо отдельного шага на каждый элемент.
+    """
+
+    def __init__(
+            self,
+            action: Callable[[Any], Any],
+            max_workers: int = BULK_MAX_WORKERS,
+            rate: float = BULK_RATE_LIMIT,
+            retries: int = 3,
+            retry_delay: float = 0.5
+    ):
+        """
+        :param action: функция над одним элементом; исключение - ошибка, TransientError - повторяемая ошибка
+        :param retries: сколько раз повторять временную ошибку
+        """
+        self.action = action
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    def _run_one(self, item: Any) -> BulkOutcome:
+        attempts = 0
+        while True:
+            attempts += 1
+            self.bucket.acquire()
+            try:
+                return BulkOutcome(item, True, attempts, result=self.action(item))
+            except (TransientError, requests.ConnectionError, requests.Timeout) as e:
+                if attempts > self.retries:
+                    return BulkOutcome(item, False, attempts, error=str(e))
+                delay = self.retry_delay * 2 ** (attempts - 1)
+                time.sleep(delay * random.uniform(0.8, 1.2))
+            except Exception as e:
+                return BulkOutcome(item, False, attempts, error=str(e))
+
+    def run(self, items: Iterable[Any], title: str = "Массовая операция") -> BulkReport:
+        """Выполнить action для всех элементов; порядок outcomes совпадает с порядком items."""
+        items = list(items)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            outcomes = list(pool.map(self._run_one, items))
+        return BulkReport(title, outcomes, time.monotonic() - started)
+
+
+def make_request_action(
+        token: str,
+        path_template: str,
+        method: str = "DELETE",
+        base_url: str = BASE_URL,
+        ok_statuses: Iterable[int] = (200,)
+) -> Callable[[Any], Any]:
+    """
+    Операция "один запрос на элемент" для BulkExecutor: path_template с плейсхолдером {id}.
+    Статусы из TRANSIENT_STATUSES поднимают TransientError (будет повтор), прочие не-ok - RuntimeError.
+    """
+    headers = {"Authorization": token}
+    ok = set(ok_statuses)
+
+    def action(entity_id):
+        url = f"{base_url}{path_template.format(id=entity_id)}"
+        response = get_session().request(method, url, headers=headers, timeout=TIMEOUT)
+        if response.status_code in ok:
+            return response.status_code
+        if response.status_code in TRANSIENT_STATUSES:
+            raise TransientError(response)
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    return action
+
+
+def bulk_delete(
+        token: str,
+        entity: str,
+        ids: Iterable[Any],
+        path_template: Optional[str] = None,
+        **executor_kwargs
+) -> BulkReport:
+    """
+    Удалить сущности пачкой и приложить сводку к Allure.
+
+    :param entity: ключ DELETE_ENDPOINTS (например, "shipment_task")
+    :param path_template: свой эндпоинт удаления с {id}, если сущности нет в DELETE_ENDPOINTS
+    """
+    template = path_template or DELETE_ENDPOINTS[entity]
+    executor = BulkExecutor(make_request_action(token, template), **executor_kwargs)
+    report = executor.run(ids, title=f"Удаление: {entity}")
+    report.attach_to_allure()
+    print(report.summary())
+    return report
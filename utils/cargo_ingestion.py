@@ -0,0 +1,313 @@
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import requests
+from pages.cargo_create_list_page import CargoPlaceListClient
+from pages.cargo_create_or_update_list_page import CargoPlaceCreateOrUpdateListClient
+from pages.mass_shipment_task_page import ShipmentTaskListClient
+from pages.replace_planned_pairs_page import ReplacePlannedPairsClient
+from utils.adaptive_batching import AimdTuner
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 2
+# Базовая задержка перед повтором пачки, не обработанной целиком (растёт вдвое с каждой попыткой)
+DEFAULT_RETRY_DELAY = 0.5
+
+
+@dataclass
+class IngestItemResult:
+    """Результат загрузки одного грузоместа; index - позиция во входном потоке."""
+    index: int
+    spec: Dict[str, Any]
+    success: bool
+    id: Optional[Any] = None
+    status: Optional[str] = None
+    errors: List[Any] = field(default_factory=list)
+    attempts: int = 1
+
+
+@dataclass
+class IngestReport:
+    """Итоги загрузки: счётчики и неуспешные элементы (успешные не хранятся - поток может быть большим)."""
+    total: int = 0
+    succeeded: int = 0
+    retried: int = 0
+    chunks: int = 0
+    failed: List[IngestItemResult] = field(default_factory=list)
+    # Ход подбора пачки и параллельности в адаптивном режиме
+    tuning: Optional[str] = None
+
+    def summary(self) -> str:
+        summary = (
+            f"Загружено {self.succeeded} из {self.total} грузомест "
+            f"({self.chunks} пачек, повторно отправлено: {self.retried}, ошибок: {len(self.failed)})"
+        )
+        return f"{summary}\n{self.tuning}" if self.tuning else summary
+
+
+@dataclass
+class _Pending:
+    index: int
+    spec: Dict[str, Any]
+    attempts: int = 1
+    # Не отправлять раньше этого момента (time.monotonic) - задержка перед повтором
+    ready_at: float = 0.0
+
+
+def data_items(response: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """Результаты пачки create-list: data[i] - результат i-го элемента."""
+    return response.get("data") or []
+
+
+def error_list_items(response: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """
+    Результаты пачки replace-planned-pairs: ответ - список ошибок {"index", "message"},
+    пустой при успехе; элементы без ошибки считаются успешными.
+    """
+    items = [{"status": "ok", "errors": []} for _ in range(count)]
+    for error in response or []:
+        index = error.get("index")
+        if isinstance(index, int) and 0 <= index < count:
+            items[index] = {"status": "error", "errors": [error.get("message", error)]}
+    return items
+
+
+def _is_overload(error: Exception) -> bool:
+    """Таймаут, обрыв соединения или 429 - сервер не справляется с текущей пачкой/параллельностью."""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 429
+
+
+def _not_applied(error: Exception) -> bool:
+    """
+    Пачка точно не дошла до обработки: соединение не установлено или сервер ответил 429.
+    После таймаута чтения, обрыва или 5xx сервер мог уже сохранить пачку - исход неизвестен.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 429
+
+
+class CargoPlaceIngestor:
+    """
+    Потоковая загрузка пачками через /cargo-place/create-list или /create-or-update-list
+    (а также другие массовые эндпоинты: /shipment/tasks/create-list, /cargo-place/replace-planned-pairs).
+
+    Входной итератор читается лениво и режется на пачки по chunk_size; одновременно в работе
+    не больше concurrency пачек, поэтому в памяти держится только concurrency * chunk_size спецификаций.
+    Ответ data[i] сопоставляется с i-м элементом пачки; в следующие пачки повторно
+    попадают только неуспешные элементы (не больше retries повторов на элемент).
+
+    Если пачка не обработана целиком (таймаут, обрыв, 5xx), её элементы повторяются с задержкой
+    retry_delay * 2^n только для идемпотентной отправки (idempotent=True: create-or-update-list
+    со стабильными externalId) или когда пачка точно не дошла до сервера (нет соединения, 429).
+    Иначе create-list мог уже создать элементы, и повтор задвоил бы их - такие элементы
+    возвращаются неуспешными.
+
+    С tuner (utils.adaptive_batching.AimdTuner) размер пачки и параллельность подбираются на ходу
+    по задержке и ошибкам запросов, chunk_size и concurrency тогда не используются.
+    """
+
+    def __init__(
+            self,
+            send: Callable[[List[Dict[str, Any]]], Any],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            retries: int = DEFAULT_RETRIES,
+            tuner: Optional[AimdTuner] = None,
+            results: Callable[[Any, int], List[Dict[str, Any]]] = data_items,
+            idempotent: bool = False,
+            retry_delay: float = DEFAULT_RETRY_DELAY
+    ):
+        """
+        :param send: отправка одной пачки, например CargoPlaceListClient.create_cargo_places_list
+        :param results: разбор ответа send в результаты элементов {"id", "status", "errors"} по порядку пачки
+        :param idempotent: повторная отправка тех же элементов не создаёт дубликатов
+        :param retry_delay: базовая задержка перед повтором пачки, не обработанной целиком
+        """
+        self.send = send
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.tuner = tuner
+        self.results = results
+        self.idempotent = idempotent
+        self.retry_delay = retry_delay
+        # Сколько пачек отправлено за всё время жизни объекта (включая повторные)
+        self.chunks_sent = 0
+
+    @classmethod
+    def for_create_list(cls, base_url: str, token: str, **kwargs) -> "CargoPlaceIngestor":
+        return cls(CargoPlaceListClient(base_url, token).create_cargo_places_list, **kwargs)
+
+    @classmethod
+    def for_create_or_update_list(cls, base_url: str, token: str, **kwargs) -> "CargoPlaceIngestor":
+        # Грузоместа сопоставляются по externalId - повтор пачки обновляет, а не создаёт заново
+        kwargs.setdefault("idempotent", True)
+        return cls(CargoPlaceCreateOrUpdateListClient(base_url, token).create_or_update_cargo_places_list, **kwargs)
+
+    @classmethod
+    def for_shipment_tasks(cls, base_url: str, token: str, **kwargs) -> "CargoPlaceIngestor":
+        return cls(ShipmentTaskListClient(base_url, token).create_tasks_list, **kwargs)
+
+    @classmethod
+    def for_replace_planned_pairs(cls, base_url: str, token: str, is_strict: bool = False,
+                                  **kwargs) -> "CargoPlaceIngestor":
+        client = ReplacePlannedPairsClient(base_url, token)
+        return cls(lambda items: client.replace_planned_pairs(items, is_strict, verbose=False),
+                   results=error_list_items, **kwargs)
+
+    @classmethod
+    def adaptive(cls, factory: Callable[..., "CargoPlaceIngestor"], base_url: str, token: str,
+                 **tuner_kwargs) -> "CargoPlaceIngestor":
+        """
+        Загрузчик в адаптивном режиме:
+        CargoPlaceIngestor.adaptive(CargoPlaceIngestor.for_shipment_tasks, BASE_URL, token, max_chunk=2000)
+        """
+        return factory(base_url, token, tuner=AimdTuner(**tuner_kwargs))
+
+    # ==================== ЗАГРУЗКА ====================
+
+    def ingest(self, specs: Iterable[Dict[str, Any]]) -> Iterator[IngestItemResult]:
+        """
+        Загрузить грузоместа, отдавая результат каждого элемента по мере готовности пачек
+        (порядок - по завершению пачек, позиция во входе - в IngestItemResult.index).
+        """
+        source = enumerate(specs)
+        retry_queue: Deque[_Pending] = deque()
+        in_flight = {}
+
+        max_workers = self.tuner.max_concurrency if self.tuner else self.concurrency
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                while len(in_flight) < self._concurrency():
+                    chunk = self._next_chunk(source, retry_queue)
+                    if not chunk:
+                        break
+                    in_flight[pool.submit(self._send_chunk, chunk)] = chunk
+                    self.chunks_sent += 1
+
+                if not in_flight:
+                    if not retry_queue:
+                        return
+                    # Остались только элементы, ждущие повтора
+                    time.sleep(self._until_ready(retry_queue))
+                    continue
+
+                done, _ = wait(in_flight, timeout=self._until_ready(retry_queue), return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    results, resend = future.result()
+                    # Пачка, не обработанная целиком, повторяется с задержкой, отдельные ошибки - сразу
+                    ready_at = time.monotonic() + self._backoff(max(p.attempts for p in chunk)) if resend else 0.0
+                    for pending, result in zip(chunk, results):
+                        if result.success or pending.attempts > self.retries or resend is False:
+                            yield result
+                        else:
+                            retry_queue.append(_Pending(pending.index, pending.spec, pending.attempts + 1, ready_at))
+
+    def run(self, specs: Iterable[Dict[str, Any]],
+            on_result: Optional[Callable[[IngestItemResult], None]] = None) -> IngestReport:
+        """Загрузить всё и вернуть сводку; on_result вызывается для каждого элемента (например, чтобы сохранить id)."""
+        report = IngestReport()
+        sent_before = self.chunks_sent
+        for result in self.ingest(specs):
+            report.total += 1
+            if result.attempts > 1:
+                report.retried += 1
+            if result.success:
+                report.succeeded += 1
+            else:
+                report.failed.append(result)
+            if on_result:
+                on_result(result)
+        report.chunks = self.chunks_sent - sent_before
+        if self.tuner:
+            report.tuning = self.tuner.summary()
+        return report
+
+    # ==================== ВНУТРЕННИЕ МЕТОДЫ ====================
+
+    def _concurrency(self) -> int:
+        return self.tuner.concurrency if self.tuner else self.concurrency
+
+    def _chunk_size(self) -> int:
+        return self.tuner.chunk_size if self.tuner else self.chunk_size
+
+    def _backoff(self, attempts: int) -> float:
+        return self.retry_delay * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def _until_ready(retry_queue: Deque[_Pending]) -> Optional[float]:
+        """Секунд до готовности ближайшего отложенного повтора (None - повторов нет)."""
+        if not retry_queue:
+            return None
+        return max(0.0, min(p.ready_at for p in retry_queue) - time.monotonic())
+
+    def _next_chunk(self, source: Iterator[Tuple[int, Dict[str, Any]]],
+                    retry_queue: Deque[_Pending]) -> List[_Pending]:
+        """Пачка: сначала элементы на повтор, чья задержка истекла, затем новые из входного потока."""
+        chunk_size = self._chunk_size()
+        chunk = []
+        now = time.monotonic()
+        for _ in range(len(retry_queue)):
+            if len(chunk) >= chunk_size:
+                break
+            pending = retry_queue.popleft()
+            if pending.ready_at <= now:
+                chunk.append(pending)
+            else:
+                retry_queue.append(pending)
+        if len(chunk) >= chunk_size:
+            return chunk
+        for index, spec in source:
+            chunk.append(_Pending(index, spec))
+            if len(chunk) >= chunk_size:
+                break
+        return chunk
+
+    def _failed_chunk(self, chunk: List[_Pending], error: str, resend: bool) -> Tuple[List[IngestItemResult], bool]:
+        """Пачка не обработана целиком: все элементы неуспешны; без resend - с пометкой, что исход неизвестен."""
+        errors = [error] if resend else [error, "Исход неизвестен - повторная отправка могла бы создать дубликаты"]
+        return [IngestItemResult(p.index, p.spec, False, errors=errors, attempts=p.attempts) for p in chunk], resend
+
+    def _send_chunk(self, chunk: List[_Pending]) -> Tuple[List[IngestItemResult], Optional[bool]]:
+        """
+        Отправить пачку. Второй элемент результата: None - результаты элементов известны
+        (неуспешные можно повторить сразу); True/False - пачка не обработана целиком
+        и её можно / нельзя отправить повторно.
+        """
+        epoch = self.tuner.epoch if self.tuner else 0
+        started = time.perf_counter()
+        try:
+            response = self.send([p.spec for p in chunk])
+        except Exception as e:
+            if self.tuner:
+                self.tuner.observe(epoch, (time.perf_counter() - started) * 1000, error=True, overload=_is_overload(e))
+            return self._failed_chunk(chunk, str(e), self.idempotent or _not_applied(e))
+        if self.tuner:
+            self.tuner.observe(epoch, (time.perf_counter() - started) * 1000)
+
+        data = self.results(response, len(chunk))
+        if len(data) != len(chunk):
+            error = f"Ответ содержит {len(data)} элементов вместо {len(chunk)}"
+            return self._failed_chunk(chunk, error, self.idempotent)
+
+        return [
+            IngestItemResult(
+                p.index, p.spec,
+                success=item.get("status") == "ok" and not item.get("errors"),
+                id=item.get("id"),
+                status=item.get("status"),
+                errors=item.get("errors") or [],
+                attempts=p.attempts
+            )
+            for p, item in zip(chunk, data)
+        ], None
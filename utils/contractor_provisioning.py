@@ -0,0 +1,232 @@
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import requests
+from config.settings import TIMEOUT, BULK_MAX_WORKERS, BULK_RATE_LIMIT
+from pages.create_contractor_page import CreateContractorPage
+from utils.bulk_executor import TRANSIENT_STATUSES, TokenBucket, TransientError
+
+# Признаки отказа из-за ИНН: дубль на стенде или организация не найдена в реестрах ФНС
+INN_REJECTION_MARKERS = ("дублирован", "duplicate", "не найден организацию", "найти организацию")
+
+# Сколько ИНН резервировать за одно обращение к источнику
+INN_BATCH_SIZE = 50
+
+
+class InnRejected(Exception):
+    """Стенд отклонил ИНН - контрагент создаётся заново с другим ИНН."""
+
+
+@dataclass
+class ProvisionResult:
+    """Результат создания одного контрагента; index - позиция во входном потоке."""
+    index: int
+    spec: Dict[str, Any]
+    success: bool
+    inn: Optional[str] = None
+    id: Optional[int] = None
+    profile: Optional[Dict[str, Any]] = None
+    rejected_inns: List[str] = field(default_factory=list)
+    attempts: int = 1
+    error: Optional[str] = None
+
+
+@dataclass
+class ProvisionReport:
+    """Итоги создания: счётчики и неуспешные элементы."""
+    total: int = 0
+    succeeded: int = 0
+    reissued: int = 0
+    elapsed: float = 0.0
+    failed: List[ProvisionResult] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"Создано {self.succeeded} из {self.total} контрагентов за {self.elapsed:.1f} с "
+            f"(ИНН перевыпущен: {self.reissued}, ошибок: {len(self.failed)})"
+        )
+
+
+@dataclass
+class _Pending:
+    index: int
+    spec: Dict[str, Any]
+    inn: Optional[str] = None
+    id: Optional[int] = None
+    rejected_inns: List[str] = field(default_factory=list)
+    attempts: int = 0
+
+
+class ContractorProvisioner:
+    """
+    Конвейер массового создания контрагентов (подготовка данных перед нагрузочным прогоном).
+
+    Стадии идут внахлёст: ИНН резервируются пачками в реестре стенда (utils.inn_registry),
+    /contractor/child-create отправляются параллельно (не больше max_workers запросов,
+    не чаще rate в секунду), а профиль каждого созданного контрагента запрашивается сразу,
+    не дожидаясь остальных. Если стенд отклонил ИНН (дубль, организация не найдена) - ИНН
+    помечается занятым и контрагент создаётся с новым ИНН; временные ошибки (429/5xx, сеть)
+    повторяются с тем же ИНН. Результаты отдаются по мере готовности.
+    """
+
+    def __init__(
+            self,
+            page: CreateContractorPage,
+            max_workers: int = BULK_MAX_WORKERS,
+            rate: float = BULK_RATE_LIMIT,
+            inn_retries: int = 3,
+            retries: int = 2,
+            retry_delay: float = 0.5,
+            fetch_profiles: bool = True,
+            inn_source: Optional[Callable[[int], List[str]]] = None
+    ):
+        """
+        :param page: клиент контрагентов (сессия, токен, генератор данных и реестр ИНН)
+        :param inn_retries: сколько раз перевыпускать отклонённый ИНН
+        :param retries: сколько раз повторять временную ошибку запроса
+        :param inn_source: функция "n ИНН" вместо резервирования в реестре страницы
+        """
+        self.page = page
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate)
+        self.inn_retries = inn_retries
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.fetch_profiles = fetch_profiles
+        self.inn_source = inn_source or self._reserve_inns
+        self._inns: Deque[str] = deque()
+
+    @classmethod
+    def for_token(cls, base_url: str, token: str, **kwargs) -> "ContractorProvisioner":
+        return cls(CreateContractorPage(base_url, token), **kwargs)
+
+    # ==================== СОЗДАНИЕ ====================
+
+    def provision(self, specs: Iterable[Dict[str, Any]]) -> Iterator[ProvisionResult]:
+        """
+        Создать контрагентов по спецификациям - аргументам prepare_simple_contractor_data
+        (role, name, add_bank_details, поля запроса). Результаты - в порядке готовности.
+        """
+        source = enumerate(specs)
+        retry_queue: Deque[_Pending] = deque()
+        in_flight: Dict[Future, Tuple[str, _Pending]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                while len(in_flight) < self.max_workers:
+                    pending = retry_queue.popleft() if retry_queue else self._next(source)
+                    if pending is None:
+                        break
+                    if pending.inn is None:
+                        pending.inn = self._take_inn()
+                    pending.attempts += 1
+                    in_flight[pool.submit(self._create, pending)] = ("create", pending)
+
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, pending = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except InnRejected as e:
+                        self.page.generator.mark_used(pending.inn)
+                        pending.rejected_inns.append(pending.inn)
+                        if len(pending.rejected_inns) > self.inn_retries:
+                            yield self._result(pending, error=str(e))
+                        else:
+                            pending.inn = None
+                            retry_queue.append(pending)
+                        continue
+                    except Exception as e:
+                        yield self._result(pending, error=f"{stage}: {e}")
+                        continue
+
+                    if stage == "create":
+                        pending.id = result.get("id")
+                        if self.fetch_profiles and pending.id is not None:
+                            # Профиль запрашивается сразу, слот создания переходит ему
+                            in_flight[pool.submit(self._profile, pending.id)] = ("profile", pending)
+                        else:
+                            yield self._result(pending)
+                    else:
+                        yield self._result(pending, profile=result)
+
+    def run(self, specs: Iterable[Dict[str, Any]],
+            on_result: Optional[Callable[[ProvisionResult], None]] = None) -> ProvisionReport:
+        """Создать всех и вернуть сводку; on_result вызывается для каждого контрагента по готовности."""
+        report = ProvisionReport()
+        started = time.monotonic()
+        for result in self.provision(specs):
+            report.total += 1
+            report.reissued += bool(result.rejected_inns)
+            if result.success:
+                report.succeeded += 1
+            else:
+                report.failed.append(result)
+            if on_result:
+                on_result(result)
+        report.elapsed = time.monotonic() - started
+        return report
+
+    # ==================== ВНУТРЕННИЕ МЕТОДЫ ====================
+
+    @staticmethod
+    def _next(source: Iterator[Tuple[int, Dict[str, Any]]]) -> Optional[_Pending]:
+        for index, spec in source:
+            return _Pending(index, spec)
+        return None
+
+    def _reserve_inns(self, count: int) -> List[str]:
+        return self.page.generator.generate_realistic_inns(count)
+
+    def _take_inn(self) -> str:
+        # Вызывается только из потока конвейера - блокировка не нужна
+        if not self._inns:
+            self._inns.extend(self.inn_source(INN_BATCH_SIZE))
+        return self._inns.popleft()
+
+    def _result(self, pending: _Pending, profile: Optional[dict] = None, error: Optional[str] = None) -> ProvisionResult:
+        return ProvisionResult(
+            pending.index, pending.spec, success=error is None, inn=pending.inn, id=pending.id,
+            profile=profile, rejected_inns=pending.rejected_inns, attempts=pending.attempts, error=error
+        )
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Запрос с ограничением частоты и повтором временных ошибок."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.bucket.acquire()
+            try:
+                response = self.page.session.request(method, url, headers=self.page.headers,
+                                                     timeout=TIMEOUT, **kwargs)
+                if response.status_code not in TRANSIENT_STATUSES:
+                    return response
+                error: Exception = TransientError(response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt > self.retries:
+                raise error
+            time.sleep(self.retry_delay * 2 ** (attempt - 1) * random.uniform(0.8, 1.2))
+
+    def _create(self, pending: _Pending) -> Dict[str, Any]:
+        data = self.page.prepare_simple_contractor_data(verbose=False, **{**pending.spec, "inn": pending.inn})
+        response = self._request("POST", self.page.child_create_url, json=data)
+        if response.status_code == 200:
+            self.page.generator.mark_used(pending.inn)
+            return response.json()
+        text = response.text.lower()
+        if any(marker in text for marker in INN_REJECTION_MARKERS):
+            raise InnRejected(f"ИНН {pending.inn}: HTTP {response.status_code}: {response.text[:200]}")
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    def _profile(self, contractor_id: int) -> Dict[str, Any]:
+        response = self._request("GET", f"{self.page.base_url}/contractor/profile/{contractor_id}")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        return response.json()
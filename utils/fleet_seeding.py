@@ -0,0 +1,160 @@
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from config.settings import BASE_URL, TIMEOUT, BULK_MAX_WORKERS, BULK_RATE_LIMIT, FLEET_MANIFEST_FILE
+from pages.driver_page import DriverCreate
+from pages.tractor_page import TractorPage
+from pages.trailer_page import TrailerCreate
+from pages.vehicle_page import VehiclePage
+from utils.bulk_executor import TRANSIENT_STATUSES, BulkExecutor, BulkReport, TransientError
+from utils.file_lock import file_lock
+from utils.http_session import get_session
+
+# Вид транспорта -> (генератор payload, эндпоинт создания, поле, уникальное на стенде)
+FLEET_KINDS: Dict[str, Tuple[Callable[..., dict], str, str]] = {
+    "driver": (DriverCreate.create_driver_payload, "/driver/create", "driverLicenseId"),
+    "vehicle": (VehiclePage.create_vehicle_payload, "/vehicle/create", "plateNumber"),
+    "trailer": (TrailerCreate.create_trailer_payload, "/trailer/create", "plateNumber"),
+    "tractor": (TractorPage.create_tractor_payload, "/tractor/create", "plateNumber"),
+}
+
+# Признак отказа стенда из-за занятого госномера / номера ВУ - payload генерируется заново
+CONFLICT_MARKERS = ("уже используется", "already", "дублирован", "duplicate")
+
+# Сколько раз перегенерировать payload при конфликте номера
+CONFLICT_RETRIES = 3
+
+
+class FleetManifest:
+    """
+    Манифест созданного транспорта: JSON {"<base_url>|<роль>": {вид: [{"id", "key", "createdAt"}]}}.
+    Тесты и нагрузочные прогоны берут id водителей и ТС отсюда, а не из констант; key - госномер
+    (для водителя - номер ВУ), по нему проверяется уникальность новых payload.
+    Запись - под файловой блокировкой с перечитыванием файла, поэтому воркеры xdist не теряют записи друг друга.
+    """
+
+    def __init__(self, path: Union[str, Path] = FLEET_MANIFEST_FILE, base_url: str = BASE_URL, role: str = "lkp"):
+        self.path = Path(path)
+        self.section = f"{base_url.rstrip('/')}|{role}"
+        self._lock_path = self.path.with_suffix(".lock")
+
+    def _read(self) -> Dict[str, Dict[str, List[dict]]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, data: Dict[str, Dict[str, List[dict]]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def records(self, kind: str) -> List[dict]:
+        return self._read().get(self.section, {}).get(kind, [])
+
+    def ids(self, kind: str) -> List[Any]:
+        return [record["id"] for record in self.records(kind)]
+
+    def keys(self, kind: str) -> Set[str]:
+        return {record["key"] for record in self.records(kind)}
+
+    def counts(self) -> Dict[str, int]:
+        section = self._read().get(self.section, {})
+        return {kind: len(section.get(kind, [])) for kind in FLEET_KINDS}
+
+    def pick(self, kind: str, exclude: Tuple[Any, ...] = ()) -> Optional[Any]:
+        """Случайный id из манифеста (кроме exclude) - параллельные тесты реже берут один и тот же транспорт."""
+        ids = [entity_id for entity_id in self.ids(kind) if entity_id not in exclude]
+        return random.choice(ids) if ids else None
+
+    def add(self, kind: str, records: List[dict]) -> None:
+        with file_lock(self._lock_path):
+            data = self._read()
+            data.setdefault(self.section, {}).setdefault(kind, []).extend(records)
+            self._write(data)
+
+    def reset(self) -> None:
+        """Забыть транспорт этого стенда и роли (например, после очистки стенда)."""
+        with file_lock(self._lock_path):
+            data = self._read()
+            data.pop(self.section, None)
+            self._write(data)
+
+
+class FleetSeeder:
+    """
+    Массовое создание водителей, ТС, прицепов и тягачей через BulkExecutor (параллельно,
+    с ограничением частоты и повтором временных ошибок). Госномера и номера ВУ проверяются
+    на уникальность до отправки - среди новых payload и по манифесту; если стенд всё же
+    отклонил номер, payload генерируется заново. Созданное записывается в манифест.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            token: str,
+            role: str = "lkp",
+            manifest: Optional[FleetManifest] = None,
+            max_workers: int = BULK_MAX_WORKERS,
+            rate: float = BULK_RATE_LIMIT,
+            retries: int = 3
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {"Authorization": token}
+        self.manifest = manifest or FleetManifest(base_url=base_url, role=role)
+        self.executor_kwargs = {"max_workers": max_workers, "rate": rate, "retries": retries}
+
+    def unique_payloads(self, kind: str, count: int, taken: Optional[Set[str]] = None) -> List[dict]:
+        """count payload вида kind с номерами, которых нет ни в манифесте, ни в taken."""
+        make_payload, _, key_field = FLEET_KINDS[kind]
+        taken = set(self.manifest.keys(kind)) if taken is None else taken
+        payloads = []
+        while len(payloads) < count:
+            payload = make_payload()
+            if payload[key_field] not in taken:
+                taken.add(payload[key_field])
+                payloads.append(payload)
+        return payloads
+
+    def _create(self, kind: str, payload: dict, taken: Set[str]) -> dict:
+        _, path, key_field = FLEET_KINDS[kind]
+        for attempt in range(CONFLICT_RETRIES + 1):
+            response = get_session().post(f"{self.base_url}{path}", headers=self.headers, json=payload, timeout=TIMEOUT)
+            if response.status_code == 200:
+                created = response.json()
+                # /tractor/create оборачивает созданное в {"tractor": {...}}
+                created = created.get(kind, created)
+                return {"id": created["id"], "key": payload[key_field], "createdAt": round(time.time())}
+            if response.status_code in TRANSIENT_STATUSES:
+                raise TransientError(response)
+            text = response.text.lower()
+            if attempt < CONFLICT_RETRIES and any(marker in text for marker in CONFLICT_MARKERS):
+                payload = self.unique_payloads(kind, 1, taken)[0]
+                continue
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    def seed(self, counts: Dict[str, int]) -> Dict[str, BulkReport]:
+        """Создать counts[вид] единиц каждого вида; отчёт BulkReport по каждому виду."""
+        reports = {}
+        for kind, count in counts.items():
+            if count <= 0:
+                continue
+            taken = set(self.manifest.keys(kind))
+            payloads = self.unique_payloads(kind, count, taken)
+            executor = BulkExecutor(lambda payload, kind=kind: self._create(kind, payload, taken),
+                                    **self.executor_kwargs)
+            report = executor.run(payloads, title=f"Создание: {kind}")
+            self.manifest.add(kind, [outcome.result for outcome in report.succeeded])
+            reports[kind] = report
+        return reports
+
+    def ensure(self, counts: Dict[str, int]) -> Dict[str, BulkReport]:
+        """Досоздать транспорт, если в манифесте меньше counts[вид] единиц."""
+        existing = self.manifest.counts()
+        return self.seed({kind: count - existing.get(kind, 0) for kind, count in counts.items()})
@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from utils.latency_histogram import LatencyHistogram
+
+# Сегменты пути, которые заменяются на {id}: числа и UUID
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+# Префикс api-ext, который не несёт информации об эндпоинте
+_API_PREFIX = "/v1/api-ext"
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Шаблон эндпоинта по URL: без хоста, префикса /v1/api-ext и query,
+    идентификаторы заменены на {id}. Пример: /truck-deliveries/{id}/details.
+    """
+    path = urlsplit(url).path
+    if path.startswith(_API_PREFIX):
+        path = path[len(_API_PREFIX):]
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+class EndpointMetrics:
+    """Метрики одного эндпоинта (метод + шаблон пути)."""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.statuses: Dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def record(self, status: Optional[int], elapsed_ms: float, request_bytes: int, response_bytes: int) -> None:
+        self.histogram.record(elapsed_ms)
+        key = str(status) if status is not None else "error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+
+    def merge(self, other: "EndpointMetrics") -> None:
+        self.histogram.merge(other.histogram)
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.histogram.summary(),
+            "statuses": dict(sorted(self.statuses.items())),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "histogram": self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointMetrics":
+        metrics = cls()
+        metrics.histogram = LatencyHistogram.from_dict(data["histogram"])
+        metrics.statuses = dict(data["statuses"])
+        metrics.request_bytes = data["request_bytes"]
+        metrics.response_bytes = data["response_bytes"]
+        return metrics
+
+
+class HttpMetrics:
+    """
+    Потокобезопасный реестр метрик HTTP-вызовов по ключу "METHOD /шаблон".
+    Заполняется InstrumentedSession (requests) и trace-конфигом aiohttp из utils.http_session.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, status: Optional[int], elapsed_ms: float,
+               request_bytes: int = 0, response_bytes: int = 0) -> None:
+        key = (method.upper(), endpoint_template(url))
+        with self._lock:
+            if key not in self.endpoints:
+                self.endpoints[key] = EndpointMetrics()
+            self.endpoints[key].record(status, elapsed_ms, request_bytes, response_bytes)
+
+    def merge(self, other: "HttpMetrics") -> "HttpMetrics":
+        with self._lock:
+            for key, metrics in other.endpoints.items():
+                self.endpoints.setdefault(key, EndpointMetrics()).merge(metrics)
+        return self
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{method} {endpoint}": metrics.to_dict()
+                for (method, endpoint), metrics in sorted(self.endpoints.items())
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HttpMetrics":
+        metrics = cls()
+        for key, value in data.items():
+            method, endpoint = key.split(" ", 1)
+            metrics.endpoints[(method, endpoint)] = EndpointMetrics.from_dict(value)
+        return metrics
+
+    def summary_table(self) -> str:
+        header = f"{'Эндпоинт':<60} {'вызовов':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>9}"
+        lines = [header, "-" * len(header)]
+        for key, row in self.to_dict().items():
+            lines.append(
+                f"{key:<60} {row['count']:>8} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['p99_ms']:>8.1f} {row['max_ms']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def read_json(cls, path: str) -> "HttpMetrics":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def worker_metrics_path(path: str, worker: str) -> str:
+    """Файл метрик воркера xdist: http-metrics.json -> http-metrics.gw3.json."""
+    base, ext = os.path.splitext(path)
+    return f"{base}.{worker}{ext}"
+
+
+def merge_worker_files(path: str) -> Optional[HttpMetrics]:
+    """
+    Объединяет файлы метрик воркеров xdist (worker_metrics_path) в path и удаляет их.
+    None - файлов воркеров нет.
+    """
+    base, ext = os.path.splitext(path)
+    worker_files = sorted(glob.glob(f"{glob.escape(base)}.gw*{ext}"))
+    if not worker_files:
+        return None
+    merged = HttpMetrics()
+    for worker_file in worker_files:
+        merged.merge(HttpMetrics.read_json(worker_file))
+        os.remove(worker_file)
+    merged.write_json(path)
+    return merged
+
+
+# Общий реестр процесса
+_metrics = HttpMetrics()
+
+
+def get_http_metrics() -> HttpMetrics:
+    return _metrics
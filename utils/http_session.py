@@ -0,0 +1,157 @@
+import time
+import aiohttp
+import requests
+from typing import Optional, Protocol
+from requests.adapters import HTTPAdapter
+from config.settings import POOL_CONNECTIONS, POOL_MAXSIZE, ASYNC_POOL_LIMIT
+from utils.http_metrics import get_http_metrics
+
+# Общая для всех page-клиентов сессия: keep-alive соединения к api.vezubr.{DOMAIN}
+# переиспользуются между вызовами, TLS-рукопожатие выполняется один раз на соединение.
+_shared_session: Optional[requests.Session] = None
+
+
+class AuthRefresher(Protocol):
+    """Источник актуальных токенов для транспорта (реализация - utils.token_store.TokenStore)."""
+
+    def resolve(self, token: str) -> str: ...
+
+    def refresh_token(self, token: str) -> Optional[str]: ...
+
+
+_auth_refresher: Optional[AuthRefresher] = None
+
+
+def set_auth_refresher(refresher: Optional[AuthRefresher]) -> None:
+    """
+    Подключить обновление токенов: заголовок Authorization с устаревшим токеном подменяется
+    на актуальный, а на первый 401 токен обновляется и запрос повторяется один раз.
+    """
+    global _auth_refresher
+    _auth_refresher = refresher
+
+
+def get_auth_refresher() -> Optional[AuthRefresher]:
+    return _auth_refresher
+
+
+class InstrumentedSession(requests.Session):
+    """
+    requests.Session, записывающая каждый вызов в общий реестр utils.http_metrics:
+    метод, шаблон эндпоинта, статус, размер запроса и ответа, полное время вызова.
+    При подключённом AuthRefresher обновляет истёкший токен и повторяет запрос после 401.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        refresher = _auth_refresher
+        token = (kwargs.get("headers") or {}).get("Authorization")
+        if refresher is None or not token:
+            return self._timed_request(method, url, *args, **kwargs)
+
+        kwargs["headers"] = {**kwargs["headers"], "Authorization": refresher.resolve(token)}
+        response = self._timed_request(method, url, *args, **kwargs)
+        if response.status_code == 401:
+            new_token = refresher.refresh_token(kwargs["headers"]["Authorization"])
+            if new_token:
+                kwargs["headers"]["Authorization"] = new_token
+                response = self._timed_request(method, url, *args, **kwargs)
+        return response
+
+    def _timed_request(self, method, url, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            get_http_metrics().record(method, url, None, (time.perf_counter() - started) * 1000)
+            raise
+
+        body = response.request.body if response.request is not None else None
+        get_http_metrics().record(
+            method, url, response.status_code, (time.perf_counter() - started) * 1000,
+            request_bytes=len(body) if body else 0,
+            response_bytes=len(response.content) if not kwargs.get("stream") else 0
+        )
+        return response
+
+
+def create_session(
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE
+) -> requests.Session:
+    """
+    Создаёт requests.Session с пулом keep-alive соединений.
+
+    :param pool_connections: количество пулов (по одному на хост)
+    :param pool_maxsize: максимальное число соединений в одном пуле
+    """
+    session = InstrumentedSession()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Возвращает общую сессию, создавая её при первом обращении."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
+
+def set_session(session: Optional[requests.Session]) -> None:
+    """Подменяет общую сессию (используется фикстурой http_session)."""
+    global _shared_session
+    _shared_session = session
+
+
+def close_session() -> None:
+    """Закрывает общую сессию и освобождает соединения пула."""
+    global _shared_session
+    if _shared_session is not None:
+        _shared_session.close()
+        _shared_session = None
+
+
+def create_async_session(limit: int = ASYNC_POOL_LIMIT) -> aiohttp.ClientSession:
+    """
+    Создаёт aiohttp.ClientSession для async-клиентов.
+    Вызывать внутри работающего event loop; закрывать через `async with` или `await session.close()`.
+
+    :param limit: максимальное число одновременных соединений коннектора;
+                  остальные запросы ждут свободного соединения в очереди
+    """
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit)
+    return aiohttp.ClientSession(connector=connector, trace_configs=[_metrics_trace_config()])
+
+
+def _metrics_trace_config() -> aiohttp.TraceConfig:
+    """
+    Trace-конфиг aiohttp для записи вызовов в utils.http_metrics.
+    Время - до получения заголовков ответа, размер ответа - по Content-Length.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.started = time.perf_counter()
+        ctx.request_bytes = 0
+
+    async def on_request_chunk_sent(session, ctx, params):
+        ctx.request_bytes += len(params.chunk)
+
+    async def on_request_end(session, ctx, params):
+        get_http_metrics().record(
+            params.method, str(params.url), params.response.status,
+            (time.perf_counter() - ctx.started) * 1000,
+            request_bytes=ctx.request_bytes,
+            response_bytes=params.response.content_length or 0
+        )
+
+    async def on_request_exception(session, ctx, params):
+        get_http_metrics().record(params.method, str(params.url), None, (time.perf_counter() - ctx.started) * 1000)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+from config.settings import INN_CORPUS_FILE
+from utils.inn_generator import INN_LENGTH, format_inns, parse_inns, validate_inns
+
+# Случайных выборок в take() до перехода к полному проходу по корпусу
+SAMPLE_ATTEMPTS = 4
+
+
+def build_corpus(path: Union[str, Path], inns: Iterable[Union[str, int]], entity_type: str = "entity",
+                 merge: bool = True) -> Dict[str, int]:
+    """
+    Собрать файл корпуса: ИНН проверяются (контрольные цифры), дубликаты убираются, массив int64
+    сортируется - так ИНН одного региона лежат подряд - и атомарно записывается в .npy.
+    merge=True дополняет существующий корпус. Возвращает счётчики: принято, отброшено, всего в корпусе.
+    """
+    values = np.asarray(inns if isinstance(inns, np.ndarray) else list(inns))
+    if values.dtype.kind in "US" or values.dtype == object:
+        values = parse_inns(values.astype(str), entity_type)
+    values = values.astype(np.int64)
+    valid = validate_inns(values, entity_type)
+
+    corpus = np.unique(values[valid])
+    path = Path(path)
+    if merge and path.exists():
+        corpus = np.union1d(np.load(path), corpus)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp, corpus)
+    os.replace(tmp, path)
+    return {"accepted": int(valid.sum()), "rejected": int((~valid).sum()), "total": len(corpus)}
+
+
+class InnCorpus:
+    """
+    Локальный корпус проверенных ИНН - источник ИНН без обращения к внешним сайтам.
+
+    Файл (.npy, отсортированный int64) собирается заранее (scripts.build_inn_corpus) и открывается
+    через mmap: в память попадают только читаемые страницы, поэтому корпус в миллионы ИНН
+    не замедляет запуск тестов. Границы регионов находятся бинарным поиском один раз.
+    Выданные ИНН процесс запоминает; exclude (например, utils.inn_registry.InnRegistry) отсекает
+    уже занятые на стенде.
+    """
+
+    def __init__(self, path: Union[str, Path] = INN_CORPUS_FILE, entity_type: str = "entity", seed: Optional[int] = None):
+        self.path = Path(path)
+        self.entity_type = entity_type
+        self._values: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+        self._issued = set()
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def available(self) -> bool:
+        return self.path.exists()
+
+    def _load(self) -> np.ndarray:
+        if self._values is None:
+            try:
+                self._values = np.load(self.path, mmap_mode="r")
+            except FileNotFoundError:
+                self._values = np.empty(0, dtype=np.int64)
+            # Границы регионов 00..99: ИНН региона r - числа [r * 10^(n-2), (r + 1) * 10^(n-2))
+            scale = 10 ** (INN_LENGTH[self.entity_type] - 2)
+            self._bounds = np.searchsorted(self._values, np.arange(101, dtype=np.int64) * scale)
+        return self._values
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def regions(self) -> Dict[int, int]:
+        """Число ИНН корпуса по кодам регионов."""
+        self._load()
+        counts = np.diff(self._bounds)
+        return {int(region): int(counts[region]) for region in np.flatnonzero(counts)}
+
+    def take(self, count: int, region: Optional[int] = None, exclude=None) -> List[str]:
+        """
+        До count случайных ИНН корпуса (региона region), ещё не выданных этим процессом
+        и не входящих в exclude (объект с методом contains(inns) -> маска, как InnRegistry).
+        Меньше count - свободные ИНН корпуса (региона) закончились.
+        """
+        values = self._load()
+        start, stop = (0, len(values)) if region is None else (self._bounds[region], self._bounds[region + 1])
+        size = int(stop - start)
+        result: List[str] = []
+
+        def collect(positions: np.ndarray) -> None:
+            candidates = [inn for inn in format_inns(values[positions], self.entity_type) if inn not in self._issued]
+            if exclude is not None and candidates:
+                candidates = [inn for inn, used in zip(candidates, exclude.contains(candidates)) if not used]
+            for inn in candidates[:count - len(result)]:
+                self._issued.add(inn)
+                result.append(inn)
+
+        # Обычно свободных ИНН много и хватает пары случайных выборок
+        for _ in range(SAMPLE_ATTEMPTS):
+            if len(result) >= count or not size:
+                return result
+            collect(start + self._rng.choice(size, size=min(size, 2 * (count - len(result)) + 16), replace=False))
+
+        # Корпус почти выбран - полный проход в случайном порядке
+        order = start + self._rng.permutation(size)
+        for offset in range(0, size, 4096):
+            if len(result) >= count:
+                break
+            collect(order[offset:offset + 4096])
+        return result
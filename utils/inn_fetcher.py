@@ -4,10 +4,50 @@ import re
 import time
 from typing import List, Optional
 from bs4 import BeautifulSoup
+from utils.inn_corpus import InnCorpus
+from utils.inn_generator import generate_inns, format_inns
 
 
 class INNFetcher:
-    """Класс для получения ИНН с различных источников"""
+    """
+    Класс для получения ИНН с различных источников.
+
+    Источник по умолчанию для тестов - локальный корпус (utils.inn_corpus), собранный заранее
+    scripts.build_inn_corpus: тест не ждёт сторонних сайтов. Загрузка с radar4site и star-pro
+    остаётся для явных source="radar"/"star" и для пополнения корпуса.
+    Корпус подменяется через INNFetcher.corpus (например, на корпус другого файла в тестах).
+    """
+
+    corpus: Optional[InnCorpus] = None
+
+    @staticmethod
+    def get_corpus() -> InnCorpus:
+        if INNFetcher.corpus is None:
+            INNFetcher.corpus = InnCorpus()
+        return INNFetcher.corpus
+
+    @staticmethod
+    def fetch_inns_from_corpus(count: int = 10, region: Optional[int] = None, exclude=None) -> List[str]:
+        """
+        ИНН из локального корпуса (без сети). exclude - реестр занятых ИНН (utils.inn_registry):
+        выбранные ИНН сразу занимаются в нём (InnRegistry.claim), поэтому воркеры xdist не получают
+        один и тот же ИНН; перехваченные другим воркером добираются новой выборкой.
+        Если корпус не собран, возвращается пустой список.
+        """
+        corpus = INNFetcher.get_corpus()
+        if not corpus.available:
+            print(f"⚠️ Корпус ИНН не найден: {corpus.path} (python -m scripts.build_inn_corpus)")
+            return []
+        if exclude is None:
+            return corpus.take(count, region)
+
+        inns: List[str] = []
+        while len(inns) < count:
+            picked = corpus.take(count - len(inns), region, exclude)
+            if not picked:
+                break
+            inns.extend(exclude.claim(picked))
+        return inns
 
     @staticmethod
     def fetch_inns_from_radar4site(count: int = 10) -> List[str]:
@@ -129,7 +169,7 @@ class INNFetcher:
         return inn
 
     @staticmethod
-    def get_fresh_inns(count: int = 5, source: str = "mixed") -> List[str]:
+    def get_fresh_inns(count: int = 5, source: str = "mixed", exclude=None) -> List[str]:
         """
         Получение свежих ИНН из различных источников
 
@@ -138,7 +178,10 @@ class INNFetcher:
         count : int
             Сколько ИНН получить
         source : str
-            Источник: "radar", "star", "generated", "mixed"
+            Источник: "corpus", "radar", "star", "generated", "mixed"
+            ("mixed" - корпус, затем генерация; сторонние сайты - только явно)
+        exclude : InnRegistry, optional
+            Реестр уже занятых ИНН - занятые не выдаются, выданные сразу занимаются в нём
 
         Возвращает:
         -----------
@@ -147,25 +190,32 @@ class INNFetcher:
         """
         inns = []
 
-        if source in ["radar", "mixed"]:
+        if source in ["corpus", "mixed"]:
+            corpus_inns = INNFetcher.fetch_inns_from_corpus(count, exclude=exclude)
+            inns.extend(corpus_inns)
+            print(f"📊 Из корпуса: {len(corpus_inns)} ИНН")
+
+        # ИНН из корпуса уже заняты в реестре exclude, остальные занимаются ниже
+        other = []
+
+        if source == "radar":
             radar_inns = INNFetcher.fetch_inns_from_radar4site(count)
-            inns.extend(radar_inns)
+            other.extend(radar_inns)
             print(f"📊 С radar4site: {len(radar_inns)} ИНН")
 
-        if source in ["star", "mixed"]:
+        if source == "star":
             star_inns = INNFetcher.fetch_inns_from_star_pro(count)
-            inns.extend(star_inns)
+            other.extend(star_inns)
             print(f"📊 Со star-pro: {len(star_inns)} ИНН")
 
         # Если не хватило, догенерируем
-        if len(inns) < count and source in ["generated", "mixed"]:
-            needed = count - len(inns)
-            for _ in range(needed):
-                inns.append(INNFetcher.generate_random_valid_inn())
+        if len(inns) + len(other) < count and source in ["generated", "mixed"]:
+            needed = count - len(inns) - len(other)
+            other.extend(format_inns(generate_inns(needed)))
             print(f"📊 Сгенерировано: {needed} ИНН")
 
-        # Убираем дубликаты и обрезаем до нужного количества
-        inns = list(set(inns))[:count]
+        other = [inn for inn in dict.fromkeys(other) if inn not in inns][:count - len(inns)]
+        inns.extend(exclude.claim(other) if exclude is not None else other)
 
         print(f"📦 Итоговый набор ИНН ({len(inns)} шт): {inns}")
         return inns
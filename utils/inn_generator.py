@@ -0,0 +1,141 @@
+from typing import Iterable, List, Optional, Union
+import numpy as np
+
+# Реальные коды регионов РФ (первые 2 цифры ИНН)
+REAL_REGIONS = (
+    1, 2, 3, 4, 5, 7, 10, 11, 12, 13, 14, 15,
+    16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27,
+    28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39,
+    40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51,
+    52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63,
+    64, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75,
+    76, 77, 78, 79, 82, 86, 87, 89
+)
+
+# Наиболее распространённые коды налоговых инспекций (3-4 цифры ИНН)
+REAL_IFNS = (
+    1, 2, 3, 4, 5, 6, 7, 8, 9,
+    10, 11, 12, 13, 14, 15, 16, 17, 18, 19,
+    20, 21, 22, 23, 24, 25
+)
+
+# Коэффициенты контрольных цифр
+ENTITY_COEFFS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+INDIVIDUAL_COEFFS_11 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+INDIVIDUAL_COEFFS_12 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+# Длина ИНН и число случайных цифр после префикса "регион + ИФНС"
+INN_LENGTH = {"entity": 10, "individual": 12}
+_RANDOM_DIGITS = {"entity": 5, "individual": 6}
+
+
+def _check_type(entity_type: str) -> None:
+    if entity_type not in INN_LENGTH:
+        raise ValueError("Тип должен быть 'individual' или 'entity'")
+
+
+def _control_digit(body: np.ndarray, coeffs: Iterable[int]) -> np.ndarray:
+    """Контрольная цифра для чисел body из len(coeffs) цифр: сумма цифр с весами % 11 % 10."""
+    total = np.zeros(body.shape, dtype=np.int64)
+    rest = body.copy()
+    for coeff in reversed(tuple(coeffs)):
+        total += rest % 10 * coeff
+        rest //= 10
+    return total % 11 % 10
+
+
+def _with_control(body: np.ndarray, entity_type: str) -> np.ndarray:
+    if entity_type == "entity":
+        return body * 10 + _control_digit(body, ENTITY_COEFFS)
+    d11 = _control_digit(body, INDIVIDUAL_COEFFS_11)
+    with_d11 = body * 10 + d11
+    return with_d11 * 10 + _control_digit(with_d11, INDIVIDUAL_COEFFS_12)
+
+
+def capacity(entity_type: str = "entity") -> int:
+    """Сколько разных ИНН даёт генератор: регионы x ИФНС x случайная часть."""
+    _check_type(entity_type)
+    return len(REAL_REGIONS) * len(REAL_IFNS) * 10 ** _RANDOM_DIGITS[entity_type]
+
+
+def _draw(count: int, entity_type: str, rng: np.random.Generator) -> np.ndarray:
+    regions = np.asarray(REAL_REGIONS, dtype=np.int64)[rng.integers(0, len(REAL_REGIONS), count)]
+    ifns = np.asarray(REAL_IFNS, dtype=np.int64)[rng.integers(0, len(REAL_IFNS), count)]
+    scale = 10 ** _RANDOM_DIGITS[entity_type]
+    return _with_control((regions * 100 + ifns) * scale + rng.integers(0, scale, count), entity_type)
+
+
+def _unique_in_order(values: np.ndarray) -> np.ndarray:
+    _, first = np.unique(values, return_index=True)
+    return values[np.sort(first)]
+
+
+def generate_inns(
+        count: int,
+        entity_type: str = "entity",
+        seed: Optional[int] = None,
+        exclude: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    count уникальных валидных ИНН с реальными кодами регионов и ИФНС - массив int64
+    (ИНН как число: регионы 01-09 дают ведущий ноль, строки - через format_inns).
+    Воспроизводим по seed. exclude - уже использованные ИНН (массив int64), они не выдаются.
+    """
+    _check_type(entity_type)
+    excluded = 0 if exclude is None else len(exclude)
+    if count + excluded > capacity(entity_type):
+        raise ValueError(f"Нельзя сгенерировать {count} уникальных ИНН: доступно {capacity(entity_type)}")
+
+    rng = np.random.default_rng(seed)
+    result = np.empty(0, dtype=np.int64)
+    while len(result) < count:
+        # Коллизии редки, поэтому дозапрос с небольшим запасом обычно один
+        missing = count - len(result)
+        drawn = _draw(missing + missing // 10 + 16, entity_type, rng)
+        if exclude is not None and len(exclude):
+            drawn = drawn[~np.isin(drawn, exclude)]
+        result = _unique_in_order(np.concatenate([result, drawn]))
+    return result[:count]
+
+
+def format_inns(values: np.ndarray, entity_type: str = "entity") -> List[str]:
+    """ИНН-числа в строки нужной длины (с ведущими нулями)."""
+    _check_type(entity_type)
+    return np.char.zfill(np.asarray(values, dtype=np.int64).astype(str), INN_LENGTH[entity_type]).tolist()
+
+
+def parse_inns(inns: Union[Iterable[str], np.ndarray], entity_type: str = "entity") -> np.ndarray:
+    """Строки ИНН в int64; строки не той длины или не из цифр дают -1 (невалидны для validate_inns)."""
+    _check_type(entity_type)
+    strings = np.asarray(inns if isinstance(inns, np.ndarray) else list(inns)).astype(str)
+    if not strings.size:
+        return np.empty(0, dtype=np.int64)
+    ok = (np.char.str_len(strings) == INN_LENGTH[entity_type]) & np.char.isdigit(strings)
+    values = np.full(strings.shape, -1, dtype=np.int64)
+    values[ok] = strings[ok].astype(np.int64)
+    return values
+
+
+def validate_inns(
+        values: Union[Iterable[str], np.ndarray],
+        entity_type: str = "entity",
+        real_prefix: bool = False
+) -> np.ndarray:
+    """
+    Маска валидности ИНН (bool-массив): контрольные цифры, а с real_prefix - ещё и код региона
+    из REAL_REGIONS и ИФНС из REAL_IFNS. Принимает массив int64 или строки.
+    """
+    _check_type(entity_type)
+    values = np.asarray(values)
+    if values.dtype.kind in "US" or values.dtype == object:
+        values = parse_inns(values.astype(str), entity_type)
+    values = values.astype(np.int64)
+
+    tail = 10 if entity_type == "entity" else 100
+    valid = (values >= 0) & (values < 10 ** INN_LENGTH[entity_type])
+    valid &= _with_control(values // tail, entity_type) == values
+
+    if real_prefix:
+        prefix = values // 10 ** (INN_LENGTH[entity_type] - 4)
+        valid &= np.isin(prefix // 100, REAL_REGIONS) & np.isin(prefix % 100, REAL_IFNS)
+    return valid
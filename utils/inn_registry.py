@@ -0,0 +1,170 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+import numpy as np
+from config.settings import BASE_URL, INN_REGISTRY_DIR
+from utils.file_lock import file_lock
+from utils.inn_generator import format_inns, generate_inns, parse_inns
+
+# Сколько записей журнала накапливается до слияния с отсортированной основой
+COMPACT_THRESHOLD = 4096
+
+
+class InnRegistry:
+    """
+    Реестр ИНН, уже использованных на стенде, - на диске, общий для прогонов и воркеров xdist.
+
+    Хранится как отсортированный массив int64 (<name>.npy) и журнал добавлений (<name>.log,
+    сырые int64): добавление - дозапись в журнал под файловой блокировкой, журнал сливается
+    с основой, когда набирает COMPACT_THRESHOLD записей. 1 млн ИНН - 8 МБ, проверка -
+    бинарный поиск, ложных срабатываний нет (в отличие от фильтра Блума).
+
+    reserve() выбирает и записывает новые ИНН под той же блокировкой, claim() так же занимает
+    ИНН из внешнего набора (корпуса), поэтому параллельные воркеры никогда не получают один
+    и тот же ИНН, а ИНН, занятые в прошлых прогонах, не выдаются.
+    """
+
+    def __init__(self, path: Union[str, Path], entity_type: str = "entity"):
+        self.path = Path(path)
+        self.entity_type = entity_type
+        self._base_path = self.path.with_suffix(".npy")
+        self._log_path = self.path.with_suffix(".log")
+        self._lock_path = self.path.with_suffix(".lock")
+        self._used = np.empty(0, dtype=np.int64)
+        self._stamp: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_environment(cls, base_url: str = BASE_URL, entity_type: str = "entity",
+                        registry_dir: Union[str, Path] = INN_REGISTRY_DIR) -> "InnRegistry":
+        """Реестр окружения base_url: отдельный файл на стенд и тип ИНН."""
+        key = hashlib.sha1(base_url.rstrip('/').encode()).hexdigest()[:16]
+        return cls(Path(registry_dir) / f"{entity_type}-{key}", entity_type)
+
+    # ==================== ХРАНЕНИЕ ====================
+
+    def _file_stamp(self) -> Tuple[Tuple[int, int], ...]:
+        def stamp(path: Path) -> Tuple[int, int]:
+            try:
+                stat = path.stat()
+                return stat.st_mtime_ns, stat.st_size
+            except FileNotFoundError:
+                return 0, 0
+        return stamp(self._base_path), stamp(self._log_path)
+
+    def _load(self) -> np.ndarray:
+        """Отсортированные уникальные ИНН основы и журнала; перечитываются, только если файлы изменились."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            try:
+                base = np.load(self._base_path)
+            except FileNotFoundError:
+                base = np.empty(0, dtype=np.int64)
+            try:
+                log = np.fromfile(self._log_path, dtype=np.int64)
+            except FileNotFoundError:
+                log = np.empty(0, dtype=np.int64)
+            self._used = np.union1d(base, log) if len(log) else base
+            self._stamp = stamp
+        return self._used
+
+    def _append(self, values: np.ndarray) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path, "ab") as f:
+            f.write(values.astype(np.int64).tobytes())
+        if self._log_path.stat().st_size // 8 >= COMPACT_THRESHOLD:
+            self._compact()
+        self._used = np.union1d(self._used, values)
+        self._stamp = self._file_stamp()
+
+    def _compact(self) -> None:
+        used = self._load()
+        tmp = self._base_path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp, used)
+        os.replace(tmp, self._base_path)
+        self._log_path.unlink(missing_ok=True)
+
+    def _to_values(self, inns: Iterable[Union[str, int]]) -> np.ndarray:
+        values = np.asarray(inns if isinstance(inns, np.ndarray) else list(inns))
+        if values.dtype.kind in "US" or values.dtype == object:
+            values = parse_inns(values.astype(str), self.entity_type)
+        return values.astype(np.int64)
+
+    # ==================== ПРОВЕРКА И ДОБАВЛЕНИЕ ====================
+
+    def used(self) -> np.ndarray:
+        """Все использованные ИНН (отсортированный массив int64)."""
+        with self._lock:
+            return self._load()
+
+    def __len__(self) -> int:
+        return len(self.used())
+
+    def __contains__(self, inn: Union[str, int]) -> bool:
+        return bool(self.contains([inn])[0])
+
+    def contains(self, inns: Iterable[Union[str, int]]) -> np.ndarray:
+        """Маска "ИНН уже использован" для пачки ИНН (строки или числа)."""
+        values = self._to_values(inns)
+        used = self.used()
+        if not len(used):
+            return np.zeros(len(values), dtype=bool)
+        positions = np.minimum(np.searchsorted(used, values), len(used) - 1)
+        return used[positions] == values
+
+    def add(self, inns: Iterable[Union[str, int]]) -> None:
+        """Отметить ИНН использованными (созданы на стенде или отклонены как дубликаты)."""
+        values = self._to_values(inns)
+        values = values[values >= 0]
+        if not len(values):
+            return
+        with self._lock, file_lock(self._lock_path):
+            self._load()
+            fresh = np.setdiff1d(values, self._used)
+            if len(fresh):
+                self._append(fresh)
+
+    def reserve(self, count: int, seed: Optional[int] = None) -> List[str]:
+        """count новых реалистичных ИНН, которых нет в реестре; сразу записываются как использованные."""
+        with self._lock, file_lock(self._lock_path):
+            values = generate_inns(count, self.entity_type, seed, exclude=self._load())
+            self._append(values)
+        return format_inns(values, self.entity_type)
+
+    def claim(self, inns: Iterable[str]) -> List[str]:
+        """
+        Занять ИНН из inns (например, выборку из корпуса): свободные записываются как использованные
+        под той же блокировкой, что и проверка, и возвращаются в исходном порядке. ИНН, занятые
+        другим процессом или воркером, в результат не попадают.
+        """
+        inns = list(dict.fromkeys(inns))
+        if not inns:
+            return []
+        values = self._to_values(inns)
+        with self._lock, file_lock(self._lock_path):
+            used = self._load()
+            if len(used):
+                positions = np.minimum(np.searchsorted(used, values), len(used) - 1)
+                free = used[positions] != values
+            else:
+                free = np.ones(len(values), dtype=bool)
+            free &= values >= 0
+            if free.any():
+                self._append(values[free])
+        return [inn for inn, is_free in zip(inns, free) if is_free]
+
+    def filter_unused(self, inns: Iterable[str]) -> List[str]:
+        """ИНН из inns (например, из внешнего источника), которых ещё нет в реестре."""
+        inns = list(inns)
+        if not inns:
+            return []
+        used = self.contains(inns)
+        return [inn for inn, is_used in zip(inns, used) if not is_used]
+
+    def compact(self) -> None:
+        """Слить журнал с основой (выполняется и автоматически)."""
+        with self._lock, file_lock(self._lock_path):
+            self._compact()
+            self._stamp = self._file_stamp()
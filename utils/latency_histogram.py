@@ -0,0 +1,137 @@
+import math
+from typing import Any, Dict, Optional
+
+# Диапазон и точность по умолчанию: от 1 мкс до часа, 2 значащие цифры (погрешность < 1%)
+DEFAULT_SIGNIFICANT_DIGITS = 2
+DEFAULT_HIGHEST_US = 3_600_000_000
+
+
+class LatencyHistogram:
+    """
+    Лог-линейная гистограмма задержек в стиле HdrHistogram.
+
+    Значения хранятся в микросекундах в бакетах с постоянной относительной точностью:
+    до 2^sub_bits мкс - по одному бакету на микросекунду, дальше каждое удвоение диапазона
+    делится на 2^(sub_bits-1) равных бакетов. Память не зависит от числа записей,
+    гистограммы с одинаковой точностью складываются (merge) без потери точности,
+    что позволяет сводить данные потоков, процессов и прогонов.
+    Публичный интерфейс принимает и отдаёт миллисекунды.
+    """
+
+    def __init__(self, significant_digits: int = DEFAULT_SIGNIFICANT_DIGITS, highest_us: int = DEFAULT_HIGHEST_US):
+        self.significant_digits = significant_digits
+        self.highest_us = highest_us
+        self.sub_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_count = 1 << self.sub_bits
+        self.half = self.sub_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self.sum_us = 0
+
+    # ==================== ИНДЕКСАЦИЯ БАКЕТОВ ====================
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self.sub_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bits
+        sub = value_us >> shift
+        return self.sub_count + (shift - 1) * self.half + (sub - self.half)
+
+    def _upper_bound(self, index: int) -> int:
+        """Наибольшее значение (мкс), попадающее в бакет index."""
+        if index < self.sub_count:
+            return index
+        k = index - self.sub_count
+        shift = k // self.half + 1
+        sub = k % self.half + self.half
+        return ((sub + 1) << shift) - 1
+
+    # ==================== ЗАПИСЬ ====================
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        """Записать задержку в миллисекундах (значения вне диапазона прижимаются к границам)."""
+        value_us = min(max(0, int(round(value_ms * 1000))), self.highest_us)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum_us += value_us * count
+        self.max_us = max(self.max_us, value_us)
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Добавить данные другой гистограммы с той же точностью."""
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("Нельзя объединить гистограммы с разной точностью")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        return self
+
+    # ==================== СТАТИСТИКА ====================
+
+    @property
+    def count(self) -> int:
+        return self.total
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_us / self.total / 1000 if self.total else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_us / 1000
+
+    def percentile(self, p: float) -> float:
+        """Перцентиль p (0..100) в миллисекундах: верхняя граница бакета, как в HdrHistogram."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_us) / 1000
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        """Основные перцентили в миллисекундах."""
+        return {
+            "count": self.total,
+            "mean_ms": round(self.mean_ms, 2),
+            "p50_ms": round(self.percentile(50), 2),
+            "p90_ms": round(self.percentile(90), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "p999_ms": round(self.percentile(99.9), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+    # ==================== СЕРИАЛИЗАЦИЯ ====================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Полное состояние (для JSON-отчётов и объединения между процессами)."""
+        return {
+            "significant_digits": self.significant_digits,
+            "highest_us": self.highest_us,
+            "counts": {str(k): v for k, v in sorted(self.counts.items())},
+            "total": self.total,
+            "sum_us": self.sum_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["significant_digits"], data["highest_us"])
+        histogram.counts = {int(k): v for k, v in data["counts"].items()}
+        histogram.total = data["total"]
+        histogram.sum_us = data["sum_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import json
+import os
+import random
+import threading
+import time
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from utils.http_session import create_async_session
+from utils.latency_histogram import LatencyHistogram
+
+DEFAULT_LOAD_WORKERS = 32
+
+
+@dataclass
+class LoadProfile:
+    """
+    Профиль нагрузки: линейный разгон до rate запросов/с, стабильная фаза и линейный спад.
+    Длительности фаз - в секундах.
+    """
+    rate: float
+    ramp_up: float = 0.0
+    steady: float = 60.0
+    ramp_down: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.ramp_up + self.steady + self.ramp_down
+
+    def rate_at(self, t: float) -> float:
+        """Целевая интенсивность (запросов/с) в момент t от начала теста."""
+        if t < 0 or t >= self.duration:
+            return 0.0
+        if t < self.ramp_up:
+            return self.rate * t / self.ramp_up
+        if t < self.ramp_up + self.steady:
+            return self.rate
+        return self.rate * (self.duration - t) / self.ramp_down
+
+    def arrival_times(self, step: float = 0.001) -> Iterator[float]:
+        """
+        Моменты отправки запросов (секунды от начала): k-й запрос отправляется, когда
+        накопленное число запросов ∫rate(t)dt достигает k. Интегрирование - шагом step.
+        """
+        expected, t = 0.0, 0.0
+        next_arrival = 1.0
+        while t < self.duration:
+            expected += self.rate_at(t) * step
+            t += step
+            while expected >= next_arrival:
+                yield t
+                next_arrival += 1.0
+
+
+class EndpointStats:
+    """Накопленная статистика одного эндпоинта: гистограмма задержек (мс) и ошибки."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.error_samples: Dict[str, int] = {}
+
+    def record(self, latency_ms: float, error: Optional[BaseException] = None) -> None:
+        self.histogram.record(latency_ms)
+        if error is not None:
+            self.errors += 1
+            key = f"{type(error).__name__}: {str(error)[:120]}"
+            self.error_samples[key] = self.error_samples.get(key, 0) + 1
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    def percentile(self, p: float) -> float:
+        return self.histogram.percentile(p)
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        return {
+            "endpoint": self.name,
+            "requests": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "throughput_rps": round(self.count / duration, 2) if duration else 0.0,
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "p999_ms": round(self.percentile(99.9), 1),
+            "max_ms": round(self.histogram.max_ms, 1),
+            "top_errors": dict(sorted(self.error_samples.items(), key=lambda kv: -kv[1])[:5]),
+            "histogram": self.histogram.to_dict(),
+        }
+
+
+@dataclass
+class LoadReport:
+    """Итоги нагрузочного прогона по эндпоинтам."""
+    profile: LoadProfile
+    stats: Dict[str, EndpointStats]
+    duration: float
+    mode: str = "closed"
+    # Только для open-loop: отставание фактической отправки от запланированной (нагрузка на генератор)
+    send_lag: Optional[LatencyHistogram] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "mode": self.mode,
+            "profile": {
+                "rate": self.profile.rate,
+                "ramp_up": self.profile.ramp_up,
+                "steady": self.profile.steady,
+                "ramp_down": self.profile.ramp_down,
+            },
+            "duration_s": round(self.duration, 2),
+            "endpoints": [s.to_dict(self.duration) for s in self.stats.values()],
+        }
+        if self.send_lag is not None:
+            data["send_lag"] = self.send_lag.summary()
+        return data
+
+    def summary_table(self) -> str:
+        header = f"{'Эндпоинт':<45} {'запр.':>6} {'ош.%':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}"
+        lines = [header, "-" * len(header)]
+        for row in self.to_dict()["endpoints"]:
+            lines.append(
+                f"{row['endpoint']:<45} {row['requests']:>6} {row['error_rate'] * 100:>6.1f} "
+                f"{row['throughput_rps']:>7.2f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+            )
+        lines.append(f"Режим: {self.mode}, длительность: {self.duration:.1f} с, задержки в мс")
+        if self.send_lag is not None:
+            lines.append(
+                f"Отставание генератора: p99 {self.send_lag.percentile(99):.1f} мс, max {self.send_lag.max_ms:.1f} мс"
+            )
+        return "\n".join(lines)
+
+    def attach_to_allure(self, name: str = "Нагрузочный тест") -> None:
+        allure.attach(self.summary_table(), name=f"{name}: сводка", attachment_type=allure.attachment_type.TEXT)
+        allure.attach(
+            json.dumps(self.to_dict(), ensure_ascii=False, indent=2),
+            name=f"{name}: JSON",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+
+@dataclass
+class LoadTarget:
+    """
+    Вызываемая под нагрузкой операция: call() выполняет один запрос через page-клиент
+    (для OpenLoopRunner - корутинная функция async-клиента).
+    weight - относительная доля запросов при смешанной нагрузке.
+    """
+    name: str
+    call: Callable[[], Any]
+    weight: float = 1.0
+
+
+def _quiet_output(stack: contextlib.ExitStack) -> None:
+    """Подавить print page-клиентов до закрытия stack (иначе вывод тормозит генератор)."""
+    stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+
+
+class LoadRunner:
+    """
+    Замкнутый цикл (closed-loop): подаёт запросы к целям по расписанию LoadProfile (разгон / стабильная фаза / спад)
+    пулом из max_workers потоков и собирает p50/p95/p99, пропускную способность и долю ошибок.
+
+    Задержка считается от фактического начала запроса. Если все потоки заняты,
+    запрос ждёт в очереди пула, и это ожидание в задержку не попадает - при зависаниях
+    сервера хвосты занижаются (coordinated omission). Для честных хвостов - OpenLoopRunner.
+    """
+
+    def __init__(
+            self,
+            profile: LoadProfile,
+            targets: List[LoadTarget],
+            max_workers: int = DEFAULT_LOAD_WORKERS,
+            seed: Optional[int] = None,
+            quiet: bool = True
+    ):
+        """
+        :param seed: seed выбора цели при смешанной нагрузке (воспроизводимая последовательность)
+        :param quiet: подавить print page-клиентов на время прогона (иначе вывод тормозит генератор)
+        """
+        self.profile = profile
+        self.targets = targets
+        self.max_workers = max_workers
+        self.quiet = quiet
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {t.name: EndpointStats(t.name) for t in targets}
+
+    def _execute(self, target: LoadTarget) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            target.call()
+        except Exception as e:
+            error = e
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.stats[target.name].record(latency_ms, error)
+
+    def run(self) -> LoadReport:
+        weights = [t.weight for t in self.targets]
+
+        with contextlib.ExitStack() as stack:
+            if self.quiet:
+                _quiet_output(stack)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for offset in self.profile.arrival_times():
+                    delay = started + offset - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    target = self._random.choices(self.targets, weights)[0]
+                    pool.submit(self._execute, target)
+
+            return LoadReport(self.profile, self.stats, time.perf_counter() - started)
+
+
+class OpenLoopRunner:
+    """
+    Открытый цикл (open-loop): запросы отправляются строго по расписанию LoadProfile,
+    не дожидаясь ответов на предыдущие, поэтому зависание сервера не замедляет генератор.
+
+    Задержка считается от запланированного момента отправки, а не от фактического:
+    ожидание свободного соединения и отставание event loop входят в задержку, как их
+    увидел бы реальный клиент. Работает на asyncio и async page-клиентах; число
+    соединений ограничено коннектором aiohttp (ASYNC_POOL_LIMIT).
+    """
+
+    def __init__(
+            self,
+            profile: LoadProfile,
+            build_targets: Callable[[Any], List[LoadTarget]],
+            seed: Optional[int] = None,
+            quiet: bool = True
+    ):
+        """
+        :param build_targets: build_targets(aiohttp_session) -> цели с корутинными call();
+                              вызывается внутри event loop, до начала расписания
+        """
+        self.profile = profile
+        self.build_targets = build_targets
+        self.quiet = quiet
+        self._random = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = {}
+        self.send_lag = LatencyHistogram()
+
+    async def _execute(self, target: LoadTarget, intended: float) -> None:
+        self.send_lag.record((time.perf_counter() - intended) * 1000)
+        error = None
+        try:
+            await target.call()
+        except Exception as e:
+            error = e
+        self.stats[target.name].record((time.perf_counter() - intended) * 1000, error)
+
+    async def _run(self) -> LoadReport:
+        async with create_async_session() as session:
+            targets = self.build_targets(session)
+            weights = [t.weight for t in targets]
+            self.stats = {t.name: EndpointStats(t.name) for t in targets}
+            tasks = []
+
+            started = time.perf_counter()
+            for offset in self.profile.arrival_times():
+                intended = started + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                target = self._random.choices(targets, weights)[0]
+                tasks.append(asyncio.ensure_future(self._execute(target, intended)))
+
+            await asyncio.gather(*tasks)
+            duration = time.perf_counter() - started
+
+        return LoadReport(self.profile, self.stats, duration, mode="open", send_lag=self.send_lag)
+
+    def run(self) -> LoadReport:
+        with contextlib.ExitStack() as stack:
+            if self.quiet:
+                _quiet_output(stack)
+            return asyncio.run(self._run())
@@ -0,0 +1,173 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from config.settings import BASE_URL, TIMEOUT, PRODUCER_ID
+from pages.cargo_create_list_page import CargoPlaceListClient
+from pages.cargo_delivery_page import CargoDeliveryClient, AsyncCargoDeliveryClient
+from pages.create_cargo_page import AsyncCargoPlaceClient
+from pages.mass_shipment_task_page import generate_random_task_item
+from utils.address_repository import get_address_repository
+from utils.http_session import get_session
+from utils.load_harness import LoadTarget
+
+
+def _tomorrow() -> str:
+    return (datetime.now() + timedelta(days=1)).replace(microsecond=0).isoformat() + "Z"
+
+
+def shipment_tasks_create_list(token: str, batch_size: int = 10, created_ids: List[str] = None) -> LoadTarget:
+    """POST /shipment/tasks/create-list с batch_size случайными заданиями (generate_random_task_item)."""
+    headers = {"Authorization": token, "Content-Type": "application/json"}
+
+    def call():
+        response = get_session().post(
+            f"{BASE_URL}/shipment/tasks/create-list",
+            headers=headers,
+            json={"data": [generate_random_task_item() for _ in range(batch_size)]},
+            timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        if created_ids is not None:
+            created_ids.extend(item["id"] for item in response.json().get("data", []) if item.get("id"))
+
+    return LoadTarget("POST /shipment/tasks/create-list", call)
+
+
+def delivery_request_create_and_publish(token: str) -> LoadTarget:
+    """POST /cargo-delivery-requests/create-and-publish: FTL-заявка по двум адресам роли."""
+    client = CargoDeliveryClient(BASE_URL, token)
+    departure, delivery = get_address_repository(BASE_URL, token).valid_points()[:2]
+
+    def call():
+        client.create_and_publish_delivery_request(
+            route=[
+                client.create_route_point(departure["id"], 1, is_loading_work=True),
+                client.create_route_point(delivery["id"], 2, is_unloading_work=True),
+            ],
+            comment="Нагрузочный тест",
+            client_identifier=f"LOAD-{uuid.uuid4().hex[:10].upper()}",
+            to_start_at_from=_tomorrow(),
+            producer_id=PRODUCER_ID
+        )
+
+    return LoadTarget("POST /cargo-delivery-requests/create-and-publish", call)
+
+
+def cargo_places_create_list(token: str, batch_size: int = 10) -> LoadTarget:
+    """POST /cargo-place/create-list с batch_size грузоместами (CargoPlaceListClient.generate_cargo_place)."""
+    client = CargoPlaceListClient(BASE_URL, token)
+    departure, delivery = get_address_repository(BASE_URL, token).valid_points()[:2]
+
+    def call():
+        suffix = uuid.uuid4().hex[:8].upper()
+        cargo_places = [
+            client.generate_cargo_place(
+                departure_external_id=departure["externalId"],
+                delivery_external_id=delivery["externalId"],
+                external_id=f"LOAD-{suffix}-{i}",
+                bar_code=f"BC-LOAD-{suffix}-{i}",
+                invoice_number=f"INV-LOAD-{suffix}-{i}"
+            )
+            for i in range(batch_size)
+        ]
+        result = client.create_cargo_places_list(cargo_places)
+        failed = [item for item in result.get("data", []) if item.get("status") != "ok"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} из {batch_size} грузомест с ошибкой: {failed[0].get('errors')}")
+
+    return LoadTarget("POST /cargo-place/create-list", call)
+
+
+# Цели нагрузки по имени (для scripts/load_test.py и tests/test_load.py)
+LOAD_TARGETS: Dict[str, Callable[..., LoadTarget]] = {
+    "shipment_tasks": shipment_tasks_create_list,
+    "delivery_requests": delivery_request_create_and_publish,
+    "cargo_places": cargo_places_create_list,
+}
+
+# Роль, под которой создаются сущности каждой цели
+LOAD_TARGET_ROLES: Dict[str, str] = {
+    "shipment_tasks": "lkz",
+    "delivery_requests": "lkz",
+    "cargo_places": "lke",
+}
+
+
+def build_load_target(name: str, token: str, batch_size: int = 10, created_task_ids: List[str] = None) -> LoadTarget:
+    """Собрать цель по имени из LOAD_TARGETS; batch_size учитывается для create-list эндпоинтов."""
+    if name == "shipment_tasks":
+        return shipment_tasks_create_list(token, batch_size, created_task_ids)
+    if name == "cargo_places":
+        return cargo_places_create_list(token, batch_size)
+    return LOAD_TARGETS[name](token)
+
+
+# ==================== ASYNC-ЦЕЛИ ДЛЯ OPEN-LOOP РЕЖИМА ====================
+
+def async_shipment_tasks_create_list(session, token: str, batch_size: int = 10,
+                                     created_ids: List[str] = None) -> LoadTarget:
+    """Async POST /shipment/tasks/create-list (OpenLoopRunner)."""
+    headers = {"Authorization": token, "Content-Type": "application/json"}
+
+    async def call():
+        payload = {"data": [generate_random_task_item() for _ in range(batch_size)]}
+        async with session.post(f"{BASE_URL}/shipment/tasks/create-list", headers=headers, json=payload) as response:
+            body = await response.json(content_type=None)
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}: {str(body)[:200]}")
+        if created_ids is not None:
+            created_ids.extend(item["id"] for item in body.get("data", []) if item.get("id"))
+
+    return LoadTarget("POST /shipment/tasks/create-list", call)
+
+
+def async_delivery_request_create_and_publish(session, token: str) -> LoadTarget:
+    """Async POST /cargo-delivery-requests/create-and-publish (OpenLoopRunner)."""
+    client = AsyncCargoDeliveryClient(BASE_URL, token, session)
+    departure, delivery = get_address_repository(BASE_URL, token).valid_points()[:2]
+
+    async def call():
+        await client.create_and_publish_delivery_request(
+            route=[
+                client.create_route_point(departure["id"], 1, is_loading_work=True),
+                client.create_route_point(delivery["id"], 2, is_unloading_work=True),
+            ],
+            comment="Нагрузочный тест",
+            client_identifier=f"LOAD-{uuid.uuid4().hex[:10].upper()}",
+            to_start_at_from=_tomorrow(),
+            producer_id=PRODUCER_ID
+        )
+
+    return LoadTarget("POST /cargo-delivery-requests/create-and-publish", call)
+
+
+def async_cargo_place_create_or_update(session, token: str) -> LoadTarget:
+    """Async POST /cargo-place/create-or-update: одно грузоместо (OpenLoopRunner)."""
+    client = AsyncCargoPlaceClient(BASE_URL, token, session)
+    departure, delivery = get_address_repository(BASE_URL, token).valid_points()[:2]
+
+    async def call():
+        await client.create_cargo_place(
+            departure_external_id=departure["externalId"],
+            delivery_external_id=delivery["externalId"],
+            external_id=f"LOAD-{uuid.uuid4().hex[:10].upper()}"
+        )
+
+    return LoadTarget("POST /cargo-place/create-or-update", call)
+
+
+# Цели open-loop режима: shipment_tasks и delivery_requests - как в закрытом режиме,
+# cargo_places - поштучный /cargo-place/create-or-update
+ASYNC_LOAD_TARGETS: Dict[str, Callable[..., LoadTarget]] = {
+    "shipment_tasks": async_shipment_tasks_create_list,
+    "delivery_requests": async_delivery_request_create_and_publish,
+    "cargo_places": async_cargo_place_create_or_update,
+}
+
+
+def build_async_load_target(name: str, session, token: str, batch_size: int = 10,
+                            created_task_ids: List[str] = None) -> LoadTarget:
+    """Собрать async-цель по имени из ASYNC_LOAD_TARGETS (внутри event loop OpenLoopRunner)."""
+    if name == "shipment_tasks":
+        return async_shipment_tasks_create_list(session, token, batch_size, created_task_ids)
+    return ASYNC_LOAD_TARGETS[name](session, token)
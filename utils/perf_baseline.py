@@ -0,0 +1,228 @@
+import html
+import json
+import math
+import os
+import statistics
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from utils.http_metrics import HttpMetrics
+from utils.latency_histogram import LatencyHistogram
+
+# Сколько последних длительностей теста хранит базовая линия
+TEST_SAMPLES_KEPT = 10
+
+# Масштаб MAD к стандартному отклонению нормального распределения
+_MAD_SCALE = 1.4826
+
+OK = "ok"
+REGRESSION = "regression"
+IMPROVED = "improved"
+NO_DATA = "no_data"
+
+_VERDICT_LABELS = {OK: "✅ норма", REGRESSION: "❌ регрессия", IMPROVED: "🚀 быстрее", NO_DATA: "⚪ мало данных"}
+
+
+@dataclass
+class PerfThresholds:
+    """
+    Пороги регрессии. Эндпоинт регрессировал, если перцентиль percentile вырос больше чем
+    на threshold (доля) И распределение задержек сдвинулось статистически значимо
+    (односторонний критерий Манна-Уитни по гистограммам, p < alpha) - случайный выброс
+    в шумном прогоне не сдвигает всё распределение. Сравниваются только эндпоинты, у которых
+    в обоих прогонах не меньше min_samples вызовов. Тест регрессировал, если его длительность
+    выше медианы базовой линии и на threshold, и на mad_factor робастных сигм (MAD).
+    """
+    threshold: float = 0.2
+    percentile: float = 95.0
+    alpha: float = 0.01
+    min_samples: int = 20
+    mad_factor: float = 3.0
+    min_test_samples: int = 3
+
+
+@dataclass
+class PerfRow:
+    """Строка сравнения: эндпоинт ("METHOD /шаблон") или тест (nodeid)."""
+    kind: str
+    key: str
+    baseline_ms: float
+    current_ms: float
+    samples: str
+    p_value: Optional[float]
+    verdict: str
+
+    @property
+    def change(self) -> float:
+        return self.current_ms / self.baseline_ms - 1 if self.baseline_ms else 0.0
+
+
+def mann_whitney_greater(current: LatencyHistogram, baseline: LatencyHistogram) -> float:
+    """
+    p-value одностороннего критерия Манна-Уитни "задержки current больше baseline" по бакетам
+    гистограмм (значения одного бакета - связки, средний ранг), нормальное приближение с поправкой на связки.
+    """
+    n1, n2 = current.total, baseline.total
+    if not n1 or not n2:
+        return 1.0
+    n = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    seen = 0
+    for index in sorted(set(current.counts) | set(baseline.counts)):
+        c1, c2 = current.counts.get(index, 0), baseline.counts.get(index, 0)
+        t = c1 + c2
+        rank_sum += c1 * (seen + (t + 1) / 2)
+        ties += t ** 3 - t
+        seen += t
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class PerfBaseline:
+    """
+    Базовая линия производительности: гистограммы задержек эндпоинтов (формат utils.http_metrics)
+    и последние длительности тестов. Хранится в JSON-файле в репозитории и обновляется
+    прогоном с --perf-baseline-update.
+    """
+
+    def __init__(self, endpoints: Optional[HttpMetrics] = None, tests: Optional[Dict[str, List[float]]] = None):
+        self.endpoints = endpoints or HttpMetrics()
+        self.tests = tests or {}
+
+    @classmethod
+    def load(cls, path: str) -> "PerfBaseline":
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls(HttpMetrics.from_dict(data.get("endpoints", {})), data.get("tests", {}))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"endpoints": self.endpoints.to_dict(), "tests": dict(sorted(self.tests.items()))},
+                      f, ensure_ascii=False, indent=2)
+
+    def update(self, metrics: HttpMetrics, durations: Dict[str, float]) -> None:
+        """Гистограммы эндпоинтов заменяются текущими, длительность теста добавляется к последним замерам."""
+        for key, endpoint in metrics.endpoints.items():
+            self.endpoints.endpoints[key] = endpoint
+        for nodeid, duration in durations.items():
+            self.tests[nodeid] = (self.tests.get(nodeid, []) + [round(duration, 3)])[-TEST_SAMPLES_KEPT:]
+
+    # ==================== СРАВНЕНИЕ ====================
+
+    def compare(self, metrics: HttpMetrics, durations: Dict[str, float],
+                thresholds: Optional[PerfThresholds] = None) -> List[PerfRow]:
+        thresholds = thresholds or PerfThresholds()
+        rows = []
+        for key, endpoint in sorted(metrics.endpoints.items()):
+            base = self.endpoints.endpoints.get(key)
+            if base is not None:
+                rows.append(self._compare_endpoint(" ".join(key), endpoint.histogram, base.histogram, thresholds))
+        for nodeid, duration in sorted(durations.items()):
+            samples = self.tests.get(nodeid)
+            if samples:
+                rows.append(self._compare_test(nodeid, duration, samples, thresholds))
+        return rows
+
+    @staticmethod
+    def _compare_endpoint(key: str, current: LatencyHistogram, base: LatencyHistogram,
+                          thresholds: PerfThresholds) -> PerfRow:
+        current_ms, baseline_ms = current.percentile(thresholds.percentile), base.percentile(thresholds.percentile)
+        row = PerfRow("endpoint", key, baseline_ms, current_ms, f"{current.total}/{base.total}", None, OK)
+        if min(current.total, base.total) < thresholds.min_samples:
+            row.verdict = NO_DATA
+            return row
+        if current_ms > baseline_ms * (1 + thresholds.threshold):
+            row.p_value = mann_whitney_greater(current, base)
+            row.verdict = REGRESSION if row.p_value < thresholds.alpha else OK
+        elif current_ms < baseline_ms * (1 - thresholds.threshold):
+            row.p_value = mann_whitney_greater(base, current)
+            row.verdict = IMPROVED if row.p_value < thresholds.alpha else OK
+        return row
+
+    @staticmethod
+    def _compare_test(nodeid: str, duration: float, samples: List[float], thresholds: PerfThresholds) -> PerfRow:
+        median = statistics.median(samples)
+        row = PerfRow("test", nodeid, median * 1000, duration * 1000, f"1/{len(samples)}", None, OK)
+        if len(samples) < thresholds.min_test_samples:
+            row.verdict = NO_DATA
+            return row
+        spread = thresholds.mad_factor * _MAD_SCALE * statistics.median(abs(s - median) for s in samples)
+        if duration > median * (1 + thresholds.threshold) and duration > median + spread:
+            row.verdict = REGRESSION
+        elif duration < median * (1 - thresholds.threshold) and duration < median - spread:
+            row.verdict = IMPROVED
+        return row
+
+
+# ==================== ОТЧЁТ ====================
+
+def regressions(rows: List[PerfRow]) -> List[PerfRow]:
+    return [row for row in rows if row.verdict == REGRESSION]
+
+
+def comparison_table(rows: List[PerfRow], percentile: float = 95.0) -> str:
+    header = (f"{'Эндпоинт / тест':<70} {'база':>10} {'сейчас':>10} {'изм.':>7} "
+              f"{'выборки':>11} {'p-value':>8}  итог")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        p_value = f"{row.p_value:.4f}" if row.p_value is not None else "-"
+        lines.append(
+            f"{row.key[:70]:<70} {row.baseline_ms:>10.1f} {row.current_ms:>10.1f} {row.change:>+7.0%} "
+            f"{row.samples:>11} {p_value:>8}  {_VERDICT_LABELS[row.verdict]}"
+        )
+    lines.append(f"Эндпоинты: p{percentile:g}, мс; тесты: длительность против медианы базовой линии, мс")
+    return "\n".join(lines)
+
+
+def comparison_html(rows: List[PerfRow], percentile: float = 95.0) -> str:
+    cells = "".join(
+        f"<tr style=\"background:{'#fdd' if row.verdict == REGRESSION else '#fff'}\">"
+        f"<td>{html.escape(row.key)}</td><td>{row.baseline_ms:.1f}</td><td>{row.current_ms:.1f}</td>"
+        f"<td>{row.change:+.0%}</td><td>{row.samples}</td>"
+        f"<td>{'-' if row.p_value is None else f'{row.p_value:.4f}'}</td>"
+        f"<td>{_VERDICT_LABELS[row.verdict]}</td></tr>"
+        for row in rows
+    )
+    return (
+        f"<table border=\"1\" cellpadding=\"4\"><tr><th>Эндпоинт / тест</th><th>база, мс</th>"
+        f"<th>сейчас, мс</th><th>изм.</th><th>выборки</th><th>p-value</th><th>итог</th></tr>{cells}</table>"
+        f"<p>Эндпоинты: p{percentile:g}; тесты: длительность против медианы базовой линии.</p>"
+    )
+
+
+def write_allure_result(results_dir: str, rows: List[PerfRow], percentile: float = 95.0) -> None:
+    """
+    Отдельный результат "Сравнение с базовой линией производительности" в allure-results с таблицей
+    во вложении: сравнение идёт после всех тестов (и после воркеров xdist), когда контекста теста уже нет.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    attachment = f"{uuid.uuid4()}-attachment.html"
+    with open(os.path.join(results_dir, attachment), "w", encoding="utf-8") as f:
+        f.write(comparison_html(rows, percentile))
+
+    failed = regressions(rows)
+    now = int(time.time() * 1000)
+    result = {
+        "uuid": str(uuid.uuid4()),
+        "historyId": "perf-baseline",
+        "name": "Сравнение с базовой линией производительности",
+        "fullName": "conftest#perf_baseline",
+        "status": "failed" if failed else "passed",
+        "statusDetails": {"message": "\n".join(f"{row.key}: {row.change:+.0%}" for row in failed)},
+        "start": now,
+        "stop": now,
+        "labels": [{"name": "feature", "value": "Производительность"},
+                   {"name": "story", "value": "Базовая линия"}],
+        "attachments": [{"name": "Сравнение с базовой линией", "source": attachment, "type": "text/html"}],
+    }
+    with open(os.path.join(results_dir, f"{result['uuid']}-result.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+# Значения по умолчанию для ожидания асинхронной обработки на стороне API
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_INTERVAL = 0.25
+DEFAULT_MAX_INTERVAL = 3.0
+DEFAULT_BACKOFF = 2.0
+DEFAULT_JITTER = 0.2
+
+
+@dataclass
+class PollResult:
+    """Результат опроса: последнее значение, признак успеха и фактически затраченное время."""
+    value: Any
+    success: bool
+    attempts: int
+    elapsed: float
+    error: Optional[BaseException] = None
+
+    def unwrap(self) -> Any:
+        """Вернуть значение или поднять последнюю ошибку / TimeoutError, если условие не выполнилось."""
+        if self.success:
+            return self.value
+        if self.error is not None:
+            raise self.error
+        raise TimeoutError(f"Условие не выполнилось за {self.elapsed:.2f} с ({self.attempts} попыток)")
+
+    def last_value(self) -> Any:
+        """Последнее полученное значение, даже если условие не выполнилось; если значения нет - как unwrap()."""
+        return self.unwrap() if self.value is None else self.value
+
+
+class Backoff:
+    """Экспоненциальная задержка с джиттером до max_interval и остатка дедлайна (poll, apoll, StatusWatcher)."""
+
+    def __init__(self, interval: float, max_interval: float, backoff: float, jitter: float):
+        self.delay = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+
+    def next_sleep(self, remaining: float) -> float:
+        sleep = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.delay = min(self.delay * self.backoff, self.max_interval)
+        return max(0.0, min(sleep, remaining))
+
+
+def poll(
+        fetch: Callable[[], Any],
+        predicate: Callable[[Any], bool] = bool,
+        timeout: float = DEFAULT_TIMEOUT,
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        jitter: float = DEFAULT_JITTER,
+        ignore_exceptions: bool = True
+) -> PollResult:
+    """
+    Опрашивает fetch() до выполнения predicate(value) или истечения общего дедлайна.
+
+    Первая попытка выполняется сразу, дальше - с экспоненциально растущей задержкой
+    (interval * backoff^n, не больше max_interval) и случайным джиттером ±jitter.
+    Исключения fetch() при ignore_exceptions=True считаются неуспешной попыткой.
+
+    :return: PollResult с последним значением, числом попыток и фактическим временем ожидания
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delays = Backoff(interval, max_interval, backoff, jitter)
+    value, error, attempts = None, None, 0
+
+    while True:
+        attempts += 1
+        try:
+            value = fetch()
+            error = None
+            if predicate(value):
+                return PollResult(value, True, attempts, time.monotonic() - started)
+        except Exception as e:
+            if not ignore_exceptions:
+                raise
+            error = e
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return PollResult(value, False, attempts, time.monotonic() - started, error)
+        time.sleep(delays.next_sleep(remaining))
+
+
+async def apoll(
+        fetch: Callable[[], Awaitable[Any]],
+        predicate: Callable[[Any], bool] = bool,
+        timeout: float = DEFAULT_TIMEOUT,
+        interval: float = DEFAULT_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        jitter: float = DEFAULT_JITTER,
+        ignore_exceptions: bool = True
+) -> PollResult:
+    """Async-вариант poll(): fetch - корутинная функция, ожидание через asyncio.sleep."""
+    started = time.monotonic()
+    deadline = started + timeout
+    delays = Backoff(interval, max_interval, backoff, jitter)
+    value, error, attempts = None, None, 0
+
+    while True:
+        attempts += 1
+        try:
+            value = await fetch()
+            error = None
+            if predicate(value):
+                return PollResult(value, True, attempts, time.monotonic() - started)
+        except Exception as e:
+            if not ignore_exceptions:
+                raise
+            error = e
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return PollResult(value, False, attempts, time.monotonic() - started, error)
+        await asyncio.sleep(delays.next_sleep(remaining))
+
+
+class _StopRetry(BaseException):
+    """Ошибка, которую retry_until_ok не повторяет: BaseException, чтобы poll() её не перехватил."""
+
+    def __init__(self, error: Exception):
+        super().__init__(error)
+        self.error = error
+
+
+def retry_until_ok(
+        action: Callable[[], Any],
+        timeout: float = DEFAULT_TIMEOUT,
+        retry_on: Tuple[Type[Exception], ...] = (Exception,),
+        **poll_kwargs
+) -> Any:
+    """
+    Повторяет action() до первого вызова без исключения (вместо фиксированного time.sleep перед шагом).
+    Подходит только для действий, которые при ошибке не меняют состояние на сервере; действия,
+    меняющие состояние (создание, назначение, отмена), выполняются один раз после poll() предусловия.
+    Повторяются только исключения типов retry_on (например, временные 429/5xx и сетевые ошибки),
+    остальные поднимаются сразу. Если за timeout успеха нет - поднимает последнюю ошибку.
+    """
+    def attempt():
+        try:
+            return action()
+        except retry_on:
+            raise
+        except Exception as e:
+            raise _StopRetry(e)
+
+    try:
+        return poll(attempt, predicate=lambda _: True, timeout=timeout, **poll_kwargs).unwrap()
+    except _StopRetry as stop:
+        raise stop.error from None
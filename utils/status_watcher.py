@@ -0,0 +1,203 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+from utils.polling import (
+    Backoff, DEFAULT_INTERVAL, DEFAULT_MAX_INTERVAL, DEFAULT_BACKOFF, DEFAULT_JITTER
+)
+
+# Общий дедлайн наблюдения и число одновременных запросов деталей
+DEFAULT_WATCH_TIMEOUT = 600.0
+DEFAULT_WATCH_CONCURRENCY = 20
+
+
+@dataclass
+class WatchResult:
+    """Итог наблюдения за одной сущностью."""
+    key: Hashable
+    value: Any
+    success: bool
+    polls: int
+    elapsed: float
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _Watched:
+    key: Hashable
+    fetch: Callable[[], Awaitable[Any]]
+    is_done: Callable[[Any], bool]
+    snapshot: Callable[[Any], Any]
+    future: asyncio.Future
+    value: Any = None
+    polls: int = 0
+    error: Optional[BaseException] = field(default=None)
+
+
+class StatusWatcher:
+    """
+    Мультиплексированное наблюдение за статусами множества сущностей (заказы, заявки, рейсы).
+
+    Все сущности опрашиваются параллельно через один event loop и общий aiohttp-пул,
+    число одновременных запросов ограничено concurrency. Частота опроса адаптивная:
+    пока снимок статуса не меняется, задержка растёт экспоненциально (до max_interval),
+    после изменения - сбрасывается к interval.
+
+    Для каждой сущности watch*() возвращает future, который разрешается WatchResult,
+    как только достигнут целевой статус (или истёк общий дедлайн). run() завершается,
+    когда разрешены все future - без ожидания до конца timeout.
+
+    Использование (внутри корутины):
+        watcher = StatusWatcher(timeout=600)
+        futures = [watcher.watch_order(order_client, oid, {12}) for oid in order_ids]
+        results = await watcher.run()
+    """
+
+    def __init__(
+            self,
+            timeout: float = DEFAULT_WATCH_TIMEOUT,
+            concurrency: int = DEFAULT_WATCH_CONCURRENCY,
+            interval: float = DEFAULT_INTERVAL,
+            max_interval: float = DEFAULT_MAX_INTERVAL,
+            backoff: float = DEFAULT_BACKOFF,
+            jitter: float = DEFAULT_JITTER,
+            on_change: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        :param timeout: общий дедлайн наблюдения за всеми сущностями, с
+        :param concurrency: максимум одновременных запросов деталей
+        :param on_change: callback(key, value), вызывается при каждом изменении снимка статуса
+        """
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.on_change = on_change
+        self._entities: Dict[Hashable, _Watched] = {}
+
+    # ==================== РЕГИСТРАЦИЯ СУЩНОСТЕЙ ====================
+
+    def watch(
+            self,
+            key: Hashable,
+            fetch: Callable[[], Awaitable[Any]],
+            is_done: Callable[[Any], bool],
+            snapshot: Callable[[Any], Any] = lambda value: value
+    ) -> asyncio.Future:
+        """
+        Добавить сущность под наблюдение. Вызывать внутри работающего event loop.
+
+        :param key: уникальный ключ сущности (например, ("order", 123))
+        :param fetch: корутинная функция получения деталей
+        :param is_done: условие завершения наблюдения по деталям
+        :param snapshot: значимая часть деталей; её изменение сбрасывает задержку опроса
+        """
+        if key in self._entities:
+            return self._entities[key].future
+
+        future = asyncio.get_running_loop().create_future()
+        self._entities[key] = _Watched(key, fetch, is_done, snapshot, future)
+        return future
+
+    def watch_order(self, client, order_id: int, target_states: Iterable[int],
+                    cargo_places_count: Optional[int] = None) -> asyncio.Future:
+        """
+        Наблюдать за заказом через AsyncTransportRequestClient.get_order_details до state из target_states
+        (и, если задано, до нужного числа грузомест в transportOrder.cargoPlaces).
+        """
+        targets = set(target_states)
+
+        def is_done(details: dict) -> bool:
+            if details.get("state") not in targets:
+                return False
+            if cargo_places_count is None:
+                return True
+            return len(details.get("transportOrder", {}).get("cargoPlaces", [])) >= cargo_places_count
+
+        return self.watch(
+            ("order", order_id),
+            lambda: client.get_order_details(order_id),
+            is_done,
+            lambda d: (d.get("state"), len(d.get("transportOrder", {}).get("cargoPlaces", [])))
+        )
+
+    def watch_request(self, client, request_id: str, target_statuses: Iterable[str]) -> asyncio.Future:
+        """Наблюдать за заявкой через AsyncCargoDeliveryClient.get_delivery_request_details до статуса из target_statuses."""
+        targets = set(target_statuses)
+        return self.watch(
+            ("request", request_id),
+            lambda: client.get_delivery_request_details(request_id),
+            lambda d: d.get("status") in targets,
+            lambda d: d.get("status")
+        )
+
+    def watch_truck_delivery(self, client, truck_delivery_id: str, target_statuses: Iterable[str]) -> asyncio.Future:
+        """Наблюдать за рейсом через AsyncTruckDeliveriesDetailsClient.get_truck_delivery_details до статуса из target_statuses."""
+        targets = set(target_statuses)
+        return self.watch(
+            ("truck_delivery", truck_delivery_id),
+            lambda: client.get_truck_delivery_details(truck_delivery_id),
+            lambda d: d.get("status") in targets,
+            lambda d: d.get("status")
+        )
+
+    # ==================== ЗАПУСК ====================
+
+    async def run(self) -> Dict[Hashable, WatchResult]:
+        """
+        Опрашивать все зарегистрированные сущности до достижения целевых статусов или дедлайна.
+
+        :return: {key: WatchResult} для всех сущностей
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        await asyncio.gather(*[
+            self._watch_one(entity, started, deadline, semaphore)
+            for entity in self._entities.values()
+            if not entity.future.done()
+        ])
+        return {key: entity.future.result() for key, entity in self._entities.items()}
+
+    async def _watch_one(self, entity: _Watched, started: float, deadline: float,
+                         semaphore: asyncio.Semaphore) -> None:
+        delays = Backoff(self.interval, self.max_interval, self.backoff, self.jitter)
+        last_snapshot = object()
+
+        while True:
+            entity.polls += 1
+            try:
+                async with semaphore:
+                    entity.value = await entity.fetch()
+                entity.error = None
+
+                current = entity.snapshot(entity.value)
+                if current != last_snapshot:
+                    last_snapshot = current
+                    # Статус изменился - возвращаемся к частому опросу
+                    delays.delay = self.interval
+                    if self.on_change:
+                        self.on_change(entity.key, entity.value)
+
+                if entity.is_done(entity.value):
+                    self._resolve(entity, True, started)
+                    return
+            except Exception as e:
+                entity.error = e
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._resolve(entity, False, started)
+                return
+            await asyncio.sleep(delays.next_sleep(remaining))
+
+    @staticmethod
+    def _resolve(entity: _Watched, success: bool, started: float) -> None:
+        if not entity.future.done():
+            entity.future.set_result(WatchResult(
+                entity.key, entity.value, success, entity.polls,
+                time.monotonic() - started, entity.error
+            ))
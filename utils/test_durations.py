@@ -0,0 +1,137 @@
+import glob
+import json
+import os
+import statistics
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Оценка для теста без истории, если истории нет вообще, с
+DEFAULT_DURATION = 1.0
+
+# Вес нового замера в скользящем среднем: история сглаживает разовые выбросы стенда
+HISTORY_WEIGHT = 0.5
+
+
+def function_key(nodeid: str) -> str:
+    """nodeid без параметров: tests/test_x.py::test_name[lkp] -> tests/test_x.py::test_name."""
+    return nodeid.split("[", 1)[0]
+
+
+def allure_full_name_to_key(full_name: str) -> str:
+    """fullName из allure-results (tests.test_x#Class.test) -> function_key (tests/test_x.py::Class::test)."""
+    module, _, test = full_name.partition("#")
+    return f"{module.replace('.', '/')}.py::{test.replace('.', '::')}"
+
+
+def durations_from_allure(results_dir: str) -> Dict[str, float]:
+    """
+    Средняя длительность (с) тестовых функций по *-result.json из allure-results.
+    Параметризованные варианты в Allure не различимы по nodeid, поэтому ключ - function_key.
+    """
+    samples: Dict[str, List[float]] = {}
+    for result_file in glob.glob(os.path.join(results_dir, "**", "*-result.json"), recursive=True):
+        try:
+            with open(result_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("status") == "skipped":
+                continue
+            duration = (data["stop"] - data["start"]) / 1000
+            key = allure_full_name_to_key(data["fullName"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        samples.setdefault(key, []).append(duration)
+    return {key: statistics.fmean(values) for key, values in samples.items()}
+
+
+class DurationHistory:
+    """
+    История длительностей тестов (с) в JSON-файле: {nodeid или function_key: секунды}.
+    Новые замеры смешиваются со старыми (HISTORY_WEIGHT), тесты, которых не было в прогоне, сохраняются.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.durations = {key: float(value) for key, value in json.load(f).items()}
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def update(self, measured: Dict[str, float]) -> None:
+        for key, duration in measured.items():
+            previous = self.durations.get(key)
+            self.durations[key] = duration if previous is None else (
+                HISTORY_WEIGHT * duration + (1 - HISTORY_WEIGHT) * previous
+            )
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.durations.items())), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def estimate(self, nodeid: str) -> float:
+        """Оценка длительности: по nodeid, по тестовой функции, иначе медиана истории."""
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        key = function_key(nodeid)
+        if key in self.durations:
+            return self.durations[key]
+        return statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+
+    def longest_first(self, nodeids: Iterable[str]) -> List[str]:
+        """Порядок запуска: самые долгие первыми (при равенстве - исходный порядок)."""
+        nodeids = list(nodeids)
+        order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+        return sorted(nodeids, key=lambda nodeid: (-self.estimate(nodeid), order[nodeid]))
+
+    def longest_modules_first(self, nodeids: Iterable[str]) -> List[str]:
+        """
+        Порядок запуска по модулям: модули с наибольшей суммарной длительностью первыми, тесты модуля -
+        подряд и в исходном порядке (module-фикстуры не пересоздаются, вывод не перемешивается).
+        """
+        modules: Dict[str, List[str]] = {}
+        for nodeid in nodeids:
+            modules.setdefault(nodeid.split("::", 1)[0], []).append(nodeid)
+        totals = {module: sum(self.estimate(nodeid) for nodeid in members) for module, members in modules.items()}
+        order = {module: i for i, module in enumerate(modules)}
+        ranked = sorted(modules, key=lambda module: (-totals[module], order[module]))
+        return [nodeid for module in ranked for nodeid in modules[module]]
+
+    def shards(self, nodeids: Sequence[str], count: int) -> List[Tuple[float, List[str]]]:
+        """
+        Разбиение на count шардов с близкой суммарной длительностью (жадный LPT: очередной
+        самый долгий тест - в наименее загруженный шард). Детерминировано для одинаковой истории,
+        поэтому каждый шард CI вычисляет свою часть сам. Возвращает [(оценка, [nodeid...])].
+        """
+        shards: List[Tuple[float, List[str]]] = [(0.0, []) for _ in range(count)]
+        for nodeid in self.longest_first(nodeids):
+            index = min(range(count), key=lambda i: (shards[i][0], i))
+            total, members = shards[index]
+            members.append(nodeid)
+            shards[index] = (total + self.estimate(nodeid), members)
+        return shards
+
+    def slowest(self, limit: int = 10) -> List[Tuple[str, float]]:
+        return sorted(self.durations.items(), key=lambda item: -item[1])[:limit]
+
+
+def measured_durations(reports: Iterable[Tuple[str, str, float]]) -> Dict[str, float]:
+    """Суммарная длительность setup+call+teardown по отчётам (nodeid, outcome, duration); пропущенные не учитываются."""
+    totals: Dict[str, float] = {}
+    skipped = set()
+    for nodeid, outcome, duration in reports:
+        totals[nodeid] = totals.get(nodeid, 0.0) + duration
+        if outcome == "skipped":
+            skipped.add(nodeid)
+    return {nodeid: duration for nodeid, duration in totals.items() if nodeid not in skipped}
+
+
+def load_history(path: str, allure_results: Optional[str] = None) -> DurationHistory:
+    """История из файла, дополненная (без перезаписи) средними из allure-results."""
+    history = DurationHistory(path)
+    if allure_results and os.path.isdir(allure_results):
+        for key, duration in durations_from_allure(allure_results).items():
+            history.durations.setdefault(key, duration)
+    return history
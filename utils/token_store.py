@@ -0,0 +1,157 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from config.settings import BASE_URL, TOKEN_CACHE_DIR, TOKEN_REFRESH_MARGIN, TOKEN_DEFAULT_TTL
+from utils.api_helpers import login
+from utils.file_lock import file_lock
+
+
+def token_expires_at(token: str, default_ttl: float = TOKEN_DEFAULT_TTL) -> float:
+    """Момент истечения (unix time) из claim exp JWT; если его нет - сейчас + default_ttl."""
+    try:
+        payload = token.removeprefix("Bearer ").split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + default_ttl
+
+
+class TokenStore:
+    """
+    Общий для процессов кэш токенов: по файлу на (base_url, роль, логин) в cache_dir.
+
+    Токен берётся из памяти, затем из файла, и только если он отсутствует или истекает
+    (с запасом refresh_margin) - выполняется вход. Чтение, вход и запись идут под файловой
+    блокировкой ключа, поэтому параллельные процессы pytest и воркеры xdist логинятся
+    под ролью один раз, а остальные подхватывают записанный токен.
+
+    Через resolve() / refresh_token() кэш подключается к общему транспорту
+    (utils.http_session.set_auth_refresher): на первый 401 токен обновляется, запрос повторяется,
+    а клиенты со старым токеном дальше автоматически ходят с новым.
+    """
+
+    def __init__(
+            self,
+            cache_dir: Path = TOKEN_CACHE_DIR,
+            base_url: str = BASE_URL,
+            login_func: Callable[..., dict] = login,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.base_url = base_url.rstrip('/')
+        self.login_func = login_func
+        self.refresh_margin = refresh_margin
+        self.logins = 0
+        self._memory: Dict[str, dict] = {}
+        # Выданный токен -> роль; устаревший токен -> заменивший его (для подмены в заголовках)
+        self._issued: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # ==================== ХРАНЕНИЕ ====================
+
+    def _key(self, role: str) -> str:
+        email = os.getenv(f"{role.upper()}_EMAIL", "")
+        return hashlib.sha1(f"{self.base_url}|{role}|{email}".encode()).hexdigest()[:16]
+
+    def _path(self, role: str) -> Path:
+        return self.cache_dir / f"{role}-{self._key(role)}.json"
+
+    def _role_lock(self, role: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(role, threading.Lock())
+
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        return entry is not None and entry["expires_at"] - self.refresh_margin > time.time()
+
+    def _read(self, role: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(role).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, role: str, entry: dict) -> None:
+        path = self._path(role)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        # Токены - учётные данные: файл доступен только владельцу
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _remember(self, role: str, entry: dict) -> dict:
+        with self._lock:
+            previous = self._memory.get(role)
+            if previous is not None and previous["token"] != entry["token"]:
+                self._aliases[previous["token"]] = entry["token"]
+            self._memory[role] = entry
+            self._issued[entry["token"]] = role
+        return {"token": entry["token"], "role": entry["role"]}
+
+    def _login(self, role: str) -> dict:
+        token_info = self.login_func(role, self.base_url)
+        self.logins += 1
+        entry = {**token_info, "expires_at": token_expires_at(token_info["token"]), "issued_at": time.time()}
+        self._write(role, entry)
+        return entry
+
+    # ==================== ПОЛУЧЕНИЕ ====================
+
+    def get(self, role: str) -> dict:
+        """{"token", "role"} для роли: из памяти, из файла или через вход."""
+        entry = self._memory.get(role)
+        if self._fresh(entry):
+            return {"token": entry["token"], "role": entry["role"]}
+
+        with self._role_lock(role), file_lock(self._path(role).with_suffix(".lock")):
+            entry = self._read(role)
+            if not self._fresh(entry):
+                entry = self._login(role)
+            return self._remember(role, entry)
+
+    def refresh(self, role: str, stale_token: Optional[str] = None) -> dict:
+        """
+        Обновить токен роли после 401. Если другой процесс уже записал токен,
+        отличный от stale_token, - берётся он, без повторного входа.
+        """
+        with self._role_lock(role), file_lock(self._path(role).with_suffix(".lock")):
+            entry = self._read(role)
+            if entry is None or entry["token"] == stale_token or not self._fresh(entry):
+                entry = self._login(role)
+            return self._remember(role, entry)
+
+    def login_all(self, roles: Iterable[str], max_workers: int = 4) -> Dict[str, dict]:
+        """Параллельный вход под всеми ролями, для которых заданы учётные данные."""
+        configured: List[str] = [r for r in roles if os.getenv(f"{r.upper()}_EMAIL")]
+        if not configured:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(configured))) as pool:
+            return dict(zip(configured, pool.map(self.get, configured)))
+
+    def invalidate(self) -> None:
+        """Забыть токены в памяти процесса (файлы остаются)."""
+        with self._lock:
+            self._memory.clear()
+
+    # ==================== ИНТЕГРАЦИЯ С ТРАНСПОРТОМ ====================
+
+    def resolve(self, token: str) -> str:
+        """Актуальный токен вместо устаревшего (если он был обновлён), иначе сам token."""
+        while token in self._aliases:
+            token = self._aliases[token]
+        return token
+
+    def refresh_token(self, token: str) -> Optional[str]:
+        """Новый токен после 401 для token, выданного этим кэшем; None - токен не наш."""
+        token = self.resolve(token)
+        role = self._issued.get(token)
+        if role is None:
+            return None
+        return self.refresh(role, stale_token=token)["token"]
@@ -0,0 +1,37 @@
+import itertools
+import os
+import secrets
+
+# Идентификатор прогона: общий для всех воркеров xdist (PYTEST_XDIST_TESTRUNUID),
+# вне xdist - случайный на процесс. Отличает данные разных прогонов на одном стенде.
+_RUN_ID = (os.getenv("PYTEST_XDIST_TESTRUNUID") or secrets.token_hex(3))[:6]
+
+# Номер воркера xdist ("gw3" -> "w3"); вне xdist - "w0"
+_WORKER_TAG = "w" + os.getenv("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw")
+
+# next() у itertools.count атомарен под GIL - счётчик безопасен для потоков
+_sequence = itertools.count(1)
+
+
+def worker_id() -> str:
+    """Имя воркера xdist ("gw0", "gw1", ...) или "master" вне xdist."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def worker_count() -> int:
+    """Число воркеров xdist (1 вне xdist)."""
+    return int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+def next_sequence() -> int:
+    """Следующий номер в пределах процесса."""
+    return next(_sequence)
+
+
+def unique_id(prefix: str) -> str:
+    """
+    Уникальный для прогона, воркера и вызова идентификатор тестовых данных:
+    unique_id("EXT-GM-lke") -> "EXT-GM-lke-3f9a1c-w2-00017".
+    Параллельные воркеры и повторные прогоны не пересекаются по externalId, штрихкодам и номерам накладных.
+    """
+    return f"{prefix}-{_RUN_ID}-{_WORKER_TAG}-{next_sequence():05d}"